@@ -13,6 +13,7 @@ const APP_ID = parseInt(process.env.ALGORAND_APP_ID || '0');
 const PINATA_API_KEY = process.env.PINATA_API_KEY || '';
 const PINATA_SECRET_KEY = process.env.PINATA_SECRET_API_KEY || '';
 const PINATA_JWT = process.env.PINATA_JWT || '';
+const PINATA_API_URL = process.env.PINATA_API_URL || 'https://api.pinata.cloud';
 
 /**
  * Test Pinata connectivity
@@ -39,7 +40,7 @@ async function testPinata(): Promise<{ status: string; error?: string; details?:
             pinataOptions: { cidVersion: 0 },
         });
 
-        const response = await fetch('https://api.pinata.cloud/pinning/pinJSONToIPFS', {
+        const response = await fetch(`${PINATA_API_URL}/pinning/pinJSONToIPFS`, {
             method: 'POST',
             headers,
             body: testBody,
@@ -16,8 +16,26 @@ const prisma = new PrismaClient();
 const upload = multer({ storage: multer.memoryStorage(), limits: { fileSize: 10 * 1024 * 1024 } });
 
 const APP_ID = process.env.ALGORAND_APP_ID || '0';
+// Optional registration outbox (python contracts/outbox.py): acknowledge at once, register in the background
+const OUTBOX_URL = process.env.OUTBOX_URL;
 const EXPLORER_BASE = 'https://testnet.algoexplorer.io';
 
+/**
+ * On-chain proof links returned once an idea is registered.
+ */
+function blockchainProof(ideaHash: string, txnId: string | null, blockTimestamp: number | null, ipfsCid: string) {
+    return {
+        ideaHash,
+        txnId,
+        appId: APP_ID.toString(),
+        blockTimestamp,
+        ipfsCid,
+        explorerLink: txnId ? `${EXPLORER_BASE}/tx/${txnId}` : null,
+        appLink: `${EXPLORER_BASE}/application/${APP_ID}`,
+        ipfsLink: getIPFSUrl(ipfsCid),
+    };
+}
+
 /**
  * Generate SHA-256 hash of idea content.
  * Hash = SHA256(title + "|" + description + "|" + ISO_timestamp)
@@ -53,6 +71,48 @@ router.post(
                 });
             }
 
+            if (OUTBOX_URL) {
+                // The outbox pins, registers and writes the row; its pending ID becomes the idea's id
+                const outboxRes = await fetch(`${OUTBOX_URL}/registrations`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({
+                        ideaHash,
+                        title,
+                        description,
+                        category,
+                        stage,
+                        location,
+                        fundingGoal: fundingGoal ? parseFloat(fundingGoal) : null,
+                        teamSize: teamSize ? parseInt(teamSize) : null,
+                        visibility: visibility || 'PUBLIC',
+                        founderId: req.user!.id,
+                        metadata: {
+                            title,
+                            description,
+                            category,
+                            stage,
+                            location,
+                            fundingGoal,
+                            teamSize,
+                            founder: req.user!.id,
+                            registeredAt: timestamp,
+                        },
+                        document: req.file ? req.file.buffer.toString('base64') : undefined,
+                        documentName: req.file?.originalname,
+                    }),
+                });
+                if (outboxRes.status === 400) {
+                    const { error } = await outboxRes.json();
+                    return res.status(400).json({ error });
+                }
+                if (!outboxRes.ok) {
+                    throw new Error(`Outbox rejected registration: ${outboxRes.status}`);
+                }
+                const pending = await outboxRes.json();
+                return res.status(202).json({ success: true, pending });
+            }
+
             // Upload documents + metadata to IPFS
             let ipfsCid = '';
             let pitchDeckUrl = '';
@@ -118,16 +178,7 @@ router.post(
             res.status(201).json({
                 success: true,
                 idea,
-                blockchainProof: {
-                    ideaHash,
-                    txnId,
-                    appId: APP_ID.toString(),
-                    blockTimestamp,
-                    ipfsCid,
-                    explorerLink: `${EXPLORER_BASE}/tx/${txnId}`,
-                    appLink: `${EXPLORER_BASE}/application/${APP_ID}`,
-                    ipfsLink: getIPFSUrl(ipfsCid),
-                },
+                blockchainProof: blockchainProof(ideaHash, txnId, blockTimestamp, ipfsCid),
             });
         } catch (err: any) {
             console.error('Idea registration error:', err);
@@ -198,6 +249,24 @@ router.get('/stats', async (_req, res: Response) => {
     }
 });
 
+// GET /api/ideas/pending/:pendingId — Progress of an outbox registration, with its proof once done
+router.get('/pending/:pendingId', requireAuth, async (req: AuthRequest, res: Response) => {
+    if (!OUTBOX_URL) return res.status(404).json({ error: 'Registration outbox not configured' });
+    try {
+        const outboxRes = await fetch(`${OUTBOX_URL}/registrations/${encodeURIComponent(req.params.pendingId)}`);
+        const pending = await outboxRes.json();
+        if (!outboxRes.ok || pending.stage !== 'done') {
+            return res.status(outboxRes.status).json(pending);
+        }
+        res.json({
+            ...pending,
+            blockchainProof: blockchainProof(pending.ideaHash, pending.txnId, pending.blockTimestamp, pending.ipfsCid),
+        });
+    } catch {
+        res.status(503).json({ error: 'Registration outbox unavailable' });
+    }
+});
+
 // GET /api/ideas/:id — Single idea detail
 router.get('/:id', requireAuth, async (req: AuthRequest, res: Response) => {
     try {
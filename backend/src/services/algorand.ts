@@ -12,6 +12,8 @@ import * as path from 'path';
 const ALGOD_URL = process.env.ALGORAND_NODE_URL || 'https://testnet-api.algonode.cloud';
 const INDEXER_URL = process.env.ALGORAND_INDEXER_URL || 'https://testnet-idx.algonode.cloud';
 const APP_ID = parseInt(process.env.ALGORAND_APP_ID || '0');
+// Optional contracts/verification_service.py sidecar (cached verify_idea results)
+const VERIFICATION_SERVICE_URL = process.env.VERIFICATION_SERVICE_URL;
 
 // Initialize Algod & Indexer clients (no API key needed for AlgoNode public endpoints)
 const algodClient = new algosdk.Algodv2('', ALGOD_URL, '');
@@ -27,9 +29,55 @@ function getServiceAccount(): algosdk.Account {
     return algosdk.mnemonicToSecretKey(mnemonic);
 }
 
+const BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz';
+const MAX_TITLE_BYTES = 64;
+const HASHES_PER_PAGE = 32; // ordinal index hashes per 1 KB page box
+const ORDINALS_PER_PAGE = 128; // founder index ordinals (uint64) per 1 KB page box
+
+/**
+ * Extract the 32-byte SHA-256 digest from a CIDv0 ("Qm...") string.
+ * The contract stores this digest instead of the 46-char base58 CID.
+ */
+export function cidToDigest(cid: string): Uint8Array {
+    let value = BigInt(0);
+    for (const char of cid) {
+        const index = BASE58_ALPHABET.indexOf(char);
+        if (index < 0) throw new Error(`Invalid base58 character in CID: ${char}`);
+        value = value * BigInt(58) + BigInt(index);
+    }
+    const hex = value.toString(16).padStart(68, '0');
+    const multihash = Buffer.from(hex, 'hex');
+    if (multihash.length !== 34 || multihash[0] !== 0x12 || multihash[1] !== 0x20) {
+        throw new Error(`Not a CIDv0 sha2-256 CID: ${cid}`);
+    }
+    return new Uint8Array(multihash.subarray(2));
+}
+
+/**
+ * Rebuild the CIDv0 string for a 32-byte SHA-256 digest.
+ */
+export function digestToCid(digest: Uint8Array): string {
+    let value = BigInt('0x' + Buffer.concat([Buffer.from([0x12, 0x20]), Buffer.from(digest)]).toString('hex'));
+    let encoded = '';
+    while (value > BigInt(0)) {
+        encoded = BASE58_ALPHABET[Number(value % BigInt(58))] + encoded;
+        value /= BigInt(58);
+    }
+    return encoded;
+}
+
+/**
+ * Truncate a title preview to the contract's 64-byte limit without splitting a UTF-8 character.
+ */
+function truncateTitle(title: string): string {
+    const encoded = Buffer.from(title, 'utf8');
+    if (encoded.length <= MAX_TITLE_BYTES) return title;
+    return encoded.subarray(0, MAX_TITLE_BYTES).toString('utf8').replace(/\uFFFD+$/, '');
+}
+
 /**
  * Register an idea hash on the Algorand blockchain.
- * Calls register_idea(idea_hash, ipfs_cid, title_preview) on IdeaRegistry contract.
+ * Calls register_idea(idea_hash, cid_digest, title_preview) on IdeaRegistry contract.
  */
 export async function registerIdeaOnChain(
     ideaHashHex: string,     // 64-char hex SHA-256 hash
@@ -41,11 +89,16 @@ export async function registerIdeaOnChain(
     // Convert hex hash to 32-byte Uint8Array
     const ideaHashBytes = Buffer.from(ideaHashHex, 'hex');
 
-    // Get suggested params
-    const suggestedParams = await algodClient.getTransactionParams().do();
+    // Get suggested params and the next ordinal / founder index slots
+    const founder = serviceAccount.addr.publicKey;
+    const [suggestedParams, nextOrdinal, founderTotal] = await Promise.all([
+        algodClient.getTransactionParams().do(),
+        getGlobalUint('next_ordinal'),
+        getFounderTotal(founder),
+    ]);
 
     // Encode ABI method call arguments
-    // Method: register_idea(byte[32],string,string)uint64
+    // Method: register_idea(byte[32],byte[32],string)uint64
     const method = getMethod('register_idea');
     const atc = new algosdk.AtomicTransactionComposer();
 
@@ -57,14 +110,17 @@ export async function registerIdeaOnChain(
         signer: algosdk.makeBasicAccountTransactionSigner(serviceAccount),
         methodArgs: [
             new Uint8Array(ideaHashBytes),
-            ipfsCid,
-            titlePreview.substring(0, 64), // Max 64 chars preview
+            cidToDigest(ipfsCid),
+            truncateTitle(titlePreview), // Max 64 bytes preview
         ],
         boxes: [
             {
                 appIndex: APP_ID,
                 name: new Uint8Array(ideaHashBytes),
             },
+            // Ordinal and founder index boxes the hash is appended to
+            ...[...registerPageNames(nextOrdinal), ...registerFounderNames(founder, founderTotal)]
+                .map((name) => ({ appIndex: APP_ID, name })),
         ],
     });
 
@@ -82,6 +138,15 @@ export async function registerIdeaOnChain(
  * Judge Improvement 4: Real-time on-chain verification — not just DB lookup.
  */
 export async function verifyIdeaOnChain(ideaHashHex: string): Promise<boolean> {
+    if (VERIFICATION_SERVICE_URL) {
+        try {
+            const res = await fetch(`${VERIFICATION_SERVICE_URL}/verify/${ideaHashHex}`);
+            if (res.ok) return Boolean(((await res.json()) as { verified: boolean }).verified);
+        } catch {
+            // Sidecar unavailable — fall through to a direct simulate
+        }
+    }
+
     try {
         const ideaHashBytes = Buffer.from(ideaHashHex, 'hex');
         const method = getMethod('verify_idea');
@@ -137,9 +202,136 @@ export async function getIdeaFromChain(ideaHashHex: string): Promise<{
         });
 
         const simResult = await atc.simulate(algodClient);
-        const [founderAddress, timestamp, ipfsCid] = simResult.methodResults[0].returnValue as [string, number, string];
+        const [founderAddress, timestamp, cidDigest] = simResult.methodResults[0].returnValue as [string, bigint, Uint8Array];
 
-        return { founderAddress, timestamp, ipfsCid };
+        return { founderAddress, timestamp: Number(timestamp), ipfsCid: digestToCid(cidDigest) };
+    } catch {
+        return null;
+    }
+}
+
+/**
+ * Read a uint64 value from the contract's global state (0 if unset).
+ */
+async function getGlobalUint(key: string): Promise<number> {
+    const appInfo = await algodClient.getApplicationByID(APP_ID).do();
+    const globalState = appInfo.params.globalState as unknown as Array<{
+        key: string;
+        value: { uint: number };
+    }>;
+
+    const entry = globalState.find(
+        (s) => Buffer.from(s.key, 'base64').toString() === key,
+    );
+    return Number(entry?.value?.uint || 0);
+}
+
+/**
+ * Box names of the ordinal index pages a registration may write:
+ * the page holding next_ordinal and the one after it.
+ */
+function registerPageNames(nextOrdinal: number): Uint8Array[] {
+    const page = Math.floor(nextOrdinal / HASHES_PER_PAGE);
+    return [pageBoxName(page), pageBoxName(page + 1)];
+}
+
+/**
+ * Box name of an ordinal index page ('p' + uint64 page).
+ */
+function pageBoxName(page: number): Uint8Array {
+    const name = new Uint8Array(9);
+    name[0] = 'p'.charCodeAt(0);
+    new DataView(name.buffer).setBigUint64(1, BigInt(page));
+    return name;
+}
+
+/**
+ * Box names of a founder's index a registration may write: the stats box
+ * ('f' + founder) and the pages holding slots founderTotal and founderTotal + 128.
+ */
+function registerFounderNames(founder: Uint8Array, founderTotal: number): Uint8Array[] {
+    const statsName = new Uint8Array(33);
+    statsName[0] = 'f'.charCodeAt(0);
+    statsName.set(founder, 1);
+
+    const page = Math.floor(founderTotal / ORDINALS_PER_PAGE);
+    const pageNames = [page, page + 1].map((p) => {
+        const name = new Uint8Array(41);
+        name.set(statsName);
+        new DataView(name.buffer).setBigUint64(33, BigInt(p));
+        return name;
+    });
+    return [statsName, ...pageNames];
+}
+
+/**
+ * Number of index slots a founder has used (0 if they never registered).
+ */
+async function getFounderTotal(founder: Uint8Array): Promise<number> {
+    const [statsName] = registerFounderNames(founder, 0);
+    try {
+        const box = await algodClient.getApplicationBoxByName(APP_ID, statsName).do();
+        // Stats box: total(8) | live(8)
+        return Number(Buffer.from(box.value).readBigUInt64BE(0));
+    } catch (err) {
+        if ((err as { response?: { status?: number } }).response?.status === 404) return 0;
+        throw err;
+    }
+}
+
+/**
+ * List one page (up to 128) of the idea hashes a founder registered, oldest first.
+ * The founder index holds ordinals; each is resolved through the ordinal page
+ * box that stores its hash, read once per page.
+ * Deleted ideas keep their slot, so callers should confirm hashes with verifyIdeaOnChain.
+ * Returns: { ideaHashes, nextOffset, liveCount }
+ */
+export async function getFounderIdeasFromChain(founderAddress: string, offset = 0): Promise<{
+    ideaHashes: string[];
+    nextOffset: number;
+    liveCount: number;
+} | null> {
+    try {
+        const founder = algosdk.decodeAddress(founderAddress).publicKey;
+        const [statsName] = registerFounderNames(founder, 0);
+        const [, pageName] = registerFounderNames(founder, offset);
+        const method = getMethod('get_founder_ideas');
+        const suggestedParams = await algodClient.getTransactionParams().do();
+        const dummyAccount = algosdk.generateAccount();
+        const atc = new algosdk.AtomicTransactionComposer();
+
+        atc.addMethodCall({
+            appID: APP_ID,
+            method,
+            sender: dummyAccount.addr,
+            suggestedParams: { ...suggestedParams, fee: 0 },
+            signer: algosdk.makeBasicAccountTransactionSigner(dummyAccount),
+            methodArgs: [founderAddress, offset, ORDINALS_PER_PAGE],
+            boxes: [
+                { appIndex: APP_ID, name: statsName },
+                { appIndex: APP_ID, name: pageName },
+            ],
+        });
+
+        const simResult = await atc.simulate(algodClient);
+        const [ordinals, nextOffset, liveCount] = simResult.methodResults[0].returnValue as [bigint[], bigint, bigint];
+
+        const pages = new Map<number, Buffer>();
+        for (const page of new Set(ordinals.map((o) => Math.floor(Number(o) / HASHES_PER_PAGE)))) {
+            const box = await algodClient.getApplicationBoxByName(APP_ID, pageBoxName(page)).do();
+            pages.set(page, Buffer.from(box.value));
+        }
+        const ideaHashes = ordinals.map((o) => {
+            const ordinal = Number(o);
+            const slot = (ordinal % HASHES_PER_PAGE) * 32;
+            return pages.get(Math.floor(ordinal / HASHES_PER_PAGE))!.subarray(slot, slot + 32).toString('hex');
+        });
+
+        return {
+            ideaHashes,
+            nextOffset: Number(nextOffset),
+            liveCount: Number(liveCount),
+        };
     } catch {
         return null;
     }
@@ -150,16 +342,7 @@ export async function getIdeaFromChain(ideaHashHex: string): Promise<{
  */
 export async function getTotalIdeasCount(): Promise<number> {
     try {
-        const appInfo = await algodClient.getApplicationByID(APP_ID).do();
-        const globalState = appInfo.params.globalState as unknown as Array<{
-            key: string;
-            value: { uint: number };
-        }>;
-
-        const totalEntry = globalState.find(
-            (s) => Buffer.from(s.key, 'base64').toString() === 'total_ideas',
-        );
-        return totalEntry?.value?.uint || 0;
+        return await getGlobalUint('total_ideas');
     } catch {
         return 0;
     }
@@ -173,41 +356,61 @@ export async function getTransactionDetails(txnId: string) {
     return txn.transaction;
 }
 
+/**
+ * ABI definition for IdeaRegistry contract (mirrors the AlgoKit arc56 artifact).
+ */
+const CONTRACT_ABI = {
+    name: 'IdeaRegistry',
+    methods: [
+        {
+            name: 'register_idea',
+            args: [
+                { name: 'idea_hash', type: 'byte[32]' },
+                { name: 'cid_digest', type: 'byte[32]' },
+                { name: 'idea_title_preview', type: 'string' },
+            ],
+            returns: { type: 'uint64' },
+        },
+        {
+            name: 'verify_idea',
+            args: [{ name: 'idea_hash', type: 'byte[32]' }],
+            returns: { type: 'bool' },
+        },
+        {
+            name: 'get_idea',
+            args: [{ name: 'idea_hash', type: 'byte[32]' }],
+            returns: { type: '(address,uint64,byte[32])' },
+        },
+        {
+            name: 'get_total_ideas',
+            args: [],
+            returns: { type: 'uint64' },
+        },
+        {
+            name: 'get_founder_ideas',
+            args: [
+                { name: 'founder', type: 'address' },
+                { name: 'offset', type: 'uint64' },
+                { name: 'limit', type: 'uint64' },
+            ],
+            returns: { type: '(uint64[],uint64,uint64)' },
+        },
+    ],
+};
+
+let contract: algosdk.ABIContract | null = null;
+const methodCache = new Map<string, algosdk.ABIMethod>();
+
 /**
  * Load ABI method from contract ABI (generated by AlgoKit).
+ * The contract is parsed once and methods are memoized by name.
  */
 function getMethod(methodName: string): algosdk.ABIMethod {
-    // ABI definition for IdeaRegistry contract
-    const contractABI = {
-        name: 'IdeaRegistry',
-        methods: [
-            {
-                name: 'register_idea',
-                args: [
-                    { name: 'idea_hash', type: 'byte[32]' },
-                    { name: 'ipfs_cid', type: 'string' },
-                    { name: 'idea_title_preview', type: 'string' },
-                ],
-                returns: { type: 'uint64' },
-            },
-            {
-                name: 'verify_idea',
-                args: [{ name: 'idea_hash', type: 'byte[32]' }],
-                returns: { type: 'bool' },
-            },
-            {
-                name: 'get_idea',
-                args: [{ name: 'idea_hash', type: 'byte[32]' }],
-                returns: { type: '(address,uint64,string)' },
-            },
-            {
-                name: 'get_total_ideas',
-                args: [],
-                returns: { type: 'uint64' },
-            },
-        ],
-    };
-
-    const contract = new algosdk.ABIContract(contractABI);
-    return contract.getMethodByName(methodName);
+    let method = methodCache.get(methodName);
+    if (!method) {
+        contract ??= new algosdk.ABIContract(CONTRACT_ABI);
+        method = contract.getMethodByName(methodName);
+        methodCache.set(methodName, method);
+    }
+    return method;
 }
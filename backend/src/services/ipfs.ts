@@ -6,6 +6,8 @@ const PINATA_API_KEY = process.env.PINATA_API_KEY || '';
 const PINATA_SECRET_KEY = process.env.PINATA_SECRET_API_KEY || '';
 const PINATA_JWT = process.env.PINATA_JWT || '';
 const PINATA_GATEWAY = process.env.PINATA_GATEWAY || 'https://gateway.pinata.cloud';
+// Point at contracts/pinning_server.py to run without the remote service
+const PINATA_API_URL = process.env.PINATA_API_URL || 'https://api.pinata.cloud';
 
 const MAX_RETRIES = 3;
 const RETRY_DELAY_MS = 2000;
@@ -66,7 +68,7 @@ export async function uploadJSONToIPFS(data: object, name: string): Promise<IPFS
         headers['pinata_secret_api_key'] = PINATA_SECRET_KEY;
     }
 
-    const response = await fetchWithRetry('https://api.pinata.cloud/pinning/pinJSONToIPFS', {
+    const response = await fetchWithRetry(`${PINATA_API_URL}/pinning/pinJSONToIPFS`, {
         method: 'POST',
         headers,
         body,
@@ -128,7 +130,7 @@ export async function uploadFileToIPFS(
         headers['pinata_secret_api_key'] = PINATA_SECRET_KEY;
     }
 
-    const response = await fetchWithRetry('https://api.pinata.cloud/pinning/pinFileToIPFS', {
+    const response = await fetchWithRetry(`${PINATA_API_URL}/pinning/pinFileToIPFS`, {
         method: 'POST',
         headers,
         body: bodyBuffer,
@@ -0,0 +1,392 @@
+"""
+IdeaRegistry cost benchmarks.
+Deploys a fresh IdeaRegistry on LocalNet and runs every ABI method under
+simulate with exec-trace enabled, sweeping title sizes and batch sizes. For
+each case it records the opcode budget consumed, opcodes executed, log and
+argument bytes, the fee, and the box minimum balance locked per idea, then
+writes a JSON report and compares it against a checked-in baseline.
+
+Any metric above its baseline value (plus --tolerance) is a regression and
+makes the run exit non-zero, so contract changes cannot silently make
+registration more expensive. The opcode budget is gated for every ABI method:
+a method without a case, or a case whose budget the baseline has not
+recorded, fails the run too. Other metrics missing from the baseline are
+reported but not enforced; record them with --update-baseline.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from algosdk import logic
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    EmptySigner,
+    TransactionSigner,
+    TransactionWithSigner,
+)
+from algosdk.transaction import (
+    ApplicationCreateTxn,
+    OnComplete,
+    PaymentTxn,
+    StateSchema,
+)
+from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.models import SimulateRequest, SimulateTraceConfig
+
+from idea_codec import (
+    BOX_BYTE_MBR,
+    FOUNDER_PAGE_KEY_SIZE,
+    HASH_SIZE,
+    HASHES_PER_PAGE,
+    ANCHOR_RECORD_SIZE,
+    HEADER_SIZE,
+    MAX_TITLE_BYTES,
+    ORDINAL_SIZE,
+    ORDINALS_PER_PAGE,
+    PAGE_KEY_SIZE,
+    anchor_box_name,
+    box_mbr,
+    index_mbr,
+)
+from merkle import MerkleTree
+from registry_client import registration_box_names
+from registry_spec import load_spec, suggested_params
+
+BASELINE_PATH = Path(__file__).parent / "benchmarks" / "baseline.json"
+REPORT_VERSION = 1
+
+TITLE_SIZES = (0, 16, 32, MAX_TITLE_BYTES)
+BATCH_SIZES = (1, 2, 3)
+READ_BATCH = 8
+ANCHOR_COUNT = 8
+MIN_FEE = 1_000
+
+# Metrics every case must have in the baseline
+GATED_METRICS = ("budget",)
+# ABI methods without a benchmark case, and why
+UNBENCHMARKED = {
+    "create_application": "runs once, as part of the deploy",
+}
+
+# Each idea adds a hash slot and an ordinal slot to the index pages; the flat
+# and key cost of an ordinal page is shared by 32 ideas, of a founder page by 128
+PAGE_MBR_PER_IDEA = (
+    BOX_BYTE_MBR * (HASH_SIZE + ORDINAL_SIZE)
+    + -(-box_mbr(0, PAGE_KEY_SIZE) // HASHES_PER_PAGE)
+    + -(-box_mbr(0, FOUNDER_PAGE_KEY_SIZE) // ORDINALS_PER_PAGE)
+)
+
+
+def registration_mbr(title_bytes: int) -> int:
+    """µALGO of box minimum balance one registration locks (record + page share)."""
+    return box_mbr(HEADER_SIZE + title_bytes) + PAGE_MBR_PER_IDEA
+
+
+def first_registration_mbr(title_bytes: int) -> int:
+    """
+    µALGO locked by the first idea in a fresh app: the record, one slot of
+    each index, both first pages and the founder's stats box.
+    """
+    return box_mbr(HEADER_SIZE + title_bytes) + index_mbr(1)
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Cost of one simulated call."""
+
+    budget: int
+    ops: int
+    log_bytes: int
+    arg_bytes: int
+    fee: int
+    mbr: int = 0
+    ideas: int = 0
+
+    def as_dict(self) -> dict:
+        metrics = {
+            "budget": self.budget,
+            "ops": self.ops,
+            "logBytes": self.log_bytes,
+            "argBytes": self.arg_bytes,
+            "feeMicroAlgo": self.fee,
+        }
+        if self.ideas:
+            metrics["mbrMicroAlgo"] = self.mbr
+            metrics["microAlgoPerIdea"] = (self.fee + self.mbr) // self.ideas
+        return metrics
+
+
+def idea_hash(label: str) -> bytes:
+    return hashlib.sha256(f"benchmark-{label}".encode()).digest()
+
+
+class Bench:
+    """Simulates IdeaRegistry calls against one deployed app."""
+
+    def __init__(self, algod_client: AlgodClient, app_id: int, sender: str):
+        self.algod = algod_client
+        self.app_id = app_id
+        self.sender = sender
+        self.spec = load_spec()
+
+    def simulate(self, method: str, args: list, ideas: int = 0, mbr: int = 0) -> Measurement:
+        """Simulate one call and measure it from the exec trace."""
+        atc = AtomicTransactionComposer()
+        atc.add_method_call(
+            app_id=self.app_id,
+            method=self.spec.method(method),
+            sender=self.sender,
+            sp=suggested_params(self.algod),
+            signer=EmptySigner(),
+            method_args=args,
+        )
+        request = SimulateRequest(
+            txn_groups=[],
+            allow_empty_signatures=True,
+            allow_unnamed_resources=True,
+            exec_trace_config=SimulateTraceConfig(enable=True),
+        )
+        response = atc.simulate(self.algod, request)
+        if response.failure_message:
+            raise RuntimeError(f"{method} failed under simulate: {response.failure_message}")
+
+        result = response.simulate_response["txn-groups"][0]["txn-results"][0]
+        if "app-budget-consumed" not in result:
+            raise RuntimeError(f"{method}: simulate reported no app-budget-consumed")
+        txn = atc.build_group()[0].txn
+        logs = result["txn-result"].get("logs", [])
+        return Measurement(
+            budget=result["app-budget-consumed"],
+            ops=len(result.get("exec-trace", {}).get("approval-program-trace", [])),
+            log_bytes=sum(len(base64.b64decode(entry)) for entry in logs),
+            arg_bytes=sum(len(arg) for arg in txn.app_args),
+            fee=max(MIN_FEE, txn.fee),
+            mbr=mbr,
+            ideas=ideas,
+        )
+
+    def entry(self, label: str, title_bytes: int) -> tuple:
+        return (idea_hash(label), hashlib.sha256(label.encode()).digest(), "t" * title_bytes)
+
+    def run_first(self) -> dict[str, Measurement]:
+        """The first registration in a fresh app, which creates every index box; run before seed()."""
+        return {
+            "register_idea[first,title=32]": self.simulate(
+                "register_idea", list(self.entry("first", 32)), 1, first_registration_mbr(32)
+            )
+        }
+
+    def run(self, existing: list[bytes], anchored: MerkleTree) -> dict[str, Measurement]:
+        """Every benchmark case after seed(), keyed "<method>[<case>]"."""
+        results: dict[str, Measurement] = {}
+        for size in TITLE_SIZES:
+            results[f"register_idea[title={size}]"] = self.simulate(
+                "register_idea", list(self.entry(f"single-{size}", size)), 1, registration_mbr(size)
+            )
+        for n in BATCH_SIZES:
+            entries = [self.entry(f"batch-{n}-{i}", 32) for i in range(n)]
+            results[f"register_ideas_batch[n={n}]"] = self.simulate(
+                "register_ideas_batch", [entries], n, n * registration_mbr(32)
+            )
+
+        # The benchmark sender created the app, so it may import (as migrate_boxes.py does)
+        legacy = self.entry("imported", 32)
+        results["import_idea[title=32]"] = self.simulate(
+            "import_idea", [legacy[0], self.sender, 1, legacy[1], legacy[2]], 1, registration_mbr(32)
+        )
+
+        found, missing = existing[0], idea_hash("missing")
+        reads = (existing * READ_BATCH)[:READ_BATCH]
+        results["verify_idea[found]"] = self.simulate("verify_idea", [found])
+        results["verify_idea[missing]"] = self.simulate("verify_idea", [missing])
+        results["get_idea[found]"] = self.simulate("get_idea", [found])
+        results[f"verify_ideas[n={READ_BATCH}]"] = self.simulate("verify_ideas", [reads])
+        results[f"get_ideas[n={READ_BATCH}]"] = self.simulate("get_ideas", [reads])
+        results["get_total_ideas"] = self.simulate("get_total_ideas", [])
+        results["list_ideas[limit=32]"] = self.simulate("list_ideas", [0, HASHES_PER_PAGE])
+        results[f"get_founder_ideas[limit={ORDINALS_PER_PAGE}]"] = self.simulate(
+            "get_founder_ideas", [self.sender, 0, ORDINALS_PER_PAGE]
+        )
+
+        tree = MerkleTree([idea_hash(f"anchor-{i}") for i in range(ANCHOR_COUNT)])
+        results[f"anchor_batch[count={ANCHOR_COUNT}]"] = self.simulate(
+            "anchor_batch",
+            [tree.root, tree.count, hashlib.sha256(tree.root).digest()],
+            ANCHOR_COUNT,
+            box_mbr(ANCHOR_RECORD_SIZE, 33),
+        )
+        proof = anchored.proof(anchored.count - 1)
+        results[f"verify_inclusion[count={anchored.count}]"] = self.simulate(
+            "verify_inclusion", [existing[-1], anchored.root, proof.index, list(proof.siblings)]
+        )
+        results["delete_idea[found]"] = self.simulate("delete_idea", [found])
+        return results
+
+
+def deploy(algod_client: AlgodClient, sender: str, signer: TransactionSigner) -> int:
+    """Create and fund a fresh IdeaRegistry; returns the app ID."""
+    spec = load_spec()
+    params = suggested_params(algod_client)
+    create = ApplicationCreateTxn(
+        sender=sender,
+        sp=params,
+        on_complete=OnComplete.NoOpOC,
+        approval_program=spec.approval_program,
+        clear_program=spec.clear_program,
+        global_schema=StateSchema(num_uints=8, num_byte_slices=8),
+        local_schema=StateSchema(num_uints=0, num_byte_slices=0),
+        app_args=[spec.method("create_application").get_selector()],
+    )
+    atc = AtomicTransactionComposer()
+    atc.add_transaction(TransactionWithSigner(create, signer))
+    txid = atc.execute(algod_client, 4).tx_ids[0]
+    app_id = algod_client.pending_transaction_info(txid)["application-index"]
+
+    fund = PaymentTxn(sender, params, logic.get_application_address(app_id), 10_000_000)
+    atc = AtomicTransactionComposer()
+    atc.add_transaction(TransactionWithSigner(fund, signer))
+    atc.execute(algod_client, 4)
+    return app_id
+
+
+def seed(
+    algod_client: AlgodClient, app_id: int, sender: str, signer: TransactionSigner
+) -> tuple[list[bytes], MerkleTree]:
+    """Register a few ideas for the read/delete benchmarks and anchor them as one batch."""
+    bench = Bench(algod_client, app_id, sender)
+    entries = [bench.entry(f"seed-{i}", 32) for i in range(3)]
+    names = [e[0] for e in entries] + registration_box_names(algod_client, app_id, sender)
+    atc = AtomicTransactionComposer()
+    atc.add_method_call(
+        app_id=app_id,
+        method=bench.spec.method("register_ideas_batch"),
+        sender=sender,
+        sp=suggested_params(algod_client),
+        signer=signer,
+        method_args=[entries],
+        boxes=[(app_id, name) for name in names],
+    )
+    tree = MerkleTree([e[0] for e in entries])
+    atc.add_method_call(
+        app_id=app_id,
+        method=bench.spec.method("anchor_batch"),
+        sender=sender,
+        sp=suggested_params(algod_client),
+        signer=signer,
+        method_args=[tree.root, tree.count, hashlib.sha256(tree.root).digest()],
+        boxes=[(app_id, anchor_box_name(tree.root))],
+    )
+    atc.execute(algod_client, 4)
+    return [e[0] for e in entries], tree
+
+
+def build_report(results: dict[str, Measurement]) -> dict:
+    return {
+        "version": REPORT_VERSION,
+        "measurements": {name: m.as_dict() for name, m in sorted(results.items())},
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.0) -> list[str]:
+    """
+    Regressions of `report` against `baseline`.
+
+    A regression is a baseline case missing from the report, a metric
+    above baseline * (1 + tolerance), or a GATED_METRICS value the report
+    has but the baseline has not recorded. Lower values are improvements.
+    """
+    regressions = []
+    current = report.get("measurements", {})
+    recorded = baseline.get("measurements", {})
+    for name, metrics in current.items():
+        for metric in GATED_METRICS:
+            if metric in metrics and metric not in recorded.get(name, {}):
+                regressions.append(f"{name}.{metric}: not recorded in baseline")
+    for name, expected in baseline.get("measurements", {}).items():
+        if name not in current:
+            regressions.append(f"{name}: missing from report")
+            continue
+        for metric, limit in expected.items():
+            value = current[name].get(metric)
+            if value is None:
+                regressions.append(f"{name}.{metric}: missing from report")
+            elif value > limit * (1 + tolerance):
+                regressions.append(f"{name}.{metric}: {value} > baseline {limit}")
+    return regressions
+
+
+def ungated_methods(baseline: dict, methods: Iterable[str]) -> list[str]:
+    """ABI methods with no baseline case recording every GATED_METRICS value."""
+    gated = {
+        name.split("[")[0]
+        for name, metrics in baseline.get("measurements", {}).items()
+        if all(metric in metrics for metric in GATED_METRICS)
+    }
+    return sorted(set(methods) - gated - UNBENCHMARKED.keys())
+
+
+def unrecorded(report: dict, baseline: dict) -> list[str]:
+    """Metrics in the report that the baseline does not enforce yet."""
+    known = baseline.get("measurements", {})
+    return [
+        f"{name}.{metric}"
+        for name, metrics in report.get("measurements", {}).items()
+        for metric in metrics
+        if metric not in known.get(name, {})
+    ]
+
+
+def load_json(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark IdeaRegistry opcode, fee and box MBR costs on LocalNet")
+    parser.add_argument("--output", type=str, default="benchmark_report.json", help="Where to write the report")
+    parser.add_argument("--baseline", type=str, default=str(BASELINE_PATH), help="Baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Allowed fractional increase per metric")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run")
+    args = parser.parse_args()
+
+    from algokit_utils import AlgorandClient
+    algorand = AlgorandClient.default_localnet()
+    algod_client = algorand.client.algod
+    dispenser = algorand.account.localnet_dispenser()
+
+    app_id = deploy(algod_client, dispenser.address, dispenser.signer)
+    bench = Bench(algod_client, app_id, dispenser.address)
+    results = bench.run_first()
+    existing, anchored = seed(algod_client, app_id, dispenser.address, dispenser.signer)
+    results.update(bench.run(existing, anchored))
+    report = build_report(results)
+    write_json(Path(args.output), report)
+    print(f"Wrote {len(report['measurements'])} measurements to {args.output}")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        write_json(baseline_path, report)
+        print(f"Baseline updated: {baseline_path}")
+        sys.exit(0)
+
+    baseline = load_json(baseline_path) if baseline_path.exists() else {}
+    for metric in unrecorded(report, baseline):
+        print(f"  not in baseline: {metric}")
+    regressions = compare(report, baseline, args.tolerance)
+    regressions += [f"{method}: no budget in baseline" for method in ungated_methods(baseline, load_spec().methods)]
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,189 @@
+"""
+IdeaRegistry enumeration.
+Rebuilds the list of registered ideas from chain state: the ordinal page
+index (32 hashes per box) is read with bounded parallelism, then records are
+fetched through get_ideas simulate groups of up to 128 hashes. Auditing or
+rebuilding the database costs O(ideas / 32) box reads plus O(ideas / 128)
+simulates instead of one sequential HTTP call per idea.
+"""
+
+import argparse
+import base64
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from algosdk.v2client.algod import AlgodClient
+
+from algosdk import encoding
+
+from idea_codec import (
+    HASHES_PER_PAGE,
+    ORDINALS_PER_PAGE,
+    decode_founder_page,
+    decode_page,
+    founder_page_box_name,
+    hash_at,
+    page_box_name,
+)
+from registry_client import (
+    MAX_GROUP_SIZE,
+    MAX_HASHES_PER_CALL,
+    OnChainIdea,
+    get_ideas,
+    read_founder_stats,
+    read_global_state,
+)
+
+DEFAULT_WORKERS = 8
+HASHES_PER_SIMULATE = MAX_HASHES_PER_CALL * MAX_GROUP_SIZE
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def bounded_map(fn: Callable[[T], R], items: Iterable[T], executor: ThreadPoolExecutor, window: int) -> Iterator[R]:
+    """Like executor.map, but keeps at most `window` calls in flight and yields in order."""
+    pending: deque[Future] = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def fetch_page(algod_client: AlgodClient, app_id: int, page: int) -> bytes:
+    """Read one ordinal index page box."""
+    response = algod_client.application_box_by_name(app_id, page_box_name(page))
+    return base64.b64decode(response["value"])
+
+
+def iter_hashes(
+    algod_client: AlgodClient,
+    app_id: int,
+    max_workers: int = DEFAULT_WORKERS,
+    next_ordinal: int | None = None,
+) -> Iterator[bytes]:
+    """
+    Yield every hash in the ordinal index, in registration order.
+
+    Deleted ideas keep their ordinal slot, so some hashes may no longer be
+    registered; enumerate_ideas filters those out.
+    """
+    if next_ordinal is None:
+        next_ordinal = read_global_state(algod_client, app_id).get("next_ordinal", 0)
+    pages = range((next_ordinal + HASHES_PER_PAGE - 1) // HASHES_PER_PAGE)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        values = bounded_map(
+            lambda page: fetch_page(algod_client, app_id, page), pages, executor, max_workers * 2
+        )
+        for page, value in zip(pages, values):
+            yield from decode_page(value, page * HASHES_PER_PAGE, next_ordinal)
+
+
+def iter_founder_hashes(
+    algod_client: AlgodClient,
+    app_id: int,
+    founder: str,
+    max_workers: int = DEFAULT_WORKERS,
+) -> Iterator[bytes]:
+    """
+    Yield every hash `founder` registered, oldest first, skipping deleted ideas.
+
+    Founder pages hold ordinals; each is resolved through the ordinal page
+    that stores its hash, reading every such page once.
+    """
+    founder_key = encoding.decode_address(founder)
+    total, _ = read_founder_stats(algod_client, app_id, founder)
+    founder_pages = range((total + ORDINALS_PER_PAGE - 1) // ORDINALS_PER_PAGE)
+
+    def fetch(page: int) -> bytes:
+        response = algod_client.application_box_by_name(app_id, founder_page_box_name(founder_key, page))
+        return base64.b64decode(response["value"])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        ordinals = [
+            ordinal
+            for page, value in zip(founder_pages, bounded_map(fetch, founder_pages, executor, max_workers * 2))
+            for ordinal in decode_founder_page(value, page * ORDINALS_PER_PAGE, total)
+        ]
+        pages = sorted({ordinal // HASHES_PER_PAGE for ordinal in ordinals})
+        values = dict(zip(pages, bounded_map(
+            lambda page: fetch_page(algod_client, app_id, page), pages, executor, max_workers * 2
+        )))
+    for ordinal in ordinals:
+        yield hash_at(values[ordinal // HASHES_PER_PAGE], ordinal)
+
+
+def _batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def enumerate_ideas(
+    algod_client: AlgodClient,
+    app_id: int,
+    max_workers: int = DEFAULT_WORKERS,
+    founder: str | None = None,
+) -> Iterator[tuple[bytes, OnChainIdea]]:
+    """Yield (idea_hash, record) for every currently registered idea, or only `founder`'s."""
+    if founder:
+        hashes = iter_founder_hashes(algod_client, app_id, founder, max_workers)
+    else:
+        hashes = iter_hashes(algod_client, app_id, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = bounded_map(
+            lambda batch: get_ideas(algod_client, app_id, batch),
+            _batched(hashes, HASHES_PER_SIMULATE),
+            executor,
+            max_workers * 2,
+        )
+        for ideas in results:
+            for idea_hash, idea in ideas.items():
+                if idea is not None:
+                    yield idea_hash, idea
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dump every registered idea from IdeaRegistry as JSON lines")
+    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    parser.add_argument("--app-id", type=int, default=int(os.environ.get("ALGORAND_APP_ID", "0")), help="IdeaRegistry app ID")
+    parser.add_argument("--founder", type=str, help="Only dump ideas registered by this address")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Maximum concurrent algod requests")
+    parser.add_argument("--output", type=str, help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    if not args.app_id:
+        raise SystemExit("App ID required: pass --app-id or set ALGORAND_APP_ID")
+
+    from algokit_utils import AlgorandClient
+    if args.network == "localnet":
+        algorand = AlgorandClient.default_localnet()
+    elif args.network == "testnet":
+        algorand = AlgorandClient.testnet()
+    else:
+        algorand = AlgorandClient.mainnet()
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else None
+    try:
+        for idea_hash, idea in enumerate_ideas(algorand.client.algod, args.app_id, args.workers, args.founder):
+            line = json.dumps({
+                "ideaHash": idea_hash.hex(),
+                "founder": idea.founder,
+                "timestamp": idea.timestamp,
+                "ipfsCid": idea.ipfs_cid,
+            })
+            print(line, file=out)
+    finally:
+        if out:
+            out.close()
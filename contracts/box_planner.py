@@ -0,0 +1,331 @@
+"""
+IdeaRegistry box-reference planner.
+Packs pending register / verify / get operations against idea_storage into
+app calls and atomic groups that respect the protocol's per-transaction
+limits (8 references, 2 KB of app arguments), the 16-transaction group cap,
+and the opcode budget pooled across a group's calls. Idea records are at
+most MAX_RECORD_SIZE bytes, well inside the 1 KB I/O quota one box
+reference grants, so every read needs exactly its own reference.
+
+References are shared across a group (AVM v9 resource sharing), so a call
+may touch a box another transaction in its group references. Registration
+groups reference their ordinal and founder index boxes once.
+
+Registrations are sent, so they are planned for the fewest transactions
+(fees); verify / get calls are readonly and simulated, so they are planned
+separately for the fewest simulate groups. Pure planning: no algod access.
+"""
+
+import json
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from idea_codec import HASHES_PER_PAGE, ORDINALS_PER_PAGE
+
+MAX_GROUP_SIZE = 16
+# Accounts + assets + apps + boxes a single transaction may reference
+MAX_TXN_REFERENCES = 8
+MAX_APP_ARGS_BYTES = 2_048
+# Box bytes a group may touch per box reference; every idea record fits one
+BOX_IO_QUOTA = 1_024
+APP_CALL_BUDGET = 700
+# Must match MAX_HASHES_PER_READ in smart_contracts/idea_registry/contract.py
+MAX_HASHES_PER_READ = 8
+# Method selector plus the entries array's length prefix
+CALL_ARGS_OVERHEAD = 4 + 2
+
+REGISTER = "register"
+VERIFY = "verify"
+GET = "get"
+READ_METHODS = {VERIFY: "verify_ideas", GET: "get_ideas"}
+
+# Simulated costs recorded by benchmark.py --update-baseline
+BASELINE_PATH = Path(__file__).parent / "benchmarks" / "baseline.json"
+BATCH_CASE_PREFIX = "register_ideas_batch[n="
+
+
+@dataclass(frozen=True)
+class BudgetModel:
+    """Opcode budget a register_ideas_batch call consumes: per_call + per_idea * entries."""
+
+    per_call: int
+    per_idea: int
+
+
+def fit_budget(consumed: dict[int, int]) -> BudgetModel:
+    """
+    Budget model through simulated register_ideas_batch costs, keyed by entry
+    count. The slope comes from the smallest and largest batch; per_call is
+    raised until the model covers every measured point.
+    """
+    if len(consumed) < 2:
+        raise ValueError("Need simulated budgets for at least two batch sizes")
+    low, high = min(consumed), max(consumed)
+    per_idea = max(0, -(-(consumed[high] - consumed[low]) // (high - low)))
+    per_call = max(0, max(cost - per_idea * n for n, cost in consumed.items()))
+    return BudgetModel(per_call=per_call, per_idea=per_idea)
+
+
+def baseline_budget(path: Path = BASELINE_PATH) -> BudgetModel | None:
+    """Budget model fitted to the register_ideas_batch budgets in a benchmark baseline, if recorded."""
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        measurements = json.load(f).get("measurements", {})
+    consumed = {
+        int(name[len(BATCH_CASE_PREFIX):-1]): metrics["budget"]
+        for name, metrics in measurements.items()
+        if name.startswith(BATCH_CASE_PREFIX) and "budget" in metrics
+    }
+    return fit_budget(consumed) if len(consumed) >= 2 else None
+
+
+# Fallback for a baseline without budgets: 3 entries (bulk_register.MAX_BATCH_ENTRIES)
+# per call's budget. The recorded cost is higher (a 3-entry batch needs a
+# pooled budget), so callers that send transactions must measure instead.
+ASSUMED_BUDGET = BudgetModel(per_call=0, per_idea=APP_CALL_BUDGET // 3)
+MEASURED_BUDGET = baseline_budget()
+DEFAULT_BUDGET = MEASURED_BUDGET or ASSUMED_BUDGET
+
+
+@dataclass(frozen=True)
+class Operation:
+    """One pending operation on an idea box."""
+
+    kind: str
+    idea_hash: bytes
+    title: str = ""
+
+
+def entry_arg_size(entry) -> int:
+    """ABI-encoded bytes of one register entry: its head offset, hash, cid digest, title offset and title."""
+    return 2 + 32 + 32 + 2 + 2 + len(entry.title.encode("utf-8"))
+
+
+def split_by_args(entries: Sequence) -> list[list]:
+    """Fewest in-order register calls whose arguments each fit MAX_APP_ARGS_BYTES."""
+    calls: list[list] = [[]]
+    used = CALL_ARGS_OVERHEAD
+    for entry in entries:
+        size = entry_arg_size(entry)
+        if used + size > MAX_APP_ARGS_BYTES and calls[-1]:
+            calls.append([])
+            used = CALL_ARGS_OVERHEAD
+        calls[-1].append(entry)
+        used += size
+    return calls
+
+
+def index_reference_bound(count: int) -> int:
+    """
+    Most index boxes a group appending `count` hashes can touch: every
+    ordinal and founder page the run spans plus the next one of each (as
+    register_page_names does), and the founder stats box.
+    """
+    def pages(per_page: int) -> int:
+        return (count + per_page - 2) // per_page + 2
+
+    return pages(HASHES_PER_PAGE) + pages(ORDINALS_PER_PAGE) + 1
+
+
+def register_group_size(
+    entries: Sequence,
+    budget: BudgetModel = DEFAULT_BUDGET,
+    separate_payer: bool = False,
+) -> int | None:
+    """
+    Fewest transactions one group registering `entries` needs.
+
+    Returns:
+        Transaction count, or None if the entries cannot share one group
+    """
+    count = len(entries)
+    payer = 1 if separate_payer else 0
+    if budget.per_call >= APP_CALL_BUDGET:
+        return None
+    references = count + index_reference_bound(count)
+    size = max(
+        -(-references // MAX_TXN_REFERENCES),
+        -(-count * budget.per_idea // (APP_CALL_BUDGET - budget.per_call)),
+        len(split_by_args(entries)) + payer,
+        1 + payer,
+    )
+    return size if size <= MAX_GROUP_SIZE else None
+
+
+def register_block_costs(
+    entries: Sequence,
+    budget: BudgetModel = DEFAULT_BUDGET,
+    separate_payer: bool = False,
+) -> list[int]:
+    """
+    costs[k] = transactions a group of k registrations needs, for every k
+    that fits a group, sizing every entry like the largest in `entries`.
+    """
+    if not entries:
+        return [0]
+    widest = max(entries, key=entry_arg_size)
+    costs = [0]
+    while True:
+        size = register_group_size([widest] * len(costs), budget, separate_payer)
+        if size is None:
+            break
+        costs.append(size)
+    if len(costs) == 1:
+        raise ValueError("A single registration does not fit a group")
+    return costs
+
+
+def _best_blocks(count: int, costs: list[int]) -> list[int]:
+    """
+    Group sizes covering `count` with the fewest transactions. Up to
+    `best * largest` registrations the dynamic program is exact and breaks
+    ties toward fewer groups; beyond that only the transaction count is
+    guaranteed.
+    """
+    largest = len(costs) - 1
+    # Most cost-effective group size, larger on ties
+    best = min(range(1, largest + 1), key=lambda k: (Fraction(costs[k], k), -k))
+    # Beyond `best * largest` registrations an optimal plan only adds more
+    # `best`-sized groups: any `best` other groups contain a subset whose
+    # sizes sum to a multiple of `best` and can be swapped for them.
+    bulk = max(0, (count - best * largest) // best)
+    remainder = count - bulk * best
+
+    plan: list[tuple[int, int, int]] = [(0, 0, 0)]  # (transactions, groups, last size)
+    for n in range(1, remainder + 1):
+        plan.append(min(
+            (plan[n - k][0] + costs[k], plan[n - k][1] + 1, k) for k in range(1, min(n, largest) + 1)
+        ))
+    blocks = [best] * bulk
+    n = remainder
+    while n:
+        blocks.append(plan[n][2])
+        n -= plan[n][2]
+    return sorted(blocks, reverse=True)
+
+
+def plan_registers(
+    entries: Sequence,
+    budget: BudgetModel = DEFAULT_BUDGET,
+    separate_payer: bool = False,
+) -> list[list]:
+    """
+    Split register entries, in order, into groups using the fewest
+    transactions (fees), ties broken toward fewer groups (confirmations).
+    """
+    if not entries:
+        return []
+    blocks = _best_blocks(len(entries), register_block_costs(entries, budget, separate_payer))
+    groups, start = [], 0
+    for size in blocks:
+        groups.append(list(entries[start:start + size]))
+        start += size
+    return groups
+
+
+@dataclass(frozen=True)
+class ReadGroup:
+    """One simulate group: verify / get calls of at most MAX_HASHES_PER_READ hashes each."""
+
+    calls: tuple[tuple[Operation, ...], ...]
+
+    @property
+    def size(self) -> int:
+        """Transactions: one per call, each referencing its own (at most 8) boxes."""
+        return len(self.calls)
+
+
+def _read_calls(ops: Sequence[Operation]) -> int:
+    kinds: dict[str, int] = {}
+    for op in ops:
+        kinds[op.kind] = kinds.get(op.kind, 0) + 1
+    return sum(-(-n // MAX_HASHES_PER_READ) for n in kinds.values())
+
+
+def plan_reads(operations: Iterable[Operation]) -> list[ReadGroup]:
+    """
+    Pack verify / get operations into the fewest simulate groups.
+
+    Operations are taken kind by kind in input order, so each group holds at
+    most one partially filled call per kind. Every call carries its own
+    references (MAX_HASHES_PER_READ fits a transaction's 8), so the plan
+    meets read_lower_bound.
+    """
+    by_kind: dict[str, list[Operation]] = {VERIFY: [], GET: []}
+    for op in operations:
+        if op.kind not in by_kind:
+            raise ValueError(f"Not a read operation: {op.kind}")
+        by_kind[op.kind].append(op)
+
+    groups: list[ReadGroup] = []
+    current: list[Operation] = []
+    for op in by_kind[VERIFY] + by_kind[GET]:
+        if _read_calls(current + [op]) > MAX_GROUP_SIZE:
+            groups.append(_read_group(current))
+            current = []
+        current.append(op)
+    if current:
+        groups.append(_read_group(current))
+    return groups
+
+
+def _read_group(ops: list[Operation]) -> ReadGroup:
+    calls: list[tuple[Operation, ...]] = []
+    for kind in (VERIFY, GET):
+        same = [op for op in ops if op.kind == kind]
+        calls += [tuple(same[i:i + MAX_HASHES_PER_READ]) for i in range(0, len(same), MAX_HASHES_PER_READ)]
+    return ReadGroup(tuple(calls))
+
+
+@dataclass(frozen=True)
+class PlannedCall:
+    """One transaction of a read group: the method, its operations and the boxes it references."""
+
+    method: str
+    operations: tuple[Operation, ...]
+    boxes: tuple[bytes, ...]
+
+
+def layout_reads(group: ReadGroup) -> list[PlannedCall]:
+    """Transactions of a read group, each referencing the boxes of its own hashes."""
+    return [
+        PlannedCall(READ_METHODS[ops[0].kind], ops, tuple(op.idea_hash for op in ops)) for ops in group.calls
+    ]
+
+
+@dataclass(frozen=True)
+class Plan:
+    """Registration groups (sent) and read groups (simulated) for a workload."""
+
+    register_groups: list[list[Operation]]
+    register_transactions: int
+    read_groups: list[ReadGroup]
+
+    @property
+    def read_transactions(self) -> int:
+        return sum(group.size for group in self.read_groups)
+
+
+def plan(
+    operations: Iterable[Operation],
+    budget: BudgetModel = DEFAULT_BUDGET,
+    separate_payer: bool = False,
+) -> Plan:
+    """Plan a mixed workload: registrations for fees, reads for simulate round-trips."""
+    registers, reads = [], []
+    for op in operations:
+        (registers if op.kind == REGISTER else reads).append(op)
+    register_groups = plan_registers(registers, budget, separate_payer)
+    return Plan(
+        register_groups=register_groups,
+        register_transactions=sum(register_group_size(g, budget, separate_payer) for g in register_groups),
+        read_groups=plan_reads(reads),
+    )
+
+
+def read_lower_bound(operations: Sequence[Operation]) -> int:
+    """No plan of these reads uses fewer transactions."""
+    return max(_read_calls(operations), -(-len(operations) // MAX_TXN_REFERENCES))
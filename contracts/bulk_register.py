@@ -0,0 +1,445 @@
+"""
+Bulk IdeaRegistry registration.
+Backfills large numbers of ideas from a JSONL or CSV file of (hash, cid, title)
+rows. Transactions are built and signed ahead of time with cached suggested
+params, sent as atomic groups of up to 16 register_ideas_batch calls (as many
+ideas as their pooled opcode budget covers) while earlier groups are still
+confirming, and confirmed through the shared confirmation watcher (one block
+scan per round for every in-flight group).
+
+Runs are resumable and idempotent: hashes already registered are filtered
+out with verify_ideas before submission, and register_ideas_batch reports
+(rather than rejects) any duplicates that slip through, so an interrupted
+backfill can simply be started again.
+"""
+
+import argparse
+import base64
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from algosdk import account, encoding, logic, mnemonic as algo_mnemonic
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner,
+    AtomicTransactionComposer,
+)
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+
+from box_planner import APP_CALL_BUDGET, DEFAULT_BUDGET, BudgetModel
+from confirmations import ConfirmationTimeout, TransactionRejected, watcher_for
+from deploy import load_env_file
+from idea_codec import (
+    HEADER_SIZE,
+    box_mbr,
+    cid_to_digest,
+    index_mbr,
+    register_founder_names,
+    register_page_names,
+    truncate_title,
+)
+from registry_client import MAX_GROUP_SIZE, read_founder_stats, read_global_state, verify_ideas
+from registry_spec import registry_method, suggested_params
+from tracing import span, traced_submit
+
+# Each call references its idea boxes plus 2 ordinal pages and 3 founder
+# index boxes; a transaction carries at most 8 references.
+MAX_BATCH_ENTRIES = 3
+# Reference limit of a group; the opcode budget usually allows fewer (group_capacity)
+ENTRIES_PER_GROUP = MAX_BATCH_ENTRIES * MAX_GROUP_SIZE
+
+DEFAULT_WINDOW = 8
+# Hashes checked per verify_ideas pass before their groups are submitted
+VERIFY_CHUNK = 2_048
+
+
+@dataclass(frozen=True)
+class BulkEntry:
+    """One idea to register."""
+
+    idea_hash: bytes
+    cid_digest: bytes
+    title: str
+
+
+@dataclass
+class BulkReport:
+    """Outcome of a bulk registration run."""
+
+    read: int = 0
+    skipped: int = 0
+    submitted: int = 0
+    registered: int = 0
+    duplicates: int = 0
+    failed: list[BulkEntry] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.registered / self.elapsed if self.elapsed else 0.0
+
+
+def parse_entry(idea_hash: str, ipfs_cid: str, title: str) -> BulkEntry:
+    """Validate one input row and convert it to contract arguments."""
+    raw_hash = bytes.fromhex(idea_hash.removeprefix("0x"))
+    if len(raw_hash) != 32:
+        raise ValueError(f"Idea hash must be 32 bytes, got {len(raw_hash)}: {idea_hash}")
+    return BulkEntry(raw_hash, cid_to_digest(ipfs_cid), truncate_title(title).decode("utf-8"))
+
+
+def read_entries(path: str | Path) -> Iterator[BulkEntry]:
+    """
+    Stream entries from a .jsonl or .csv file.
+
+    JSONL rows use the backend's field names (ideaHash, ipfsCid, title);
+    CSV files need a header row with idea_hash, ipfs_cid and title columns.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                yield parse_entry(row["idea_hash"], row["ipfs_cid"], row.get("title", ""))
+        else:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield parse_entry(row["ideaHash"], row["ipfsCid"], row.get("title", ""))
+
+
+def batch_calls(count: int, budget: BudgetModel = DEFAULT_BUDGET) -> int:
+    """
+    register_ideas_batch calls a group of `count` entries needs: at most
+    MAX_BATCH_ENTRIES each, and enough of them to pool the opcode budget.
+    """
+    if budget.per_call >= APP_CALL_BUDGET:
+        raise ValueError("A register_ideas_batch call alone exceeds the opcode budget")
+    calls = -(-count // MAX_BATCH_ENTRIES)
+    return max(calls, -(-count * budget.per_idea // (APP_CALL_BUDGET - budget.per_call)))
+
+
+def group_capacity(budget: BudgetModel = DEFAULT_BUDGET) -> int:
+    """Most entries one group of MAX_GROUP_SIZE register_ideas_batch calls can register."""
+    count = ENTRIES_PER_GROUP
+    while count > 1 and batch_calls(count, budget) > MAX_GROUP_SIZE:
+        count -= 1
+    return count
+
+
+def _spread(items: Sequence, parts: int) -> list[list]:
+    """Split `items`, in order, into `parts` runs whose lengths differ by at most one."""
+    size, extra = divmod(len(items), parts)
+    runs, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        runs.append(list(items[start:end]))
+        start = end
+    return runs
+
+
+def _counted(entries: Iterable[BulkEntry], report: BulkReport) -> Iterator[BulkEntry]:
+    """Pass entries through, counting them into report.read."""
+    for entry in entries:
+        report.read += 1
+        yield entry
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    chunk: list = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def estimate_mbr(entries: Sequence[BulkEntry], next_ordinal: int = 0, founder_total: int = 0) -> int:
+    """
+    Minimum balance (µALGO) the app account needs to store `entries`, all
+    new and from one founder, appended at the given index positions.
+    """
+    records = sum(box_mbr(HEADER_SIZE + len(e.title.encode("utf-8"))) for e in entries)
+    return records + index_mbr(len(entries), next_ordinal, founder_total)
+
+
+class IndexCursor:
+    """
+    Predicts the ordinal / founder index boxes each call will write.
+
+    Groups are sent in order, so every call starts where the previous one
+    ended. Hashes the cursor has already placed are not counted again (the
+    contract skips duplicates without appending), and duplicates raced in
+    by other writers are given back with rewind() once a call reports them;
+    the two-page window in each call's references absorbs what is left.
+    """
+
+    def __init__(self, next_ordinal: int, founder: bytes, founder_total: int):
+        self.next_ordinal = next_ordinal
+        self.founder = founder
+        self.founder_total = founder_total
+        self.placed: set[bytes] = set()
+
+    def advance(self, entries: Iterable[BulkEntry]) -> int:
+        """Move past the entries the contract will append; returns how many."""
+        count = 0
+        for entry in entries:
+            if entry.idea_hash not in self.placed:
+                self.placed.add(entry.idea_hash)
+                count += 1
+        self.next_ordinal += count
+        self.founder_total += count
+        return count
+
+    def rewind(self, count: int) -> None:
+        """Give back positions predicted for hashes a confirmed call reported as duplicates."""
+        self.next_ordinal -= count
+        self.founder_total -= count
+
+    def take(self, entries: Sequence[BulkEntry]) -> list[bytes]:
+        """Box names for a call appending `entries`; advances the cursor."""
+        names = register_page_names(self.next_ordinal) + register_founder_names(
+            self.founder, self.founder_total
+        )
+        self.advance(entries)
+        return names
+
+
+@dataclass
+class InFlightGroup:
+    txids: list[str]
+    entries: list[BulkEntry]
+    last_valid: int
+    # Pending transaction info of each txid, resolved by the watcher
+    confirmations: list[Future] = field(default_factory=list)
+
+
+class BulkRegistrar:
+    """Pipelined register_ideas_batch submission for one sender."""
+
+    def __init__(
+        self,
+        algod_client: AlgodClient,
+        app_id: int,
+        private_key: str,
+        window: int = DEFAULT_WINDOW,
+        budget: BudgetModel = DEFAULT_BUDGET,
+    ):
+        self.algod = algod_client
+        self.app_id = app_id
+        self.sender = account.address_from_private_key(private_key)
+        self.signer = AccountTransactionSigner(private_key)
+        self.window = window
+        self.budget = budget
+        self.method = registry_method("register_ideas_batch")
+        self.watcher = watcher_for(algod_client)
+
+    def index_cursor(self) -> IndexCursor:
+        """Current ordinal / founder index positions for this sender."""
+        next_ordinal = read_global_state(self.algod, self.app_id).get("next_ordinal", 0)
+        founder_total, _ = read_founder_stats(self.algod, self.app_id, self.sender)
+        return IndexCursor(next_ordinal, encoding.decode_address(self.sender), founder_total)
+
+    def plan(self, entries: Iterable[BulkEntry]) -> Iterator[list[BulkEntry]]:
+        """Split entries into the per-group chunks build_group turns into groups."""
+        return _chunks(entries, group_capacity(self.budget))
+
+    def build_group(self, entries: list[BulkEntry], cursor: IndexCursor) -> AtomicTransactionComposer:
+        """One atomic group of register_ideas_batch calls covering `entries`."""
+        params = suggested_params(self.algod)
+        atc = AtomicTransactionComposer()
+        for call_entries in _spread(entries, batch_calls(len(entries), self.budget)):
+            names = [e.idea_hash for e in call_entries] + cursor.take(call_entries)
+            atc.add_method_call(
+                app_id=self.app_id,
+                method=self.method,
+                sender=self.sender,
+                sp=params,
+                signer=self.signer,
+                method_args=[[(e.idea_hash, e.cid_digest, e.title) for e in call_entries]],
+                boxes=[(self.app_id, name) for name in names],
+            )
+        return atc
+
+    def pending_entries(self, entries: Iterable[BulkEntry], report: BulkReport) -> Iterator[BulkEntry]:
+        """Drop hashes already registered (and repeats within the input)."""
+        seen: set[bytes] = set()
+        for chunk in _chunks(entries, VERIFY_CHUNK):
+            fresh = []
+            for entry in chunk:
+                if entry.idea_hash not in seen:
+                    seen.add(entry.idea_hash)
+                    fresh.append(entry)
+            report.skipped += len(chunk) - len(fresh)
+            registered = verify_ideas(self.algod, self.app_id, [e.idea_hash for e in fresh], self.sender)
+            for entry in fresh:
+                if registered.get(entry.idea_hash):
+                    report.skipped += 1
+                else:
+                    yield entry
+
+    def _settle(self, in_flight: deque[InFlightGroup], report: BulkReport, drain: bool, cursor: IndexCursor) -> bool:
+        """
+        Retire finished groups, waiting for the watcher until the window has
+        room again (or everything settled when `drain` is set). Groups commit
+        atomically, so a group is done once its first transaction is.
+        Duplicates a group reports are rewound from `cursor`.
+
+        Returns:
+            True if any group failed
+        """
+        failed = False
+        while in_flight and (drain or len(in_flight) >= self.window):
+            with span("confirm", operation=self.method.name, groups=len(in_flight)):
+                wait([group.confirmations[0] for group in in_flight], return_when=FIRST_COMPLETED)
+            for group in [group for group in in_flight if group.confirmations[0].done()]:
+                in_flight.remove(group)
+                try:
+                    infos = [confirmation.result() for confirmation in group.confirmations]
+                except (ConfirmationTimeout, TransactionRejected):
+                    report.failed.extend(group.entries)
+                    failed = True
+                else:
+                    cursor.rewind(self._record_confirmed(group, infos, report))
+        return failed
+
+    def _record_confirmed(self, group: InFlightGroup, infos: list[dict], report: BulkReport) -> int:
+        """Count a confirmed group into `report`; returns its duplicates."""
+        # The last log of each call is its ABI return: (timestamps, duplicates)
+        duplicates = 0
+        for info in infos:
+            logs = info.get("logs") or []
+            if logs:
+                _, flags = self.method.returns.type.decode(base64.b64decode(logs[-1])[4:])
+                duplicates += sum(flags)
+        report.duplicates += duplicates
+        report.registered += len(group.entries) - duplicates
+        return duplicates
+
+    def _submit_all(self, entries: Iterable[BulkEntry], report: BulkReport) -> None:
+        cursor = self.index_cursor()
+        in_flight: deque[InFlightGroup] = deque()
+
+        for group_entries in self.plan(entries):
+            if self._settle(in_flight, report, drain=False, cursor=cursor):
+                # Index predictions are off once a group fails; resync first
+                self._settle(in_flight, report, drain=True, cursor=cursor)
+                cursor = self.index_cursor()
+
+            atc = self.build_group(group_entries, cursor)
+            report.submitted += len(group_entries)
+            try:
+                txids = traced_submit(atc, self.algod, self.method.name)
+            except AlgodHTTPError as e:
+                # algod evaluates calls on submission; a rejected group never ran
+                print(f"Group rejected: {e}")
+                report.failed.extend(group_entries)
+                self._settle(in_flight, report, drain=True, cursor=cursor)
+                cursor = self.index_cursor()
+                continue
+            last_valid = atc.build_group()[0].txn.last_valid_round
+            confirmations = self.watcher.watch_many(txids, last_valid)
+            in_flight.append(InFlightGroup(txids, group_entries, last_valid, confirmations))
+
+        self._settle(in_flight, report, drain=True, cursor=cursor)
+
+    def check(self, entries: Iterable[BulkEntry]) -> tuple[list[BulkEntry], BulkReport]:
+        """
+        Filter `entries` with one verify_ideas pass, for shortfall() and
+        submit() to share.
+
+        Returns:
+            (entries still to register, report counting what was read and skipped)
+        """
+        report = BulkReport()
+        started = time.monotonic()
+        pending = list(self.pending_entries(_counted(entries, report), report))
+        report.elapsed = time.monotonic() - started
+        return pending, report
+
+    def shortfall(self, pending: Sequence[BulkEntry]) -> int:
+        """µALGO the app account is missing to cover the boxes `pending` (from check) will create."""
+        cursor = self.index_cursor()
+        info = self.algod.account_info(logic.get_application_address(self.app_id))
+        available = info["amount"] - info["min-balance"]
+        return max(0, estimate_mbr(pending, cursor.next_ordinal, cursor.founder_total) - available)
+
+    def submit(self, pending: Iterable[BulkEntry], report: BulkReport, retries: int = 1) -> BulkReport:
+        """
+        Register entries already filtered by pending_entries, keeping `window`
+        groups in flight and adding to `report`.
+
+        Entries of failed groups are re-checked and resubmitted up to
+        `retries` more times; whatever still fails is left in report.failed.
+        """
+        started = time.monotonic()
+        self._submit_all(pending, report)
+        for _ in range(retries):
+            if not report.failed:
+                break
+            retry, report.failed = report.failed, []
+            self._submit_all(self.pending_entries(retry, report), report)
+
+        report.elapsed += time.monotonic() - started
+        return report
+
+    def run(self, entries: Iterable[BulkEntry], retries: int = 1) -> BulkReport:
+        """Register every entry not yet on-chain, verifying and submitting them as a stream."""
+        report = BulkReport()
+        return self.submit(self.pending_entries(_counted(entries, report), report), report, retries)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-register ideas from a JSONL or CSV file")
+    parser.add_argument("input", type=str, help="JSONL (ideaHash, ipfsCid, title) or CSV (idea_hash, ipfs_cid, title)")
+    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    parser.add_argument("--app-id", type=int, default=0, help="IdeaRegistry app ID (default: ALGORAND_APP_ID)")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Groups of 16 calls kept in flight")
+    parser.add_argument("--retries", type=int, default=1, help="Resubmission passes for failed groups")
+    args = parser.parse_args()
+
+    backend_env_path = Path(__file__).parent.parent / "backend" / ".env"
+    for key, value in load_env_file(backend_env_path).items():
+        os.environ.setdefault(key, value)
+
+    app_id = args.app_id or int(os.environ.get("ALGORAND_APP_ID", "0"))
+    mnemonic = os.getenv("ALGORAND_DEPLOYER_MNEMONIC") or os.getenv("DEPLOYER_MNEMONIC")
+    if not app_id or not mnemonic:
+        raise SystemExit("ALGORAND_APP_ID and ALGORAND_DEPLOYER_MNEMONIC must be set")
+
+    from algokit_utils import AlgorandClient
+    if args.network == "localnet":
+        algorand = AlgorandClient.default_localnet()
+    elif args.network == "testnet":
+        algorand = AlgorandClient.testnet()
+    else:
+        algorand = AlgorandClient.mainnet()
+    algod_client = algorand.client.algod
+
+    entries = list(read_entries(args.input))
+    registrar = BulkRegistrar(
+        algod_client, app_id, algo_mnemonic.to_private_key(mnemonic), window=args.window
+    )
+    pending, report = registrar.check(entries)
+    shortfall = registrar.shortfall(pending)
+    if shortfall:
+        raise SystemExit(
+            f"App account needs {shortfall / 1_000_000:.3f} more ALGO of box minimum balance "
+            f"to store the new ideas in {args.input}; fund {logic.get_application_address(app_id)} first"
+        )
+
+    report = registrar.submit(pending, report, retries=args.retries)
+
+    print(
+        f"Read {report.read}, skipped {report.skipped} already registered, "
+        f"registered {report.registered} ({report.duplicates} raced duplicates) "
+        f"in {report.elapsed:.1f}s — {report.rate:.1f} ideas/s"
+    )
+    if report.failed:
+        print(f"{len(report.failed)} ideas failed; re-run the same command to resume")
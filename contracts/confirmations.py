@@ -0,0 +1,222 @@
+"""
+Shared transaction confirmation watcher.
+Instead of one wait_for_confirmation polling loop per transaction, a single
+thread per algod follows the chain with status_after_block and lists each
+new block's transaction IDs once. Every watched txid found in a block
+resolves its future with its pending transaction info; txids still missing
+once their last-valid round has been scanned can no longer confirm and fail
+with ConfirmationTimeout. Polling traffic is one status call and one txid
+listing per round, however many transactions are in flight. Watched txids
+are also re-checked every RECHECK_ROUNDS rounds, so one that algod drops
+from its pool fails promptly instead of at its last-valid round.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Iterable
+
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+
+# Consecutive algod failures after which every watched future is failed
+MAX_FAILURES = 10
+RETRY_DELAY = 1.0
+# Rounds between pending_transaction_info sweeps for pool rejections
+RECHECK_ROUNDS = 5
+
+
+class ConfirmationTimeout(Exception):
+    """The transaction's last-valid round passed without it being confirmed."""
+
+
+class TransactionRejected(Exception):
+    """algod dropped the transaction from its pool (the pool-error is the message)."""
+
+
+class ConfirmationWatcher:
+    """
+    Resolves futures for watched txids as their blocks are committed.
+
+    The watching thread starts on the first watch() and exits once nothing
+    is left to watch. A txid is checked with pending_transaction_info when
+    it is registered, so one that confirmed before it was watched is not
+    left waiting, and again every RECHECK_ROUNDS rounds to catch pool
+    rejections. A closed watcher can be watched again.
+    """
+
+    def __init__(self, algod_client: AlgodClient):
+        self.algod = algod_client
+        self.rounds_scanned = 0
+        self._watched: dict[str, tuple[Future, int]] = {}
+        self._unchecked: list[str] = []
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._block_txids = True
+
+    def watch(self, txid: str, last_valid: int) -> Future:
+        """Future of `txid`'s pending transaction info once it is confirmed."""
+        with self._lock:
+            if txid in self._watched:
+                return self._watched[txid][0]
+            future: Future = Future()
+            self._watched[txid] = (future, last_valid)
+            self._unchecked.append(txid)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop,), name="confirmation-watcher", daemon=True,
+                )
+                self._thread.start()
+        return future
+
+    def watch_many(self, txids: Iterable[str], last_valid: int) -> list[Future]:
+        return [self.watch(txid, last_valid) for txid in txids]
+
+    def wait(self, txid: str, last_valid: int, timeout: float | None = None) -> dict:
+        """Block until `txid` confirms; raises ConfirmationTimeout or TransactionRejected."""
+        return self.watch(txid, last_valid).result(timeout)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._watched)
+
+    def close(self) -> None:
+        """Stop watching; unresolved futures are cancelled."""
+        with self._lock:
+            self._stop.set()
+            watched, self._watched = self._watched, {}
+            self._unchecked = []
+            self._thread = None
+            # The old thread may still be inside a long-poll; it exits on its
+            # own event, and a later watch() starts a fresh thread
+            self._stop = threading.Event()
+        for future, _ in watched.values():
+            future.cancel()
+        with _watchers_lock:
+            if _watchers.get(self.algod.algod_address) is self:
+                del _watchers[self.algod.algod_address]
+
+    def _run(self, stop: threading.Event) -> None:
+        failures = 0
+        current: int | None = None
+        rechecked = 0
+        while not stop.is_set():
+            with self._lock:
+                if stop.is_set():
+                    return
+                if not self._watched:
+                    self._thread = None
+                    return
+                if current is not None and current - rechecked >= RECHECK_ROUNDS:
+                    self._unchecked = list(self._watched)
+                    rechecked = current
+                unchecked, self._unchecked = self._unchecked, []
+            try:
+                if current is None:
+                    current = rechecked = self.algod.status()["last-round"]
+                self._check(unchecked)
+                unchecked = []
+                latest = self.algod.status_after_block(current)["last-round"]
+                # Catch up round by round if more than one block was committed
+                while current < latest:
+                    self._scan(current + 1)
+                    current += 1
+                failures = 0
+            except Exception as e:
+                with self._lock:
+                    self._unchecked = unchecked + self._unchecked
+                failures += 1
+                if failures >= MAX_FAILURES:
+                    self._fail_all(e)
+                    failures = 0
+                stop.wait(RETRY_DELAY)
+
+    def _check(self, txids: list[str]) -> None:
+        for txid in txids:
+            try:
+                info = self.algod.pending_transaction_info(txid)
+            except AlgodHTTPError:
+                continue  # not known yet; the block scan will find it
+            if info.get("confirmed-round"):
+                self._resolve(txid, info)
+            elif info.get("pool-error"):
+                self._reject(txid, TransactionRejected(info["pool-error"]))
+
+    def _scan(self, round_number: int) -> None:
+        with self._lock:
+            if not self._watched:
+                return
+        for txid in self._txids_in(round_number):
+            with self._lock:
+                watched = txid in self._watched
+            if watched:
+                try:
+                    info = self.algod.pending_transaction_info(txid)
+                except AlgodHTTPError:
+                    # Already evicted from algod's cache; the block is proof enough
+                    info = {"confirmed-round": round_number}
+                self._resolve(txid, info)
+
+        with self._lock:
+            expired = [(txid, last_valid) for txid, (_, last_valid) in self._watched.items() if last_valid <= round_number]
+        for txid, last_valid in expired:
+            self._reject(txid, ConfirmationTimeout(f"{txid} not confirmed by its last valid round {last_valid}"))
+        self.rounds_scanned += 1
+
+    def _txids_in(self, round_number: int) -> list[str]:
+        if self._block_txids:
+            try:
+                return self.algod.get_block_txids(round_number)["blockTxids"] or []
+            except (AttributeError, AlgodHTTPError) as e:
+                if isinstance(e, AlgodHTTPError) and e.code != 404:
+                    raise
+                # SDK or node without /v2/blocks/{round}/txids
+                self._block_txids = False
+        # Fallback: ask about each watched txid instead
+        with self._lock:
+            watched = list(self._watched)
+        found = []
+        for txid in watched:
+            try:
+                if 0 < self.algod.pending_transaction_info(txid).get("confirmed-round", 0) <= round_number:
+                    found.append(txid)
+            except AlgodHTTPError:
+                continue
+        return found
+
+    def _resolve(self, txid: str, info: dict) -> None:
+        with self._lock:
+            entry = self._watched.pop(txid, None)
+        if entry:
+            entry[0].set_result(info)
+
+    def _reject(self, txid: str, error: Exception) -> None:
+        with self._lock:
+            entry = self._watched.pop(txid, None)
+        if entry:
+            entry[0].set_exception(error)
+
+    def _fail_all(self, error: Exception) -> None:
+        with self._lock:
+            watched, self._watched = self._watched, {}
+            self._unchecked = []
+        for future, _ in watched.values():
+            future.set_exception(error)
+
+
+_watchers: dict[str, ConfirmationWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def watcher_for(algod_client: AlgodClient) -> ConfirmationWatcher:
+    """The process-wide watcher for the network `algod_client` points at."""
+    with _watchers_lock:
+        watcher = _watchers.get(algod_client.algod_address)
+        if watcher is None:
+            watcher = _watchers[algod_client.algod_address] = ConfirmationWatcher(algod_client)
+        return watcher
+
+
+def wait_for_confirmation(algod_client: AlgodClient, txid: str, last_valid: int) -> dict:
+    """Drop-in for transaction.wait_for_confirmation, on the shared watcher."""
+    return watcher_for(algod_client).wait(txid, last_valid)
@@ -1,11 +1,37 @@
 """
 Convert between Algorand private key (base64) and mnemonic (25 words).
 Useful if you have one format and need the other.
+
+Batch mode converts whole keystores: JSONL or CSV records are streamed from a
+file or stdin, converted in chunks across a process pool, and written to an
+output file that only appears once complete. Secrets are never printed —
+the console shows counts, throughput and per-line errors only.
 """
 
 import argparse
 import base64
-from algosdk import mnemonic
+import binascii
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from algosdk import account, mnemonic
+
+from box_enumerator import bounded_map
+
+CHUNK_SIZE = 1_000
+MNEMONIC = "mnemonic"
+PRIVATE_KEY = "privateKey"
+TARGETS = {"mnemonic": (MNEMONIC,), "key": (PRIVATE_KEY,), "both": (MNEMONIC, PRIVATE_KEY)}
+# CSV headers accepted for each field
+CSV_COLUMNS = {MNEMONIC: ("mnemonic",), PRIVATE_KEY: ("privateKey", "private_key")}
 
 def key_to_mnemonic(private_key_b64: str):
     """Convert base64 private key to 25-word mnemonic"""
@@ -55,6 +81,152 @@ def mnemonic_to_key(mnemonic_phrase: str):
         print(f"Error converting mnemonic to key: {e}")
         raise
 
+@dataclass
+class BatchReport:
+    """Counts and timing of a batch conversion."""
+
+    records: int = 0
+    converted: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+    def format(self) -> str:
+        return (
+            f"Converted {self.converted}/{self.records} records in {self.elapsed:.2f}s "
+            f"({self.rate:.0f}/s); {len(self.errors)} failed"
+        )
+
+
+def read_records(stream: TextIO, csv_input: bool) -> Iterator[tuple[int, dict | str]]:
+    """
+    (line number, record) pairs from CSV (header row required) or JSON
+    lines; JSON is left as text for the workers to parse.
+    """
+    if csv_input:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            record = dict(row)
+            for name, columns in CSV_COLUMNS.items():
+                values = [record.pop(column) for column in columns if column in record]
+                if any(values):
+                    record[name] = next(value for value in values if value)
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(stream, 1):
+        if line.strip():
+            yield line_number, line
+
+
+class RecordError(ValueError):
+    """A record that cannot be converted; the message never contains the secret."""
+
+
+def convert_record(record: dict, targets: tuple[str, ...]) -> dict:
+    """
+    Convert one record holding a mnemonic or a base64 private key.
+
+    The record's other fields are kept; a given address must match the key.
+    Error messages never include the secret.
+    """
+    if record.get(MNEMONIC):
+        private_key = mnemonic.to_private_key(record[MNEMONIC])
+    elif record.get(PRIVATE_KEY):
+        private_key = record[PRIVATE_KEY]
+        try:
+            raw = base64.b64decode(private_key, validate=True)
+        except binascii.Error:
+            raise RecordError("private key is not valid base64") from None
+        if len(raw) != 64:
+            raise RecordError("private key must be 64 bytes")
+    else:
+        raise RecordError(f"record has neither {MNEMONIC} nor {PRIVATE_KEY}")
+    address = account.address_from_private_key(private_key)
+    if record.get("address") and record["address"] != address:
+        raise RecordError("address does not match the key")
+
+    converted = {k: v for k, v in record.items() if k not in (MNEMONIC, PRIVATE_KEY)}
+    converted["address"] = address
+    if MNEMONIC in targets:
+        converted[MNEMONIC] = mnemonic.from_private_key(private_key)
+    if PRIVATE_KEY in targets:
+        converted[PRIVATE_KEY] = private_key
+    return converted
+
+
+def convert_chunk(chunk: list[tuple[int, dict | str]], targets: tuple[str, ...]) -> list[tuple[int, dict | None, str | None]]:
+    """Worker: (line, converted record or None, error) for each record of a chunk."""
+    results = []
+    for line_number, record in chunk:
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            results.append((line_number, convert_record(record, targets), None))
+        except Exception as e:
+            # Other exceptions' text may quote the input, so only their type is reported
+            results.append((line_number, None, str(e) if isinstance(e, RecordError) else type(e).__name__))
+    return results
+
+
+def _chunks(records: Iterable, size: int) -> Iterator[list]:
+    chunk: list = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def convert_batch(
+    records: Iterable[tuple[int, dict | str]],
+    output: Path,
+    targets: tuple[str, ...] = TARGETS["both"],
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> BatchReport:
+    """
+    Convert a stream of records into `output` (.csv or JSON lines).
+
+    Records are written in input order to a private temporary file beside
+    `output`, which replaces it only once every record has been processed.
+    """
+    report = BatchReport()
+    started = time.perf_counter()
+    partial_path = output.with_name(output.name + ".part")
+    fd = os.open(partial_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with open(fd, "w", encoding="utf-8", newline="") as out, ProcessPoolExecutor(workers) as pool:
+            writer = None
+            window = 2 * (workers or os.cpu_count() or 1)
+            for results in bounded_map(partial(convert_chunk, targets=targets), _chunks(records, chunk_size), pool, window):
+                for line_number, converted, error in results:
+                    report.records += 1
+                    if converted is None:
+                        report.errors.append((line_number, error))
+                        continue
+                    report.converted += 1
+                    if output.suffix.lower() == ".csv":
+                        if writer is None:
+                            writer = csv.DictWriter(out, fieldnames=list(converted), extrasaction="ignore")
+                            writer.writeheader()
+                        writer.writerow(converted)
+                    else:
+                        out.write(json.dumps(converted) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(partial_path, output)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Convert between Algorand private key and mnemonic",
@@ -72,8 +244,28 @@ Examples:
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--key-to-mnemonic", type=str, help="Convert base64 private key to mnemonic")
     group.add_argument("--mnemonic-to-key", type=str, help="Convert mnemonic to base64 private key")
+    group.add_argument("--batch", type=str, metavar="INPUT", help="Convert a JSONL/CSV file of records ('-' for stdin)")
+    parser.add_argument("--output", type=str, help="Batch output file, .csv or JSON lines (required with --batch)")
+    parser.add_argument("--to", default="both", choices=sorted(TARGETS), help="Formats to write in batch mode")
+    parser.add_argument("--csv", action="store_true", help="Batch input is CSV (implied by a .csv input file)")
+    parser.add_argument("--workers", type=int, help="Conversion processes (default: one per CPU)")
     
     args = parser.parse_args()
+
+    if args.batch:
+        if not args.output:
+            parser.error("--output is required with --batch")
+        csv_input = args.csv or args.batch.lower().endswith(".csv")
+        source = sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8", newline="")
+        try:
+            report = convert_batch(read_records(source, csv_input), Path(args.output), TARGETS[args.to], args.workers)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        for line_number, error in report.errors:
+            print(f"  record {line_number}: {error}", file=sys.stderr)
+        print(f"{report.format()} → {args.output}", file=sys.stderr)
+        raise SystemExit(1 if report.errors else 0)
     
     try:
         if args.key_to_mnemonic:
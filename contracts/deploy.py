@@ -1,16 +1,33 @@
 import argparse
 import base64
+import hashlib
+import json
 import logging
 import os
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 
 from algosdk import mnemonic as algo_mnemonic
 from algosdk import account, transaction
+from algosdk.error import AlgodHTTPError
 from algosdk.v2client.algod import AlgodClient
 
+from confirmations import wait_for_confirmation
+from registry_spec import ARC56_PATH, RegistrySpec, load_spec, suggested_params
+from tracing import span
+
 logger = logging.getLogger(__name__)
 
+# Local record of what was deployed where (not committed)
+MANIFEST_PATH = Path(__file__).parent / "deployments.json"
+
+NOOP = "noop"
+UPDATE = "update"
+CREATE = "create"
+
 def load_env_file(env_path: Path) -> dict[str, str]:
     """Load environment variables from a .env file"""
     env_vars = {}
@@ -36,7 +53,104 @@ def load_env_file(env_path: Path) -> dict[str, str]:
                 env_vars[key] = value
     return env_vars
 
-def deploy(network: str, mnemonic_phrase: str | None = None, private_key_b64: str | None = None, auto_generate: bool = False):
+def program_hash(program: bytes) -> str:
+    """SHA-256 of a compiled program, hex encoded."""
+    return hashlib.sha256(program).hexdigest()
+
+
+@dataclass(frozen=True)
+class DeployPlan:
+    """What a deploy has to do to bring a network up to the local artifact."""
+
+    action: str
+    app_id: int | None
+    reason: str
+
+
+def plan_deployment(algod_client: AlgodClient, spec: RegistrySpec, app_id: int | None, sender: str) -> DeployPlan:
+    """
+    Compare the artifact's programs with those of the live app `app_id`.
+
+    One application_info lookup decides: identical programs are a no-op, and
+    changed ones are an update when the contract accepts UpdateApplication
+    from `sender`. Otherwise (no app, deleted app, or a contract that cannot
+    be updated) a new app is created.
+    """
+    if not app_id:
+        return DeployPlan(CREATE, None, "no existing app")
+    try:
+        params = algod_client.application_info(app_id)["params"]
+    except AlgodHTTPError as e:
+        if e.code == 404:
+            return DeployPlan(CREATE, None, f"app {app_id} does not exist")
+        raise
+
+    live = (base64.b64decode(params["approval-program"]), base64.b64decode(params["clear-state-program"]))
+    if (program_hash(live[0]), program_hash(live[1])) == (
+        program_hash(spec.approval_program),
+        program_hash(spec.clear_program),
+    ):
+        return DeployPlan(NOOP, app_id, f"app {app_id} already runs this artifact")
+    if not spec.updatable:
+        return DeployPlan(CREATE, None, f"app {app_id} runs other programs and {spec.name} rejects updates")
+    if params["creator"] != sender:
+        raise ValueError(f"App {app_id} runs other programs but was created by {params['creator']}, not {sender}")
+    return DeployPlan(UPDATE, app_id, f"app {app_id} runs other programs")
+
+
+class DeploymentManifest:
+    """
+    JSON file of deployments per network, newest last. Safe to share
+    between the threads of a multi-network deploy; each record rewrites the
+    file atomically.
+    """
+
+    def __init__(self, path: Path = MANIFEST_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[str, list[dict]]:
+        if not self.path.exists():
+            return {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def latest(self, network: str) -> dict | None:
+        deployments = self.load().get(network)
+        return deployments[-1] if deployments else None
+
+    def record(self, network: str, entry: dict) -> None:
+        with self._lock:
+            manifest = self.load()
+            manifest.setdefault(network, []).append(entry)
+            partial_path = self.path.with_name(self.path.name + ".part")
+            with open(partial_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+                f.write("\n")
+            os.replace(partial_path, self.path)
+
+
+def known_app_id(manifest: DeploymentManifest, network: str, env_app_id: str | None = None) -> int | None:
+    """
+    The app a network's deploy compares against: the last one recorded in
+    the manifest for that network, else ALGORAND_APP_ID (which names a single
+    network's app, so callers pass it only for single-network deploys).
+    """
+    latest = manifest.latest(network)
+    if latest:
+        return latest["appId"]
+    return int(env_app_id) if env_app_id and env_app_id.strip() not in ("", "0") else None
+
+
+def deploy(
+    network: str,
+    mnemonic_phrase: str | None = None,
+    private_key_b64: str | None = None,
+    auto_generate: bool = False,
+    app_id: int | None = None,
+    manifest: DeploymentManifest | None = None,
+    force_create: bool = False,
+):
     """
     Deploy the IdeaRegistry smart contract.
     
@@ -45,6 +159,12 @@ def deploy(network: str, mnemonic_phrase: str | None = None, private_key_b64: st
         mnemonic_phrase: 25-word Algorand mnemonic (optional)
         private_key_b64: Base64-encoded private key (alternative to mnemonic)
         auto_generate: If True and no credentials provided, generate a new wallet
+        app_id: Existing app to bring up to date instead of creating a new one
+        manifest: Where to record the deployment (not recorded if None)
+        force_create: Create a new app even if `app_id` is up to date
+
+    Returns:
+        App ID of the deployed (or already current) contract
     """
     # Connect to Algod using AlgorandClient (handles fallbacks and headers better)
     from algokit_utils import AlgorandClient
@@ -109,63 +229,101 @@ def deploy(network: str, mnemonic_phrase: str | None = None, private_key_b64: st
     # Load artifacts
     # We use arc56.json because it contains pre-compiled bytecode
     # This avoids the 403 Forbidden error on the /v2/teal/compile endpoint
-    artifacts_dir = Path(__file__).parent / "smart_contracts" / "idea_registry" / "artifacts"
-    arc56_path = artifacts_dir / "IdeaRegistry.arc56.json"
-
-    if not arc56_path.exists():
-        raise FileNotFoundError(f"ARC56 artifact not found at {arc56_path}. Did you compile first?")
+    print(f"Loading bytecode from {ARC56_PATH.name}...")
+    spec = load_spec()
 
-    print(f"Loading bytecode from {arc56_path.name}...")
-    with open(arc56_path, "r") as f:
-        arc56_data = json.load(f)
-    
-    try:
-        approval_b64 = arc56_data["byteCode"]["approval"]
-        clear_b64 = arc56_data["byteCode"]["clear"]
-    except KeyError:
-        raise ValueError("Bytecode not found in arc56.json. Ensure the contract was compiled with bytecode output.")
-
-    approval_bytes = base64.b64decode(approval_b64)
-    clear_bytes = base64.b64decode(clear_b64)
-
-    # Suggested params
-    params = algod_client.suggested_params()
-
-    # ARC4 selector for create_application()void is 0x752c3ac0
-    app_args = [base64.b16decode("752C3AC0")] 
-
-    # Create transaction
-    print("Creating ApplicationCreate transaction...")
-    txn = transaction.ApplicationCreateTxn(
-        sender=sender,
-        sp=params,
-        on_complete=transaction.OnComplete.NoOpOC,
-        approval_program=approval_bytes,
-        clear_program=clear_bytes,
-        global_schema=transaction.StateSchema(num_uints=8, num_byte_slices=8),
-        local_schema=transaction.StateSchema(num_uints=0, num_byte_slices=0),
-        app_args=app_args
+    plan = DeployPlan(CREATE, None, "--force-create") if force_create else plan_deployment(
+        algod_client, spec, app_id, sender
     )
+    print(f"Plan for {network}: {plan.action} ({plan.reason})")
+    if plan.action == NOOP:
+        return plan.app_id
+
+    # Suggested params (cached per network, shared with the other tools)
+    params = suggested_params(algod_client)
+
+    if plan.action == UPDATE:
+        print("Creating ApplicationUpdate transaction...")
+        txn = transaction.ApplicationUpdateTxn(
+            sender=sender,
+            sp=params,
+            index=plan.app_id,
+            approval_program=spec.approval_program,
+            clear_program=spec.clear_program,
+        )
+    else:
+        # ARC4 selector for create_application()void
+        app_args = [spec.method("create_application").get_selector()]
+
+        # Create transaction
+        print("Creating ApplicationCreate transaction...")
+        txn = transaction.ApplicationCreateTxn(
+            sender=sender,
+            sp=params,
+            on_complete=transaction.OnComplete.NoOpOC,
+            approval_program=spec.approval_program,
+            clear_program=spec.clear_program,
+            global_schema=transaction.StateSchema(num_uints=8, num_byte_slices=8),
+            local_schema=transaction.StateSchema(num_uints=0, num_byte_slices=0),
+            app_args=app_args
+        )
 
     # Sign and send
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with span("sign", operation=f"deploy.{plan.action}"):
+        signed_txn = txn.sign(private_key)
+    with span("submit", operation=f"deploy.{plan.action}", network=network):
+        txid = algod_client.send_transaction(signed_txn)
 
     print(f"Transaction ID: {txid}")
     print("Waiting for confirmation...")
 
-    result = transaction.wait_for_confirmation(algod_client, txid, 4)
+    with span("confirm", operation=f"deploy.{plan.action}", network=network) as confirm:
+        result = wait_for_confirmation(algod_client, txid, txn.last_valid_round)
+        confirm.set(txid=txid, round=result["confirmed-round"])
 
-    app_id = result["application-index"]
+    app_id = plan.app_id if plan.action == UPDATE else result["application-index"]
     print(f"Deployed successfully! App ID: {app_id}")
     
     # Get app address
     from algosdk import logic
     app_address = logic.get_application_address(app_id)
     print(f"App Address: {app_address}")
+
+    if manifest is not None:
+        manifest.record(network, {
+            "appId": app_id,
+            "action": plan.action,
+            "approvalHash": program_hash(spec.approval_program),
+            "clearHash": program_hash(spec.clear_program),
+            "txId": txid,
+            "confirmedRound": result["confirmed-round"],
+            "deployer": sender,
+            "deployedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        })
     
     return app_id
 
+
+def deploy_networks(networks: list[str], app_ids: dict[str, int | None], **kwargs) -> dict[str, int | Exception]:
+    """
+    Deploy to several networks at once, one thread each (the work is algod
+    round-trips and confirmation waits).
+
+    Returns:
+        App ID per network, or the exception its deploy raised
+    """
+    results: dict[str, int | Exception] = {}
+    with ThreadPoolExecutor(max_workers=len(networks)) as pool:
+        futures = {
+            network: pool.submit(deploy, network, app_id=app_ids.get(network), **kwargs) for network in networks
+        }
+        for network, future in futures.items():
+            try:
+                results[network] = future.result()
+            except Exception as e:
+                results[network] = e
+    return results
+
 def update_env_file(app_id: int, env_path: Path | None = None):
     """Update ALGORAND_APP_ID in the backend .env file"""
     if env_path is None:
@@ -219,14 +377,23 @@ Examples:
   
   # Generate new wallet automatically
   python deploy.py --network testnet --auto-generate --update-env
+
+  # Bring several networks up to date at once
+  python deploy.py --network localnet testnet
         """
     )
-    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    parser.add_argument("--network", nargs="+", default=["localnet"], choices=["localnet", "testnet", "mainnet"], help="Target network(s)")
     parser.add_argument("--update-env", action="store_true", help="Automatically update backend .env file with App ID")
     parser.add_argument("--env-file", type=str, help="Path to .env file to load/update (default: backend/.env)")
     parser.add_argument("--load-env", action="store_true", default=True, help="Load environment variables from backend/.env file")
     parser.add_argument("--auto-generate", action="store_true", help="Auto-generate a new wallet if no credentials provided")
+    parser.add_argument("--app-id", type=int, help="Existing app to update or skip (default: the manifest's, then ALGORAND_APP_ID)")
+    parser.add_argument("--force-create", action="store_true", help="Create a new app even if the existing one is current")
+    parser.add_argument("--manifest", type=str, default=str(MANIFEST_PATH), help="Deployment manifest file")
     args = parser.parse_args()
+    networks = list(dict.fromkeys(args.network))
+    if len(networks) > 1 and (args.auto_generate or args.update_env or args.env_file or args.app_id):
+        parser.error("--auto-generate, --update-env, --env-file and --app-id apply to a single network")
     
     logging.basicConfig(level=logging.INFO)
     
@@ -250,23 +417,40 @@ Examples:
         mnemonic = os.getenv("ALGORAND_DEPLOYER_MNEMONIC") or os.getenv("DEPLOYER_MNEMONIC")
         private_key_b64 = os.getenv("ALGORAND_DEPLOYER_PRIVATE_KEY")
     
-    try:
-        app_id = deploy(
-            args.network, 
-            mnemonic_phrase=mnemonic,
-            private_key_b64=private_key_b64,
-            auto_generate=args.auto_generate
-        )
-        
+    manifest = DeploymentManifest(Path(args.manifest))
+    if args.app_id:
+        app_ids = {networks[0]: args.app_id}
+    else:
+        env_app_id = os.getenv("ALGORAND_APP_ID") if len(networks) == 1 else None
+        app_ids = {network: known_app_id(manifest, network, env_app_id) for network in networks}
+
+    results = deploy_networks(
+        networks,
+        app_ids,
+        mnemonic_phrase=mnemonic,
+        private_key_b64=private_key_b64,
+        auto_generate=args.auto_generate,
+        manifest=manifest,
+        force_create=args.force_create,
+    )
+
+    failed = False
+    for network, result in results.items():
+        if isinstance(result, Exception):
+            failed = True
+            print(f"Deployment to {network} failed: {result}")
+            import traceback
+            traceback.print_exception(result)
+        elif len(networks) > 1:
+            print(f"{network}: App ID {result}")
+
+    if len(networks) == 1 and not failed:
+        app_id = results[networks[0]]
         # Optionally update .env file
         if args.update_env or args.env_file:
             env_path = Path(args.env_file) if args.env_file else None
             update_env_file(app_id, env_path)
-        else:
+        elif app_id != app_ids[networks[0]]:
             print(f"\n💡 Tip: Run with --update-env to automatically update backend/.env file")
             print(f"   Or manually set ALGORAND_APP_ID={app_id} in backend/.env")
-            
-    except Exception as e:
-        print(f"Deployment failed: {e}")
-        import traceback
-        traceback.print_exc()
+    raise SystemExit(1 if failed else 0)
@@ -1,9 +1,35 @@
 """
 Generate a new Algorand testnet wallet with 25-word mnemonic.
 Use this if you only have 24 words or need a fresh wallet.
+
+Bulk mode provisions many accounts at once: blocks of accounts are generated
+and sealed across a process pool and written to an encrypted keystore
+(keystore.py) instead of being printed, and the new addresses can be funded
+from a dispenser account in atomic groups of 16 payments.
 """
 
-from algosdk import account, mnemonic
+import argparse
+import getpass
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Iterable
+
+from algosdk import account, encoding, mnemonic, transaction
+from algosdk.v2client.algod import AlgodClient
+
+from box_enumerator import bounded_map
+from box_planner import MAX_GROUP_SIZE
+from confirmations import watcher_for
+from keystore import RECORD_SIZE, SEED_SIZE, Keystore, KeystoreWriter, public_key, seal
+
+BLOCK_SIZE = 1_000
+BASE32_ALPHABET = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ234567")
+DEFAULT_FUNDING = 200_000  # microAlgos: minimum balance plus fees for a few calls
+
 
 def generate_algorand_wallet():
     """Generate a new Algorand account with 25-word mnemonic"""
@@ -40,10 +66,180 @@ def generate_algorand_wallet():
     
     return address, mnemonic_phrase
 
+
+def generate_block(key: bytes, count: int, prefix: str = "") -> bytes:
+    """
+    `count` new accounts as sealed keystore records. Runs in a worker
+    process; with a vanity `prefix`, candidates are drawn until that many
+    addresses start with it (about 32^len(prefix) tries each).
+    """
+    records = bytearray()
+    while len(records) < count * RECORD_SIZE:
+        seed = os.urandom(SEED_SIZE)
+        public = public_key(seed)
+        if prefix and not encoding.encode_address(public).startswith(prefix):
+            continue
+        records += seal(key, seed, public)
+    return bytes(records)
+
+
+def generate_keystore(
+    path: str | Path,
+    password: bytes,
+    count: int,
+    workers: int | None = None,
+    prefix: str = "",
+    block_size: int = BLOCK_SIZE,
+) -> float:
+    """
+    Generate `count` accounts into a new keystore at `path`, replacing it
+    atomically once every record is written.
+
+    Returns:
+        Elapsed seconds
+    """
+    if prefix and not set(prefix) <= BASE32_ALPHABET:
+        raise ValueError(f"Vanity prefix must use the address alphabet A-Z, 2-7: {prefix}")
+    started = time.perf_counter()
+    blocks = [min(block_size, count - start) for start in range(0, count, block_size)]
+    with KeystoreWriter(path, password) as writer, ProcessPoolExecutor(workers) as pool:
+        # Blocks are written in order as they finish; at most 2 per worker are held
+        window = 2 * (workers or os.cpu_count() or 1)
+        for records in bounded_map(partial(generate_block, writer.key, prefix=prefix), blocks, pool, window):
+            writer.append(records)
+    return time.perf_counter() - started
+
+
+@dataclass
+class FundingReport:
+    """Outcome of funding a keystore's accounts."""
+
+    groups: int = 0
+    funded: int = 0
+    failed: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+def payment_groups(
+    sender: str,
+    params: transaction.SuggestedParams,
+    addresses: Iterable[str],
+    amount: int,
+) -> Iterable[list[transaction.PaymentTxn]]:
+    """Payments of `amount` to each address, as atomic groups of up to 16."""
+    group: list[transaction.PaymentTxn] = []
+    for address in addresses:
+        group.append(transaction.PaymentTxn(sender, params, address, amount))
+        if len(group) == MAX_GROUP_SIZE:
+            yield transaction.assign_group_id(group)
+            group = []
+    if group:
+        yield transaction.assign_group_id(group)
+
+
+def fund_accounts(
+    algod_client: AlgodClient,
+    private_key: str,
+    addresses: Iterable[str],
+    amount: int = DEFAULT_FUNDING,
+) -> FundingReport:
+    """
+    Pay `amount` to every address from the dispenser account, sending all
+    groups before waiting, then confirming them together on the shared
+    confirmation watcher.
+    """
+    started = time.perf_counter()
+    sender = account.address_from_private_key(private_key)
+    params = algod_client.suggested_params()
+    report = FundingReport()
+    watcher = watcher_for(algod_client)
+    sent: list[tuple[Future, list[str]]] = []
+    for group in payment_groups(sender, params, addresses, amount):
+        receivers = [txn.receiver for txn in group]
+        try:
+            txid = algod_client.send_transactions([txn.sign(private_key) for txn in group])
+        except Exception as e:
+            print(f"Group rejected: {e}")
+            report.failed.extend(receivers)
+            continue
+        # Groups commit atomically, so the first transaction stands for the group
+        sent.append((watcher.watch(txid, group[0].last_valid_round), receivers))
+        report.groups += 1
+
+    for confirmation, receivers in sent:
+        try:
+            confirmation.result()
+        except Exception as e:
+            print(f"Group did not confirm: {e}")
+            report.failed.extend(receivers)
+        else:
+            report.funded += len(receivers)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def keystore_password(confirm: bool) -> bytes:
+    """WALLET_KEYSTORE_PASSWORD, or a prompt (twice when creating a keystore)."""
+    password = os.environ.get("WALLET_KEYSTORE_PASSWORD")
+    if password:
+        return password.encode()
+    password = getpass.getpass("Keystore password: ")
+    if confirm and getpass.getpass("Repeat password: ") != password:
+        raise SystemExit("Passwords do not match")
+    if not password:
+        raise SystemExit("A keystore password is required")
+    return password.encode()
+
+
 if __name__ == "__main__":
-    try:
-        generate_algorand_wallet()
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+    parser = argparse.ArgumentParser(description="Generate Algorand wallets: one printed, or many into an encrypted keystore")
+    parser.add_argument("--count", type=int, default=0, help="Generate this many accounts into --keystore")
+    parser.add_argument("--keystore", type=str, default="wallets.keystore", help="Keystore file")
+    parser.add_argument("--workers", type=int, help="Generator processes (default: one per CPU)")
+    parser.add_argument("--vanity", type=str, default="", help="Only keep addresses starting with this prefix")
+    parser.add_argument("--fund", type=int, metavar="MICROALGOS", help="Fund every keystore account with this amount")
+    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Network to fund on")
+    args = parser.parse_args()
+
+    if not args.count and args.fund is None:
+        try:
+            generate_algorand_wallet()
+        except Exception as e:
+            print(f"Error: {e}")
+            import traceback
+            traceback.print_exc()
+        raise SystemExit(0)
+
+    if args.count:
+        elapsed = generate_keystore(args.keystore, keystore_password(confirm=True), args.count, args.workers, args.vanity.upper())
+        print(f"Generated {args.count} accounts into {args.keystore} in {elapsed:.2f}s ({args.count / elapsed:.0f}/s)")
+
+    if args.fund is not None:
+        from deploy import load_env_file
+
+        backend_env_path = Path(__file__).parent.parent / "backend" / ".env"
+        for key, value in load_env_file(backend_env_path).items():
+            os.environ.setdefault(key, value)
+        dispenser = os.getenv("DISPENSER_MNEMONIC") or os.getenv("ALGORAND_DEPLOYER_MNEMONIC")
+        if not dispenser:
+            raise SystemExit("DISPENSER_MNEMONIC or ALGORAND_DEPLOYER_MNEMONIC must be set to fund accounts")
+
+        from algokit_utils import AlgorandClient
+        if args.network == "localnet":
+            algorand = AlgorandClient.default_localnet()
+        elif args.network == "testnet":
+            algorand = AlgorandClient.testnet()
+        else:
+            algorand = AlgorandClient.mainnet()
+
+        # Addresses are stored in the clear: funding needs no password
+        with Keystore(args.keystore) as keystore:
+            report = fund_accounts(
+                algorand.client.algod, mnemonic.to_private_key(dispenser), keystore.addresses(), args.fund
+            )
+        print(
+            f"Funded {report.funded} accounts with {args.fund} microAlgos in {report.groups} groups "
+            f"({report.elapsed:.1f}s); {len(report.failed)} failed"
+        )
+        for address in report.failed:
+            print(f"  not funded: {address}")
@@ -0,0 +1,342 @@
+"""
+IdeaRegistry box record encoding.
+Encoder/decoder for the versioned fixed-offset idea record stored in box
+storage, plus the legacy variable-length layout it replaces. Shared by the
+contract tests and the deploy/migration tooling.
+
+Record v1 layout (all offsets fixed):
+
+    version(1) | founder(32) | timestamp(8) | cid_digest(32) | founder_slot(4) | title(0..64)
+
+founder_slot is the idea's position in its founder's index page list. The CID is stored as the raw 32-byte SHA-256 digest of a CIDv0 multihash
+instead of its 46-char base58 string. The title is the tail of the box, so
+its length is implied by the box size and no length prefixes are needed.
+
+Legacy layout:
+
+    founder(32) | timestamp(8) | cid_len(2) | cid | title_len(2) | title
+
+Records are never told apart by content: a v1 record whose founder starts
+with 0x01 can also parse as a legacy one. Legacy records only exist in a
+pre-v1 app and are carried into a new app by migrate_boxes.py, so the app a
+box comes from decides which decoder applies.
+"""
+
+from dataclasses import dataclass
+
+RECORD_VERSION = 1
+
+VERSION_OFFSET = 0
+FOUNDER_OFFSET = 1
+TIMESTAMP_OFFSET = 33
+CID_OFFSET = 41
+FOUNDER_SLOT_OFFSET = 73
+TITLE_OFFSET = 77
+
+HEADER_SIZE = TITLE_OFFSET
+MAX_TITLE_BYTES = 64
+MAX_RECORD_SIZE = HEADER_SIZE + MAX_TITLE_BYTES
+
+# Ordinal page index: up to 32 hashes per box keyed b"p" + uint64 page number.
+# Index pages are created one slot wide and grow a slot per append, up to
+# PAGE_SIZE bytes.
+PAGE_PREFIX = b"p"
+HASH_SIZE = 32
+HASHES_PER_PAGE = 32
+PAGE_SIZE = 1024
+PAGE_KEY_SIZE = len(PAGE_PREFIX) + 8
+
+# Founder index: per founder, the uint64 ordinals of their ideas, up to 128
+# per box keyed b"f" + founder(32) + uint64 page, next to a stats box keyed
+# b"f" + founder(32) holding total(8) | live(8). Ordinals resolve to hashes
+# through the ordinal pages, so each hash is stored once outside its record key.
+# A deleted idea's slot is overwritten with DELETED_ORDINAL.
+FOUNDER_PREFIX = b"f"
+ORDINAL_SIZE = 8
+ORDINALS_PER_PAGE = PAGE_SIZE // ORDINAL_SIZE
+FOUNDER_STATS_SIZE = 16
+FOUNDER_STATS_KEY_SIZE = len(FOUNDER_PREFIX) + 32
+FOUNDER_PAGE_KEY_SIZE = FOUNDER_STATS_KEY_SIZE + 8
+DELETED_ORDINAL = 2**64 - 1
+
+# Merkle anchors: one box per batch keyed b"m" + root(32) holding
+# anchorer(32) | timestamp(8) | count(8) | manifest cid_digest(32)
+ANCHOR_PREFIX = b"m"
+ANCHOR_RECORD_SIZE = 80
+
+# Box minimum balance: 2500 µALGO per box + 400 µALGO per byte of key and value
+BOX_FLAT_MBR = 2_500
+BOX_BYTE_MBR = 400
+IDEA_KEY_SIZE = 32
+
+# CIDv0 = base58btc(0x12 sha2-256 | 0x20 length | 32-byte digest)
+_MULTIHASH_SHA256_PREFIX = b"\x12\x20"
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_INDEX = {char: index for index, char in enumerate(_B58_ALPHABET)}
+
+
+def b58encode(data: bytes) -> str:
+    """Encode bytes with the Bitcoin base58 alphabet used by CIDv0."""
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = _B58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b"\x00"))
+    return "1" * leading_zeros + encoded
+
+
+def b58decode(text: str) -> bytes:
+    """Decode a base58 string produced by b58encode."""
+    number = 0
+    for char in text:
+        if char not in _B58_INDEX:
+            raise ValueError(f"Invalid base58 character: {char!r}")
+        number = number * 58 + _B58_INDEX[char]
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big") if number else b""
+    leading_zeros = len(text) - len(text.lstrip("1"))
+    return b"\x00" * leading_zeros + body
+
+
+def cid_to_digest(cid: str) -> bytes:
+    """Extract the 32-byte SHA-256 digest from a CIDv0 ("Qm...") string."""
+    multihash = b58decode(cid)
+    if len(multihash) != 34 or not multihash.startswith(_MULTIHASH_SHA256_PREFIX):
+        raise ValueError(f"Not a CIDv0 sha2-256 multihash: {cid}")
+    return multihash[2:]
+
+
+def digest_to_cid(digest: bytes) -> str:
+    """Rebuild the CIDv0 string for a 32-byte SHA-256 digest."""
+    if len(digest) != 32:
+        raise ValueError(f"CID digest must be 32 bytes, got {len(digest)}")
+    return b58encode(_MULTIHASH_SHA256_PREFIX + digest)
+
+
+def truncate_title(title: str, limit: int = MAX_TITLE_BYTES) -> bytes:
+    """UTF-8 encode a title preview, cut to `limit` bytes on a character boundary."""
+    encoded = title.encode("utf-8")
+    if len(encoded) <= limit:
+        return encoded
+    return encoded[:limit].decode("utf-8", errors="ignore").encode("utf-8")
+
+
+def box_mbr(value_size: int, key_size: int = IDEA_KEY_SIZE) -> int:
+    """Minimum balance (µALGO) the app account must hold for one box."""
+    return BOX_FLAT_MBR + BOX_BYTE_MBR * (key_size + value_size)
+
+
+def _pages_opened(start: int, count: int, per_page: int) -> int:
+    """Index pages of `per_page` slots created appending `count` slots from position `start`."""
+    return -(-(start + count) // per_page) - -(-start // per_page)
+
+
+def index_mbr(count: int, next_ordinal: int = 0, founder_total: int = 0) -> int:
+    """
+    Minimum balance (µALGO) the ordinal and founder indexes lock for `count`
+    registrations by one founder, appended at the given index positions.
+
+    Every idea adds one 32-byte hash slot and one 8-byte ordinal slot; a page
+    box's flat and key cost is paid by the append that creates it, and the
+    founder's stats box by their first idea.
+    """
+    slots = count * BOX_BYTE_MBR * (HASH_SIZE + ORDINAL_SIZE)
+    pages = _pages_opened(next_ordinal, count, HASHES_PER_PAGE) * box_mbr(0, PAGE_KEY_SIZE)
+    pages += _pages_opened(founder_total, count, ORDINALS_PER_PAGE) * box_mbr(0, FOUNDER_PAGE_KEY_SIZE)
+    stats = box_mbr(FOUNDER_STATS_SIZE, FOUNDER_STATS_KEY_SIZE) if count and founder_total == 0 else 0
+    return slots + pages + stats
+
+
+def page_box_name(page: int) -> bytes:
+    """Box name of an ordinal index page."""
+    return PAGE_PREFIX + page.to_bytes(8, "big")
+
+
+def register_page_names(next_ordinal: int) -> list[bytes]:
+    """
+    Page boxes a registration must reference: the page holding next_ordinal
+    and the one after it, in case concurrent registrations fill the first.
+    """
+    page = next_ordinal // HASHES_PER_PAGE
+    return [page_box_name(page), page_box_name(page + 1)]
+
+
+def founder_stats_box_name(founder: bytes) -> bytes:
+    """Box name of a founder's (total, live) counters."""
+    if len(founder) != 32:
+        raise ValueError("Founder public key must be 32 bytes")
+    return FOUNDER_PREFIX + founder
+
+
+def founder_page_box_name(founder: bytes, page: int) -> bytes:
+    """Box name of one page of a founder's ordinal list."""
+    return founder_stats_box_name(founder) + page.to_bytes(8, "big")
+
+
+def register_founder_names(founder: bytes, founder_total: int) -> list[bytes]:
+    """Founder index boxes a registration must reference: stats, current and next page."""
+    page = founder_total // ORDINALS_PER_PAGE
+    return [
+        founder_stats_box_name(founder),
+        founder_page_box_name(founder, page),
+        founder_page_box_name(founder, page + 1),
+    ]
+
+
+def delete_founder_names(founder: bytes, founder_slot: int) -> list[bytes]:
+    """Founder index boxes a delete_idea call must reference: stats and the page holding the slot."""
+    return [founder_stats_box_name(founder), founder_page_box_name(founder, founder_slot // ORDINALS_PER_PAGE)]
+
+
+def decode_founder_stats(value: bytes) -> tuple[int, int]:
+    """Parse a founder stats box into (total, live)."""
+    if len(value) != FOUNDER_STATS_SIZE:
+        raise ValueError(f"Invalid founder stats size: {len(value)}")
+    return int.from_bytes(value[:8], "big"), int.from_bytes(value[8:], "big")
+
+
+def anchor_box_name(root: bytes) -> bytes:
+    """Box name of a Merkle-anchored batch."""
+    if len(root) != 32:
+        raise ValueError("Merkle root must be 32 bytes")
+    return ANCHOR_PREFIX + root
+
+
+@dataclass(frozen=True)
+class AnchorRecord:
+    """Decoded anchor box value."""
+
+    anchorer: bytes
+    timestamp: int
+    count: int
+    cid_digest: bytes
+
+    @property
+    def manifest_cid(self) -> str:
+        return digest_to_cid(self.cid_digest)
+
+
+def decode_anchor(value: bytes) -> AnchorRecord:
+    """Parse an anchor box."""
+    if len(value) != ANCHOR_RECORD_SIZE:
+        raise ValueError(f"Invalid anchor record size: {len(value)}")
+    return AnchorRecord(
+        anchorer=value[:32],
+        timestamp=int.from_bytes(value[32:40], "big"),
+        count=int.from_bytes(value[40:48], "big"),
+        cid_digest=value[48:80],
+    )
+
+
+def decode_page(value: bytes, first_ordinal: int, next_ordinal: int) -> list[bytes]:
+    """Split a page box into its hashes, dropping slots at or past next_ordinal."""
+    used = max(0, min(HASHES_PER_PAGE, next_ordinal - first_ordinal))
+    return [value[i * 32 : (i + 1) * 32] for i in range(used)]
+
+
+def decode_founder_page(value: bytes, first_slot: int, total: int) -> list[int]:
+    """Split a founder page box into its ordinals, dropping deleted slots and slots at or past total."""
+    used = max(0, min(ORDINALS_PER_PAGE, total - first_slot))
+    ordinals = (int.from_bytes(value[i * ORDINAL_SIZE : (i + 1) * ORDINAL_SIZE], "big") for i in range(used))
+    return [ordinal for ordinal in ordinals if ordinal != DELETED_ORDINAL]
+
+
+def hash_at(page_value: bytes, ordinal: int) -> bytes:
+    """The hash stored for `ordinal` in the ordinal page that holds it."""
+    slot = ordinal % HASHES_PER_PAGE
+    return page_value[slot * 32 : (slot + 1) * 32]
+
+
+@dataclass(frozen=True)
+class IdeaRecord:
+    """Decoded idea box value."""
+
+    founder: bytes
+    timestamp: int
+    cid_digest: bytes
+    title: str
+    founder_slot: int = 0
+
+    @property
+    def ipfs_cid(self) -> str:
+        return digest_to_cid(self.cid_digest)
+
+    @property
+    def founder_address(self) -> str:
+        from algosdk import encoding
+
+        return encoding.encode_address(self.founder)
+
+
+def encode_record(record: IdeaRecord) -> bytes:
+    """Serialize a record using the current (v1) layout."""
+    if len(record.founder) != 32:
+        raise ValueError("Founder public key must be 32 bytes")
+    if len(record.cid_digest) != 32:
+        raise ValueError("CID digest must be 32 bytes")
+    title = record.title.encode("utf-8")
+    if len(title) > MAX_TITLE_BYTES:
+        raise ValueError(f"Title preview must be at most {MAX_TITLE_BYTES} bytes")
+    return (
+        bytes([RECORD_VERSION])
+        + record.founder
+        + record.timestamp.to_bytes(8, "big")
+        + record.cid_digest
+        + record.founder_slot.to_bytes(4, "big")
+        + title
+    )
+
+
+def decode_record(value: bytes) -> IdeaRecord:
+    """Parse a v1 record. Raises ValueError for any other layout."""
+    if len(value) < HEADER_SIZE or len(value) > MAX_RECORD_SIZE:
+        raise ValueError(f"Invalid record size: {len(value)}")
+    if value[VERSION_OFFSET] != RECORD_VERSION:
+        raise ValueError(f"Unsupported record version: {value[VERSION_OFFSET]}")
+    return IdeaRecord(
+        founder=value[FOUNDER_OFFSET:TIMESTAMP_OFFSET],
+        timestamp=int.from_bytes(value[TIMESTAMP_OFFSET:CID_OFFSET], "big"),
+        cid_digest=value[CID_OFFSET:FOUNDER_SLOT_OFFSET],
+        title=value[TITLE_OFFSET:].decode("utf-8"),
+        founder_slot=int.from_bytes(value[FOUNDER_SLOT_OFFSET:TITLE_OFFSET], "big"),
+    )
+
+
+@dataclass(frozen=True)
+class LegacyIdeaRecord:
+    """Decoded pre-v1 variable-length idea box value."""
+
+    founder: bytes
+    timestamp: int
+    ipfs_cid: str
+    title: str
+
+
+def decode_legacy_record(value: bytes) -> LegacyIdeaRecord:
+    """Parse a legacy record. Raises ValueError if the lengths don't add up."""
+    if len(value) < 44:
+        raise ValueError(f"Invalid legacy record size: {len(value)}")
+    cid_len = int.from_bytes(value[40:42], "big")
+    title_len_at = 42 + cid_len
+    if title_len_at + 2 > len(value):
+        raise ValueError("Legacy CID length overruns record")
+    title_len = int.from_bytes(value[title_len_at : title_len_at + 2], "big")
+    if title_len_at + 2 + title_len != len(value):
+        raise ValueError("Legacy title length does not match record size")
+    return LegacyIdeaRecord(
+        founder=value[0:32],
+        timestamp=int.from_bytes(value[32:40], "big"),
+        ipfs_cid=value[42:title_len_at].decode("utf-8"),
+        title=value[title_len_at + 2 :].decode("utf-8"),
+    )
+
+
+def migrate_legacy_record(value: bytes) -> IdeaRecord:
+    """Convert a legacy box value (from a pre-v1 app) into the equivalent v1 record."""
+    legacy = decode_legacy_record(value)
+    return IdeaRecord(
+        founder=legacy.founder,
+        timestamp=legacy.timestamp,
+        cid_digest=cid_to_digest(legacy.ipfs_cid),
+        title=truncate_title(legacy.title).decode("utf-8"),
+    )
@@ -0,0 +1,121 @@
+"""
+IdeaRegistry ARC-28 event decoding.
+All events have only static ARC-4 fields, so every log is a fixed-size
+record: decoding a block is a single pass of selector lookups and
+precompiled struct unpacks, with no per-log ABI type machinery.
+"""
+
+import base64
+import hashlib
+import struct
+from dataclasses import dataclass
+from typing import Iterable, Union
+
+from idea_codec import digest_to_cid
+
+
+def event_selector(signature: str) -> bytes:
+    """ARC-28 event selector: first 4 bytes of SHA-512/256(signature)."""
+    return hashlib.new("sha512_256", signature.encode()).digest()[:4]
+
+
+IDEA_REGISTERED_SIGNATURE = "IdeaRegistered(byte[32],address,uint64,byte[32])"
+IDEA_DELETED_SIGNATURE = "IdeaDeleted(byte[32],address)"
+BATCH_ANCHORED_SIGNATURE = "BatchAnchored(byte[32],address,uint64,uint64,byte[32])"
+
+IDEA_REGISTERED = event_selector(IDEA_REGISTERED_SIGNATURE)
+IDEA_DELETED = event_selector(IDEA_DELETED_SIGNATURE)
+BATCH_ANCHORED = event_selector(BATCH_ANCHORED_SIGNATURE)
+
+_REGISTERED_STRUCT = struct.Struct(">4s32s32sQ32s")
+_DELETED_STRUCT = struct.Struct(">4s32s32s")
+_ANCHORED_STRUCT = struct.Struct(">4s32s32sQQ32s")
+
+
+@dataclass(frozen=True)
+class IdeaRegisteredEvent:
+    idea_hash: bytes
+    founder: bytes
+    timestamp: int
+    cid_digest: bytes
+    round: int = 0
+
+    @property
+    def ipfs_cid(self) -> str:
+        return digest_to_cid(self.cid_digest)
+
+
+@dataclass(frozen=True)
+class IdeaDeletedEvent:
+    idea_hash: bytes
+    founder: bytes
+    round: int = 0
+
+
+@dataclass(frozen=True)
+class BatchAnchoredEvent:
+    root: bytes
+    anchorer: bytes
+    timestamp: int
+    count: int
+    cid_digest: bytes
+    round: int = 0
+
+    @property
+    def manifest_cid(self) -> str:
+        return digest_to_cid(self.cid_digest)
+
+
+IdeaEvent = Union[IdeaRegisteredEvent, IdeaDeletedEvent, BatchAnchoredEvent]
+
+
+def decode_log(entry: bytes, round_number: int = 0) -> IdeaEvent | None:
+    """Decode a single log line; returns None for anything that isn't one of our events."""
+    selector = entry[:4]
+    if selector == IDEA_REGISTERED and len(entry) == _REGISTERED_STRUCT.size:
+        _, idea_hash, founder, timestamp, cid_digest = _REGISTERED_STRUCT.unpack(entry)
+        return IdeaRegisteredEvent(idea_hash, founder, timestamp, cid_digest, round_number)
+    if selector == IDEA_DELETED and len(entry) == _DELETED_STRUCT.size:
+        _, idea_hash, founder = _DELETED_STRUCT.unpack(entry)
+        return IdeaDeletedEvent(idea_hash, founder, round_number)
+    if selector == BATCH_ANCHORED and len(entry) == _ANCHORED_STRUCT.size:
+        _, root, anchorer, timestamp, count, cid_digest = _ANCHORED_STRUCT.unpack(entry)
+        return BatchAnchoredEvent(root, anchorer, timestamp, count, cid_digest, round_number)
+    return None
+
+
+def decode_logs(logs: Iterable[bytes], round_number: int = 0) -> list[IdeaEvent]:
+    """Decode the events in a sequence of logs, preserving order."""
+    return [event for event in (decode_log(entry, round_number) for entry in logs) if event]
+
+
+def decode_registered_payload(payload: bytes, round_number: int = 0) -> list[IdeaRegisteredEvent]:
+    """
+    Decode a concatenation of IdeaRegistered logs in one struct.iter_unpack pass.
+
+    Useful for catch-up indexing where logs were already filtered by selector.
+    """
+    return [
+        IdeaRegisteredEvent(idea_hash, founder, timestamp, cid_digest, round_number)
+        for _, idea_hash, founder, timestamp, cid_digest in _REGISTERED_STRUCT.iter_unpack(payload)
+    ]
+
+
+def decode_block(block: dict, app_id: int, round_number: int = 0) -> list[IdeaEvent]:
+    """
+    Decode every IdeaRegistry event in an algod block, in transaction order.
+
+    Logs are base64 strings in algod's JSON block format and raw bytes when the
+    block was decoded from msgpack; both are accepted.
+    """
+    events: list[IdeaEvent] = []
+    for stxn in block.get("txns", []):
+        txn = stxn.get("txn", {})
+        if txn.get("type") != "appl" or txn.get("apid") != app_id:
+            continue
+        for entry in stxn.get("dt", {}).get("lg", ()):
+            raw = entry if isinstance(entry, bytes) else base64.b64decode(entry)
+            event = decode_log(raw, round_number)
+            if event:
+                events.append(event)
+    return events
@@ -0,0 +1,313 @@
+"""
+IdeaRegistry indexer.
+Follows blocks from algod (or a recorded block fixture) as a stream, decodes
+IdeaRegistry's ARC-28 IdeaRegistered / IdeaDeleted events, and maintains an
+incremental SQLite index of idea_hash → founder / timestamp / CID.
+
+Blocks written before the contract emitted events are still understood: for
+those calls the legacy IDEA_REGISTERED:<founder>:<timestamp> log is combined
+with the decoded app-call arguments.
+
+Every block is applied in a single SQLite transaction together with the
+checkpointed round, so a restarted indexer resumes exactly where it stopped.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from idea_codec import cid_to_digest, digest_to_cid
+from idea_events import IdeaDeletedEvent, IdeaRegisteredEvent, decode_logs
+
+LOG_PREFIX = b"IDEA_REGISTERED:"
+LOG_SIZE = len(LOG_PREFIX) + 32 + 1 + 8
+ABI_RETURN_PREFIX = bytes.fromhex("151f7c75")
+
+
+def method_selector(signature: str) -> bytes:
+    """ARC-4 method selector: first 4 bytes of SHA-512/256(signature)."""
+    return hashlib.new("sha512_256", signature.encode()).digest()[:4]
+
+
+REGISTER_IDEA = method_selector("register_idea(byte[32],byte[32],string)uint64")
+# Originally deployed ABI, which took the CID as a base58 string
+REGISTER_IDEA_STRING_CID = method_selector("register_idea(byte[32],string,string)uint64")
+REGISTER_IDEAS_BATCH = method_selector(
+    "register_ideas_batch((byte[32],byte[32],string)[])(uint64[],bool[])"
+)
+DELETE_IDEA = method_selector("delete_idea(byte[32])void")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ideas (
+    idea_hash  BLOB PRIMARY KEY,
+    founder    BLOB NOT NULL,
+    timestamp  INTEGER NOT NULL,
+    cid_digest BLOB NOT NULL,
+    round      INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ideas_founder ON ideas (founder);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    app_id INTEGER PRIMARY KEY,
+    round  INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class IndexedIdea:
+    """One registration recovered from the chain."""
+
+    idea_hash: bytes
+    founder: bytes
+    timestamp: int
+    cid_digest: bytes
+    round: int
+
+    @property
+    def ipfs_cid(self) -> str:
+        return digest_to_cid(self.cid_digest)
+
+
+def _raw(value: bytes | str) -> bytes:
+    """Block byte fields are base64 strings in algod JSON, raw bytes if msgpack-decoded."""
+    return value if isinstance(value, bytes) else base64.b64decode(value)
+
+
+def parse_registered_log(entry: bytes) -> tuple[bytes, int] | None:
+    """Decode an IDEA_REGISTERED:<founder>:<timestamp> log line."""
+    if len(entry) != LOG_SIZE or not entry.startswith(LOG_PREFIX):
+        return None
+    founder = entry[len(LOG_PREFIX) : len(LOG_PREFIX) + 32]
+    timestamp = int.from_bytes(entry[-8:], "big")
+    return founder, timestamp
+
+
+def decode_batch_entries(data: bytes) -> list[tuple[bytes, bytes]]:
+    """Decode (idea_hash, cid_digest) pairs from the (byte[32],byte[32],string)[] batch argument."""
+    count = int.from_bytes(data[0:2], "big")
+    body = data[2:]
+    entries = []
+    for i in range(count):
+        start = int.from_bytes(body[2 * i : 2 * i + 2], "big")
+        entries.append((body[start : start + 32], body[start + 32 : start + 64]))
+    return entries
+
+
+def decode_bool_array(data: bytes) -> list[bool]:
+    """Decode an ARC-4 bool[] (uint16 length + bit-packed values)."""
+    count = int.from_bytes(data[0:2], "big")
+    return [bool(data[2 + i // 8] & (0x80 >> (i % 8))) for i in range(count)]
+
+
+def decode_batch_duplicates(return_log: bytes) -> list[bool]:
+    """Extract the duplicate flags from a register_ideas_batch return log."""
+    value = return_log[len(ABI_RETURN_PREFIX) :]
+    duplicates_offset = int.from_bytes(value[2:4], "big")
+    return decode_bool_array(value[duplicates_offset:])
+
+
+def decode_app_call(
+    txn: dict, apply_data: dict, app_id: int, round_number: int
+) -> tuple[list[IndexedIdea], list[bytes]]:
+    """
+    Decode one IdeaRegistry app call into (registrations, deleted hashes).
+
+    `apply_data` is the transaction's eval delta ("dt"), which carries its logs.
+    ARC-28 events are used when present; otherwise the legacy log line is
+    paired with the call arguments.
+
+    Only top-level calls are decoded; IdeaRegistry is never called from inner
+    transactions by our tooling.
+    """
+    if txn.get("type") != "appl" or txn.get("apid") != app_id:
+        return [], []
+    logs = [_raw(entry) for entry in apply_data.get("lg", [])]
+
+    events = decode_logs(logs, round_number)
+    if events:
+        added = [
+            IndexedIdea(e.idea_hash, e.founder, e.timestamp, e.cid_digest, e.round)
+            for e in events
+            if isinstance(e, IdeaRegisteredEvent)
+        ]
+        deleted = [e.idea_hash for e in events if isinstance(e, IdeaDeletedEvent)]
+        return added, deleted
+
+    args = [_raw(arg) for arg in txn.get("apaa", [])]
+    if not args:
+        return [], []
+    registered = [parsed for parsed in map(parse_registered_log, logs) if parsed]
+    selector = args[0]
+
+    if selector == REGISTER_IDEA and registered:
+        founder, timestamp = registered[0]
+        return [IndexedIdea(args[1], founder, timestamp, args[2], round_number)], []
+
+    if selector == REGISTER_IDEA_STRING_CID and registered:
+        founder, timestamp = registered[0]
+        cid = args[2][2:].decode("utf-8")
+        return [IndexedIdea(args[1], founder, timestamp, cid_to_digest(cid), round_number)], []
+
+    if selector == REGISTER_IDEAS_BATCH and logs:
+        entries = decode_batch_entries(args[1])
+        duplicates = decode_batch_duplicates(logs[-1])
+        fresh = [entry for entry, duplicate in zip(entries, duplicates) if not duplicate]
+        ideas = [
+            IndexedIdea(idea_hash, founder, timestamp, cid_digest, round_number)
+            for (idea_hash, cid_digest), (founder, timestamp) in zip(fresh, registered)
+        ]
+        return ideas, []
+
+    if selector == DELETE_IDEA:
+        return [], [args[1]]
+
+    return [], []
+
+
+class IdeaIndex:
+    """SQLite-backed idea index with a per-app round checkpoint."""
+
+    def __init__(self, path: str | Path, app_id: int):
+        self.app_id = app_id
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @property
+    def checkpoint(self) -> int:
+        """Last fully applied round (0 if nothing indexed yet)."""
+        row = self.conn.execute(
+            "SELECT round FROM checkpoint WHERE app_id = ?", (self.app_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def apply_block(self, round_number: int, block: dict) -> int:
+        """Index every IdeaRegistry call in a block. Returns the number of changes."""
+        changes = 0
+        with self.conn:
+            # Apply calls in block order so a delete followed by a re-registration
+            # of the same hash within one round ends up registered
+            for stxn in block.get("txns", []):
+                added, deleted = decode_app_call(
+                    stxn.get("txn", {}), stxn.get("dt", {}), self.app_id, round_number
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO ideas VALUES (?, ?, ?, ?, ?)",
+                    [(i.idea_hash, i.founder, i.timestamp, i.cid_digest, i.round) for i in added],
+                )
+                self.conn.executemany(
+                    "DELETE FROM ideas WHERE idea_hash = ?", [(h,) for h in deleted]
+                )
+                changes += len(added) + len(deleted)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoint VALUES (?, ?)", (self.app_id, round_number)
+            )
+        return changes
+
+    def consume(self, blocks: Iterable[tuple[int, dict]]) -> int:
+        """Apply a stream of (round, block) pairs, skipping rounds already indexed."""
+        changes = 0
+        checkpoint = self.checkpoint
+        for round_number, block in blocks:
+            if round_number <= checkpoint:
+                continue
+            changes += self.apply_block(round_number, block)
+        return changes
+
+    def get(self, idea_hash: bytes) -> IndexedIdea | None:
+        row = self.conn.execute(
+            "SELECT idea_hash, founder, timestamp, cid_digest, round FROM ideas WHERE idea_hash = ?",
+            (idea_hash,),
+        ).fetchone()
+        return IndexedIdea(*row) if row else None
+
+    def is_registered(self, idea_hash: bytes) -> bool:
+        return self.get(idea_hash) is not None
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM ideas").fetchone()[0]
+
+    def lookup(
+        self,
+        idea_hash: bytes,
+        fallback: Callable[[bytes], IndexedIdea | None] | None = None,
+    ) -> IndexedIdea | None:
+        """
+        Answer from the index, falling back to a chain read for hashes
+        registered after the checkpoint (e.g. registry_client.get_ideas).
+        """
+        idea = self.get(idea_hash)
+        if idea is None and fallback is not None:
+            idea = fallback(idea_hash)
+        return idea
+
+
+def follow_blocks(algod_client, start_round: int, stop_round: int | None = None) -> Iterator[tuple[int, dict]]:
+    """
+    Yield (round, block) from algod starting at `start_round`, waiting for new
+    rounds with status_after_block once the tip is reached.
+    """
+    round_number = start_round
+    while stop_round is None or round_number <= stop_round:
+        last_round = algod_client.status()["last-round"]
+        while round_number > last_round:
+            last_round = algod_client.status_after_block(round_number - 1)["last-round"]
+        yield round_number, algod_client.block_info(round_number)["block"]
+        round_number += 1
+
+
+def iter_block_fixture(path: str | Path) -> Iterator[tuple[int, dict]]:
+    """Yield (round, block) from a JSON-lines fixture of recorded blocks."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["round"], record["block"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index IdeaRegistry registrations into SQLite")
+    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    parser.add_argument("--app-id", type=int, default=int(os.environ.get("ALGORAND_APP_ID", "0")), help="IdeaRegistry app ID")
+    parser.add_argument("--db", default="idea_index.sqlite3", help="SQLite index path")
+    parser.add_argument("--from-round", type=int, default=1, help="First round to index when no checkpoint exists")
+    parser.add_argument("--fixture", type=str, help="Replay a JSON-lines block fixture instead of following algod")
+    args = parser.parse_args()
+
+    if not args.app_id:
+        raise SystemExit("App ID required: pass --app-id or set ALGORAND_APP_ID")
+
+    index = IdeaIndex(args.db, args.app_id)
+    try:
+        if args.fixture:
+            changes = index.consume(iter_block_fixture(args.fixture))
+            print(f"Indexed {changes} change(s); checkpoint at round {index.checkpoint}")
+        else:
+            from algokit_utils import AlgorandClient
+            if args.network == "localnet":
+                algorand = AlgorandClient.default_localnet()
+            elif args.network == "testnet":
+                algorand = AlgorandClient.testnet()
+            else:
+                algorand = AlgorandClient.mainnet()
+
+            start = max(index.checkpoint + 1, args.from_round)
+            print(f"Following app {args.app_id} from round {start}...")
+            started = time.monotonic()
+            for round_number, block in follow_blocks(algorand.client.algod, start):
+                if index.apply_block(round_number, block):
+                    elapsed = time.monotonic() - started
+                    print(f"round {round_number}: {index.count()} ideas indexed ({elapsed:.0f}s)")
+    except KeyboardInterrupt:
+        print(f"\nStopped at round {index.checkpoint}")
+    finally:
+        index.close()
@@ -0,0 +1,179 @@
+"""
+Streaming document ingest.
+Reads a pitch deck once, in fixed-size chunks, and computes both its SHA-256
+content hash and its UnixFS CIDv0 on the fly, so neither step needs the whole
+file in memory. Because the CID is known before anything is uploaded, the
+document digest can be committed on-chain with register_idea while the pin
+upload is still running, instead of after it.
+
+Uploads stream too: the multipart body Pinata expects is sent as an iterator
+of file chunks with a precomputed Content-Length, and the CID Pinata reports
+is checked against the local one.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, TypeVar
+
+from idea_codec import cid_to_digest
+from unixfs import CHUNK_SIZE, DagBuilder
+
+READ_SIZE = CHUNK_SIZE
+
+T = TypeVar("T")
+
+
+class CidMismatch(Exception):
+    """The pinning service reported a different CID than was computed locally."""
+
+
+@dataclass(frozen=True)
+class DocumentDigest:
+    """Content hash and CID of one document."""
+
+    sha256: bytes
+    cid: str
+    size: int
+    dag_size: int  # cumulative DAG size, Pinata's PinSize
+
+    @property
+    def cid_digest(self) -> bytes:
+        """32-byte digest register_idea takes for the CID."""
+        return cid_to_digest(self.cid)
+
+    def as_dict(self) -> dict:
+        return {"sha256": self.sha256.hex(), "cid": self.cid, "size": self.size, "dagSize": self.dag_size}
+
+
+class DocumentHasher:
+    """SHA-256 and UnixFS CIDv0 of a byte stream, fed incrementally."""
+
+    def __init__(self):
+        self._sha256 = hashlib.sha256()
+        self._dag = DagBuilder()
+
+    def update(self, data: bytes | memoryview) -> None:
+        self._sha256.update(data)
+        self._dag.update(data)
+
+    def digest(self) -> DocumentDigest:
+        root = self._dag.finish()
+        return DocumentDigest(self._sha256.digest(), root.cid, self._dag.size, root.cumulative_size)
+
+
+def iter_chunks(stream: BinaryIO, read_size: int = READ_SIZE) -> Iterator[bytes]:
+    while chunk := stream.read(read_size):
+        yield chunk
+
+
+def hash_stream(stream: BinaryIO, read_size: int = READ_SIZE) -> DocumentDigest:
+    hasher = DocumentHasher()
+    for chunk in iter_chunks(stream, read_size):
+        hasher.update(chunk)
+    return hasher.digest()
+
+
+def hash_file(path: Path, read_size: int = READ_SIZE) -> DocumentDigest:
+    with open(path, "rb") as f:
+        return hash_stream(f, read_size)
+
+
+def multipart_upload(path: Path, filename: str | None = None) -> tuple[str, int, Iterator[bytes]]:
+    """(content type, content length, body iterator) for a pinFileToIPFS request streaming `path`."""
+    filename = filename or path.name
+    boundary = uuid.uuid4().hex
+    head = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    tail = (
+        f'\r\n--{boundary}\r\nContent-Disposition: form-data; name="pinataMetadata"\r\n\r\n'
+        + json.dumps({"name": filename})
+        + f'\r\n--{boundary}\r\nContent-Disposition: form-data; name="pinataOptions"\r\n\r\n'
+        + json.dumps({"cidVersion": 0})
+        + f"\r\n--{boundary}--\r\n"
+    ).encode()
+
+    def body() -> Iterator[bytes]:
+        yield head
+        with open(path, "rb") as f:
+            yield from iter_chunks(f)
+        yield tail
+
+    return f"multipart/form-data; boundary={boundary}", len(head) + os.path.getsize(path) + len(tail), body()
+
+
+def pin_file(api_url: str, path: Path, headers: dict[str, str] | None = None, timeout: float = 300.0) -> dict:
+    """Stream `path` to a Pinata-compatible pinFileToIPFS endpoint; returns its JSON response."""
+    content_type, length, body = multipart_upload(path)
+    request = urllib.request.Request(
+        api_url.rstrip("/") + "/pinning/pinFileToIPFS",
+        data=body,
+        method="POST",
+        headers={**(headers or {}), "Content-Type": content_type, "Content-Length": str(length)},
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+
+def pin_json(api_url: str, content: dict, name: str, headers: dict[str, str] | None = None, timeout: float = 60.0) -> dict:
+    """Pin a JSON document through a Pinata-compatible pinJSONToIPFS endpoint; returns its JSON response."""
+    body = json.dumps({
+        "pinataContent": content,
+        "pinataMetadata": {"name": name},
+        "pinataOptions": {"cidVersion": 0},
+    }).encode()
+    request = urllib.request.Request(
+        api_url.rstrip("/") + "/pinning/pinJSONToIPFS",
+        data=body,
+        method="POST",
+        headers={**(headers or {}), "Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+
+def register_while_pinning(
+    path: Path,
+    api_url: str,
+    register: Callable[[DocumentDigest], T],
+    headers: dict[str, str] | None = None,
+) -> tuple[DocumentDigest, T]:
+    """
+    Hash `path`, then run register(digest) and the upload concurrently.
+
+    The upload's CID is compared with the local one; a mismatch raises
+    CidMismatch after both have finished, since the on-chain commitment
+    would then point at content that is not what was pinned.
+    """
+    digest = hash_file(path)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        upload = executor.submit(pin_file, api_url, path, headers)
+        registered = register(digest)
+        pinned = upload.result()
+    if pinned["IpfsHash"] != digest.cid:
+        raise CidMismatch(f"{path}: pinned as {pinned['IpfsHash']}, expected {digest.cid}")
+    return digest, registered
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream-hash documents: SHA-256 and UnixFS CIDv0")
+    parser.add_argument("files", nargs="+", help="Documents to hash")
+    parser.add_argument("--pinning-url", type=str, help="Also stream each file to this pinning API and check the CID")
+    args = parser.parse_args()
+
+    for name in args.files:
+        path = Path(name)
+        digest = hash_file(path)
+        result = {"file": str(path), **digest.as_dict()}
+        if args.pinning_url:
+            pinned = pin_file(args.pinning_url, path)
+            result["pinned"] = pinned["IpfsHash"] == digest.cid
+        print(json.dumps(result))
@@ -0,0 +1,208 @@
+"""
+Encrypted Algorand keystore.
+A flat file of fixed-width records, one per account: the 32-byte public key
+in the clear (so addresses can be listed, funded and looked up by index
+without the password), then the 32-byte ed25519 seed sealed with
+XSalsa20-Poly1305 under a key derived once per file with Argon2id.
+
+Record i lives at HEADER_SIZE + i * RECORD_SIZE, so a keystore of any size
+is read through mmap with no parsing, and writers can append sealed record
+blocks produced by other processes. Every decrypted seed is checked against
+its stored public key, so swapped or tampered records are rejected.
+"""
+
+import base64
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import nacl.bindings
+import nacl.exceptions
+import nacl.pwhash
+import nacl.secret
+from algosdk import encoding
+
+MAGIC = b"IVKS"
+VERSION = 1
+HEADER_SIZE = 64
+# magic, version, Argon2id opslimit / memlimit, salt
+HEADER_STRUCT = struct.Struct(">4sBxxxQQ16s")
+SEED_SIZE = 32
+PUBLIC_KEY_SIZE = 32
+NONCE_SIZE = nacl.secret.SecretBox.NONCE_SIZE
+SEALED_SIZE = SEED_SIZE + nacl.secret.SecretBox.MACBYTES
+RECORD_SIZE = PUBLIC_KEY_SIZE + NONCE_SIZE + SEALED_SIZE
+
+# Argon2id runs once per file, not per record
+DEFAULT_OPSLIMIT = nacl.pwhash.argon2id.OPSLIMIT_INTERACTIVE
+DEFAULT_MEMLIMIT = nacl.pwhash.argon2id.MEMLIMIT_INTERACTIVE
+
+
+class KeystoreError(Exception):
+    """The file is not a keystore, the password is wrong, or a record was tampered with."""
+
+
+@dataclass(frozen=True)
+class KeystoreHeader:
+    """Key-derivation parameters of a keystore file."""
+
+    salt: bytes
+    opslimit: int = DEFAULT_OPSLIMIT
+    memlimit: int = DEFAULT_MEMLIMIT
+
+    @classmethod
+    def new(cls, opslimit: int = DEFAULT_OPSLIMIT, memlimit: int = DEFAULT_MEMLIMIT) -> "KeystoreHeader":
+        return cls(os.urandom(nacl.pwhash.argon2id.SALTBYTES), opslimit, memlimit)
+
+    def encode(self) -> bytes:
+        packed = HEADER_STRUCT.pack(MAGIC, VERSION, self.opslimit, self.memlimit, self.salt)
+        return packed.ljust(HEADER_SIZE, b"\x00")
+
+    @classmethod
+    def decode(cls, data: bytes) -> "KeystoreHeader":
+        if len(data) < HEADER_SIZE:
+            raise KeystoreError("Truncated keystore header")
+        magic, version, opslimit, memlimit, salt = HEADER_STRUCT.unpack_from(data)
+        if magic != MAGIC:
+            raise KeystoreError("Not a keystore file")
+        if version != VERSION:
+            raise KeystoreError(f"Unsupported keystore version {version}")
+        return cls(salt, opslimit, memlimit)
+
+    def derive_key(self, password: bytes) -> bytes:
+        return nacl.pwhash.argon2id.kdf(
+            nacl.secret.SecretBox.KEY_SIZE, password, self.salt, opslimit=self.opslimit, memlimit=self.memlimit
+        )
+
+
+def public_key(seed: bytes) -> bytes:
+    """ed25519 public key of a 32-byte seed."""
+    public, _ = nacl.bindings.crypto_sign_seed_keypair(seed)
+    return public
+
+
+def seal(key: bytes, seed: bytes, public: bytes | None = None) -> bytes:
+    """One keystore record for `seed` (its public key may be passed if already known)."""
+    public = public or public_key(seed)
+    nonce = os.urandom(NONCE_SIZE)
+    return public + nonce + nacl.secret.SecretBox(key).encrypt(seed, nonce).ciphertext
+
+
+def unseal(key: bytes, record: bytes) -> bytes:
+    """The seed in a record, checked against its public key."""
+    public = record[:PUBLIC_KEY_SIZE]
+    nonce = record[PUBLIC_KEY_SIZE:PUBLIC_KEY_SIZE + NONCE_SIZE]
+    try:
+        seed = nacl.secret.SecretBox(key).decrypt(record[PUBLIC_KEY_SIZE + NONCE_SIZE:RECORD_SIZE], nonce)
+    except nacl.exceptions.CryptoError:
+        raise KeystoreError("Wrong password or corrupted record") from None
+    if public_key(seed) != public:
+        raise KeystoreError("Record does not match its public key")
+    return seed
+
+
+def private_key(seed: bytes) -> str:
+    """algosdk's private key format: base64 of seed and public key."""
+    return base64.b64encode(seed + public_key(seed)).decode()
+
+
+class KeystoreWriter:
+    """
+    Writes a keystore atomically: records go to a temporary file that
+    replaces `path` only on commit.
+    """
+
+    def __init__(self, path: str | Path, password: bytes, header: KeystoreHeader | None = None):
+        self.path = Path(path)
+        self.header = header or KeystoreHeader.new()
+        self.key = self.header.derive_key(password)
+        self.count = 0
+        self._partial = self.path.with_name(self.path.name + ".part")
+        self._file = open(self._partial, "wb")
+        self._file.write(self.header.encode())
+
+    def append(self, records: bytes) -> None:
+        """Append a block of consecutive sealed records."""
+        if len(records) % RECORD_SIZE:
+            raise ValueError("Record block is not a whole number of records")
+        self._file.write(records)
+        self.count += len(records) // RECORD_SIZE
+
+    def commit(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._partial, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._partial.unlink(missing_ok=True)
+
+    def __enter__(self) -> "KeystoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class Keystore:
+    """Read-only, memory-mapped view of a keystore file."""
+
+    def __init__(self, path: str | Path, password: bytes | None = None):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER_SIZE or (size - HEADER_SIZE) % RECORD_SIZE:
+            self._file.close()
+            raise KeystoreError(f"{self.path} is not a whole keystore")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = KeystoreHeader.decode(self._map[:HEADER_SIZE])
+        self._count = (size - HEADER_SIZE) // RECORD_SIZE
+        self.key = self.header.derive_key(password) if password is not None else None
+        if self.key is not None and self._count:
+            self.seed(0)  # fail fast on a wrong password
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "Keystore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, index: int) -> bytes:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        offset = HEADER_SIZE + index * RECORD_SIZE
+        return self._map[offset:offset + RECORD_SIZE]
+
+    def address(self, index: int) -> str:
+        return encoding.encode_address(self.record(index)[:PUBLIC_KEY_SIZE])
+
+    def addresses(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self.address(index)
+
+    def seed(self, index: int) -> bytes:
+        if self.key is None:
+            raise KeystoreError("Keystore opened without a password")
+        return unseal(self.key, self.record(index))
+
+    def private_key(self, index: int) -> str:
+        return private_key(self.seed(index))
+
+    def accounts(self) -> Iterator[tuple[str, str]]:
+        """(address, private key) of every account, decrypted one at a time."""
+        for index in range(self._count):
+            yield self.address(index), self.private_key(index)
@@ -0,0 +1,544 @@
+"""
+IdeaVault registration load generator.
+Drives synthetic ideas through the same stages as POST /api/ideas: the
+SHA-256 idea hash, the pitch-deck and metadata pin uploads, register_idea
+and the database insert. Each concurrency level runs at a fixed arrival rate
+(or closed-loop) and reports p50/p95/p99 latency per stage, plus the
+throughput reached, which gives a throughput-vs-concurrency curve for sizing
+nodes before launch events.
+
+By default every dependency is a local stand-in: pinning_server.py (real
+CIDv0s, with a configurable Pinata-like delay), a simulated chain that
+confirms transactions at block boundaries, and SQLite in place of Postgres.
+Pass --app-id to register against a real IdeaRegistry on LocalNet instead.
+In open-loop mode end-to-end latency is measured from each idea's scheduled
+arrival, so a saturated pipeline shows up as queueing delay rather than
+being hidden; in closed-loop mode it starts once the idea has a slot.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from idea_codec import cid_to_digest, truncate_title
+from ingest import CidMismatch
+from pinning_server import PinningServer, pinata_json
+from tracing import traced_execute
+from unixfs import cidv0
+
+STAGES = ("hash", "cid", "pin_file", "pin_json", "register", "db_insert", "total")
+PERCENTILES = (50, 95, 99)
+
+DEFAULT_BLOCK_TIME = 2.8
+DEFAULT_PIN_LATENCY = 0.15
+DEFAULT_DOC_SIZE = 256 * 1024
+
+
+class DuplicateIdea(Exception):
+    """The idea hash is already registered."""
+
+
+def generate_idea_hash(title: str, description: str, timestamp: str) -> str:
+    """SHA256(title | description | ISO timestamp), as routes/ideas.ts computes it."""
+    return hashlib.sha256(f"{title}|{description}|{timestamp}".encode()).hexdigest()
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 if empty)."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, -(-len(sorted_samples) * q // 100))
+    return sorted_samples[int(rank) - 1]
+
+
+class LatencyRecorder:
+    """Thread-safe latency samples and failure counts per stage."""
+
+    def __init__(self):
+        self._samples: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        self._failures: dict[str, int] = {stage: 0 for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    def fail(self, stage: str) -> None:
+        with self._lock:
+            self._failures[stage] += 1
+
+    @property
+    def completed(self) -> int:
+        return len(self._samples["total"])
+
+    @property
+    def failed(self) -> int:
+        return sum(self._failures.values())
+
+    def summary(self) -> dict:
+        """Per-stage {count, failures, p50Ms, p95Ms, p99Ms, maxMs}."""
+        with self._lock:
+            snapshot = {stage: sorted(samples) for stage, samples in self._samples.items()}
+            failures = dict(self._failures)
+        return {
+            stage: {
+                "count": len(samples),
+                "failures": failures[stage],
+                **{f"p{q}Ms": round(percentile(samples, q) * 1000, 3) for q in PERCENTILES},
+                "maxMs": round(samples[-1] * 1000, 3) if samples else 0.0,
+            }
+            for stage, samples in snapshot.items()
+        }
+
+
+@dataclass(frozen=True)
+class IdeaPayload:
+    title: str
+    description: str
+    category: str
+    stage: str
+    pitch_deck: bytes
+
+
+def synthetic_payloads(seed: int, doc_size: int):
+    """Endless stream of distinct synthetic ideas sharing one random pitch-deck body."""
+    rng = random.Random(seed)
+    deck = rng.randbytes(doc_size)
+    words = ["ai", "climate", "fintech", "health", "logistics", "edtech", "robotics", "saas"]
+    i = 0
+    while True:
+        yield IdeaPayload(
+            title=f"Load test idea {seed}-{i}",
+            description=" ".join(rng.choice(words) for _ in range(80)),
+            category=rng.choice(words),
+            stage="IDEA",
+            pitch_deck=i.to_bytes(8, "big") + deck,
+        )
+        i += 1
+
+
+# --- Pinning ----------------------------------------------------------------
+
+class PinningClient:
+    """Minimal Pinata client, sending the same request shapes as services/ipfs.ts."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, path: str, body: bytes, content_type: str) -> str:
+        request = urllib.request.Request(
+            self.base_url + path, data=body, method="POST", headers={"Content-Type": content_type}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.load(response)["IpfsHash"]
+
+    def pin_file(self, data: bytes, filename: str = "pitch-deck.pdf") -> str:
+        boundary = uuid.uuid4().hex
+        options = json.dumps({"cidVersion": 0}).encode()
+        metadata = json.dumps({"name": filename}).encode()
+        body = b"".join([
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n".encode(),
+            data,
+            f'\r\n--{boundary}\r\nContent-Disposition: form-data; name="pinataMetadata"\r\n\r\n'.encode(),
+            metadata,
+            f'\r\n--{boundary}\r\nContent-Disposition: form-data; name="pinataOptions"\r\n\r\n'.encode(),
+            options,
+            f"\r\n--{boundary}--\r\n".encode(),
+        ])
+        return self._post("/pinning/pinFileToIPFS", body, f"multipart/form-data; boundary={boundary}")
+
+    def pin_json(self, document: dict, name: str = "idea-metadata.json") -> str:
+        body = json.dumps({
+            "pinataContent": document,
+            "pinataMetadata": {"name": name},
+            "pinataOptions": {"cidVersion": 0},
+        }).encode()
+        return self._post("/pinning/pinJSONToIPFS", body, "application/json")
+
+
+# --- Chain ------------------------------------------------------------------
+
+class SimulatedChain:
+    """
+    Stand-in for algod + IdeaRegistry.register_idea.
+
+    A submission is rejected if its hash is already registered, otherwise it
+    lands in the next block with spare capacity and the call returns once
+    that block is produced (blocks every `block_time` seconds).
+    """
+
+    def __init__(self, block_time: float = DEFAULT_BLOCK_TIME, txns_per_block: int = 5_000):
+        self.block_time = block_time
+        self.txns_per_block = txns_per_block
+        self._genesis = time.monotonic()
+        self._registered: set[bytes] = set()
+        self._block_load: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def current_round(self) -> int:
+        return int((time.monotonic() - self._genesis) / self.block_time)
+
+    def register(self, idea_hash: bytes, cid_digest: bytes, title: bytes) -> tuple[str, int]:
+        """Returns (txid, block timestamp) once confirmed; raises DuplicateIdea."""
+        with self._lock:
+            if idea_hash in self._registered:
+                raise DuplicateIdea(idea_hash.hex())
+            self._registered.add(idea_hash)
+            confirm_round = self.current_round() + 1
+            while self._block_load.get(confirm_round, 0) >= self.txns_per_block:
+                confirm_round += 1
+            self._block_load[confirm_round] = self._block_load.get(confirm_round, 0) + 1
+            self._block_load.pop(confirm_round - 16, None)
+
+        delay = self._genesis + confirm_round * self.block_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        txid = hashlib.sha512(idea_hash + cid_digest + title).hexdigest()[:52].upper()
+        return txid, int(time.time())
+
+
+class LocalNetChain:
+    """register_idea against a deployed IdeaRegistry, sent from the LocalNet dispenser."""
+
+    def __init__(self, algod_client, app_id: int, sender: str, signer):
+        self.algod = algod_client
+        self.app_id = app_id
+        self.sender = sender
+        self.signer = signer
+
+    def register(self, idea_hash: bytes, cid_digest: bytes, title: bytes) -> tuple[str, int]:
+        from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+        from algosdk.error import AlgodHTTPError
+
+        from registry_client import registration_box_names
+        from registry_spec import registry_method, suggested_params
+
+        names = [idea_hash] + registration_box_names(self.algod, self.app_id, self.sender)
+        atc = AtomicTransactionComposer()
+        atc.add_method_call(
+            app_id=self.app_id,
+            method=registry_method("register_idea"),
+            sender=self.sender,
+            sp=suggested_params(self.algod),
+            signer=self.signer,
+            method_args=[idea_hash, cid_digest, title.decode("utf-8")],
+            boxes=[(self.app_id, name) for name in names],
+        )
+        try:
+            result = traced_execute(atc, self.algod, 4, "register_idea")
+        except AlgodHTTPError as e:
+            if "already registered" in str(e):
+                raise DuplicateIdea(idea_hash.hex()) from e
+            raise
+        return result.tx_ids[0], result.abi_results[0].return_value
+
+
+# --- Database stand-in --------------------------------------------------------
+
+class IdeaStore:
+    """SQLite stand-in for the Prisma `Idea` insert (one connection per thread)."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS idea (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            category TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            idea_hash TEXT NOT NULL UNIQUE,
+            txn_id TEXT NOT NULL,
+            block_timestamp INTEGER NOT NULL,
+            ipfs_cid TEXT NOT NULL,
+            pitch_deck_cid TEXT NOT NULL,
+            is_verified INTEGER NOT NULL DEFAULT 1
+        )
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+        with sqlite3.connect(path) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(self.SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def insert(self, payload: IdeaPayload, idea_hash: str, txn_id: str, block_timestamp: int,
+               ipfs_cid: str, pitch_deck_cid: str) -> None:
+        db = self._db()
+        with db:
+            db.execute(
+                "INSERT INTO idea (title, description, category, stage, idea_hash, txn_id,"
+                " block_timestamp, ipfs_cid, pitch_deck_cid) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (payload.title, payload.description, payload.category, payload.stage,
+                 idea_hash, txn_id, block_timestamp, ipfs_cid, pitch_deck_cid),
+            )
+
+    def count(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM idea").fetchone()[0]
+
+
+# --- Pipeline ---------------------------------------------------------------
+
+class Pipeline:
+    """
+    One registration, stage by stage, in the order the backend runs them.
+
+    With precompute=True both CIDs are computed locally first (stage "cid"),
+    and register_idea runs while the two uploads are still in flight. This is
+    the ordering ingest.register_while_pinning enables.
+    """
+
+    def __init__(self, pinning: PinningClient, chain, store: IdeaStore, precompute: bool = False):
+        self.pinning = pinning
+        self.chain = chain
+        self.store = store
+        self.precompute = precompute
+        self._uploads = ThreadPoolExecutor(max_workers=64, thread_name_prefix="upload") if precompute else None
+
+    def close(self) -> None:
+        if self._uploads:
+            self._uploads.shutdown()
+
+    def run_one(self, payload: IdeaPayload, recorder: LatencyRecorder, arrival: float) -> bool:
+        stage = "hash"
+        try:
+            started = time.perf_counter()
+            registered_at = datetime.now(timezone.utc).isoformat()
+            idea_hash = generate_idea_hash(payload.title, payload.description, registered_at)
+            recorder.record(stage, time.perf_counter() - started)
+
+            if self.precompute:
+                stage = "cid"
+                started = time.perf_counter()
+                pitch_deck_cid = cidv0(payload.pitch_deck)
+                metadata = self._metadata(payload, registered_at, idea_hash, pitch_deck_cid)
+                ipfs_cid = cidv0(pinata_json(metadata))
+                recorder.record(stage, time.perf_counter() - started)
+                uploads = [
+                    ("pin_file", pitch_deck_cid, self._uploads.submit(
+                        self._timed, recorder, "pin_file", self.pinning.pin_file, payload.pitch_deck)),
+                    ("pin_json", ipfs_cid, self._uploads.submit(
+                        self._timed, recorder, "pin_json", self.pinning.pin_json, metadata)),
+                ]
+            else:
+                stage = "pin_file"
+                pitch_deck_cid = self._timed(recorder, stage, self.pinning.pin_file, payload.pitch_deck)
+                stage = "pin_json"
+                metadata = self._metadata(payload, registered_at, idea_hash, pitch_deck_cid)
+                ipfs_cid = self._timed(recorder, stage, self.pinning.pin_json, metadata)
+                uploads = []
+
+            stage = "register"
+            txn_id, block_timestamp = self._timed(
+                recorder, stage, self.chain.register,
+                bytes.fromhex(idea_hash), cid_to_digest(ipfs_cid), truncate_title(payload.title),
+            )
+
+            for stage, expected, upload in uploads:
+                if upload.result() != expected:
+                    raise CidMismatch(f"{stage}: pinned {upload.result()}, registered {expected}")
+
+            stage = "db_insert"
+            self._timed(recorder, stage, self.store.insert,
+                        payload, idea_hash, txn_id, block_timestamp, ipfs_cid, pitch_deck_cid)
+        except Exception:
+            recorder.fail(stage)
+            return False
+        recorder.record("total", time.perf_counter() - arrival)
+        return True
+
+    @staticmethod
+    def _metadata(payload: IdeaPayload, registered_at: str, idea_hash: str, pitch_deck_cid: str) -> dict:
+        return {
+            "title": payload.title,
+            "description": payload.description,
+            "category": payload.category,
+            "stage": payload.stage,
+            "registeredAt": registered_at,
+            "ideaHash": idea_hash,
+            "pitchDeckCid": pitch_deck_cid,
+        }
+
+    @staticmethod
+    def _timed(recorder: LatencyRecorder, stage: str, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        recorder.record(stage, time.perf_counter() - started)
+        return result
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    rate: float
+    elapsed: float
+    completed: int
+    failed: int
+    stages: dict = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "targetRate": self.rate,
+            "elapsedSeconds": round(self.elapsed, 3),
+            "completed": self.completed,
+            "failed": self.failed,
+            "throughput": round(self.throughput, 3),
+            "stages": self.stages,
+        }
+
+
+def run_level(
+    pipeline: Pipeline,
+    payloads,
+    concurrency: int,
+    count: int | None = None,
+    duration: float | None = None,
+    rate: float = 0.0,
+) -> LevelResult:
+    """
+    Push ideas through `pipeline` with at most `concurrency` in flight.
+
+    With rate > 0 ideas arrive on a fixed schedule (open loop); otherwise a
+    new idea starts as soon as a slot frees up. Stops after `count` ideas or
+    `duration` seconds, whichever comes first, then waits for stragglers.
+    """
+    if count is None and duration is None:
+        raise ValueError("Either count or duration is required")
+    recorder = LatencyRecorder()
+    slots = threading.BoundedSemaphore(concurrency)
+    started = time.perf_counter()
+
+    def release(_) -> None:
+        slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadgen") as executor:
+        i = 0
+        while (count is None or i < count) and (duration is None or time.perf_counter() - started < duration):
+            if rate > 0:
+                arrival = started + i / rate
+                delay = arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                slots.acquire()
+            else:
+                # Closed loop: an idea only arrives once a slot is free, so
+                # waiting for the slot is not part of its latency
+                slots.acquire()
+                arrival = time.perf_counter()
+            executor.submit(pipeline.run_one, next(payloads), recorder, arrival).add_done_callback(release)
+            i += 1
+
+    return LevelResult(
+        concurrency=concurrency,
+        rate=rate,
+        elapsed=time.perf_counter() - started,
+        completed=recorder.completed,
+        failed=recorder.failed,
+        stages=recorder.summary(),
+    )
+
+
+def format_level(result: LevelResult) -> str:
+    lines = [
+        f"concurrency {result.concurrency}: {result.completed} ok, {result.failed} failed, "
+        f"{result.throughput:.1f} ideas/s",
+        f"  {'stage':<10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}",
+    ]
+    for stage in STAGES:
+        s = result.stages[stage]
+        lines.append(f"  {stage:<10} {s['p50Ms']:>10.1f} {s['p95Ms']:>10.1f} {s['p99Ms']:>10.1f} {s['maxMs']:>10.1f}")
+    return "\n".join(lines)
+
+
+def parse_levels(text: str) -> list[int]:
+    levels = [int(part) for part in text.split(",") if part.strip()]
+    if not levels or min(levels) < 1:
+        raise argparse.ArgumentTypeError("Concurrency levels must be positive integers")
+    return levels
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the idea registration pipeline")
+    parser.add_argument("--concurrency", type=parse_levels, default=[1, 4, 16, 64], help="Comma-separated levels to sweep")
+    parser.add_argument("--count", type=int, help="Ideas per level")
+    parser.add_argument("--duration", type=float, help="Seconds per level (soak test)")
+    parser.add_argument("--rate", type=float, default=0.0, help="Arrivals per second (0 = closed loop)")
+    parser.add_argument("--doc-size", type=int, default=DEFAULT_DOC_SIZE, help="Pitch deck bytes per idea")
+    parser.add_argument("--pin-latency", type=float, default=DEFAULT_PIN_LATENCY, help="Stand-in pinning delay (seconds)")
+    parser.add_argument("--pinning-url", type=str, help="Use this pinning API instead of the stand-in")
+    parser.add_argument("--block-time", type=float, default=DEFAULT_BLOCK_TIME, help="Simulated block interval (seconds)")
+    parser.add_argument("--app-id", type=int, default=0, help="Register on this LocalNet IdeaRegistry instead of the simulated chain")
+    parser.add_argument("--precompute-cid", action="store_true", help="Compute CIDs locally and register while uploads run")
+    parser.add_argument("--seed", type=int, default=0, help="Payload generator seed")
+    parser.add_argument("--output", type=str, help="Write results as JSON")
+    args = parser.parse_args()
+
+    if args.count is None and args.duration is None:
+        args.count = 200
+
+    workdir = tempfile.mkdtemp(prefix="ideavault-loadgen-")
+    pinning_server = None
+    if args.pinning_url:
+        pinning = PinningClient(args.pinning_url)
+    else:
+        pinning_server = PinningServer(Path(workdir) / "pins", latency=args.pin_latency).start()
+        pinning = PinningClient(pinning_server.url)
+
+    if args.app_id:
+        from algokit_utils import AlgorandClient
+        algorand = AlgorandClient.default_localnet()
+        dispenser = algorand.account.localnet_dispenser()
+        chain = LocalNetChain(algorand.client.algod, args.app_id, dispenser.address, dispenser.signer)
+    else:
+        chain = SimulatedChain(args.block_time)
+
+    store = IdeaStore(Path(workdir) / "ideas.db")
+    pipeline = Pipeline(pinning, chain, store, precompute=args.precompute_cid)
+    payloads = synthetic_payloads(args.seed, args.doc_size)
+
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            result = run_level(pipeline, payloads, concurrency, args.count, args.duration, args.rate)
+            results.append(result)
+            print(format_level(result))
+    finally:
+        pipeline.close()
+        if pinning_server:
+            pinning_server.stop()
+
+    print("\nthroughput vs concurrency")
+    for result in results:
+        p99 = result.stages["total"]["p99Ms"]
+        print(f"  {result.concurrency:>5}  {result.throughput:>8.1f} ideas/s  p99 {p99:>9.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"levels": [r.as_dict() for r in results]}, f, indent=2)
+        print(f"Wrote {args.output}")
+    print(f"Database: {os.path.join(workdir, 'ideas.db')} ({store.count()} rows)")
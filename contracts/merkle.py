@@ -0,0 +1,285 @@
+"""
+Merkle-batched idea anchoring.
+Builds the binary SHA-256 tree IdeaRegistry.anchor_batch commits to and the
+inclusion proofs IdeaRegistry.verify_inclusion checks, so a batch of N idea
+hashes costs one 80-byte anchor box on-chain and each idea is later proven
+with ceil(log2(N)) sibling hashes instead of owning a record box.
+
+Leaves are sha256(0x00 | idea_hash) and inner nodes sha256(0x01 | left |
+right), so a leaf can never be passed off as an inner node. The last node of
+an odd-sized level is promoted unchanged rather than paired with a copy of
+itself, which keeps roots unique per leaf list. Proofs are just the sibling
+hashes: the leaf count anchored with the root fixes the tree shape, so which
+levels have a sibling and on which side follows from (index, count).
+
+The batch manifest (root, count and every idea hash) is pinned to IPFS and its
+CIDv0 anchored alongside the root, so anyone can rebuild any proof from it.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from idea_codec import anchor_box_name, cid_to_digest
+from tracing import traced_execute
+from unixfs import cidv0
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+MANIFEST_VERSION = 1
+
+
+def leaf_hash(idea_hash: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + idea_hash).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def tree_depth(count: int) -> int:
+    """Number of levels above the leaves (the proof length of a full level path)."""
+    return (count - 1).bit_length() if count > 1 else 0
+
+
+@dataclass(frozen=True)
+class InclusionProof:
+    """Position of a leaf in a batch of `count` and its sibling hashes, leaf level first."""
+
+    index: int
+    count: int
+    siblings: tuple[bytes, ...]
+
+    def encode(self) -> bytes:
+        """index(8) | count(8) | siblings(32 each)."""
+        return self.index.to_bytes(8, "big") + self.count.to_bytes(8, "big") + b"".join(self.siblings)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "InclusionProof":
+        if len(data) < 16 or (len(data) - 16) % 32:
+            raise ValueError(f"Invalid proof size: {len(data)}")
+        siblings = tuple(data[offset:offset + 32] for offset in range(16, len(data), 32))
+        return cls(int.from_bytes(data[:8], "big"), int.from_bytes(data[8:16], "big"), siblings)
+
+    def as_dict(self) -> dict:
+        return {"index": self.index, "count": self.count, "siblings": [s.hex() for s in self.siblings]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "InclusionProof":
+        return cls(data["index"], data["count"], tuple(bytes.fromhex(s) for s in data["siblings"]))
+
+
+class MerkleTree:
+    """Every level of the tree over `idea_hashes`, in order; levels[-1] is [root]."""
+
+    def __init__(self, idea_hashes: Sequence[bytes]):
+        if not idea_hashes:
+            raise ValueError("A Merkle batch needs at least one idea hash")
+        for idea_hash in idea_hashes:
+            if len(idea_hash) != 32:
+                raise ValueError("Idea hashes must be 32 bytes")
+        self.idea_hashes = list(idea_hashes)
+        level = [leaf_hash(h) for h in self.idea_hashes]
+        self.levels = [level]
+        while len(level) > 1:
+            paired = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                paired.append(level[-1])
+            level = paired
+            self.levels.append(level)
+        self._positions: dict[bytes, int] | None = None
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    @property
+    def count(self) -> int:
+        return len(self.idea_hashes)
+
+    def index_of(self, idea_hash: bytes) -> int:
+        """Leaf position of `idea_hash` (its first occurrence); raises KeyError if absent."""
+        if self._positions is None:
+            self._positions = {}
+            for index, h in enumerate(self.idea_hashes):
+                self._positions.setdefault(h, index)
+        return self._positions[idea_hash]
+
+    def proof(self, index: int) -> InclusionProof:
+        if not 0 <= index < self.count:
+            raise IndexError(f"Leaf {index} out of range for a batch of {self.count}")
+        siblings = []
+        position = index
+        for level in self.levels[:-1]:
+            if position % 2:
+                siblings.append(level[position - 1])
+            elif position + 1 < len(level):
+                siblings.append(level[position + 1])
+            position //= 2
+        return InclusionProof(index, self.count, tuple(siblings))
+
+
+def compute_root(idea_hash: bytes, proof: InclusionProof) -> bytes | None:
+    """Root `proof` leads to from `idea_hash`, or None if the proof has the wrong shape."""
+    if not 0 <= proof.index < proof.count:
+        return None
+    node = leaf_hash(idea_hash)
+    position, width = proof.index, proof.count
+    siblings = iter(proof.siblings)
+    while width > 1:
+        if position % 2 or position + 1 < width:
+            sibling = next(siblings, None)
+            if sibling is None:
+                return None
+            node = node_hash(sibling, node) if position % 2 else node_hash(node, sibling)
+        position //= 2
+        width = (width + 1) // 2
+    if next(siblings, None) is not None:
+        return None
+    return node
+
+
+def verify_inclusion(idea_hash: bytes, proof: InclusionProof, root: bytes) -> bool:
+    """
+    Off-chain twin of IdeaRegistry.verify_inclusion.
+
+    Args:
+        idea_hash: 32-byte SHA-256 idea hash
+        proof: Inclusion proof for the batch
+        root: Merkle root the batch was anchored under
+
+    Returns:
+        True if the proof recomputes `root` from `idea_hash`
+    """
+    return compute_root(idea_hash, proof) == root
+
+
+def build_manifest(tree: MerkleTree) -> dict:
+    """Batch manifest pinned to IPFS next to the anchor."""
+    return {
+        "version": MANIFEST_VERSION,
+        "root": tree.root.hex(),
+        "count": tree.count,
+        "leaves": [h.hex() for h in tree.idea_hashes],
+    }
+
+
+def manifest_bytes(manifest: dict) -> bytes:
+    """Manifest serialized as pinJSONToIPFS stores it (JSON.stringify output)."""
+    return json.dumps(manifest, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def manifest_cid(manifest: dict) -> str:
+    return cidv0(manifest_bytes(manifest))
+
+
+def load_manifest(path: str | Path) -> tuple[MerkleTree, dict]:
+    """Rebuild a batch's tree from its manifest; raises ValueError if the root doesn't match."""
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    tree = MerkleTree([bytes.fromhex(h) for h in manifest["leaves"]])
+    if tree.root.hex() != manifest["root"]:
+        raise ValueError(f"{path}: leaves hash to {tree.root.hex()}, manifest says {manifest['root']}")
+    return tree, manifest
+
+
+def read_hashes(path: str | Path) -> Iterable[bytes]:
+    """Idea hashes from a file of hex lines or JSONL rows with an ideaHash field."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                line = json.loads(line)["ideaHash"]
+            yield bytes.fromhex(line.removeprefix("0x"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build, prove and anchor Merkle batches of idea hashes")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Build a batch manifest from a list of idea hashes")
+    build.add_argument("input", type=str, help="Hex idea hashes, one per line, or JSONL with ideaHash")
+    build.add_argument("--output", type=str, required=True, help="Manifest path")
+
+    prove = commands.add_parser("prove", help="Print the inclusion proof of one idea")
+    prove.add_argument("manifest", type=str, help="Batch manifest")
+    prove.add_argument("idea_hash", type=str, help="Hex idea hash")
+
+    check = commands.add_parser("verify", help="Check an inclusion proof against a root")
+    check.add_argument("idea_hash", type=str, help="Hex idea hash")
+    check.add_argument("proof", type=str, help="Proof JSON as printed by prove")
+    check.add_argument("root", type=str, help="Hex Merkle root")
+
+    anchor = commands.add_parser("anchor", help="Anchor a batch manifest with anchor_batch")
+    anchor.add_argument("manifest", type=str, help="Batch manifest (pin it first; its CID is anchored)")
+    anchor.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    anchor.add_argument("--app-id", type=int, default=0, help="IdeaRegistry app ID (default: ALGORAND_APP_ID)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        tree = MerkleTree(list(read_hashes(args.input)))
+        manifest = build_manifest(tree)
+        Path(args.output).write_bytes(manifest_bytes(manifest))
+        print(json.dumps({"root": tree.root.hex(), "count": tree.count, "cid": manifest_cid(manifest)}))
+
+    elif args.command == "prove":
+        tree, _ = load_manifest(args.manifest)
+        proof = tree.proof(tree.index_of(bytes.fromhex(args.idea_hash)))
+        print(json.dumps({"root": tree.root.hex(), "proof": proof.as_dict(), "encoded": proof.encode().hex()}))
+
+    elif args.command == "verify":
+        proof = InclusionProof.from_dict(json.loads(args.proof))
+        ok = verify_inclusion(bytes.fromhex(args.idea_hash), proof, bytes.fromhex(args.root))
+        print("included" if ok else "NOT included")
+        raise SystemExit(0 if ok else 1)
+
+    else:
+        from algosdk import account, mnemonic as algo_mnemonic
+        from algosdk.atomic_transaction_composer import AccountTransactionSigner, AtomicTransactionComposer
+
+        from deploy import load_env_file
+        from registry_spec import registry_method, suggested_params
+
+        backend_env_path = Path(__file__).parent.parent / "backend" / ".env"
+        for key, value in load_env_file(backend_env_path).items():
+            os.environ.setdefault(key, value)
+
+        app_id = args.app_id or int(os.environ.get("ALGORAND_APP_ID", "0"))
+        mnemonic = os.getenv("ALGORAND_DEPLOYER_MNEMONIC") or os.getenv("DEPLOYER_MNEMONIC")
+        if not app_id or not mnemonic:
+            raise SystemExit("ALGORAND_APP_ID and ALGORAND_DEPLOYER_MNEMONIC must be set")
+
+        from algokit_utils import AlgorandClient
+        if args.network == "localnet":
+            algorand = AlgorandClient.default_localnet()
+        elif args.network == "testnet":
+            algorand = AlgorandClient.testnet()
+        else:
+            algorand = AlgorandClient.mainnet()
+        algod_client = algorand.client.algod
+
+        tree, manifest = load_manifest(args.manifest)
+        cid = manifest_cid(manifest)
+        private_key = algo_mnemonic.to_private_key(mnemonic)
+        atc = AtomicTransactionComposer()
+        atc.add_method_call(
+            app_id=app_id,
+            method=registry_method("anchor_batch"),
+            sender=account.address_from_private_key(private_key),
+            sp=suggested_params(algod_client),
+            signer=AccountTransactionSigner(private_key),
+            method_args=[tree.root, tree.count, cid_to_digest(cid)],
+            boxes=[(app_id, anchor_box_name(tree.root))],
+        )
+        result = traced_execute(atc, algod_client, 4, "anchor_batch")
+        print(
+            f"Anchored {tree.count} ideas under {tree.root.hex()} (manifest {cid}) "
+            f"in round {result.confirmed_round}, timestamp {result.abi_results[0].return_value}"
+        )
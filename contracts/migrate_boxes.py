@@ -0,0 +1,163 @@
+"""
+Carry ideas from a pre-v1 IdeaRegistry app into a new v1 app.
+The pre-v1 program accepts no UpdateApplication, so its variable-length boxes
+cannot be rewritten in place. This script lists every idea box of the old
+app, decodes it with idea_codec and replays it into the new app with
+import_idea (creator only), keeping the original founder and timestamp.
+Ideas are imported oldest first, so the new app's ordinal index follows the
+original registration order. Hashes the new app already holds are skipped,
+so the script can be re-run safely after an interruption. The old app is
+left untouched.
+"""
+
+import argparse
+import base64
+import os
+from pathlib import Path
+from typing import Iterator
+
+from algosdk import account, mnemonic as algo_mnemonic
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner,
+    AtomicTransactionComposer,
+)
+from algosdk.v2client.algod import AlgodClient
+
+from deploy import load_env_file
+from idea_codec import (
+    HEADER_SIZE,
+    IdeaRecord,
+    box_mbr,
+    index_mbr,
+    migrate_legacy_record,
+    register_founder_names,
+    register_page_names,
+)
+from registry_client import read_founder_stats, read_global_state
+from registry_spec import registry_method, suggested_params
+from tracing import traced_execute
+
+
+def idea_box_names(algod_client: AlgodClient, app_id: int) -> set[bytes]:
+    """Names of every idea record box of an app (the 32-byte keys)."""
+    boxes = algod_client.application_boxes(app_id)["boxes"]
+    names = (base64.b64decode(box["name"]) for box in boxes)
+    return {name for name in names if len(name) == 32}
+
+
+def iter_legacy_boxes(
+    algod_client: AlgodClient, app_id: int, skip: set[bytes] | None = None
+) -> Iterator[tuple[bytes, IdeaRecord]]:
+    """
+    Yield (idea_hash, v1 record) for every idea box of the pre-v1 app
+    `app_id` not in `skip`, oldest registration first.
+    """
+    records = []
+    for name in sorted(idea_box_names(algod_client, app_id) - (skip or set())):
+        value = base64.b64decode(algod_client.application_box_by_name(app_id, name)["value"])
+        try:
+            records.append((name, migrate_legacy_record(value)))
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"Skipping {name.hex()}: not a legacy record ({e})")
+    records.sort(key=lambda item: (item[1].timestamp, item[0]))
+    yield from records
+
+
+def migrate(
+    algod_client: AlgodClient,
+    from_app_id: int,
+    app_id: int,
+    private_key: str,
+    dry_run: bool = False,
+) -> tuple[int, int]:
+    """
+    Import every idea of the pre-v1 app `from_app_id` into the v1 app `app_id`.
+
+    Args:
+        algod_client: Connected algod client
+        from_app_id: Pre-v1 IdeaRegistry application ID (read only)
+        app_id: v1 IdeaRegistry application ID
+        private_key: Private key of the v1 app's creator
+        dry_run: Only report what would be imported
+
+    Returns:
+        (ideas imported, or that would be imported when dry_run; µALGO of box
+        minimum balance they lock in the v1 app)
+    """
+    sender = account.address_from_private_key(private_key)
+    signer = AccountTransactionSigner(private_key)
+    params = suggested_params(algod_client)
+    import_idea = registry_method("import_idea")
+    # Each imported hash is appended to the ordinal and founder indexes
+    next_ordinal = read_global_state(algod_client, app_id).get("next_ordinal", 0)
+    founder_totals: dict[bytes, int] = {}
+
+    imported, mbr = 0, 0
+    existing = idea_box_names(algod_client, app_id)
+    for idea_hash, record in iter_legacy_boxes(algod_client, from_app_id, skip=existing):
+        if record.founder not in founder_totals:
+            founder_totals[record.founder], _ = read_founder_stats(algod_client, app_id, record.founder_address)
+        founder_total = founder_totals[record.founder]
+        print(f"{'Would import' if dry_run else 'Importing'} {idea_hash.hex()} → {record.ipfs_cid}")
+        imported += 1
+        mbr += box_mbr(HEADER_SIZE + len(record.title.encode("utf-8"))) + index_mbr(1, next_ordinal, founder_total)
+        if not dry_run:
+            names = (
+                [idea_hash]
+                + register_page_names(next_ordinal)
+                + register_founder_names(record.founder, founder_total)
+            )
+            atc = AtomicTransactionComposer()
+            atc.add_method_call(
+                app_id=app_id,
+                method=import_idea,
+                sender=sender,
+                sp=params,
+                signer=signer,
+                method_args=[idea_hash, record.founder_address, record.timestamp, record.cid_digest, record.title],
+                boxes=[(app_id, name) for name in names],
+            )
+            traced_execute(atc, algod_client, 4, "import_idea")
+        next_ordinal += 1
+        founder_totals[record.founder] += 1
+    return imported, mbr
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the ideas of a pre-v1 IdeaRegistry app into a v1 app")
+    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    parser.add_argument("--from-app-id", type=int, required=True, help="Pre-v1 IdeaRegistry app ID to read from")
+    parser.add_argument("--app-id", type=int, help="v1 IdeaRegistry app ID to import into (default: ALGORAND_APP_ID)")
+    parser.add_argument("--dry-run", action="store_true", help="List the ideas to import without importing them")
+    args = parser.parse_args()
+
+    backend_env_path = Path(__file__).parent.parent / "backend" / ".env"
+    for key, value in load_env_file(backend_env_path).items():
+        os.environ.setdefault(key, value)
+
+    from algokit_utils import AlgorandClient
+    if args.network == "localnet":
+        algorand = AlgorandClient.default_localnet()
+    elif args.network == "testnet":
+        algorand = AlgorandClient.testnet()
+    else:
+        algorand = AlgorandClient.mainnet()
+
+    app_id = args.app_id or int(os.environ.get("ALGORAND_APP_ID", "0"))
+    if not app_id:
+        raise SystemExit("App ID required: pass --app-id or set ALGORAND_APP_ID")
+    if app_id == args.from_app_id:
+        raise SystemExit("--app-id must be the new v1 app, not the app being migrated from")
+
+    mnemonic_phrase = os.getenv("ALGORAND_DEPLOYER_MNEMONIC") or os.getenv("DEPLOYER_MNEMONIC")
+    if not mnemonic_phrase:
+        raise SystemExit("ALGORAND_DEPLOYER_MNEMONIC (v1 app creator) is required")
+
+    count, mbr = migrate(
+        algorand.client.algod,
+        args.from_app_id,
+        app_id,
+        algo_mnemonic.to_private_key(mnemonic_phrase),
+        dry_run=args.dry_run,
+    )
+    print(f"{count} idea(s) {'to import' if args.dry_run else 'imported'}, locking {mbr} µALGO of box MBR")
@@ -0,0 +1,746 @@
+"""
+IdeaRegistry registration outbox.
+A durable SQLite (WAL) queue between the API and the three remote steps of
+registering an idea: pinning its documents to IPFS, register_idea on chain,
+and writing the backend's Idea row. The API only enqueues the intent — one
+local insert — and answers with a pending ID (which becomes the Idea's id);
+workers then drive each registration through the stages.
+
+Every stage is idempotent on the idea hash: pinning the same bytes yields
+the same CID, the chain stage records its transaction ID before sending and
+checks the box before registering, and the row is upserted on ideaHash. A
+failed stage is retried on its own with jittered exponential backoff, so a
+database outage can no longer leave an on-chain registration without a row.
+
+Run as a sidecar to serve POST /registrations, GET /registrations/<id> and
+/stats, with the workers on background threads.
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+from algosdk import account, encoding
+from algosdk.atomic_transaction_composer import AccountTransactionSigner, AtomicTransactionComposer
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+
+from confirmations import ConfirmationTimeout, TransactionRejected, watcher_for
+from idea_codec import cid_to_digest, register_founder_names, register_page_names, truncate_title
+from ingest import CidMismatch, hash_file, pin_file, pin_json
+from registry_client import get_ideas, read_founder_stats, read_global_state
+from registry_spec import registry_method, suggested_params
+from tracing import traced_execute
+
+PIN = "pin"
+CHAIN = "chain"
+RECORD = "record"
+DONE = "done"
+FAILED = "failed"
+STAGES = (PIN, CHAIN, RECORD)
+NEXT_STAGE = {PIN: CHAIN, CHAIN: RECORD, RECORD: DONE}
+
+# Columns a stage may fill in
+RESULT_FIELDS = ("ipfs_cid", "pitch_deck_cid", "txn_id", "block_timestamp", "idea_id")
+
+# Payload fields the record stage writes to non-null Idea columns
+REQUIRED_FIELDS = ("title", "description", "category", "stage", "founderId")
+
+# Long enough for a register_idea call to confirm (about 4 rounds)
+DEFAULT_LEASE = 120.0
+# Seconds a chain attempt waits on a previous attempt's transaction still in the pool
+PENDING_WAIT = 60.0
+DEFAULT_CONCURRENCY = {PIN: 8, CHAIN: 4, RECORD: 4}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS registrations (
+    pending_id      TEXT PRIMARY KEY,
+    idea_hash       BLOB NOT NULL UNIQUE,
+    stage           TEXT NOT NULL,
+    payload         TEXT NOT NULL,
+    document_name   TEXT,
+    ipfs_cid        TEXT,
+    pitch_deck_cid  TEXT,
+    txn_id          TEXT,
+    block_timestamp INTEGER,
+    idea_id         TEXT,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt    REAL NOT NULL,
+    lease_until     REAL NOT NULL DEFAULT 0,
+    last_error      TEXT,
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS registrations_due ON registrations (stage, next_attempt);
+"""
+
+COLUMNS = (
+    "pending_id, idea_hash, stage, payload, document_name, ipfs_cid, pitch_deck_cid, txn_id, "
+    "block_timestamp, idea_id, attempts, last_error, created_at, updated_at"
+)
+
+
+class PermanentError(Exception):
+    """A stage failure that retrying cannot fix; the registration is failed at once."""
+
+
+@dataclass(frozen=True)
+class Registration:
+    """One queued registration and what its stages have produced so far."""
+
+    pending_id: str
+    idea_hash: bytes
+    stage: str
+    payload: dict
+    document_name: str | None = None
+    ipfs_cid: str | None = None
+    pitch_deck_cid: str | None = None
+    txn_id: str | None = None
+    block_timestamp: int | None = None
+    idea_id: str | None = None
+    attempts: int = 0
+    last_error: str | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "pendingId": self.pending_id,
+            "ideaHash": self.idea_hash.hex(),
+            "stage": self.stage,
+            "ipfsCid": self.ipfs_cid,
+            "pitchDeckCid": self.pitch_deck_cid,
+            "txnId": self.txn_id,
+            "blockTimestamp": self.block_timestamp,
+            "ideaId": self.idea_id,
+            "attempts": self.attempts,
+            "lastError": self.last_error,
+        }
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """Full-jitter exponential backoff: up to base * 2^attempt seconds, at most cap."""
+
+    base: float = 1.0
+    cap: float = 300.0
+    max_attempts: int = 10
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+
+
+class Outbox:
+    """
+    Durable registration queue. Thread-safe; rows are claimed with a lease,
+    so a crashed worker's registrations are picked up again once it expires.
+    """
+
+    def __init__(self, path: str | Path, clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self.spool = self.path.with_name(self.path.name + ".spool")
+        self.spool.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # An acknowledged enqueue must survive a power cut
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # Set whenever there may be new work: enqueues and finished stages
+        self.wake = threading.Event()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def document_path(self, pending_id: str) -> Path:
+        return self.spool / pending_id
+
+    def enqueue(
+        self,
+        idea_hash: bytes,
+        payload: dict,
+        document: bytes | None = None,
+        document_name: str | None = None,
+    ) -> tuple[Registration, bool]:
+        """
+        Queue a registration, keyed on its idea hash.
+
+        Returns:
+            (registration, created); an already queued hash returns its
+            existing registration with created False
+        """
+        if len(idea_hash) != 32:
+            raise ValueError("Idea hash must be 32 bytes")
+        missing = [name for name in REQUIRED_FIELDS if not isinstance(payload.get(name), str) or not payload[name]]
+        if missing:
+            raise ValueError(f"{', '.join(missing)} required")
+        existing = self.get_by_hash(idea_hash)
+        if existing is not None:
+            return existing, False
+
+        pending_id = str(uuid.uuid4())
+        if document is not None:
+            # Spool first: a row must never point at a document that is not on disk
+            partial = self.document_path(pending_id).with_suffix(".part")
+            with open(partial, "wb") as f:
+                f.write(document)
+                f.flush()
+                os.fsync(f.fileno())
+            partial.replace(self.document_path(pending_id))
+
+        now = self._clock()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO registrations "
+                "(pending_id, idea_hash, stage, payload, document_name, next_attempt, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (pending_id, idea_hash, PIN, json.dumps(payload), document_name if document else None, now, now, now),
+            )
+            created = cursor.rowcount == 1
+        if not created:
+            # Lost a race with an enqueue of the same hash
+            self.document_path(pending_id).unlink(missing_ok=True)
+            return self.get_by_hash(idea_hash), False
+        self.wake.set()
+        return self.get(pending_id), True
+
+    def _select(self, where: str, params: tuple) -> list[Registration]:
+        with self._lock:
+            rows = self._db.execute(f"SELECT {COLUMNS} FROM registrations WHERE {where}", params).fetchall()
+        return [
+            Registration(
+                pending_id, bytes(idea_hash), stage, json.loads(payload), *rest
+            )
+            for pending_id, idea_hash, stage, payload, *rest in rows
+        ]
+
+    def get(self, pending_id: str) -> Registration | None:
+        found = self._select("pending_id = ?", (pending_id,))
+        return found[0] if found else None
+
+    def get_by_hash(self, idea_hash: bytes) -> Registration | None:
+        found = self._select("idea_hash = ?", (idea_hash,))
+        return found[0] if found else None
+
+    def claim(self, stage: str, limit: int, lease: float = DEFAULT_LEASE) -> list[Registration]:
+        """Lease up to `limit` registrations due in `stage`, oldest first."""
+        if limit <= 0:
+            return []
+        now = self._clock()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                ids = [
+                    row[0]
+                    for row in self._db.execute(
+                        "SELECT pending_id FROM registrations "
+                        "WHERE stage = ? AND next_attempt <= ? AND lease_until <= ? "
+                        "ORDER BY next_attempt LIMIT ?",
+                        (stage, now, now, limit),
+                    )
+                ]
+                self._db.executemany(
+                    "UPDATE registrations SET lease_until = ? WHERE pending_id = ?",
+                    [(now + lease, pending_id) for pending_id in ids],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        claimed = {r.pending_id: r for r in self._select(
+            f"pending_id IN ({','.join('?' * len(ids))})", tuple(ids)
+        )} if ids else {}
+        return [claimed[pending_id] for pending_id in ids]
+
+    def note(self, pending_id: str, **fields) -> None:
+        """Record stage results before the stage finishes (e.g. a txn ID about to be sent)."""
+        unknown = set(fields) - set(RESULT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}")
+        if not fields:
+            return
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE registrations SET {assignments}, updated_at = ? WHERE pending_id = ?",
+                (*fields.values(), self._clock(), pending_id),
+            )
+
+    def advance(self, pending_id: str, stage: str, fields: dict | None = None) -> bool:
+        """
+        Finish `stage`: store its results and move to the next stage.
+
+        Returns:
+            False if the registration had already left `stage` (a worker
+            whose lease expired finished it too)
+        """
+        self.note(pending_id, **(fields or {}))
+        now = self._clock()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE registrations SET stage = ?, attempts = 0, next_attempt = ?, lease_until = 0, "
+                "last_error = NULL, updated_at = ? WHERE pending_id = ? AND stage = ?",
+                (NEXT_STAGE[stage], now, now, pending_id, stage),
+            )
+        if stage == PIN:
+            self.document_path(pending_id).unlink(missing_ok=True)
+        return cursor.rowcount == 1
+
+    def retry(self, pending_id: str, stage: str, error: str, backoff: Backoff) -> str:
+        """
+        Record a failed attempt and schedule the next one, or fail the
+        registration once backoff.max_attempts is reached.
+
+        Returns:
+            The registration's stage afterwards
+        """
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT attempts FROM registrations WHERE pending_id = ? AND stage = ?", (pending_id, stage)
+            ).fetchone()
+            if row is None:
+                return self._stage(pending_id)
+            attempts = row[0] + 1
+            next_stage = FAILED if attempts >= backoff.max_attempts else stage
+            self._db.execute(
+                "UPDATE registrations SET stage = ?, attempts = ?, next_attempt = ?, lease_until = 0, "
+                "last_error = ?, updated_at = ? WHERE pending_id = ?",
+                (next_stage, attempts, now + backoff.delay(attempts), error, now, pending_id),
+            )
+        return next_stage
+
+    def fail(self, pending_id: str, stage: str, error: str) -> None:
+        """Fail a registration without further retries."""
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "UPDATE registrations SET stage = ?, lease_until = 0, last_error = ?, updated_at = ? "
+                "WHERE pending_id = ? AND stage = ?",
+                (FAILED, error, now, pending_id, stage),
+            )
+
+    def requeue(self, pending_id: str) -> str | None:
+        """
+        Send a failed registration back to the first stage it has not
+        completed.
+
+        Returns:
+            That stage, or None if the registration is not failed
+        """
+        registration = self.get(pending_id)
+        if registration is None or registration.stage != FAILED:
+            return None
+        if registration.ipfs_cid is None:
+            stage = PIN
+        elif registration.block_timestamp is None:
+            stage = CHAIN
+        else:
+            stage = RECORD
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "UPDATE registrations SET stage = ?, attempts = 0, next_attempt = ?, updated_at = ? "
+                "WHERE pending_id = ? AND stage = ?",
+                (stage, now, now, pending_id, FAILED),
+            )
+        self.wake.set()
+        return stage
+
+    def _stage(self, pending_id: str) -> str:
+        row = self._db.execute("SELECT stage FROM registrations WHERE pending_id = ?", (pending_id,)).fetchone()
+        return row[0] if row else FAILED
+
+    def counts(self) -> dict[str, int]:
+        """Registrations per stage."""
+        with self._lock:
+            rows = self._db.execute("SELECT stage, COUNT(*) FROM registrations GROUP BY stage").fetchall()
+        return {stage: 0 for stage in (*STAGES, DONE, FAILED)} | dict(rows)
+
+
+Handler = Callable[[Registration], dict]
+
+
+class Dispatcher:
+    """
+    Drives registrations through their stages: a bounded pool per stage,
+    fed by leasing due rows from the outbox whenever a slot is free.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        handlers: dict[str, Handler],
+        concurrency: dict[str, int] | None = None,
+        backoff: Backoff = Backoff(),
+        lease: float = DEFAULT_LEASE,
+    ):
+        self.outbox = outbox
+        self.handlers = handlers
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.backoff = backoff
+        self.lease = lease
+        self.stats: Counter = Counter()
+        self._pools = {
+            stage: ThreadPoolExecutor(self.concurrency[stage], thread_name_prefix=f"outbox-{stage}")
+            for stage in STAGES
+        }
+        self._in_flight: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        for pool in self._pools.values():
+            pool.shutdown()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return sum(self._in_flight.values())
+
+    def poll(self) -> int:
+        """Start every due registration there is a free slot for; returns how many started."""
+        started = 0
+        for stage in STAGES:
+            with self._lock:
+                free = self.concurrency[stage] - self._in_flight[stage]
+            for registration in self.outbox.claim(stage, free, self.lease):
+                with self._lock:
+                    self._in_flight[stage] += 1
+                self._pools[stage].submit(self._run, stage, registration)
+                started += 1
+        return started
+
+    def _run(self, stage: str, registration: Registration) -> None:
+        try:
+            fields = self.handlers[stage](registration)
+        except PermanentError as e:
+            self.outbox.fail(registration.pending_id, stage, str(e))
+            self.stats[FAILED] += 1
+        except Exception as e:
+            outcome = self.outbox.retry(registration.pending_id, stage, f"{type(e).__name__}: {e}", self.backoff)
+            self.stats["retries" if outcome != FAILED else FAILED] += 1
+        else:
+            self.outbox.advance(registration.pending_id, stage, fields)
+            self.stats[stage] += 1
+        finally:
+            with self._lock:
+                self._in_flight[stage] -= 1
+            self.outbox.wake.set()
+
+    def run(self, stop: threading.Event, poll_interval: float = 1.0) -> None:
+        """Poll until `stop` is set, waking early whenever work may have arrived."""
+        while not stop.is_set():
+            self.outbox.wake.clear()
+            self.poll()
+            self.outbox.wake.wait(poll_interval)
+
+
+def pinata_headers() -> dict[str, str]:
+    """Pinata credentials from the backend's environment: JWT, else API key and secret."""
+    if os.environ.get("PINATA_JWT"):
+        return {"Authorization": f"Bearer {os.environ['PINATA_JWT']}"}
+    return {
+        "pinata_api_key": os.environ.get("PINATA_API_KEY", ""),
+        "pinata_secret_api_key": os.environ.get("PINATA_SECRET_API_KEY", ""),
+    }
+
+
+class PinStage:
+    """Pins the pitch deck (if any), then the idea's metadata JSON, as the backend does."""
+
+    def __init__(self, outbox: Outbox, api_url: str, headers: dict[str, str] | None = None):
+        self.outbox = outbox
+        self.api_url = api_url
+        self.headers = headers or {}
+
+    def __call__(self, registration: Registration) -> dict:
+        pitch_deck_cid = registration.pitch_deck_cid or ""
+        document = self.outbox.document_path(registration.pending_id)
+        if registration.document_name and not pitch_deck_cid:
+            if not document.exists():
+                raise PermanentError("Pitch deck missing from the spool")
+            expected = hash_file(document).cid
+            pinned = pin_file(self.api_url, document, self.headers)["IpfsHash"]
+            if pinned != expected:
+                raise CidMismatch(f"Pitch deck pinned as {pinned}, expected {expected}")
+            pitch_deck_cid = pinned
+            self.outbox.note(registration.pending_id, pitch_deck_cid=pitch_deck_cid)
+
+        idea_hash = registration.idea_hash.hex()
+        metadata = {**registration.payload.get("metadata", {}), "ideaHash": idea_hash, "pitchDeckCid": pitch_deck_cid}
+        pinned = pin_json(self.api_url, metadata, f"idea-{idea_hash[:8]}.json", self.headers)
+        return {"ipfs_cid": pinned["IpfsHash"], "pitch_deck_cid": pitch_deck_cid}
+
+
+class ChainStage:
+    """
+    register_idea from the service account. The transaction ID is noted
+    before sending, and a hash whose box already exists (a previous attempt
+    that confirmed after timing out) is adopted instead of re-registered.
+    A noted transaction is looked up before anything is rebuilt: while it
+    can still confirm no second one is sent, so the row keeps the ID of the
+    transaction that actually registered the idea.
+    """
+
+    def __init__(self, outbox: Outbox, algod_client: AlgodClient, app_id: int, private_key: str):
+        self.outbox = outbox
+        self.algod = algod_client
+        self.app_id = app_id
+        self.sender = account.address_from_private_key(private_key)
+        self.signer = AccountTransactionSigner(private_key)
+        self.method = registry_method("register_idea")
+
+    def _confirmed(self, txn_id: str) -> bool:
+        """
+        Whether a previous attempt's transaction confirmed. Waits (up to
+        PENDING_WAIT, then raises to retry later) while it is still in the pool.
+        """
+        try:
+            info = self.algod.pending_transaction_info(txn_id)
+        except AlgodHTTPError as e:
+            if e.code == 404:
+                return False  # never reached the pool, or expired
+            raise
+        if info.get("confirmed-round"):
+            return True
+        if info.get("pool-error"):
+            return False
+        try:
+            watcher_for(self.algod).wait(txn_id, info["txn"]["txn"]["lv"], timeout=PENDING_WAIT)
+        except (ConfirmationTimeout, TransactionRejected):
+            return False
+        return True
+
+    def __call__(self, registration: Registration) -> dict:
+        idea_hash = registration.idea_hash
+        confirmed_txn_id = registration.txn_id if registration.txn_id and self._confirmed(registration.txn_id) else None
+        existing = get_ideas(self.algod, self.app_id, [idea_hash], self.sender)[idea_hash]
+        if existing is not None:
+            if existing.founder != self.sender or existing.ipfs_cid != registration.ipfs_cid:
+                raise PermanentError(
+                    f"Hash already registered by {existing.founder} with CID {existing.ipfs_cid}"
+                )
+            # A noted ID that did not confirm must not stay on the row
+            return {"txn_id": confirmed_txn_id, "block_timestamp": existing.timestamp}
+
+        next_ordinal = read_global_state(self.algod, self.app_id).get("next_ordinal", 0)
+        founder_total, _ = read_founder_stats(self.algod, self.app_id, self.sender)
+        names = (
+            [idea_hash]
+            + register_page_names(next_ordinal)
+            + register_founder_names(encoding.decode_address(self.sender), founder_total)
+        )
+        atc = AtomicTransactionComposer()
+        atc.add_method_call(
+            app_id=self.app_id,
+            method=self.method,
+            sender=self.sender,
+            sp=suggested_params(self.algod),
+            signer=self.signer,
+            method_args=[
+                idea_hash,
+                cid_to_digest(registration.ipfs_cid),
+                truncate_title(registration.payload.get("title", "")).decode("utf-8"),
+            ],
+            boxes=[(self.app_id, name) for name in names],
+        )
+        txn_id = atc.build_group()[0].txn.get_txid()
+        self.outbox.note(registration.pending_id, txn_id=txn_id)
+        result = traced_execute(atc, self.algod, 4, "register_idea")
+        return {"txn_id": txn_id, "block_timestamp": result.abi_results[0].return_value}
+
+
+UPSERT_IDEA = """
+INSERT INTO "Idea" (
+    "id", "title", "description", "category", "stage", "location", "fundingGoal", "teamSize",
+    "visibility", "pitchDeckUrl", "ideaHash", "txnId", "appId", "blockTimestamp", "ipfsCid",
+    "isVerified", "founderId", "updatedAt"
+)
+VALUES (%s, %s, %s, %s, %s::"IdeaStage", %s, %s, %s, %s::"IdeaVisibility", %s, %s, %s, %s, %s, %s, true, %s, CURRENT_TIMESTAMP)
+ON CONFLICT ("ideaHash") DO UPDATE SET
+    "txnId" = COALESCE(EXCLUDED."txnId", "Idea"."txnId"),
+    "blockTimestamp" = EXCLUDED."blockTimestamp",
+    "ipfsCid" = EXCLUDED."ipfsCid",
+    "isVerified" = true,
+    "updatedAt" = CURRENT_TIMESTAMP
+RETURNING "id"
+"""
+
+
+class RecordStage:
+    """Upserts the backend's Idea row on ideaHash; one connection per worker thread."""
+
+    def __init__(self, connect: Callable[[], object], app_id: int):
+        self.connect = connect
+        self.app_id = app_id
+        self._local = threading.local()
+
+    def _connection(self):
+        if getattr(self._local, "connection", None) is None:
+            self._local.connection = self.connect()
+        return self._local.connection
+
+    def __call__(self, registration: Registration) -> dict:
+        idea = registration.payload
+        connection = self._connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(UPSERT_IDEA, (
+                registration.pending_id,
+                idea["title"],
+                idea["description"],
+                idea["category"],
+                idea["stage"],
+                idea.get("location"),
+                idea.get("fundingGoal"),
+                idea.get("teamSize"),
+                idea.get("visibility") or "PUBLIC",
+                registration.pitch_deck_cid or "",
+                registration.idea_hash.hex(),
+                registration.txn_id,
+                str(self.app_id),
+                registration.block_timestamp,
+                registration.ipfs_cid,
+                idea["founderId"],
+            ))
+            (idea_id,) = cursor.fetchone()
+            connection.commit()
+        except Exception:
+            # Reconnect next time; the connection may be what failed
+            self._local.connection = None
+            raise
+        return {"idea_id": idea_id}
+
+
+def make_handler(outbox: Outbox) -> type[BaseHTTPRequestHandler]:
+    """HTTP handler serving POST /registrations, GET /registrations/<id> and /stats."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if self.path.rstrip("/") != "/registrations":
+                self._send(404, {"error": "Not found"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))))
+                idea_hash = bytes.fromhex(body["ideaHash"])
+                document = base64.b64decode(body["document"]) if body.get("document") else None
+                payload = {k: v for k, v in body.items() if k not in ("ideaHash", "document", "documentName")}
+                registration, created = outbox.enqueue(idea_hash, payload, document, body.get("documentName"))
+            except (KeyError, ValueError) as e:
+                self._send(400, {"error": str(e) or "Invalid request"})
+                return
+            self._send(202 if created else 200, registration.as_dict())
+
+        def do_GET(self) -> None:
+            parts = self.path.strip("/").split("/")
+            if parts == ["stats"]:
+                self._send(200, outbox.counts())
+            elif len(parts) == 2 and parts[0] == "registrations":
+                registration = outbox.get(parts[1])
+                if registration is None:
+                    self._send(404, {"error": "Unknown pending ID"})
+                else:
+                    self._send(200, registration.as_dict())
+            else:
+                self._send(404, {"error": "Not found"})
+
+        def _send(self, status: int, body: dict) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the registration outbox and run its workers")
+    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    parser.add_argument("--app-id", type=int, default=0, help="IdeaRegistry app ID (default: ALGORAND_APP_ID)")
+    parser.add_argument("--db", type=str, default="outbox.sqlite", help="Outbox database file")
+    parser.add_argument("--port", type=int, default=8083, help="HTTP port")
+    parser.add_argument("--pin-workers", type=int, default=DEFAULT_CONCURRENCY[PIN], help="Concurrent IPFS pins")
+    parser.add_argument("--chain-workers", type=int, default=DEFAULT_CONCURRENCY[CHAIN], help="Concurrent register_idea calls")
+    parser.add_argument("--record-workers", type=int, default=DEFAULT_CONCURRENCY[RECORD], help="Concurrent database writes")
+    parser.add_argument("--max-attempts", type=int, default=Backoff.max_attempts, help="Attempts per stage before failing")
+    parser.add_argument("--requeue", nargs="+", metavar="PENDING_ID", help="Retry failed registrations and exit")
+    args = parser.parse_args()
+
+    outbox = Outbox(args.db)
+    if args.requeue:
+        for pending_id in args.requeue:
+            print(f"{pending_id}: {outbox.requeue(pending_id) or 'not failed'}")
+        raise SystemExit(0)
+
+    from deploy import load_env_file
+    from reconcile import libpq_url
+
+    backend_env_path = Path(__file__).parent.parent / "backend" / ".env"
+    for key, value in load_env_file(backend_env_path).items():
+        os.environ.setdefault(key, value)
+
+    app_id = args.app_id or int(os.environ.get("ALGORAND_APP_ID", "0"))
+    mnemonic = os.getenv("ALGORAND_DEPLOYER_MNEMONIC") or os.getenv("DEPLOYER_MNEMONIC")
+    database_url = os.environ.get("DATABASE_URL")
+    if not app_id or not mnemonic or not database_url:
+        raise SystemExit("ALGORAND_APP_ID, ALGORAND_DEPLOYER_MNEMONIC and DATABASE_URL must be set")
+
+    try:
+        import psycopg
+    except ImportError:
+        raise SystemExit("The outbox needs psycopg: pip install 'psycopg[binary]'")
+
+    from algosdk import mnemonic as algo_mnemonic
+
+    from algokit_utils import AlgorandClient
+    if args.network == "localnet":
+        algorand = AlgorandClient.default_localnet()
+    elif args.network == "testnet":
+        algorand = AlgorandClient.testnet()
+    else:
+        algorand = AlgorandClient.mainnet()
+    algod_client = algorand.client.algod
+
+    dispatcher = Dispatcher(
+        outbox,
+        {
+            PIN: PinStage(outbox, os.environ.get("PINATA_API_URL", "https://api.pinata.cloud"), pinata_headers()),
+            CHAIN: ChainStage(outbox, algod_client, app_id, algo_mnemonic.to_private_key(mnemonic)),
+            RECORD: RecordStage(lambda: psycopg.connect(libpq_url(database_url)), app_id),
+        },
+        concurrency={PIN: args.pin_workers, CHAIN: args.chain_workers, RECORD: args.record_workers},
+        backoff=Backoff(max_attempts=args.max_attempts),
+    )
+    stop = threading.Event()
+    workers = threading.Thread(target=dispatcher.run, args=(stop,), name="outbox-dispatcher", daemon=True)
+    workers.start()
+
+    server = ThreadingHTTPServer(("", args.port), make_handler(outbox))
+    print(f"Outbox {args.db} for app {app_id} on :{args.port} — pending: {outbox.counts()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        stop.set()
+        outbox.wake.set()
+        workers.join()
+        dispatcher.close()
+        print(f"\n{dict(dispatcher.stats)}")
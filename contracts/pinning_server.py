@@ -0,0 +1,252 @@
+"""
+Local Pinata stand-in.
+Serves the two Pinata endpoints the backend uses, pinJSONToIPFS and
+pinFileToIPFS, plus testAuthentication and an /ipfs/<cid> gateway, entirely
+offline. CIDs are real UnixFS CIDv0s (see unixfs.py), so tests, benchmarks
+and deploy dry-runs see the same "Qm..." strings Pinata would return.
+
+Pinned content is stored once per CID in a content-addressed directory,
+sharded by the next-to-last two characters of the CID (like go-ipfs's
+flatfs), written atomically and served from mmap. Point the backend at it
+with PINATA_API_URL and PINATA_GATEWAY.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from unixfs import file_root
+
+DEFAULT_PORT = 8082
+DEFAULT_ROOT = Path(__file__).parent / ".pinning"
+
+
+def pinata_json(content) -> bytes:
+    """Serialize pinataContent the way JSON.stringify does before Pinata adds it."""
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def parse_multipart(content_type: str, body: bytes) -> dict[str, tuple[str | None, bytes]]:
+    """Form fields of a multipart/form-data body as {name: (filename, value)}."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    if not message.is_multipart():
+        raise ValueError("Expected multipart/form-data")
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[name] = (part.get_filename(), part.get_payload(decode=True) or b"")
+    return fields
+
+
+class ContentStore:
+    """Content-addressed blob directory: <root>/blobs/<shard>/<cid>."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blobs = self.root / "blobs"
+        self.blobs.mkdir(parents=True, exist_ok=True)
+
+    def path(self, cid: str) -> Path:
+        return self.blobs / cid[-3:-1] / cid
+
+    def has(self, cid: str) -> bool:
+        return self.path(cid).exists()
+
+    def put(self, cid: str, data: bytes) -> bool:
+        """Store `data` under `cid`; False if it was already present."""
+        path = self.path(cid)
+        if path.exists():
+            return False
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return True
+
+    def open(self, cid: str) -> mmap.mmap | bytes | None:
+        """Read-only mmap of a blob (b"" when empty), or None if unknown."""
+        try:
+            with open(self.path(cid), "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b""
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+
+class PinningService:
+    """Pins content into a ContentStore and keeps an append-only pin log."""
+
+    def __init__(self, store: ContentStore, latency: float = 0.0):
+        self.store = store
+        self.latency = latency
+        self.pins = 0
+        self._lock = threading.Lock()
+        self._log = open(store.root / "pins.jsonl", "a", encoding="utf-8")
+
+    def pin(self, data: bytes, name: str | None = None) -> dict:
+        """Pin `data`; returns Pinata's response body."""
+        if self.latency:
+            time.sleep(self.latency * random.uniform(0.5, 1.5))
+        root = file_root(data)
+        cid = root.cid
+        stored = self.store.put(cid, data)
+        timestamp = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self.pins += 1
+            self._log.write(json.dumps({"cid": cid, "name": name, "size": len(data), "timestamp": timestamp}) + "\n")
+            self._log.flush()
+        return {
+            "IpfsHash": cid,
+            "PinSize": root.cumulative_size,
+            "Timestamp": timestamp,
+            "isDuplicate": not stored,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._log.close()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 turns bursts into 1 s SYN retries
+    request_queue_size = 1024
+
+
+def make_handler(service: PinningService) -> type[BaseHTTPRequestHandler]:
+    """HTTP handler for the Pinata API subset and the /ipfs/<cid> gateway."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+            try:
+                if self.path == "/pinning/pinJSONToIPFS":
+                    request = json.loads(body)
+                    if "pinataContent" not in request:
+                        raise ValueError("pinataContent is required")
+                    name = (request.get("pinataMetadata") or {}).get("name")
+                    self._send_json(200, service.pin(pinata_json(request["pinataContent"]), name))
+                elif self.path == "/pinning/pinFileToIPFS":
+                    fields = parse_multipart(self.headers.get("Content-Type", ""), body)
+                    if "file" not in fields:
+                        raise ValueError("file is required")
+                    filename, data = fields["file"]
+                    metadata = json.loads(fields.get("pinataMetadata", (None, b"{}"))[1] or b"{}")
+                    self._send_json(200, service.pin(data, metadata.get("name") or filename))
+                else:
+                    self._send_json(404, {"error": "Not found"})
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+
+        def do_GET(self) -> None:
+            self._get(send_body=True)
+
+        def do_HEAD(self) -> None:
+            self._get(send_body=False)
+
+        def _get(self, send_body: bool) -> None:
+            if self.path == "/data/testAuthentication":
+                self._send_json(200, {"message": "Congratulations! You are communicating with the Pinata API!"})
+                return
+            parts = self.path.split("?", 1)[0].strip("/").split("/")
+            if len(parts) != 2 or parts[0] != "ipfs":
+                self._send_json(404, {"error": "Not found"})
+                return
+            content = service.store.open(parts[1])
+            if content is None:
+                self._send_json(404, {"error": "Content not pinned"})
+                return
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(content)))
+                self.send_header("Cache-Control", "public, max-age=29030400, immutable")
+                self.send_header("Etag", f'"{parts[1]}"')
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(content)
+            finally:
+                if isinstance(content, mmap.mmap):
+                    content.close()
+
+        def _send_json(self, status: int, body: dict) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+class PinningServer:
+    """PinningService behind an HTTP server on a background thread."""
+
+    def __init__(self, root: Path, port: int = 0, latency: float = 0.0, host: str = "127.0.0.1"):
+        self.service = PinningService(ContentStore(root), latency)
+        self._server = _Server((host, port), make_handler(self.service))
+        self._thread = threading.Thread(target=self._server.serve_forever, name="pinning-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "PinningServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self.service.close()
+
+    def serve_forever(self) -> None:
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self.service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local Pinata-compatible pinning service and gateway")
+    parser.add_argument("--root", type=str, default=str(DEFAULT_ROOT), help="Content store directory")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="HTTP port")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated pin delay in seconds")
+    args = parser.parse_args()
+
+    server = PinningServer(Path(args.root), args.port, args.latency, args.host)
+    print(f"Pinning API and gateway on {server.url} (store: {args.root})")
+    print(f"  PINATA_API_URL={server.url}")
+    print(f"  PINATA_GATEWAY={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{server.service.pins} pins")
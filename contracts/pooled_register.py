@@ -0,0 +1,348 @@
+"""
+Fee-pooled grouped registration.
+Packs register_ideas_batch calls into atomic groups whose first transaction
+pays the fees of the whole group, so every other call is sent with a zero
+fee. The payer can be a separate service account, in which case founders
+sign their own registrations (and are recorded as the founder) without
+holding any ALGO for fees.
+
+Box references are shared across a group (AVM v9 resource sharing), so the
+ordinal and founder index boxes are referenced once per group instead of
+once per call, and calls are no longer capped at three entries each. Group
+sizes come from box_planner.plan_registers, which splits the input into the
+fewest transactions that respect 8 references per transaction, 2 KB of app
+arguments per call, the pooled opcode budget and 16 transactions per group.
+
+Note the minimum fee is still charged per transaction: pooling moves who
+pays, and the savings come from fitting more ideas into fewer transactions
+and groups. Run with --plan-only to see them for an input file.
+"""
+
+import argparse
+import base64
+import copy
+import os
+import uuid
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from algosdk import account, mnemonic as algo_mnemonic
+from algosdk.atomic_transaction_composer import AccountTransactionSigner, AtomicTransactionComposer
+from algosdk.v2client.algod import AlgodClient
+
+from box_planner import (
+    DEFAULT_BUDGET,
+    MAX_TXN_REFERENCES,
+    MEASURED_BUDGET,
+    BudgetModel,
+    fit_budget,
+    plan_registers,
+    register_group_size,
+    split_by_args,
+)
+from bulk_register import (
+    DEFAULT_WINDOW,
+    VERIFY_CHUNK,
+    BulkEntry,
+    BulkRegistrar,
+    BulkReport,
+    IndexCursor,
+    InFlightGroup,
+    batch_calls,
+    group_capacity,
+    read_entries,
+)
+from deploy import load_env_file
+from idea_codec import (
+    HASHES_PER_PAGE,
+    ORDINALS_PER_PAGE,
+    founder_page_box_name,
+    founder_stats_box_name,
+    page_box_name,
+)
+from registry_spec import registry_method, suggested_params
+
+MIN_FEE = 1_000
+# Entries planned together: larger chunks only trim the one remainder group each has
+PLAN_CHUNK = VERIFY_CHUNK
+
+
+def index_box_names(cursor: IndexCursor, entries: Sequence[BulkEntry]) -> list[bytes]:
+    """Index boxes for appending `entries` at the cursor; advances it."""
+    ordinal, founder_total = cursor.next_ordinal, cursor.founder_total
+    count = cursor.advance(entries)
+
+    def pages(start: int, per_page: int) -> range:
+        return range(start // per_page, (start + count - 1) // per_page + 2)
+
+    names = [page_box_name(page) for page in pages(ordinal, HASHES_PER_PAGE)]
+    names.append(founder_stats_box_name(cursor.founder))
+    names += [founder_page_box_name(cursor.founder, page) for page in pages(founder_total, ORDINALS_PER_PAGE)]
+    return names
+
+
+def plan_pooled(
+    entries: Iterable[BulkEntry],
+    budget: BudgetModel = DEFAULT_BUDGET,
+    separate_payer: bool = False,
+) -> Iterator[list[BulkEntry]]:
+    """Split a stream of entries, in order, into groups with box_planner.plan_registers."""
+    entries = iter(entries)
+    while chunk := list(islice(entries, PLAN_CHUNK)):
+        yield from plan_registers(chunk, budget, separate_payer)
+
+
+@dataclass(frozen=True)
+class PooledCall:
+    """One transaction of a pooled group; payer calls (no entries) only add references and budget."""
+
+    entries: tuple[BulkEntry, ...]
+    boxes: tuple[bytes, ...]
+
+
+def layout_group(
+    entries: Sequence[BulkEntry],
+    index_names: Sequence[bytes],
+    budget: BudgetModel = DEFAULT_BUDGET,
+    separate_payer: bool = False,
+) -> list[PooledCall]:
+    """
+    Assign a group's entries and box references to its transactions.
+
+    Entries are split into the fewest calls their arguments need, then the
+    largest calls are halved until every transaction the group needs (for
+    references or budget) has work; references fill transactions 8 at a time.
+    """
+    size = register_group_size(entries, budget, separate_payer)
+    if size is None:
+        raise ValueError(f"{len(entries)} entries do not fit one group")
+    payer = 1 if separate_payer else 0
+
+    calls = split_by_args(entries)
+    while len(calls) < size - payer:
+        largest = max(range(len(calls)), key=lambda i: len(calls[i]))
+        if len(calls[largest]) < 2:
+            # Only budget is missing: pad with payer calls that register nothing
+            calls.append([])
+            continue
+        half = len(calls[largest]) // 2
+        calls[largest:largest + 1] = [calls[largest][:half], calls[largest][half:]]
+    if separate_payer:
+        calls.insert(0, [])
+
+    names = [e.idea_hash for e in entries] + list(index_names)
+    return [
+        PooledCall(tuple(call), tuple(names[i * MAX_TXN_REFERENCES:(i + 1) * MAX_TXN_REFERENCES]))
+        for i, call in enumerate(calls)
+    ]
+
+
+@dataclass(frozen=True)
+class FeeReport:
+    """Fees and confirmations of a pooled plan against the unpooled alternatives."""
+
+    ideas: int
+    groups: int
+    transactions: int
+    budget: BudgetModel = DEFAULT_BUDGET
+
+    @property
+    def pooled_fee(self) -> int:
+        return self.transactions * MIN_FEE
+
+    @property
+    def single_fee(self) -> int:
+        """One register_idea transaction per idea, as the backend sends them."""
+        return self.ideas * MIN_FEE
+
+    @property
+    def batched_fee(self) -> int:
+        """Up to three ideas per call and one fee each, as bulk_register sends them."""
+        full, rest = divmod(self.ideas, group_capacity(self.budget))
+        calls = full * batch_calls(group_capacity(self.budget), self.budget) + batch_calls(rest, self.budget)
+        return calls * MIN_FEE
+
+    @property
+    def batched_groups(self) -> int:
+        return -(-self.ideas // group_capacity(self.budget))
+
+    def savings(self, baseline: int) -> float:
+        return 1 - self.pooled_fee / baseline if baseline else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "ideas": self.ideas,
+            "groups": self.groups,
+            "transactions": self.transactions,
+            "pooledFeeMicroAlgo": self.pooled_fee,
+            "singleFeeMicroAlgo": self.single_fee,
+            "batchedFeeMicroAlgo": self.batched_fee,
+            "savingsVsSingle": round(self.savings(self.single_fee), 4),
+            "savingsVsBatched": round(self.savings(self.batched_fee), 4),
+        }
+
+    def format(self) -> str:
+        if not self.ideas:
+            return "Nothing to register"
+        return (
+            f"{self.ideas} ideas in {self.groups} groups / {self.transactions} transactions: "
+            f"{self.pooled_fee / 1e6:.3f} ALGO in fees ({self.pooled_fee / self.ideas:.0f} µALGO/idea)\n"
+            f"  vs one call per idea: {self.single_fee / 1e6:.3f} ALGO, {self.ideas} confirmations "
+            f"({self.savings(self.single_fee):.0%} saved)\n"
+            f"  vs bulk_register: {self.batched_fee / 1e6:.3f} ALGO, {self.batched_groups} groups "
+            f"({self.savings(self.batched_fee):.0%} saved)"
+        )
+
+
+def fee_report(entries: Iterable[BulkEntry], budget: BudgetModel = DEFAULT_BUDGET, separate_payer: bool = False) -> FeeReport:
+    """Plan `entries` without submitting anything and price the result."""
+    ideas = groups = transactions = 0
+    for group in plan_pooled(entries, budget, separate_payer):
+        ideas += len(group)
+        groups += 1
+        transactions += register_group_size(group, budget, separate_payer)
+    return FeeReport(ideas, groups, transactions, budget)
+
+
+def calibrate_budget(algod_client: AlgodClient, app_id: int, sender: str) -> BudgetModel:
+    """Measure register_ideas_batch's opcode cost with simulate (1 to 3 fresh 64-byte-title entries)."""
+    from benchmark import Bench
+
+    bench = Bench(algod_client, app_id, sender)
+    nonce = uuid.uuid4().hex
+    consumed = {}
+    for n in (1, 2, 3):
+        entries = [bench.entry(f"calibrate-{nonce}-{n}-{i}", 64) for i in range(n)]
+        consumed[n] = bench.simulate("register_ideas_batch", [entries]).budget
+    return fit_budget(consumed)
+
+
+class PooledRegistrar(BulkRegistrar):
+    """BulkRegistrar sending fee-pooled groups sized by plan_pooled."""
+
+    def __init__(
+        self,
+        algod_client: AlgodClient,
+        app_id: int,
+        private_key: str,
+        payer_private_key: str | None = None,
+        budget: BudgetModel = DEFAULT_BUDGET,
+        window: int = DEFAULT_WINDOW,
+    ):
+        super().__init__(algod_client, app_id, private_key, window, budget)
+        self.payer = account.address_from_private_key(payer_private_key) if payer_private_key else self.sender
+        self.payer_signer = AccountTransactionSigner(payer_private_key) if payer_private_key else self.signer
+        self.separate_payer = self.payer != self.sender
+        self.payer_method = registry_method("get_total_ideas")
+        self.transactions = 0
+
+    def plan(self, entries: Iterable[BulkEntry]) -> Iterator[list[BulkEntry]]:
+        return plan_pooled(entries, self.budget, self.separate_payer)
+
+    def build_group(self, entries: list[BulkEntry], cursor: IndexCursor) -> AtomicTransactionComposer:
+        """One fee-pooled group; the first transaction pays min_fee for every member."""
+        calls = layout_group(entries, index_box_names(cursor, entries), self.budget, self.separate_payer)
+        params = suggested_params(self.algod)
+        params.flat_fee = True
+        min_fee = max(params.min_fee or MIN_FEE, MIN_FEE)
+
+        atc = AtomicTransactionComposer()
+        for i, call in enumerate(calls):
+            sp = copy.copy(params)
+            sp.fee = min_fee * len(calls) if i == 0 else 0
+            boxes = [(self.app_id, name) for name in call.boxes]
+            if call.entries:
+                atc.add_method_call(
+                    app_id=self.app_id,
+                    method=self.method,
+                    sender=self.sender,
+                    sp=sp,
+                    signer=self.signer,
+                    method_args=[[(e.idea_hash, e.cid_digest, e.title) for e in call.entries]],
+                    boxes=boxes,
+                )
+            else:
+                atc.add_method_call(
+                    app_id=self.app_id,
+                    method=self.payer_method,
+                    sender=self.payer,
+                    sp=sp,
+                    signer=self.payer_signer,
+                    boxes=boxes,
+                )
+        self.transactions += len(calls)
+        return atc
+
+    def _record_confirmed(self, group: InFlightGroup, infos: list[dict], report: BulkReport) -> int:
+        # Payer calls return get_total_ideas, not (timestamps, duplicates)
+        selector = base64.b64encode(self.method.get_selector()).decode()
+        calls = [info for info in infos if info["txn"]["txn"].get("apaa", [None])[0] == selector]
+        return super()._record_confirmed(group, calls, report)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Register ideas in fee-pooled atomic groups")
+    parser.add_argument("input", type=str, help="JSONL (ideaHash, ipfsCid, title) or CSV (idea_hash, ipfs_cid, title)")
+    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    parser.add_argument("--app-id", type=int, default=0, help="IdeaRegistry app ID (default: ALGORAND_APP_ID)")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Groups kept in flight")
+    parser.add_argument("--retries", type=int, default=1, help="Resubmission passes for failed groups")
+    parser.add_argument("--plan-only", action="store_true", help="Print the packing and fee savings without submitting")
+    parser.add_argument(
+        "--calibrate",
+        action="store_true",
+        help="Measure the opcode cost per idea with simulate first (automatic when the baseline has none)",
+    )
+    args = parser.parse_args()
+
+    backend_env_path = Path(__file__).parent.parent / "backend" / ".env"
+    for key, value in load_env_file(backend_env_path).items():
+        os.environ.setdefault(key, value)
+
+    entries = list(read_entries(args.input))
+    mnemonic = os.getenv("ALGORAND_DEPLOYER_MNEMONIC") or os.getenv("DEPLOYER_MNEMONIC")
+    payer_mnemonic = os.getenv("ALGORAND_FEE_PAYER_MNEMONIC")
+    private_key = algo_mnemonic.to_private_key(mnemonic) if mnemonic else None
+    payer_key = algo_mnemonic.to_private_key(payer_mnemonic) if payer_mnemonic else None
+    separate_payer = bool(payer_key) and (
+        private_key is None
+        or account.address_from_private_key(payer_key) != account.address_from_private_key(private_key)
+    )
+    if args.plan_only and not args.calibrate:
+        if MEASURED_BUDGET is None:
+            print("No simulated budget in benchmarks/baseline.json; planning with the assumed 3 ideas per call")
+        print(fee_report(entries, DEFAULT_BUDGET, separate_payer).format())
+        raise SystemExit(0)
+
+    app_id = args.app_id or int(os.environ.get("ALGORAND_APP_ID", "0"))
+    if not app_id or not private_key:
+        raise SystemExit("ALGORAND_APP_ID and ALGORAND_DEPLOYER_MNEMONIC must be set")
+
+    from algokit_utils import AlgorandClient
+    if args.network == "localnet":
+        algorand = AlgorandClient.default_localnet()
+    elif args.network == "testnet":
+        algorand = AlgorandClient.testnet()
+    else:
+        algorand = AlgorandClient.mainnet()
+    algod_client = algorand.client.algod
+
+    budget = DEFAULT_BUDGET
+    if args.calibrate or MEASURED_BUDGET is None:
+        budget = calibrate_budget(algod_client, app_id, account.address_from_private_key(private_key))
+        print(f"Measured {budget.per_call} + {budget.per_idea}/idea opcode budget per call")
+    print(fee_report(entries, budget, separate_payer).format())
+    if args.plan_only:
+        raise SystemExit(0)
+
+    registrar = PooledRegistrar(algod_client, app_id, private_key, payer_key, budget, window=args.window)
+    report = registrar.run(entries, retries=args.retries)
+
+    print(
+        f"Read {report.read}, skipped {report.skipped} already registered, "
+        f"registered {report.registered} ({report.duplicates} raced duplicates) "
+        f"in {report.elapsed:.1f}s — {report.rate:.1f} ideas/s, {registrar.transactions} transactions"
+    )
+    if report.failed:
+        print(f"{len(report.failed)} ideas failed; re-run the same command to resume")
@@ -0,0 +1,337 @@
+"""
+IdeaRegistry database reconciliation.
+Streams the backend's Idea rows in keyset-paginated pages (ideaHash order,
+so every page is an index range scan however deep the job gets) and checks
+each against its box through get_ideas simulate groups of up to 128 hashes,
+fetched by a bounded worker pool. Founder, block timestamp and CID are
+diffed; mismatches are written as JSON lines and, with repair enabled, each
+row's isVerified flag is set to whether the chain backs it.
+
+Memory stays flat: at most one page of rows plus `window` simulate groups
+are held at a time, so a million rows cost the same as a thousand.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from box_enumerator import HASHES_PER_SIMULATE, bounded_map
+
+if TYPE_CHECKING:
+    from registry_client import OnChainIdea
+
+DEFAULT_PAGE_SIZE = 5_000
+DEFAULT_WORKERS = 16
+
+MISSING = "missing"
+FOUNDER = "founder"
+TIMESTAMP = "timestamp"
+CID = "cid"
+INVALID_HASH = "invalid_hash"
+VERIFIED_FLAG = "verified_flag"
+
+Fetch = Callable[[list[bytes]], dict[bytes, Optional["OnChainIdea"]]]
+
+SELECT_PAGE = """
+SELECT i."id", i."ideaHash", u."walletAddress", i."blockTimestamp", i."ipfsCid", i."isVerified"
+FROM "Idea" i JOIN "User" u ON u."id" = i."founderId"
+WHERE i."ideaHash" > {p}
+ORDER BY i."ideaHash"
+LIMIT {p}
+"""
+
+UPDATE_VERIFIED = 'UPDATE "Idea" SET "isVerified" = {p}, "updatedAt" = CURRENT_TIMESTAMP WHERE "id" = {p}'
+
+# Prisma connection-string options libpq does not understand
+PRISMA_URL_OPTIONS = {"schema", "pgbouncer", "connection_limit", "pool_timeout", "socket_timeout"}
+
+
+@dataclass(frozen=True)
+class IdeaRow:
+    """The blockchain fields of one Idea row, with its founder's wallet."""
+
+    id: str
+    idea_hash: str
+    founder_wallet: str | None
+    block_timestamp: int | None
+    ipfs_cid: str | None
+    is_verified: bool
+
+
+class IdeaTable:
+    """
+    Keyset-paginated access to the Prisma Idea table over any DB-API
+    connection: psycopg in production ("%s" placeholders), sqlite3 in tests
+    ("?").
+    """
+
+    def __init__(self, connection, placeholder: str = "%s"):
+        self.connection = connection
+        self._select = SELECT_PAGE.format(p=placeholder)
+        self._update = UPDATE_VERIFIED.format(p=placeholder)
+
+    def pages(self, page_size: int = DEFAULT_PAGE_SIZE, after: str = "") -> Iterator[list[IdeaRow]]:
+        """Yield rows in ideaHash order, `page_size` at a time, starting after the given hash."""
+        while True:
+            cursor = self.connection.cursor()
+            cursor.execute(self._select, (after, page_size))
+            rows = [
+                IdeaRow(id, idea_hash, wallet, timestamp, cid, bool(verified))
+                for id, idea_hash, wallet, timestamp, cid, verified in cursor.fetchall()
+            ]
+            cursor.close()
+            # Don't hold a read transaction open across the whole job
+            self.connection.commit()
+            if not rows:
+                return
+            yield rows
+            after = rows[-1].idea_hash
+
+    def set_verified(self, updates: list[tuple[str, bool]]) -> None:
+        """Set isVerified for (row id, value) pairs in one transaction."""
+        cursor = self.connection.cursor()
+        cursor.executemany(self._update, [(verified, id) for id, verified in updates])
+        cursor.close()
+        self.connection.commit()
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    """One disagreement between a row and the chain."""
+
+    idea_id: str
+    idea_hash: str
+    kind: str
+    database: object
+    chain: object
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.idea_id,
+            "ideaHash": self.idea_hash,
+            "kind": self.kind,
+            "database": self.database,
+            "chain": self.chain,
+        }
+
+
+def parse_hash(idea_hash: str) -> bytes | None:
+    """The 32-byte hash a row stores as hex, or None if it is malformed."""
+    try:
+        raw = bytes.fromhex(idea_hash)
+    except ValueError:
+        return None
+    return raw if len(raw) == 32 else None
+
+
+def diff_row(row: IdeaRow, idea: Optional["OnChainIdea"], founders: frozenset[str] = frozenset()) -> list[Mismatch]:
+    """
+    Field mismatches between a row and its on-chain record.
+
+    Args:
+        row: Database row
+        idea: Its get_ideas record, or None if the hash has no box
+        founders: Addresses that register on behalf of users (the backend's
+            service account); the founder's own wallet is always accepted
+
+    Returns:
+        Mismatches, empty if the chain backs the row
+    """
+    if idea is None:
+        return [Mismatch(row.id, row.idea_hash, MISSING, row.idea_hash, None)]
+
+    mismatches = []
+    expected = founders | ({row.founder_wallet} if row.founder_wallet else set())
+    if expected and idea.founder not in expected:
+        mismatches.append(Mismatch(row.id, row.idea_hash, FOUNDER, sorted(expected), idea.founder))
+    if row.block_timestamp != idea.timestamp:
+        mismatches.append(Mismatch(row.id, row.idea_hash, TIMESTAMP, row.block_timestamp, idea.timestamp))
+    if row.ipfs_cid != idea.ipfs_cid:
+        mismatches.append(Mismatch(row.id, row.idea_hash, CID, row.ipfs_cid, idea.ipfs_cid))
+    return mismatches
+
+
+@dataclass
+class ReconcileReport:
+    """Counts for one reconciliation run."""
+
+    rows: int = 0
+    matched: int = 0
+    mismatches: Counter = field(default_factory=Counter)
+    repaired: int = 0
+    last_hash: str = ""
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "matched": self.matched,
+            "mismatches": dict(sorted(self.mismatches.items())),
+            "repaired": self.repaired,
+            "lastHash": self.last_hash,
+            "elapsedSeconds": round(self.elapsed, 3),
+            "rowsPerSecond": round(self.rows_per_second, 1),
+        }
+
+    def format(self) -> str:
+        kinds = ", ".join(f"{kind} {count}" for kind, count in sorted(self.mismatches.items())) or "none"
+        return (
+            f"Checked {self.rows} rows in {self.elapsed:.1f}s ({self.rows_per_second:.0f} rows/s): "
+            f"{self.matched} matched; mismatches: {kinds}; repaired {self.repaired}"
+        )
+
+
+def reconcile(
+    table: IdeaTable,
+    fetch: Fetch,
+    executor: ThreadPoolExecutor,
+    window: int,
+    founders: frozenset[str] = frozenset(),
+    page_size: int = DEFAULT_PAGE_SIZE,
+    after: str = "",
+    repair: bool = False,
+    on_mismatch: Callable[[Mismatch], None] | None = None,
+) -> ReconcileReport:
+    """
+    Check every row after `after` against the chain.
+
+    Args:
+        table: Idea rows to stream (and repair)
+        fetch: Looks up a chunk of hashes, like registry_client.get_ideas
+        executor: Pool running the fetches
+        window: Most fetches in flight (bounds memory as well as load)
+        founders: Service addresses accepted as founder, see diff_row
+        page_size: Rows per keyset page
+        after: Resume after this ideaHash
+        repair: Set each row's isVerified to whether the chain backs it
+        on_mismatch: Called with every mismatch, in ideaHash order
+
+    Returns:
+        Counts, including the last hash checked to resume from
+    """
+    report = ReconcileReport(last_hash=after)
+    started = time.perf_counter()
+
+    def chunks() -> Iterator[list[IdeaRow]]:
+        for page in table.pages(page_size, after):
+            for start in range(0, len(page), HASHES_PER_SIMULATE):
+                yield page[start:start + HASHES_PER_SIMULATE]
+
+    def check(rows: list[IdeaRow]) -> tuple[list[IdeaRow], dict]:
+        hashes = [h for h in (parse_hash(row.idea_hash) for row in rows) if h is not None]
+        return rows, fetch(hashes) if hashes else {}
+
+    for rows, ideas in bounded_map(check, chunks(), executor, window):
+        updates = []
+        for row in rows:
+            raw = parse_hash(row.idea_hash)
+            if raw is None:
+                mismatches = [Mismatch(row.id, row.idea_hash, INVALID_HASH, row.idea_hash, None)]
+            else:
+                mismatches = diff_row(row, ideas.get(raw), founders)
+            verified = not mismatches
+            if row.is_verified != verified:
+                mismatches.append(Mismatch(row.id, row.idea_hash, VERIFIED_FLAG, row.is_verified, verified))
+                updates.append((row.id, verified))
+
+            report.rows += 1
+            if not mismatches:
+                report.matched += 1
+            for mismatch in mismatches:
+                report.mismatches[mismatch.kind] += 1
+                if on_mismatch:
+                    on_mismatch(mismatch)
+
+        if repair and updates:
+            table.set_verified(updates)
+            report.repaired += len(updates)
+        report.last_hash = rows[-1].idea_hash
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def libpq_url(database_url: str) -> str:
+    """Drop the Prisma-only options from a DATABASE_URL so libpq accepts it."""
+    parts = urlsplit(database_url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in PRISMA_URL_OPTIONS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile the backend's Idea rows against IdeaRegistry boxes")
+    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    parser.add_argument("--app-id", type=int, default=0, help="IdeaRegistry app ID (default: ALGORAND_APP_ID)")
+    parser.add_argument("--database-url", type=str, help="Postgres URL (default: DATABASE_URL)")
+    parser.add_argument("--founder", action="append", default=[], help="Address registering on users' behalf (default: the deployer account)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Maximum concurrent simulate requests")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Rows per database page")
+    parser.add_argument("--after", type=str, default="", help="Resume after this ideaHash")
+    parser.add_argument("--repair", action="store_true", help="Set isVerified to whether the chain backs each row")
+    parser.add_argument("--output", type=str, help="Mismatch report, JSON lines (default: stdout)")
+    args = parser.parse_args()
+
+    from deploy import load_env_file
+
+    backend_env_path = Path(__file__).parent.parent / "backend" / ".env"
+    for key, value in load_env_file(backend_env_path).items():
+        os.environ.setdefault(key, value)
+
+    app_id = args.app_id or int(os.environ.get("ALGORAND_APP_ID", "0"))
+    database_url = args.database_url or os.environ.get("DATABASE_URL")
+    if not app_id or not database_url:
+        raise SystemExit("ALGORAND_APP_ID and DATABASE_URL must be set")
+
+    founders = set(args.founder)
+    mnemonic = os.getenv("ALGORAND_DEPLOYER_MNEMONIC") or os.getenv("DEPLOYER_MNEMONIC")
+    if not founders and mnemonic:
+        from algosdk import account, mnemonic as algo_mnemonic
+        founders.add(account.address_from_private_key(algo_mnemonic.to_private_key(mnemonic)))
+
+    try:
+        import psycopg
+    except ImportError:
+        raise SystemExit("Reconciliation needs psycopg: pip install 'psycopg[binary]'")
+
+    from algokit_utils import AlgorandClient
+    if args.network == "localnet":
+        algorand = AlgorandClient.default_localnet()
+    elif args.network == "testnet":
+        algorand = AlgorandClient.testnet()
+    else:
+        algorand = AlgorandClient.mainnet()
+    algod_client = algorand.client.algod
+
+    from registry_client import get_ideas
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        with psycopg.connect(libpq_url(database_url)) as connection, ThreadPoolExecutor(args.workers) as executor:
+            report = reconcile(
+                IdeaTable(connection),
+                lambda hashes: get_ideas(algod_client, app_id, hashes),
+                executor,
+                window=2 * args.workers,
+                founders=frozenset(founders),
+                page_size=args.page_size,
+                after=args.after,
+                repair=args.repair,
+                on_mismatch=lambda mismatch: print(json.dumps(mismatch.as_dict()), file=out),
+            )
+    finally:
+        if args.output:
+            out.close()
+    print(report.format(), file=sys.stderr)
+    print(json.dumps(report.as_dict()), file=sys.stderr)
@@ -0,0 +1,195 @@
+"""
+IdeaRegistry client helpers.
+Bulk read-only verification: splits any number of idea hashes into
+verify_ideas / get_ideas calls sized to the contract's per-call box budget,
+arranged in atomic groups, and simulates every group in a single algod
+round-trip.
+"""
+
+import base64
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+from algosdk import account, encoding
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    EmptySigner,
+)
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.models import SimulateRequest, SimulateRequestTransactionGroup
+
+from box_planner import MAX_GROUP_SIZE, MAX_HASHES_PER_READ
+from idea_codec import (
+    decode_founder_stats,
+    decode_record,
+    delete_founder_names,
+    digest_to_cid,
+    founder_stats_box_name,
+    register_founder_names,
+    register_page_names,
+)
+from registry_spec import registry_method, suggested_params
+from tracing import span
+
+MAX_HASHES_PER_CALL = MAX_HASHES_PER_READ
+
+
+@dataclass(frozen=True)
+class OnChainIdea:
+    """Decoded get_ideas record for a registered hash."""
+
+    founder: str
+    timestamp: int
+    ipfs_cid: str
+
+
+def read_global_state(algod_client: AlgodClient, app_id: int) -> dict[str, int]:
+    """Fetch IdeaRegistry's uint64 global state (total_ideas, next_ordinal)."""
+    info = algod_client.application_info(app_id)
+    return {
+        base64.b64decode(entry["key"]).decode(): entry["value"].get("uint", 0)
+        for entry in info["params"].get("global-state", [])
+    }
+
+
+def read_founder_stats(algod_client: AlgodClient, app_id: int, founder: str) -> tuple[int, int]:
+    """Fetch a founder's (total, live) counters; (0, 0) if they never registered."""
+    name = founder_stats_box_name(encoding.decode_address(founder))
+    try:
+        response = algod_client.application_box_by_name(app_id, name)
+    except AlgodHTTPError as e:
+        if e.code == 404:
+            return 0, 0
+        raise
+    return decode_founder_stats(base64.b64decode(response["value"]))
+
+
+def registration_box_names(algod_client: AlgodClient, app_id: int, founder: str) -> list[bytes]:
+    """
+    Index boxes a register call from `founder` must reference, besides the
+    idea boxes themselves: two ordinal pages and three founder index boxes.
+    """
+    next_ordinal = read_global_state(algod_client, app_id).get("next_ordinal", 0)
+    founder_total, _ = read_founder_stats(algod_client, app_id, founder)
+    return register_page_names(next_ordinal) + register_founder_names(
+        encoding.decode_address(founder), founder_total
+    )
+
+
+def deletion_box_names(algod_client: AlgodClient, app_id: int, idea_hash: bytes) -> list[bytes]:
+    """Boxes a delete_idea call must reference: the record, its founder's stats box and founder page."""
+    response = algod_client.application_box_by_name(app_id, idea_hash)
+    record = decode_record(base64.b64decode(response["value"]))
+    return [idea_hash] + delete_founder_names(record.founder, record.founder_slot)
+
+
+def chunk_hashes(idea_hashes: Sequence[bytes], size: int = MAX_HASHES_PER_CALL) -> list[list[bytes]]:
+    """Split hashes into per-call chunks of at most `size` entries."""
+    for idea_hash in idea_hashes:
+        if len(idea_hash) != 32:
+            raise ValueError(f"Idea hash must be 32 bytes, got {len(idea_hash)}")
+    return [list(idea_hashes[i : i + size]) for i in range(0, len(idea_hashes), size)]
+
+
+def plan_groups(idea_hashes: Sequence[bytes]) -> list[list[list[bytes]]]:
+    """Arrange hashes into atomic groups of up to MAX_GROUP_SIZE calls each."""
+    chunks = chunk_hashes(idea_hashes)
+    return [chunks[i : i + MAX_GROUP_SIZE] for i in range(0, len(chunks), MAX_GROUP_SIZE)]
+
+
+def _simulate_bulk(
+    algod_client: AlgodClient,
+    app_id: int,
+    method_name: str,
+    idea_hashes: Sequence[bytes],
+    sender: str | None = None,
+) -> list:
+    """Run the named method over all hashes and return the flattened per-hash results."""
+    if not idea_hashes:
+        return []
+
+    # Read-only simulation needs neither funds nor a real signature
+    if sender is None:
+        _, sender = account.generate_account()
+    signer = EmptySigner()
+    method = registry_method(method_name)
+
+    # Cached per network; the copy is ours to adjust
+    params = suggested_params(algod_client)
+    params.flat_fee = True
+    params.fee = 0
+
+    # Every group goes into one simulate request: a single algod round-trip
+    txn_groups = []
+    for group in plan_groups(idea_hashes):
+        atc = AtomicTransactionComposer()
+        for chunk in group:
+            atc.add_method_call(
+                app_id=app_id,
+                method=method,
+                sender=sender,
+                sp=params,
+                signer=signer,
+                method_args=[chunk],
+                boxes=[(app_id, idea_hash) for idea_hash in chunk],
+            )
+        txn_groups.append(SimulateRequestTransactionGroup(txns=atc.gather_signatures()))
+
+    request = SimulateRequest(txn_groups=txn_groups, allow_empty_signatures=True)
+    with span("simulate", method=method_name, hashes=len(idea_hashes), groups=len(txn_groups)):
+        response = algod_client.simulate_transactions(request)
+
+    results: list = []
+    for group_result in response["txn-groups"]:
+        if "failure-message" in group_result:
+            raise RuntimeError(f"{method_name} failed under simulate: {group_result['failure-message']}")
+        for txn_result in group_result["txn-results"]:
+            # The last log of each call is its ABI return
+            log = base64.b64decode(txn_result["txn-result"]["logs"][-1])
+            results.extend(method.returns.type.decode(log[4:]))
+    return results
+
+
+def verify_ideas(
+    algod_client: AlgodClient,
+    app_id: int,
+    idea_hashes: Iterable[bytes],
+    sender: str | None = None,
+) -> dict[bytes, bool]:
+    """
+    Check which hashes are registered on-chain.
+
+    Returns:
+        Mapping of idea hash → True if registered
+    """
+    hashes = list(dict.fromkeys(idea_hashes))
+    flags = _simulate_bulk(algod_client, app_id, "verify_ideas", hashes, sender)
+    return {idea_hash: bool(flag) for idea_hash, flag in zip(hashes, flags)}
+
+
+def get_ideas(
+    algod_client: AlgodClient,
+    app_id: int,
+    idea_hashes: Iterable[bytes],
+    sender: str | None = None,
+) -> dict[bytes, OnChainIdea | None]:
+    """
+    Fetch on-chain metadata for many hashes.
+
+    Returns:
+        Mapping of idea hash → OnChainIdea, or None if not registered
+    """
+    hashes = list(dict.fromkeys(idea_hashes))
+    records = _simulate_bulk(algod_client, app_id, "get_ideas", hashes, sender)
+    ideas: dict[bytes, OnChainIdea | None] = {}
+    for idea_hash, (found, founder, timestamp, cid_digest) in zip(hashes, records):
+        if not found:
+            ideas[idea_hash] = None
+            continue
+        ideas[idea_hash] = OnChainIdea(
+            founder=founder,
+            timestamp=timestamp,
+            ipfs_cid=digest_to_cid(bytes(cid_digest)),
+        )
+    return ideas
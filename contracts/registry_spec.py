@@ -0,0 +1,162 @@
+"""
+IdeaRegistry ABI spec and suggested-params cache.
+Shared by every Python tool that talks to the contract: the ARC-56 artifact
+is parsed once per process into ABI methods and selectors, and suggested
+params are cached per network and refreshed in the background about once
+per round, so building a transaction costs neither a JSON parse nor an
+extra algod round-trip.
+"""
+
+import base64
+import copy
+import json
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from algosdk.abi import Method
+from algosdk.transaction import SuggestedParams
+from algosdk.v2client.algod import AlgodClient
+
+from tracing import span
+
+ARC56_PATH = Path(__file__).parent / "smart_contracts" / "idea_registry" / "artifacts" / "IdeaRegistry.arc56.json"
+
+# Algorand produces a block roughly every 2.8 s; params older than this are
+# refetched synchronously if the background refresh has fallen behind.
+DEFAULT_PARAMS_TTL = 5.0
+
+
+@dataclass(frozen=True)
+class RegistrySpec:
+    """Parsed ARC-56 app spec."""
+
+    name: str
+    methods: dict[str, Method]
+    selectors: dict[bytes, Method]
+    approval_program: bytes
+    clear_program: bytes
+    # The approval program accepts a bare UpdateApplication call
+    updatable: bool = False
+
+    def method(self, name: str) -> Method:
+        """ABI method by name; raises KeyError if the artifact predates it."""
+        try:
+            return self.methods[name]
+        except KeyError:
+            raise KeyError(
+                f"{self.name} artifact has no method {name!r}. Run `algokit compile` to refresh it."
+            ) from None
+
+
+@lru_cache(maxsize=None)
+def load_spec(path: Path = ARC56_PATH) -> RegistrySpec:
+    """Parse an ARC-56 artifact once; later calls return the cached spec."""
+    if not path.exists():
+        raise FileNotFoundError(f"ARC56 artifact not found at {path}. Did you compile first?")
+    with open(path, "r", encoding="utf-8") as f:
+        arc56 = json.load(f)
+
+    methods = {m["name"]: Method.undictify(m) for m in arc56["methods"]}
+    try:
+        approval = base64.b64decode(arc56["byteCode"]["approval"])
+        clear = base64.b64decode(arc56["byteCode"]["clear"])
+    except KeyError:
+        raise ValueError("Bytecode not found in arc56.json. Ensure the contract was compiled with bytecode output.")
+
+    return RegistrySpec(
+        name=arc56["name"],
+        methods=methods,
+        selectors={method.get_selector(): method for method in methods.values()},
+        approval_program=approval,
+        clear_program=clear,
+        updatable="UpdateApplication" in arc56.get("bareActions", {}).get("call", []),
+    )
+
+
+def registry_method(name: str) -> Method:
+    """Shorthand for load_spec().method(name)."""
+    return load_spec().method(name)
+
+
+class SuggestedParamsCache:
+    """
+    Suggested params per network, keyed by algod address.
+
+    The first request for a network fetches synchronously and starts a daemon
+    thread that waits for each new round (status_after_block) and refetches.
+    Callers get a copy, so adjusting fee/flat_fee never leaks into the cache.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_PARAMS_TTL, background: bool = True):
+        self.ttl = ttl
+        self.background = background
+        self._entries: dict[str, tuple[SuggestedParams, float]] = {}
+        self._refreshers: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def get(self, algod_client: AlgodClient) -> SuggestedParams:
+        key = algod_client.algod_address
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            params = self._fetch(key, algod_client)
+            if self.background:
+                self._start_refresher(key, algod_client)
+        else:
+            params = entry[0]
+        return copy.copy(params)
+
+    def invalidate(self, algod_client: AlgodClient | None = None) -> None:
+        """Drop cached params for one network (or all of them)."""
+        with self._lock:
+            if algod_client is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(algod_client.algod_address, None)
+
+    def close(self) -> None:
+        """Stop background refreshers (they are daemons, so this is optional)."""
+        self._stop.set()
+
+    def _fetch(self, key: str, algod_client: AlgodClient) -> SuggestedParams:
+        with span("params.fetch", algod=key):
+            params = algod_client.suggested_params()
+        with self._lock:
+            self._entries[key] = (params, time.monotonic())
+        return params
+
+    def _start_refresher(self, key: str, algod_client: AlgodClient) -> None:
+        with self._lock:
+            if key in self._refreshers and self._refreshers[key].is_alive():
+                return
+            thread = threading.Thread(
+                target=self._refresh_loop,
+                args=(key, algod_client),
+                name=f"params-refresh-{key}",
+                daemon=True,
+            )
+            self._refreshers[key] = thread
+        thread.start()
+
+    def _refresh_loop(self, key: str, algod_client: AlgodClient) -> None:
+        while not self._stop.is_set():
+            try:
+                last_round = algod_client.status()["last-round"]
+                algod_client.status_after_block(last_round)
+                self._fetch(key, algod_client)
+            except Exception:
+                # Node hiccup: fall back to synchronous fetches until it recovers
+                self._stop.wait(self.ttl)
+
+
+# Process-wide cache used by the tooling
+params_cache = SuggestedParamsCache()
+
+
+def suggested_params(algod_client: AlgodClient) -> SuggestedParams:
+    """Cached suggested params for the network `algod_client` points at."""
+    return params_cache.get(algod_client)
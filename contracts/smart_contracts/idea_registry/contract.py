@@ -3,6 +3,8 @@ IdeaVault — IdeaRegistry Smart Contract
 Algorand Python (AlgoKit) Contract for registering and verifying startup ideas with immutable proof of ownership.
 """
 
+import typing as t
+
 from algopy import (
     ARC4Contract,
     Bytes,
@@ -11,45 +13,187 @@ from algopy import (
     String,
     Txn,
     subroutine,
-    log,
-    # op,  # Removed: op is not available in algopy
+    op,
+    urange,
     BoxMap,
+    arc4,
 )
 
 
+# ARC-4 encoding of a raw SHA-256 idea hash
+Hash32: t.TypeAlias = arc4.StaticArray[arc4.Byte, t.Literal[32]]
+
+# Box record layout v1 — every field at a fixed offset:
+# version(1) | founder(32) | timestamp(8) | cid_digest(32) | founder_slot(4) | title(0..64)
+# founder_slot is the idea's position in its founder's index, so delete_idea
+# can tombstone it. The title is the tail of the box; its length is implied
+# by the box size.
+# Mirrored by contracts/idea_codec.py for off-chain encoding/decoding.
+RECORD_VERSION = 1
+FOUNDER_OFFSET = 1
+TIMESTAMP_OFFSET = 33
+CID_OFFSET = 41
+FOUNDER_SLOT_OFFSET = 73
+TITLE_OFFSET = 77
+MAX_TITLE_BYTES = 64
+MAX_RECORD_SIZE = TITLE_OFFSET + MAX_TITLE_BYTES
+
+# Bulk reads touch one box per hash and a transaction carries at most
+# 8 references, so a single verify_ideas/get_ideas call is capped at 8 hashes.
+# Clients spread larger lists across the calls of an atomic group.
+MAX_HASHES_PER_READ = 8
+
+# Ordinal index — idea hashes in registration order, packed 32 per page box
+# keyed PAGE_PREFIX + itob(page). A page is created one slot wide and grows by
+# a slot per registration up to PAGE_SIZE, so MBR is only locked for slots in
+# use. Enumerating the registry reads one box per 32 ideas. Register calls must reference the page holding next_ordinal
+# and the one after it (in case a concurrent call fills the current page).
+PAGE_PREFIX = b"p"
+HASHES_PER_PAGE = 32
+PAGE_SIZE = 1024
+
+# Founder index — per founder, the ordinals (uint64) of their ideas packed 128
+# per growing page box keyed FOUNDER_PREFIX + founder(32) + itob(page), next
+# to a FounderStats box keyed FOUNDER_PREFIX + founder(32). Storing ordinals
+# rather than hashes costs 8 bytes of MBR per idea instead of 32. Register
+# calls must reference the stats box and the founder's current and next page.
+# delete_idea overwrites the idea's slot with DELETED_ORDINAL, which
+# get_founder_ideas skips.
+FOUNDER_PREFIX = b"f"
+ORDINALS_PER_PAGE = 128
+DELETED_ORDINAL = b"\xff\xff\xff\xff\xff\xff\xff\xff"
+
+# Merkle anchoring — one AnchorRecord box per batch, keyed ANCHOR_PREFIX + root.
+# Leaves are sha256(0x00 | idea_hash) and inner nodes sha256(0x01 | left | right);
+# an odd node at the end of a level is promoted unchanged. Mirrored by
+# contracts/merkle.py, which builds trees and proofs off-chain.
+ANCHOR_PREFIX = b"m"
+MERKLE_LEAF_PREFIX = b"\x00"
+MERKLE_NODE_PREFIX = b"\x01"
+
+
+class IdeaEntry(arc4.Struct):
+    """One (hash, cid_digest, title) tuple submitted through register_ideas_batch."""
+
+    idea_hash: Hash32
+    cid_digest: Hash32
+    title_preview: arc4.String
+
+
+class IdeaRecord(arc4.Struct):
+    """get_ideas result row; `found` is False (and the rest zeroed) for unknown hashes."""
+
+    found: arc4.Bool
+    founder: arc4.Address
+    timestamp: arc4.UInt64
+    cid_digest: Hash32
+
+
+class FounderStats(arc4.Struct):
+    """Per-founder counters: `total` slots ever appended, `live` ideas not deleted."""
+
+    total: arc4.UInt64
+    live: arc4.UInt64
+
+
+class AnchorRecord(arc4.Struct):
+    """A Merkle-anchored batch: who anchored it, when, its size and manifest CID."""
+
+    anchorer: arc4.Address
+    timestamp: arc4.UInt64
+    count: arc4.UInt64
+    cid_digest: Hash32
+
+
+class IdeaRegistered(arc4.Struct):
+    """
+    ARC-28 event emitted for every new registration.
+
+    Carries everything an indexer needs, so logs alone are sufficient. The title
+    is left out to keep an 8-entry batch inside the 1 KB per-call log budget.
+    """
+
+    idea_hash: Hash32
+    founder: arc4.Address
+    timestamp: arc4.UInt64
+    cid_digest: Hash32
+
+
+class IdeaDeleted(arc4.Struct):
+    """ARC-28 event emitted when the creator removes an idea, with its founder."""
+
+    idea_hash: Hash32
+    founder: arc4.Address
+
+
+class BatchAnchored(arc4.Struct):
+    """ARC-28 event emitted when a Merkle root of `count` idea hashes is anchored."""
+
+    root: Hash32
+    anchorer: arc4.Address
+    timestamp: arc4.UInt64
+    count: arc4.UInt64
+    cid_digest: Hash32
+
+
 class IdeaRegistry(ARC4Contract):
     """
     IdeaRegistry — Blockchain-backed idea registration and verification.
     
     Storage Model:
     - Global State: total_ideas counter
-    - Box Storage: Maps idea_hash (32 bytes) → (founder_address, timestamp, ipfs_cid, title)
+    - Box Storage: Maps idea_hash (32 bytes) → v1 record (founder, timestamp, cid_digest, title)
+    - Box Storage: Ordinal page index of registered hashes, per-founder pages of ordinals
+    - Box Storage: Maps Merkle root → AnchorRecord for batch-anchored ideas
     
     Key Methods:
-    - register_idea(hash, ipfs_cid, title_preview) → timestamp
+    - register_idea(hash, cid_digest, title_preview) → timestamp
+    - register_ideas_batch([(hash, cid_digest, title_preview), ...]) → (timestamps, duplicates)
     - verify_idea(hash) → bool
-    - get_idea(hash) → (founder, timestamp, cid)
+    - verify_ideas([hash, ...]) → [bool, ...]
+    - get_idea(hash) → (founder, timestamp, cid_digest)
+    - get_ideas([hash, ...]) → [(found, founder, timestamp, cid_digest), ...]
     - get_total_ideas() → total count
+    - import_idea(hash, founder, timestamp, cid_digest, title_preview) → carry over an idea from a pre-v1 app
+    - list_ideas(cursor, limit) → (hashes, next_cursor) in registration order
+    - get_founder_ideas(founder, offset, limit) → (ordinals, next_offset, live_count)
+    - anchor_batch(root, count, cid_digest) → timestamp
+    - verify_inclusion(hash, root, index, proof) → bool
     """
 
-    # Global state
-    total_ideas: UInt64 = UInt64(0)
+    def __init__(self) -> None:
+        # Global state
+        self.total_ideas = UInt64(0)
+        # Ordinal assigned to the next registration; never reused after deletes
+        self.next_ordinal = UInt64(0)
+        # Merkle-anchored batches and the idea hashes they commit to
+        self.total_batches = UInt64(0)
+        self.anchored_ideas = UInt64(0)
 
-    # Box storage: idea_hash (32 bytes) → Bytes (packed data)
-    # We use BoxMap to store idea metadata
-    # Format: founder_address(32) + timestamp(8) + ipfs_cid_len(2) + ipfs_cid + title_len(2) + title
-    idea_storage: BoxMap[Bytes, Bytes] = BoxMap(Bytes, Bytes)
+        # Box storage: idea_hash (32 bytes) → Bytes (packed data)
+        # We use BoxMap to store idea metadata
+        # Format (v1): version(1) + founder_address(32) + timestamp(8) + cid_digest(32)
+        # + founder_slot(4) + title. Ideas stored by a pre-v1 app in the legacy layout
+        # are carried over with import_idea; this app never holds legacy boxes.
+        self.idea_storage = BoxMap(Hash32, Bytes, key_prefix=b"")
+        # founder address → FounderStats; the founder's pages share the prefix
+        self.founder_stats = BoxMap(arc4.Address, FounderStats, key_prefix=FOUNDER_PREFIX)
+        # Merkle root → AnchorRecord
+        self.anchors = BoxMap(Hash32, AnchorRecord, key_prefix=ANCHOR_PREFIX)
 
-    @ARC4Contract.abimethod(create="require")
+    @arc4.abimethod(create="require")
     def create_application(self) -> None:
         """Initialize the contract."""
         self.total_ideas = UInt64(0)
+        self.next_ordinal = UInt64(0)
+        self.total_batches = UInt64(0)
+        self.anchored_ideas = UInt64(0)
 
-    @ARC4Contract.abimethod
+    @arc4.abimethod
     def register_idea(
         self,
-        idea_hash: Bytes,
-        ipfs_cid: String,
+        idea_hash: Hash32,
+        cid_digest: Hash32,
         title_preview: String,
     ) -> UInt64:
         """
@@ -57,55 +201,218 @@ class IdeaRegistry(ARC4Contract):
         
         Args:
             idea_hash: SHA-256 hash of idea content (32 bytes)
-            ipfs_cid: IPFS CID of uploaded document
-            title_preview: Short title preview (for transparency)
+            cid_digest: Raw 32-byte sha2-256 digest decoded from the document's CIDv0 multihash
+            title_preview: Short title preview, at most 64 UTF-8 bytes (for transparency)
         
         Returns:
             Unix timestamp of registration
         
         Side Effects:
-            - Stores (founder_address, timestamp, ipfs_cid, title) in box storage
+            - Stores (founder_address, timestamp, cid_digest, title) in box storage
+            - Appends the hash to the ordinal index and its ordinal to the founder index
             - Increments total_ideas counter
-            - Emits IDEA_REGISTERED event
+            - Emits IdeaRegistered event
             - Rejects if hash already exists
         """
-        # Validate hash is 32 bytes
-        assert len(idea_hash) == 32, "Idea hash must be 32 bytes (SHA-256)"
-        
         # Check for duplicates
-        assert not self.idea_storage[idea_hash].exists(), "Idea hash already registered"
+        assert idea_hash not in self.idea_storage, "Idea hash already registered"
         
-        # Get sender (founder) and current timestamp
-        founder = Txn.sender
         timestamp = Global.latest_timestamp
+        self._store_idea(idea_hash, arc4.Address(Txn.sender), timestamp, cid_digest, title_preview)
         
-        # Pack data: founder(32) | timestamp(8) | ipfs_cid_len(2) | ipfs_cid | title_len(2) | title
-        ipfs_bytes = ipfs_cid.encode()
-        title_bytes = title_preview.encode()
+        # Increment counter
+        self.total_ideas += UInt64(1)
         
-        # Build packed value
-        packed_value = Bytes("")
-        packed_value += founder  # 32 bytes — Algorand account address
-        packed_value += timestamp.to_bytes(8)  # 8 bytes — Unix timestamp
-        packed_value += len(ipfs_bytes).to_bytes(2)  # 2 bytes — CID length
-        packed_value += ipfs_bytes  # Variable — IPFS CID
-        packed_value += len(title_bytes).to_bytes(2)  # 2 bytes — Title length
-        packed_value += title_bytes  # Variable — Title preview
+        return timestamp
+
+    @arc4.abimethod
+    def register_ideas_batch(
+        self,
+        entries: arc4.DynamicArray[IdeaEntry],
+    ) -> tuple[arc4.DynamicArray[arc4.UInt64], arc4.DynamicArray[arc4.Bool]]:
+        """
+        Register several ideas in a single application call.
         
-        # Store in box
-        self.idea_storage[idea_hash] = packed_value
+        Args:
+            entries: Array of (idea_hash, cid_digest, title_preview) tuples
         
-        # Increment counter
-        self.total_ideas += UInt64(1)
+        Returns:
+            (timestamps, duplicates) — one element per entry. Entries whose hash
+            is already registered are skipped instead of aborting the call; they
+            get timestamp 0 and their duplicate flag set.
+        
+        Side Effects:
+            - Writes one box per new entry (caller must reference every box,
+              the two ordinal pages and the three founder index boxes, so at
+              most 3 entries fit one call)
+            - Increments total_ideas once by the number of new entries
+            - Emits one IdeaRegistered event per new entry
+        """
+        assert entries.length > 0, "Batch must not be empty"
+        
+        timestamps = arc4.DynamicArray[arc4.UInt64]()
+        duplicates = arc4.DynamicArray[arc4.Bool]()
+        registered = UInt64(0)
+        founder = arc4.Address(Txn.sender)
+        timestamp = Global.latest_timestamp
+        
+        for index in urange(entries.length):
+            entry = entries[index].copy()
+            idea_hash = entry.idea_hash.copy()
+            if idea_hash in self.idea_storage:
+                timestamps.append(arc4.UInt64(0))
+                duplicates.append(arc4.Bool(True))
+            else:
+                self._store_idea(
+                    idea_hash,
+                    founder,
+                    timestamp,
+                    entry.cid_digest.copy(),
+                    entry.title_preview.native,
+                )
+                timestamps.append(arc4.UInt64(timestamp))
+                duplicates.append(arc4.Bool(False))
+                registered += UInt64(1)
+        
+        # Single counter write for the whole batch
+        self.total_ideas += registered
+        
+        return timestamps.copy(), duplicates.copy()
+
+    @subroutine
+    def _store_idea(
+        self,
+        idea_hash: Hash32,
+        founder: arc4.Address,
+        timestamp: UInt64,
+        cid_digest: Hash32,
+        title_preview: String,
+    ) -> None:
+        """
+        Pack, store and index a single idea record, then emit IdeaRegistered.
+        
+        Callers are responsible for the duplicate check and the counter update.
+        """
+        founder_slot = self._append_founder(founder, self._append_ordinal(idea_hash))
+        self.idea_storage[idea_hash] = self._pack_idea(
+            founder.bytes, timestamp, cid_digest.bytes, founder_slot, title_preview.bytes
+        )
         
         # Emit event (for transparency in logs)
-        log_msg = Bytes("IDEA_REGISTERED:") + founder + Bytes(":") + timestamp.to_bytes(8)
-        log(log_msg)
+        arc4.emit(
+            IdeaRegistered(
+                idea_hash=idea_hash.copy(),
+                founder=founder,
+                timestamp=arc4.UInt64(timestamp),
+                cid_digest=cid_digest.copy(),
+            )
+        )
         
-        return timestamp
 
-    @ARC4Contract.abimethod(readonly=True)
-    def verify_idea(self, idea_hash: Bytes) -> bool:
+    @subroutine
+    def _pack_idea(
+        self,
+        founder: Bytes,
+        timestamp: UInt64,
+        cid_digest: Bytes,
+        founder_slot: UInt64,
+        title_bytes: Bytes,
+    ) -> Bytes:
+        """Build a v1 record: version(1) | founder(32) | timestamp(8) | cid_digest(32) | founder_slot(4) | title."""
+        assert title_bytes.length <= MAX_TITLE_BYTES, "Title preview must be at most 64 bytes"
+        
+        packed_value = Bytes(b"\x01")  # 1 byte — layout version (RECORD_VERSION)
+        packed_value += founder  # 32 bytes — Algorand account address
+        packed_value += op.itob(timestamp)  # 8 bytes — Unix timestamp
+        packed_value += cid_digest  # 32 bytes — sha2-256 digest from the CIDv0 multihash
+        packed_value += op.extract(op.itob(founder_slot), 4, 4)  # 4 bytes — founder index slot
+        packed_value += title_bytes  # Remainder — Title preview
+        return packed_value
+
+    @subroutine
+    def _append_ordinal(self, idea_hash: Hash32) -> UInt64:
+        """Record idea_hash at the next ordinal slot of the page index; returns the ordinal."""
+        ordinal = self.next_ordinal
+        self._write_slot(Bytes(PAGE_PREFIX), ordinal, idea_hash.bytes)
+        self.next_ordinal += 1
+        return ordinal
+
+    @subroutine
+    def _append_founder(self, founder: arc4.Address, ordinal: UInt64) -> UInt64:
+        """Record an idea's ordinal at the founder's next slot and bump their counters; returns the slot."""
+        stats = self.founder_stats.get(
+            founder, default=FounderStats(total=arc4.UInt64(0), live=arc4.UInt64(0))
+        ).copy()
+        total = stats.total.as_uint64()
+        self._write_slot(Bytes(FOUNDER_PREFIX) + founder.bytes, total, op.itob(ordinal))
+        self.founder_stats[founder] = FounderStats(
+            total=arc4.UInt64(total + 1),
+            live=arc4.UInt64(stats.live.as_uint64() + 1),
+        )
+        return total
+
+    @subroutine
+    def _write_slot(self, key_prefix: Bytes, slot: UInt64, value: Bytes) -> None:
+        """Append `value` at `slot` of the page index under key_prefix, growing the page by one slot."""
+        per_page = PAGE_SIZE // value.length
+        page_key = key_prefix + op.itob(slot // per_page)
+        offset = (slot % per_page) * value.length
+        if offset == 0:
+            assert op.Box.create(page_key, value.length), "Index page already exists"
+        else:
+            op.Box.resize(page_key, offset + value.length)
+        op.Box.replace(page_key, offset, value)
+
+    @subroutine
+    def _slots_end(self, cursor: UInt64, limit: UInt64, count: UInt64, per_page: UInt64) -> UInt64:
+        """End of a read from `cursor`: `limit` slots on, clipped to the page end and `count`."""
+        end = cursor + limit
+        page_end = (cursor // per_page + 1) * per_page
+        if end > page_end:
+            end = page_end
+        if end > count:
+            end = count
+        return end
+
+    @subroutine
+    def _read_slots(
+        self, key_prefix: Bytes, cursor: UInt64, limit: UInt64, count: UInt64
+    ) -> tuple[arc4.DynamicArray[Hash32], UInt64]:
+        """Read up to `limit` hashes from `cursor`, stopping at the page end or `count`."""
+        hashes = arc4.DynamicArray[Hash32]()
+        if cursor >= count:
+            return hashes.copy(), count
+        
+        end = self._slots_end(cursor, limit, count, UInt64(HASHES_PER_PAGE))
+        page_key = key_prefix + op.itob(cursor // HASHES_PER_PAGE)
+        ordinal = cursor
+        while ordinal < end:
+            slot = (ordinal % HASHES_PER_PAGE) * 32
+            hashes.append(Hash32.from_bytes(op.Box.extract(page_key, slot, 32)))
+            ordinal += 1
+        return hashes.copy(), end
+
+    @subroutine
+    def _read_ordinals(
+        self, key_prefix: Bytes, cursor: UInt64, limit: UInt64, count: UInt64
+    ) -> tuple[arc4.DynamicArray[arc4.UInt64], UInt64]:
+        """Read up to `limit` ordinal slots from `cursor`, stopping at the page end or `count`; skips tombstones."""
+        ordinals = arc4.DynamicArray[arc4.UInt64]()
+        if cursor >= count:
+            return ordinals.copy(), count
+        
+        end = self._slots_end(cursor, limit, count, UInt64(ORDINALS_PER_PAGE))
+        page_key = key_prefix + op.itob(cursor // ORDINALS_PER_PAGE)
+        position = cursor
+        while position < end:
+            slot = op.Box.extract(page_key, (position % ORDINALS_PER_PAGE) * 8, 8)
+            if slot != DELETED_ORDINAL:
+                ordinals.append(arc4.UInt64(op.btoi(slot)))
+            position += 1
+        return ordinals.copy(), end
+
+    @arc4.abimethod(readonly=True)
+    def verify_idea(self, idea_hash: Hash32) -> bool:
         """
         Verify if an idea is registered on-chain.
         
@@ -115,14 +422,13 @@ class IdeaRegistry(ARC4Contract):
         Returns:
             True if idea exists, False otherwise
         """
-        assert len(idea_hash) == 32, "Idea hash must be 32 bytes"
-        return self.idea_storage[idea_hash].exists()
+        return idea_hash in self.idea_storage
 
-    @ARC4Contract.abimethod(readonly=True)
+    @arc4.abimethod(readonly=True)
     def get_idea(
         self,
-        idea_hash: Bytes,
-    ) -> tuple[String, UInt64, String]:
+        idea_hash: Hash32,
+    ) -> tuple[arc4.Address, UInt64, Hash32]:
         """
         Retrieve idea metadata from on-chain storage.
         
@@ -130,35 +436,85 @@ class IdeaRegistry(ARC4Contract):
             idea_hash: SHA-256 hash of idea (32 bytes)
         
         Returns:
-            (founder_address, timestamp, ipfs_cid)
+            (founder_address, timestamp, cid_digest)
         
         Raises:
             Assertion error if idea not found
         """
-        assert len(idea_hash) == 32, "Idea hash must be 32 bytes"
-        
         # Get packed data from box
-        assert self.idea_storage[idea_hash].exists(), "Idea not found on-chain"
-        packed = self.idea_storage[idea_hash].value
+        assert idea_hash in self.idea_storage, "Idea not found on-chain"
+        record = self._unpack_idea(self.idea_storage[idea_hash])
+        
+        return (record.founder.copy(), record.timestamp.as_uint64(), record.cid_digest.copy())
+
+    @arc4.abimethod(readonly=True)
+    def verify_ideas(
+        self,
+        idea_hashes: arc4.DynamicArray[Hash32],
+    ) -> arc4.DynamicArray[arc4.Bool]:
+        """
+        Verify several idea hashes in one read-only call.
+        
+        Args:
+            idea_hashes: Up to MAX_HASHES_PER_READ 32-byte hashes
         
-        # Unpack: founder(32) | timestamp(8) | ipfs_cid_len(2) | ipfs_cid | title_len(2) | title
-        founder = packed[0:32]
-        timestamp_bytes = packed[32:40]
-        timestamp = UInt64.from_bytes(timestamp_bytes)
+        Returns:
+            One flag per hash, True if the idea is registered
+        """
+        assert idea_hashes.length <= MAX_HASHES_PER_READ, "Too many hashes for one call"
         
-        cid_len_bytes = packed[40:42]
-        cid_len = Bytes.btoi(cid_len_bytes)
-        cid_start = 42
-        cid_end = cid_start + cid_len
-        ipfs_cid = packed[cid_start:cid_end].decode()
+        results = arc4.DynamicArray[arc4.Bool]()
+        for index in urange(idea_hashes.length):
+            idea_hash = idea_hashes[index].copy()
+            results.append(arc4.Bool(idea_hash in self.idea_storage))
+        return results
+
+    @arc4.abimethod(readonly=True)
+    def get_ideas(
+        self,
+        idea_hashes: arc4.DynamicArray[Hash32],
+    ) -> arc4.DynamicArray[IdeaRecord]:
+        """
+        Retrieve metadata for several ideas in one read-only call.
         
-        # Convert founder bytes to address string (Algorand format)
-        # For simplicity, we return it as bytes and let client decode
-        founder_str = founder.decode()
+        Unlike get_idea, unknown hashes do not abort the call; they yield a
+        record with found=False so the rest of the batch is still returned.
         
-        return (founder_str, timestamp, ipfs_cid)
+        Args:
+            idea_hashes: Up to MAX_HASHES_PER_READ 32-byte hashes
+        
+        Returns:
+            One (found, founder, timestamp, cid_digest) record per hash
+        """
+        assert idea_hashes.length <= MAX_HASHES_PER_READ, "Too many hashes for one call"
+        
+        results = arc4.DynamicArray[IdeaRecord]()
+        for index in urange(idea_hashes.length):
+            idea_hash = idea_hashes[index].copy()
+            if idea_hash in self.idea_storage:
+                results.append(self._unpack_idea(self.idea_storage[idea_hash]))
+            else:
+                results.append(
+                    IdeaRecord(
+                        found=arc4.Bool(False),
+                        founder=arc4.Address(),
+                        timestamp=arc4.UInt64(0),
+                        cid_digest=Hash32.from_bytes(op.bzero(32)),
+                    )
+                )
+        return results
 
-    @ARC4Contract.abimethod(readonly=True)
+    @subroutine
+    def _unpack_idea(self, packed: Bytes) -> IdeaRecord:
+        """Decode a v1 box value into an IdeaRecord — plain fixed-offset extracts."""
+        return IdeaRecord(
+            found=arc4.Bool(True),
+            founder=arc4.Address(op.extract(packed, FOUNDER_OFFSET, 32)),
+            timestamp=arc4.UInt64(op.extract_uint64(packed, TIMESTAMP_OFFSET)),
+            cid_digest=Hash32.from_bytes(op.extract(packed, CID_OFFSET, 32)),
+        )
+
+    @arc4.abimethod(readonly=True)
     def get_total_ideas(self) -> UInt64:
         """
         Get total number of ideas registered.
@@ -168,20 +524,236 @@ class IdeaRegistry(ARC4Contract):
         """
         return self.total_ideas
 
-    @ARC4Contract.abimethod
-    def delete_idea(self, idea_hash: Bytes) -> None:
+    @arc4.abimethod(readonly=True)
+    def list_ideas(
+        self,
+        cursor: UInt64,
+        limit: UInt64,
+    ) -> tuple[arc4.DynamicArray[Hash32], UInt64]:
+        """
+        Page through registered hashes in registration order.
+        
+        A call never crosses a page boundary, so it needs exactly one box
+        reference: the page holding `cursor`. Deleted ideas keep their slot,
+        so callers should confirm hashes with verify_ideas/get_ideas.
+        
+        Args:
+            cursor: First ordinal to return (0 to start)
+            limit: Maximum number of hashes to return
+        
+        Returns:
+            (hashes, next_cursor) — next_cursor equals next_ordinal once the
+            end of the index is reached
+        """
+        assert limit > 0, "Limit must be positive"
+        return self._read_slots(Bytes(PAGE_PREFIX), cursor, limit, self.next_ordinal)
+
+    @arc4.abimethod(readonly=True)
+    def get_founder_ideas(
+        self,
+        founder: arc4.Address,
+        offset: UInt64,
+        limit: UInt64,
+    ) -> tuple[arc4.DynamicArray[arc4.UInt64], UInt64, UInt64]:
+        """
+        Page through the ordinals of the ideas one founder registered, oldest first.
+        
+        Needs two box references: the founder's stats box and the page
+        holding `offset`. Like list_ideas a call never crosses a page.
+        Deleted ideas keep their slot but are tombstoned and skipped, so a
+        page can return fewer than `limit` ordinals before next_offset
+        reaches the founder's total. Each ordinal's hash is in the ordinal index: list_ideas(ordinal, 1)
+        or the PAGE_PREFIX page box holding it.
+        
+        Args:
+            founder: Founder account address
+            offset: First founder slot to return (0 to start)
+            limit: Maximum number of ordinals to return
+        
+        Returns:
+            (ordinals, next_offset, live_count) — next_offset equals the
+            founder's total once the end of their list is reached
+        """
+        assert limit > 0, "Limit must be positive"
+        
+        ordinals = arc4.DynamicArray[arc4.UInt64]()
+        if founder not in self.founder_stats:
+            return ordinals.copy(), UInt64(0), UInt64(0)
+        
+        stats = self.founder_stats[founder].copy()
+        ordinals, end = self._read_ordinals(
+            Bytes(FOUNDER_PREFIX) + founder.bytes, offset, limit, stats.total.as_uint64()
+        )
+        return ordinals.copy(), end, stats.live.as_uint64()
+
+    @arc4.abimethod
+    def anchor_batch(
+        self,
+        root: Hash32,
+        count: UInt64,
+        cid_digest: Hash32,
+    ) -> UInt64:
+        """
+        Anchor a Merkle root committing to `count` idea hashes.
+        
+        One 80-byte box per batch replaces one record box per idea; each idea
+        is later proven with a log2(count) inclusion proof. Duplicate hashes
+        are not detected inside a batch, so anchored ideas are counted apart
+        from total_ideas.
+        
+        Args:
+            root: Merkle root built by contracts/merkle.py
+            count: Number of leaves in the tree
+            cid_digest: SHA-256 digest of the CIDv0 of the batch manifest,
+                which lists the leaves so anyone can rebuild the proofs
+        
+        Returns:
+            Unix timestamp of the anchor
+        
+        Side Effects:
+            - Stores (anchorer, timestamp, count, cid_digest) in the anchor box
+              (caller must reference ANCHOR_PREFIX + root)
+            - Emits BatchAnchored event
+            - Rejects if the root is already anchored
+        """
+        assert count > 0, "Batch must not be empty"
+        assert root not in self.anchors, "Root already anchored"
+        
+        timestamp = Global.latest_timestamp
+        anchorer = arc4.Address(Txn.sender)
+        self.anchors[root] = AnchorRecord(
+            anchorer=anchorer,
+            timestamp=arc4.UInt64(timestamp),
+            count=arc4.UInt64(count),
+            cid_digest=cid_digest.copy(),
+        )
+        self.total_batches += 1
+        self.anchored_ideas += count
+        
+        arc4.emit(
+            BatchAnchored(
+                root=root.copy(),
+                anchorer=anchorer,
+                timestamp=arc4.UInt64(timestamp),
+                count=arc4.UInt64(count),
+                cid_digest=cid_digest.copy(),
+            )
+        )
+        return timestamp
+
+    @arc4.abimethod(readonly=True)
+    def verify_inclusion(
+        self,
+        idea_hash: Hash32,
+        root: Hash32,
+        index: UInt64,
+        proof: arc4.DynamicArray[Hash32],
+    ) -> bool:
+        """
+        Check that idea_hash is leaf `index` of an anchored batch.
+        
+        Needs one box reference: ANCHOR_PREFIX + root. The leaf count stored
+        with the root fixes the tree shape, so the proof is just the sibling
+        hashes from leaf to root.
+        
+        Args:
+            idea_hash: 32-byte SHA-256 idea hash
+            root: Anchored Merkle root
+            index: Leaf position of idea_hash in the batch
+            proof: Sibling hashes, leaf level first
+        
+        Returns:
+            True if the root is anchored and the proof recomputes it
+        """
+        if root not in self.anchors:
+            return False
+        width = self.anchors[root].count.as_uint64()
+        if index >= width:
+            return False
+        
+        node = op.sha256(Bytes(MERKLE_LEAF_PREFIX) + idea_hash.bytes)
+        position = index
+        used = UInt64(0)
+        while width > 1:
+            if position % 2 == 1 or position + 1 < width:
+                if used >= proof.length:
+                    return False
+                sibling = proof[used].bytes
+                used += 1
+                if position % 2 == 1:
+                    node = op.sha256(Bytes(MERKLE_NODE_PREFIX) + sibling + node)
+                else:
+                    node = op.sha256(Bytes(MERKLE_NODE_PREFIX) + node + sibling)
+            # else: last node of an odd level, promoted unchanged
+            position = position // 2
+            width = (width + 1) // 2
+        return used == proof.length and node == root.bytes
+
+    @arc4.abimethod
+    def delete_idea(self, idea_hash: Hash32) -> None:
         """
         Delete an idea from storage (only callable by contract creator).
         
+        Callers must reference the idea box, the founder's stats box and the
+        founder page holding the idea's slot; the founder's live count drops
+        by one and the slot is tombstoned so get_founder_ideas skips it.
+        
         Args:
             idea_hash: 32-byte SHA-256 hash to remove
         """
-        assert Txn.sender == Global.creator_address(), "Only creator can delete"
-        assert len(idea_hash) == 32, "Idea hash must be 32 bytes"
-        assert self.idea_storage[idea_hash].exists(), "Idea not found"
+        assert Txn.sender == Global.creator_address, "Only creator can delete"
+        assert idea_hash in self.idea_storage, "Idea not found"
+        record = self.idea_storage[idea_hash]
+        
+        founder = arc4.Address(op.extract(record, FOUNDER_OFFSET, 32))
+        stats = self.founder_stats[founder].copy()
+        stats.live = arc4.UInt64(stats.live.as_uint64() - 1)
+        self.founder_stats[founder] = stats.copy()
+        founder_slot = op.btoi(op.extract(record, FOUNDER_SLOT_OFFSET, 4))
+        op.Box.replace(
+            Bytes(FOUNDER_PREFIX) + founder.bytes + op.itob(founder_slot // ORDINALS_PER_PAGE),
+            (founder_slot % ORDINALS_PER_PAGE) * 8,
+            DELETED_ORDINAL,
+        )
         
         # Delete from box storage
         del self.idea_storage[idea_hash]
+        arc4.emit(IdeaDeleted(idea_hash=idea_hash.copy(), founder=founder))
         
         # Decrement counter
         self.total_ideas -= UInt64(1)
+
+    @arc4.abimethod
+    def import_idea(
+        self,
+        idea_hash: Hash32,
+        founder: arc4.Address,
+        timestamp: UInt64,
+        cid_digest: Hash32,
+        title_preview: String,
+    ) -> None:
+        """
+        Register an idea carried over from a pre-v1 IdeaRegistry app (creator only).
+        
+        The pre-v1 program accepts no UpdateApplication, so its boxes cannot
+        be rewritten in place. contracts/migrate_boxes.py reads them from the
+        old app and replays each one here, keeping the original founder and
+        timestamp. The record is indexed and announced exactly like a new
+        registration, so the callers must reference the same boxes as for
+        register_idea.
+        
+        Args:
+            idea_hash: 32-byte SHA-256 hash of the idea
+            founder: Founder recorded in the legacy box
+            timestamp: Registration timestamp recorded in the legacy box
+            cid_digest: Raw 32-byte sha2-256 digest decoded from the legacy
+                CIDv0 multihash (idea_codec.cid_to_digest); base58 decoding
+                on-chain would not fit the opcode budget
+            title_preview: Legacy title, truncated to 64 UTF-8 bytes
+        """
+        assert Txn.sender == Global.creator_address, "Only creator can import"
+        assert idea_hash not in self.idea_storage, "Idea hash already registered"
+        assert timestamp <= Global.latest_timestamp, "Timestamp is in the future"
+        
+        self._store_idea(idea_hash, founder, timestamp, cid_digest, title_preview)
+        self.total_ideas += UInt64(1)
@@ -0,0 +1,168 @@
+"""
+IdeaVault — shared test configuration
+Contract tests run in-process on algopy_testing's AVM emulator by default.
+Tests marked `localnet` need a running AlgoKit LocalNet and are skipped
+unless pytest is given --localnet (or the IDEAVAULT_LOCALNET env var is set).
+
+The emulator fixtures import algopy lazily so the pure tooling tests still
+collect without the contract toolchain installed.
+"""
+
+import ast
+import hashlib
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+
+SYNTHETIC_TIMESTAMP = 1_760_000_000
+CONTRACT_PATH = Path(__file__).parent.parent / "smart_contracts" / "idea_registry" / "contract.py"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--localnet",
+        action="store_true",
+        default=bool(os.environ.get("IDEAVAULT_LOCALNET")),
+        help="Also run tests marked localnet (needs `algokit localnet start`)",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("--localnet"):
+        return
+    skip = pytest.mark.skip(reason="LocalNet test; run with --localnet")
+    for item in items:
+        if "localnet" in item.keywords:
+            item.add_marker(skip)
+
+
+def contract_abimethods() -> set[str]:
+    """Names of the @arc4.abimethod functions declared in contract.py, read without algopy."""
+    names = set()
+    for node in ast.walk(ast.parse(CONTRACT_PATH.read_text())):
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        for deco in node.decorator_list:
+            target = deco.func if isinstance(deco, ast.Call) else deco
+            if ast.unparse(target) == "arc4.abimethod":
+                names.add(node.name)
+    return names
+
+
+def synthetic_hash(label: str, i: int) -> bytes:
+    """Deterministic 32-byte idea hash for synthetic registrations."""
+    return hashlib.sha256(f"{label}-{i}".encode()).digest()
+
+
+def legacy_value(founder: bytes, timestamp: int, cid: str, title: str) -> bytes:
+    """Build a box value in the pre-v1 variable-length layout."""
+    cid_bytes = cid.encode()
+    title_bytes = title.encode()
+    return (
+        founder
+        + timestamp.to_bytes(8, "big")
+        + len(cid_bytes).to_bytes(2, "big")
+        + cid_bytes
+        + len(title_bytes).to_bytes(2, "big")
+        + title_bytes
+    )
+
+
+@dataclass
+class SyntheticIdea:
+    """One idea registered through the emulator, as the test model sees it."""
+
+    idea_hash: bytes
+    founder: object  # algopy.Account
+    cid_digest: bytes
+    title: str
+    timestamp: int = 0
+    deleted: bool = False
+
+
+@dataclass
+class Registry:
+    """An emulated IdeaRegistry plus helpers to drive it as different senders."""
+
+    context: object  # algopy_testing.AlgopyTestContext
+    contract: object  # IdeaRegistry
+    ideas: list[SyntheticIdea] = field(default_factory=list)
+    calls: int = 0  # app-call transactions sent through call()
+
+    def call(self, sender, method: str, *args):
+        """Invoke an ABI method in its own app-call transaction from `sender`."""
+        self.calls += 1
+        with self.context.txn.create_group(active_txn_overrides={"sender": sender}):
+            return getattr(self.contract, method)(*args)
+
+    def register(self, sender, idea_hash: bytes, cid_digest: bytes, title: str) -> int:
+        from algopy import String
+
+        from smart_contracts.idea_registry.contract import Hash32
+
+        timestamp = self.call(
+            sender, "register_idea", Hash32.from_bytes(idea_hash), Hash32.from_bytes(cid_digest), String(title)
+        )
+        self.ideas.append(SyntheticIdea(idea_hash, sender, cid_digest, title, int(timestamp)))
+        return int(timestamp)
+
+    def register_many(self, count: int, founders: list, label: str = "synthetic") -> list[SyntheticIdea]:
+        """Register `count` distinct ideas, round-robin across `founders`."""
+        start = len(self.ideas)
+        for i in range(count):
+            idea_hash = synthetic_hash(label, start + i)
+            self.register(
+                founders[i % len(founders)],
+                idea_hash,
+                hashlib.sha256(idea_hash).digest(),
+                f"{label} idea {start + i}",
+            )
+        return self.ideas[start:]
+
+    def delete(self, idea_hash: bytes) -> None:
+        from smart_contracts.idea_registry.contract import Hash32
+
+        self.call(self.context.default_sender, "delete_idea", Hash32.from_bytes(idea_hash))
+        for idea in self.ideas:
+            if idea.idea_hash == idea_hash:
+                idea.deleted = True
+
+    def box(self, key: bytes) -> bytes | None:
+        """Raw box value, or None if the box does not exist."""
+        if not self.context.ledger.box_exists(self.contract, key):
+            return None
+        return bytes(self.context.ledger.get_box(self.contract, key))
+
+    @property
+    def live(self) -> list[SyntheticIdea]:
+        return [idea for idea in self.ideas if not idea.deleted]
+
+
+@pytest.fixture
+def context():
+    """Fresh in-memory AVM ledger per test."""
+    from algopy import UInt64
+    from algopy_testing import algopy_testing_context
+
+    with algopy_testing_context() as ctx:
+        ctx.ledger.patch_global_fields(latest_timestamp=UInt64(SYNTHETIC_TIMESTAMP))
+        yield ctx
+
+
+@pytest.fixture
+def registry(context) -> Registry:
+    """A freshly created IdeaRegistry; the default sender is its creator."""
+    from smart_contracts.idea_registry.contract import IdeaRegistry
+
+    contract = IdeaRegistry()
+    with context.txn.create_group(active_txn_overrides={"sender": context.default_sender}):
+        contract.create_application()
+    return Registry(context, contract)
+
+
+@pytest.fixture
+def founders(context) -> list:
+    """A handful of distinct founder accounts."""
+    return [context.any.account() for _ in range(5)]
@@ -0,0 +1,101 @@
+"""
+IdeaVault — cost benchmark tests
+Checks the baseline comparison and the MBR model without LocalNet; the
+benchmark run itself needs a node.
+"""
+
+from benchmark import (
+    BASELINE_PATH,
+    PAGE_MBR_PER_IDEA,
+    UNBENCHMARKED,
+    Measurement,
+    build_report,
+    compare,
+    first_registration_mbr,
+    load_json,
+    registration_mbr,
+    ungated_methods,
+    unrecorded,
+)
+from conftest import contract_abimethods
+from idea_codec import FOUNDER_STATS_SIZE, HEADER_SIZE, PAGE_SIZE, box_mbr
+
+
+def report(**metrics) -> dict:
+    return {"version": 1, "measurements": {"register_idea[title=32]": metrics}}
+
+
+class TestCompare:
+
+    def test_equal_is_not_a_regression(self):
+        assert compare(report(budget=700), report(budget=700)) == []
+
+    def test_improvement_is_not_a_regression(self):
+        assert compare(report(budget=650), report(budget=700)) == []
+
+    def test_increase_is_a_regression(self):
+        regressions = compare(report(budget=701), report(budget=700))
+        assert regressions == ["register_idea[title=32].budget: 701 > baseline 700"]
+
+    def test_tolerance(self):
+        assert compare(report(budget=735), report(budget=700), tolerance=0.05) == []
+        assert compare(report(budget=736), report(budget=700), tolerance=0.05)
+
+    def test_missing_case_and_metric(self):
+        baseline = {"measurements": {"get_idea[found]": {"budget": 1}}}
+        assert compare(report(budget=1), baseline) == [
+            "register_idea[title=32].budget: not recorded in baseline",
+            "get_idea[found]: missing from report",
+        ]
+        assert compare(report(ops=1), report(budget=1)) == [
+            "register_idea[title=32].budget: missing from report"
+        ]
+
+    def test_unrecorded(self):
+        assert unrecorded(report(budget=1, ops=2), report(budget=1)) == ["register_idea[title=32].ops"]
+
+    def test_unrecorded_budget_is_a_regression(self):
+        assert compare(report(budget=1, ops=2), report(ops=2)) == [
+            "register_idea[title=32].budget: not recorded in baseline"
+        ]
+        assert compare(report(budget=1, ops=3), report(budget=1)) == []
+
+
+class TestMethodCoverage:
+
+    def test_ungated_methods(self):
+        baseline = {"measurements": {"get_idea[found]": {"budget": 1}, "verify_idea[found]": {"ops": 1}}}
+        methods = ["get_idea", "verify_idea", "list_ideas", *UNBENCHMARKED]
+        assert ungated_methods(baseline, methods) == ["list_ideas", "verify_idea"]
+
+    def test_unbenchmarked_methods_exist(self):
+        assert UNBENCHMARKED.keys() <= contract_abimethods()
+
+    def test_baseline_gates_every_method(self):
+        assert ungated_methods(load_json(BASELINE_PATH), contract_abimethods()) == []
+
+
+class TestMbr:
+
+    def test_registration_mbr(self):
+        assert registration_mbr(0) == box_mbr(HEADER_SIZE) + PAGE_MBR_PER_IDEA
+        assert registration_mbr(64) - registration_mbr(0) == 64 * 400
+
+    def test_first_registration_mbr(self):
+        # Both first pages are created one slot wide, next to the founder's stats box
+        pages = box_mbr(32, 9) + box_mbr(8, 41)
+        assert first_registration_mbr(0) == box_mbr(HEADER_SIZE) + pages + box_mbr(FOUNDER_STATS_SIZE, 33)
+        # ... which together cost less than the full 1 KB founder page alone used to
+        assert first_registration_mbr(0) < box_mbr(PAGE_SIZE, 41)
+
+    def test_per_idea_cost(self):
+        m = Measurement(budget=0, ops=0, log_bytes=0, arg_bytes=0, fee=1_000, mbr=3 * registration_mbr(32), ideas=3)
+        metrics = build_report({"batch": m})["measurements"]["batch"]
+        assert metrics["microAlgoPerIdea"] == (1_000 + 3 * registration_mbr(32)) // 3
+
+    def test_baseline_matches_model(self):
+        # The checked-in baseline must agree with the MBR model it enforces
+        baseline = load_json(BASELINE_PATH)["measurements"]
+        for size in (0, 16, 32, 64):
+            assert baseline[f"register_idea[title={size}]"]["mbrMicroAlgo"] == registration_mbr(size)
+        assert baseline["register_idea[first,title=32]"]["mbrMicroAlgo"] == first_registration_mbr(32)
@@ -0,0 +1,198 @@
+"""
+IdeaVault — Box-reference planner tests
+Random workloads checked against brute-force optima and lower bounds, and
+every planned transaction checked against the protocol limits. No LocalNet
+required.
+"""
+
+import hashlib
+import json
+import random
+from functools import lru_cache
+
+import pytest
+
+from box_planner import (
+    APP_CALL_BUDGET,
+    ASSUMED_BUDGET,
+    BOX_IO_QUOTA,
+    DEFAULT_BUDGET,
+    GET,
+    MAX_GROUP_SIZE,
+    MAX_HASHES_PER_READ,
+    MAX_TXN_REFERENCES,
+    MEASURED_BUDGET,
+    READ_METHODS,
+    REGISTER,
+    VERIFY,
+    BudgetModel,
+    Operation,
+    baseline_budget,
+    fit_budget,
+    layout_reads,
+    plan,
+    plan_reads,
+    plan_registers,
+    read_lower_bound,
+    register_block_costs,
+    register_group_size,
+)
+from idea_codec import MAX_RECORD_SIZE
+
+
+def op(kind: str, i: int, title: str = "") -> Operation:
+    return Operation(kind, hashlib.sha256(f"{kind}-{i}".encode()).digest(), title)
+
+
+def registers(count: int, title: str = "t" * 32) -> list[Operation]:
+    return [op(REGISTER, i, title=title) for i in range(count)]
+
+
+def brute_force_blocks(count: int, costs: list[int]) -> tuple[int, int]:
+    """(transactions, groups) of the best split, by enumerating every partition of count."""
+    largest = len(costs) - 1
+
+    @lru_cache(maxsize=None)
+    def best(n: int, cap: int) -> tuple[int, int]:
+        if n == 0:
+            return 0, 0
+        options = []
+        for k in range(min(n, cap), 0, -1):
+            txns, groups = best(n - k, k)
+            options.append((txns + costs[k], groups + 1))
+        return min(options)
+
+    return best(count, largest)
+
+
+def full_dp(count: int, costs: list[int]) -> int:
+    """Fewest transactions by a plain dynamic program over every count."""
+    largest = len(costs) - 1
+    dp = [0] + [0] * count
+    for n in range(1, count + 1):
+        dp[n] = min(dp[n - k] + costs[k] for k in range(1, min(n, largest) + 1))
+    return dp[count]
+
+
+def random_budget(rng: random.Random) -> BudgetModel:
+    return BudgetModel(per_call=rng.randint(0, 400), per_idea=rng.randint(30, 700 - 400))
+
+
+class TestRegisterPacking:
+
+    def test_assumed_budget_groups_of_48(self):
+        groups = plan_registers(registers(100), ASSUMED_BUDGET)
+        assert [len(g) for g in groups] == [48, 48, 4]
+        assert [register_group_size(g, ASSUMED_BUDGET) for g in groups] == [16, 16, 2]
+
+    def test_order_preserved(self):
+        ops = registers(250)
+        assert [o for g in plan_registers(ops) for o in g] == ops
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_matches_brute_force_optimum(self, seed):
+        rng = random.Random(seed)
+        budget = random_budget(rng)
+        separate_payer = rng.random() < 0.5
+        ops = registers(rng.randint(1, 60), title="x" * rng.randint(0, 64))
+        groups = plan_registers(ops, budget, separate_payer)
+        txns = sum(register_group_size(g, budget, separate_payer) for g in groups)
+        costs = register_block_costs(ops, budget, separate_payer)
+        assert (txns, len(groups)) == brute_force_blocks(len(ops), costs)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_large_workloads_keep_fewest_transactions(self, seed):
+        rng = random.Random(seed)
+        budget = random_budget(rng)
+        ops = registers(rng.randint(2_000, 6_000))
+        groups = plan_registers(ops, budget)
+        txns = sum(register_group_size(g, budget) for g in groups)
+        assert txns == full_dp(len(ops), register_block_costs(ops, budget))
+
+    def test_single_registration_that_cannot_fit(self):
+        with pytest.raises(ValueError, match="does not fit"):
+            plan_registers(registers(1), BudgetModel(per_call=0, per_idea=700 * MAX_GROUP_SIZE + 1))
+
+
+class TestReadPacking:
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_record_sized_boxes_meet_the_lower_bound(self, seed):
+        rng = random.Random(seed)
+        ops = [op(rng.choice([VERIFY, GET]), i) for i in range(rng.randint(1, 2_000))]
+        groups = plan_reads(ops)
+        txns = sum(g.size for g in groups)
+        assert txns == read_lower_bound(ops)
+        assert len(groups) == -(-txns // MAX_GROUP_SIZE)
+        assert all(g.size == len(g.calls) for g in groups)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_layouts_reference_their_own_boxes(self, seed):
+        rng = random.Random(seed)
+        ops = [op(rng.choice([VERIFY, GET]), i) for i in range(rng.randint(1, 400))]
+        groups = plan_reads(ops)
+        assert sorted(o.idea_hash for g in groups for c in g.calls for o in c) == sorted(o.idea_hash for o in ops)
+
+        for group in groups:
+            calls = layout_reads(group)
+            assert len(calls) == group.size <= MAX_GROUP_SIZE
+            for call in calls:
+                assert len(call.operations) <= MAX_HASHES_PER_READ <= MAX_TXN_REFERENCES
+                assert call.boxes == tuple(o.idea_hash for o in call.operations)
+                assert call.method == READ_METHODS[call.operations[0].kind]
+                assert {o.kind for o in call.operations} == {call.operations[0].kind}
+
+    def test_records_fit_one_reference(self):
+        # Why reads never need empty references for extra I/O quota
+        assert MAX_RECORD_SIZE <= BOX_IO_QUOTA
+
+    def test_rejects_writes(self):
+        with pytest.raises(ValueError, match="Not a read operation"):
+            plan_reads([op(REGISTER, 0)])
+
+
+class TestMixedPlan:
+
+    def test_registers_and_reads_planned_apart(self):
+        ops = registers(100) + [op(VERIFY, i) for i in range(20)] + [op(GET, i) for i in range(5)]
+        result = plan(ops, ASSUMED_BUDGET)
+        assert sum(len(g) for g in result.register_groups) == 100
+        assert result.register_transactions == 34
+        assert result.read_transactions == 3 + 1
+
+
+class TestBudgetModel:
+
+    def test_fit_is_exact_on_linear_costs(self):
+        assert fit_budget({1: 300, 2: 420, 3: 540}) == BudgetModel(per_call=180, per_idea=120)
+
+    def test_fit_covers_every_measurement(self):
+        consumed = {1: 310, 2: 415, 3: 541}
+        model = fit_budget(consumed)
+        assert all(model.per_call + model.per_idea * n >= cost for n, cost in consumed.items())
+        assert model == BudgetModel(per_call=194, per_idea=116)
+
+    def test_fit_needs_two_sizes(self):
+        with pytest.raises(ValueError, match="two batch sizes"):
+            fit_budget({3: 540})
+
+    def test_baseline_budget(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        assert baseline_budget(path) is None
+        measurements = {
+            "register_ideas_batch[n=1]": {"budget": 300, "feeMicroAlgo": 1000},
+            "register_ideas_batch[n=3]": {"budget": 540, "feeMicroAlgo": 1000},
+            "register_idea[title=0]": {"budget": 999},
+        }
+        path.write_text(json.dumps({"measurements": measurements}))
+        assert baseline_budget(path) == BudgetModel(per_call=180, per_idea=120)
+        del measurements["register_ideas_batch[n=3]"]["budget"]
+        path.write_text(json.dumps({"measurements": measurements}))
+        assert baseline_budget(path) is None
+
+    def test_default_prefers_the_measured_budget(self):
+        assert DEFAULT_BUDGET == (MEASURED_BUDGET or ASSUMED_BUDGET)
+
+    def test_baseline_records_batch_budgets(self):
+        assert MEASURED_BUDGET is not None
+        assert MEASURED_BUDGET.per_call + MEASURED_BUDGET.per_idea <= APP_CALL_BUDGET
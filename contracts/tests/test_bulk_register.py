@@ -0,0 +1,168 @@
+"""
+IdeaVault — Bulk registration tests
+Input parsing and index box planning for bulk_register. No LocalNet required.
+"""
+
+import hashlib
+import json
+
+import pytest
+from algosdk import account
+from algosdk.error import AlgodHTTPError
+
+import bulk_register
+from box_planner import APP_CALL_BUDGET, ASSUMED_BUDGET, DEFAULT_BUDGET, MAX_GROUP_SIZE, BudgetModel
+from bulk_register import (
+    ENTRIES_PER_GROUP,
+    MAX_BATCH_ENTRIES,
+    BulkEntry,
+    BulkRegistrar,
+    IndexCursor,
+    batch_calls,
+    estimate_mbr,
+    group_capacity,
+    parse_entry,
+    read_entries,
+)
+from idea_codec import (
+    FOUNDER_STATS_SIZE,
+    HEADER_SIZE,
+    box_mbr,
+    digest_to_cid,
+    founder_page_box_name,
+    page_box_name,
+)
+
+FOUNDER = bytes(range(32))
+DIGEST = hashlib.sha256(b"document").digest()
+CID = digest_to_cid(DIGEST)
+
+
+def idea_hash(label: str) -> bytes:
+    return hashlib.sha256(label.encode()).digest()
+
+
+class TestInput:
+
+    def test_jsonl_and_csv_parse_identically(self, tmp_path):
+        jsonl = tmp_path / "ideas.jsonl"
+        jsonl.write_text(
+            json.dumps({"ideaHash": idea_hash("a").hex(), "ipfsCid": CID, "title": "A"}) + "\n\n",
+            encoding="utf-8",
+        )
+        csv_file = tmp_path / "ideas.csv"
+        csv_file.write_text(f"idea_hash,ipfs_cid,title\n{idea_hash('a').hex()},{CID},A\n", encoding="utf-8")
+
+        expected = [BulkEntry(idea_hash("a"), DIGEST, "A")]
+        assert list(read_entries(jsonl)) == expected
+        assert list(read_entries(csv_file)) == expected
+
+    def test_long_title_truncated(self):
+        entry = parse_entry(idea_hash("long").hex(), CID, "é" * 40)
+        assert len(entry.title.encode("utf-8")) <= 64
+
+    def test_bad_hash_rejected(self):
+        with pytest.raises(ValueError):
+            parse_entry("abcd", CID, "Short hash")
+
+
+class TestPlanning:
+
+    def test_cursor_advances_across_calls(self):
+        cursor = IndexCursor(next_ordinal=30, founder=FOUNDER, founder_total=0)
+        batch = [BulkEntry(idea_hash(str(i)), DIGEST, "") for i in range(2 * MAX_BATCH_ENTRIES)]
+        first = cursor.take(batch[:MAX_BATCH_ENTRIES])
+        second = cursor.take(batch[MAX_BATCH_ENTRIES:])
+
+        assert first[:2] == [page_box_name(0), page_box_name(1)]
+        assert second[:2] == [page_box_name(1), page_box_name(2)]
+        assert founder_page_box_name(FOUNDER, 0) in second
+        assert cursor.next_ordinal == 36 and cursor.founder_total == 6
+        # Every call stays within the 8-reference limit
+        assert len(first) + MAX_BATCH_ENTRIES <= 8
+
+    @pytest.mark.parametrize("budget", [ASSUMED_BUDGET, DEFAULT_BUDGET, BudgetModel(per_call=89, per_idea=413)])
+    def test_group_fits_the_pooled_budget(self, budget):
+        capacity = group_capacity(budget)
+        calls = batch_calls(capacity, budget)
+        assert calls <= MAX_GROUP_SIZE and capacity <= calls * MAX_BATCH_ENTRIES
+        assert capacity * budget.per_idea + calls * budget.per_call <= calls * APP_CALL_BUDGET
+        assert capacity == ENTRIES_PER_GROUP or batch_calls(capacity + 1, budget) > MAX_GROUP_SIZE
+
+    def test_batch_calls(self):
+        # Three entries per call when the budget allows, more calls when it does not
+        assert batch_calls(48, ASSUMED_BUDGET) == 16
+        assert batch_calls(23, BudgetModel(per_call=89, per_idea=413)) == 16
+        assert group_capacity(BudgetModel(per_call=89, per_idea=413)) == 23
+        assert batch_calls(0) == 0
+
+    def test_cursor_skips_duplicates(self):
+        cursor = IndexCursor(next_ordinal=0, founder=FOUNDER, founder_total=5)
+        a, b = BulkEntry(idea_hash("a"), DIGEST, ""), BulkEntry(idea_hash("b"), DIGEST, "")
+        cursor.take([a, a, b])
+        cursor.take([b])
+        assert (cursor.next_ordinal, cursor.founder_total) == (2, 7)
+        # A confirmed call reported one hash as raced in by another writer
+        cursor.rewind(1)
+        assert (cursor.next_ordinal, cursor.founder_total) == (1, 6)
+
+    def test_mbr_estimate_covers_records_and_pages(self):
+        entries = [BulkEntry(idea_hash(str(i)), DIGEST, "") for i in range(33)]
+        assert estimate_mbr(entries) > 33 * box_mbr(HEADER_SIZE)
+        assert estimate_mbr(entries[:32]) < estimate_mbr(entries)
+
+    def test_mbr_estimate_counts_only_new_boxes(self):
+        entries = [BulkEntry(idea_hash(str(i)), DIGEST, "") for i in range(2)]
+        # Every idea adds a 32-byte hash slot and an 8-byte ordinal slot to the index pages
+        records = 2 * box_mbr(HEADER_SIZE) + 2 * 400 * (32 + 8)
+        stats = box_mbr(FOUNDER_STATS_SIZE, 33)
+        ordinal_page, founder_page = box_mbr(0, 9), box_mbr(0, 41)
+        # First ideas of the app and the founder: both first pages and the stats box
+        assert estimate_mbr(entries) == records + ordinal_page + founder_page + stats
+        # Mid-page for both indexes, founder already known: records and slots only
+        assert estimate_mbr(entries, next_ordinal=5, founder_total=3) == records
+        # The second entry opens a new ordinal page
+        assert estimate_mbr(entries, next_ordinal=31, founder_total=3) == records + ordinal_page
+        # Founder pages hold 128 ordinals, so 32 slots on no founder page opens
+        assert estimate_mbr(entries, next_ordinal=5, founder_total=31) == records
+        assert estimate_mbr(entries, next_ordinal=5, founder_total=127) == records + founder_page
+        assert estimate_mbr([], next_ordinal=0, founder_total=0) == 0
+
+
+class FakeAlgod:
+    """Just enough algod for BulkRegistrar.shortfall on an empty app."""
+
+    algod_address = "http://fake-algod"
+
+    def application_info(self, app_id):
+        return {"params": {"global-state": []}}
+
+    def application_box_by_name(self, app_id, name):
+        raise AlgodHTTPError("box not found", 404)
+
+    def account_info(self, address):
+        return {"amount": 200_000, "min-balance": 100_000}
+
+
+class TestRegistrar:
+
+    def test_check_verifies_once_for_shortfall_and_submit(self, monkeypatch):
+        registered = BulkEntry(idea_hash("on-chain"), DIGEST, "")
+        new = BulkEntry(idea_hash("new"), DIGEST, "")
+        passes = []
+
+        def verify_ideas(algod_client, app_id, hashes, sender=None):
+            passes.append(list(hashes))
+            return {h: h == registered.idea_hash for h in hashes}
+
+        monkeypatch.setattr(bulk_register, "verify_ideas", verify_ideas)
+        private_key, _ = account.generate_account()
+        registrar = BulkRegistrar(FakeAlgod(), 1, private_key)
+
+        pending, report = registrar.check([registered, new, new])
+        assert pending == [new]
+        assert (report.read, report.skipped) == (3, 2)
+        assert registrar.shortfall(pending) == estimate_mbr([new]) - 100_000
+        # Neither shortfall nor submit verifies again
+        registrar.submit([], report)
+        assert passes == [[registered.idea_hash, new.idea_hash]]
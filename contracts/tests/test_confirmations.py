@@ -0,0 +1,132 @@
+"""
+IdeaVault — Confirmation watcher tests
+Many pending transactions resolved from one status_after_block loop against
+a simulated chain: timeouts, rejections and the per-round call count. No
+LocalNet required.
+"""
+
+import threading
+from collections import Counter
+
+import pytest
+from algosdk.error import AlgodHTTPError
+
+from confirmations import ConfirmationTimeout, ConfirmationWatcher, TransactionRejected, watcher_for
+
+
+class FakeChain:
+    """Minimal algod double: a round advances on every status_after_block."""
+
+    algod_address = "http://localhost:4001"
+
+    def __init__(self, schedule: dict[str, int] | None = None, rejected: dict[str, str] | None = None):
+        self.round = 100
+        self.schedule = dict(schedule or {})  # txid → round it confirms in
+        self.rejected = dict(rejected or {})
+        self.calls = Counter()
+        self.running = threading.Event()
+        self.running.set()
+
+    def status(self):
+        self.calls["status"] += 1
+        return {"last-round": self.round}
+
+    def status_after_block(self, round_number):
+        self.calls["status_after_block"] += 1
+        self.running.wait(5)
+        self.round = max(self.round, round_number + 1)
+        return {"last-round": self.round}
+
+    def get_block_txids(self, round_number):
+        self.calls["get_block_txids"] += 1
+        return {"blockTxids": [txid for txid, at in self.schedule.items() if at == round_number]}
+
+    def pending_transaction_info(self, txid):
+        self.calls["pending_transaction_info"] += 1
+        if txid in self.rejected:
+            return {"pool-error": self.rejected[txid]}
+        confirmed = self.schedule.get(txid)
+        if confirmed is None:
+            raise AlgodHTTPError("txn not found", 404)
+        return {"confirmed-round": confirmed} if confirmed <= self.round else {"pool-error": ""}
+
+
+class LegacyChain(FakeChain):
+    """An algod client without the block txids endpoint."""
+
+    def __getattribute__(self, name):
+        if name == "get_block_txids":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+
+class TestWatcher:
+
+    def test_many_transactions_share_one_loop(self):
+        schedule = {f"TX{i}": 101 + i % 5 for i in range(200)}
+        chain = FakeChain(schedule)
+        watcher = ConfirmationWatcher(chain)
+        chain.running.clear()  # hold the chain until every txid is watched
+        futures = {txid: watcher.watch(txid, last_valid=200) for txid in schedule}
+        chain.running.set()
+
+        results = {txid: future.result(timeout=5) for txid, future in futures.items()}
+        assert all(results[txid]["confirmed-round"] == at for txid, at in schedule.items())
+        # One wait and one block listing per round, not per transaction
+        assert chain.calls["get_block_txids"] == watcher.rounds_scanned <= 6
+        assert chain.calls["status_after_block"] <= 6
+        assert watcher.pending() == 0
+
+    def test_expired_transactions_time_out(self):
+        chain = FakeChain({"LATE": 150})
+        watcher = ConfirmationWatcher(chain)
+        with pytest.raises(ConfirmationTimeout, match="last valid round 103"):
+            watcher.wait("LATE", last_valid=103, timeout=5)
+        assert chain.round == 103
+
+    def test_rejected_and_already_confirmed(self):
+        chain = FakeChain({"DONE": 90}, rejected={"BAD": "overspend"})
+        watcher = ConfirmationWatcher(chain)
+        assert watcher.wait("DONE", last_valid=1000, timeout=5) == {"confirmed-round": 90}
+        with pytest.raises(TransactionRejected, match="overspend"):
+            watcher.wait("BAD", last_valid=1000, timeout=5)
+
+    def test_watching_twice_shares_the_future(self):
+        watcher = ConfirmationWatcher(FakeChain({"TX": 102}))
+        first = watcher.watch("TX", 200)
+        assert watcher.watch("TX", 200) is first
+        assert first.result(timeout=5)["confirmed-round"] == 102
+
+    def test_later_pool_rejection_is_noticed(self):
+        chain = FakeChain()
+        watcher = ConfirmationWatcher(chain)
+        future = watcher.watch("EVICTED", last_valid=1000)
+        # Accepted at registration, dropped from the pool a round later
+        chain.rejected["EVICTED"] = "fee too small"
+        with pytest.raises(TransactionRejected, match="fee too small"):
+            future.result(timeout=5)
+        assert chain.round < 1000
+
+    def test_watching_after_close(self):
+        chain = FakeChain({"LATER": 150})
+        watcher = ConfirmationWatcher(chain)
+        cancelled = watcher.watch("NEVER", last_valid=10_000)
+        watcher.close()
+        assert cancelled.cancelled() and watcher.pending() == 0
+        assert watcher.wait("LATER", last_valid=1000, timeout=5)["confirmed-round"] == 150
+
+    def test_falls_back_without_block_txids(self):
+        schedule = {"A": 101, "B": 103}
+        watcher = ConfirmationWatcher(LegacyChain(schedule))
+        assert [watcher.wait(txid, 200, timeout=5)["confirmed-round"] for txid in schedule] == [101, 103]
+
+
+def test_one_watcher_per_network():
+    chain = FakeChain()
+    assert watcher_for(chain) is watcher_for(FakeChain())
+    other = FakeChain()
+    other.algod_address = "http://localhost:4002"
+    assert watcher_for(other) is not watcher_for(chain)
+    closed = watcher_for(chain)
+    closed.close()
+    assert watcher_for(chain) is not closed
@@ -0,0 +1,83 @@
+"""
+IdeaVault — Batch key conversion tests
+Streams JSONL / CSV records through convert_key.convert_batch with a process
+pool and checks the output file and error reporting. No LocalNet required.
+"""
+
+import csv
+import io
+import json
+import os
+
+import pytest
+from algosdk import account, mnemonic
+
+from convert_key import TARGETS, convert_batch, read_records
+
+
+@pytest.fixture(scope="module")
+def accounts():
+    return [account.generate_account() for _ in range(20)]
+
+
+def jsonl(records) -> io.StringIO:
+    return io.StringIO("".join(json.dumps(r) + "\n" for r in records))
+
+
+class TestBatch:
+
+    def test_mnemonics_to_keys_in_order(self, tmp_path, accounts):
+        records = [{"name": f"svc-{i}", "mnemonic": mnemonic.from_private_key(key)} for i, (key, _) in enumerate(accounts)]
+        output = tmp_path / "keys.jsonl"
+        report = convert_batch(read_records(jsonl(records), False), output, TARGETS["key"], workers=2, chunk_size=3)
+
+        assert (report.records, report.converted, report.errors) == (20, 20, [])
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [(r["name"], r["address"], r["privateKey"]) for r in rows] == [
+            (f"svc-{i}", address, key) for i, (key, address) in enumerate(accounts)
+        ]
+        assert all("mnemonic" not in r for r in rows)
+        assert os.stat(output).st_mode & 0o777 == 0o600
+
+    def test_csv_keys_to_both(self, tmp_path, accounts):
+        source = io.StringIO("address,private_key\n" + "".join(f"{a},{k}\n" for k, a in accounts[:5]))
+        output = tmp_path / "out.csv"
+        report = convert_batch(read_records(source, True), output, TARGETS["both"], workers=1)
+        assert report.converted == 5
+        rows = list(csv.DictReader(output.open()))
+        assert [mnemonic.to_private_key(r["mnemonic"]) for r in rows] == [k for k, _ in accounts[:5]]
+
+    def test_bad_records_reported_without_secrets(self, tmp_path, accounts):
+        key, address = accounts[0]
+        other = accounts[1][1]
+        words = mnemonic.from_private_key(key).split()
+        bad_checksum = " ".join(words[:-1] + [words[0] if words[-1] != words[0] else words[1]])
+        records = [
+            {"mnemonic": bad_checksum},
+            {"privateKey": "not base64!"},
+            {"privateKey": key, "address": other},
+            {"name": "nothing"},
+            {"privateKey": key},
+        ]
+        source = jsonl(records)
+        source = io.StringIO(source.getvalue() + "{broken json\n")
+        report = convert_batch(read_records(source, False), tmp_path / "out.jsonl", workers=1)
+
+        assert report.converted == 1
+        assert [line for line, _ in report.errors] == [1, 2, 3, 4, 6]
+        messages = " ".join(message for _, message in report.errors)
+        assert key not in messages and bad_checksum not in messages
+        assert "address does not match" in messages
+
+    def test_output_replaced_only_when_complete(self, tmp_path):
+        output = tmp_path / "out.jsonl"
+        output.write_text("previous\n")
+
+        def failing_source():
+            yield 1, json.dumps({"name": "x"})
+            raise OSError("input vanished")
+
+        with pytest.raises(OSError):
+            convert_batch(failing_source(), output, workers=1)
+        assert output.read_text() == "previous\n"
+        assert list(tmp_path.iterdir()) == [output]
@@ -0,0 +1,128 @@
+"""
+IdeaVault — Idempotent deploy tests
+Plans create / update / no-op against an algod double, and checks the
+deployment manifest and multi-network fan-out. No LocalNet required.
+"""
+
+import base64
+import threading
+
+import pytest
+from algosdk.error import AlgodHTTPError
+
+import deploy
+from deploy import CREATE, NOOP, UPDATE, DeploymentManifest, known_app_id, plan_deployment
+from registry_spec import RegistrySpec
+
+SENDER = "DEPLOYER"
+
+
+def make_spec(approval: bytes = b"approval-v2", updatable: bool = False) -> RegistrySpec:
+    return RegistrySpec("IdeaRegistry", {}, {}, approval, b"clear", updatable)
+
+
+class AppAlgod:
+    """Minimal algod double: one live app, counting lookups."""
+
+    def __init__(self, apps: dict[int, tuple[bytes, bytes]], creator: str = SENDER):
+        self.apps = apps
+        self.creator = creator
+        self.lookups = 0
+
+    def application_info(self, app_id):
+        self.lookups += 1
+        if app_id not in self.apps:
+            raise AlgodHTTPError("application does not exist", 404)
+        approval, clear = self.apps[app_id]
+        return {"id": app_id, "params": {
+            "creator": self.creator,
+            "approval-program": base64.b64encode(approval).decode(),
+            "clear-state-program": base64.b64encode(clear).decode(),
+        }}
+
+
+class TestPlan:
+
+    def test_identical_programs_are_a_noop(self):
+        algod = AppAlgod({7: (b"approval-v2", b"clear")})
+        plan = plan_deployment(algod, make_spec(), 7, SENDER)
+        assert (plan.action, plan.app_id) == (NOOP, 7)
+        assert algod.lookups == 1
+
+    def test_changed_programs_update_an_updatable_app(self):
+        algod = AppAlgod({7: (b"approval-v1", b"clear")})
+        plan = plan_deployment(algod, make_spec(updatable=True), 7, SENDER)
+        assert (plan.action, plan.app_id) == (UPDATE, 7)
+
+    def test_changed_programs_recreate_a_fixed_app(self):
+        algod = AppAlgod({7: (b"approval-v1", b"clear")})
+        plan = plan_deployment(algod, make_spec(), 7, SENDER)
+        assert (plan.action, plan.app_id) == (CREATE, None)
+        assert "rejects updates" in plan.reason
+
+    def test_missing_app_is_created(self):
+        assert plan_deployment(AppAlgod({}), make_spec(), 7, SENDER).action == CREATE
+        algod = AppAlgod({})
+        assert plan_deployment(algod, make_spec(), None, SENDER).action == CREATE
+        assert algod.lookups == 0
+
+    def test_update_requires_the_creator(self):
+        algod = AppAlgod({7: (b"approval-v1", b"clear")}, creator="SOMEONE ELSE")
+        with pytest.raises(ValueError, match="created by"):
+            plan_deployment(algod, make_spec(updatable=True), 7, SENDER)
+
+    def test_other_errors_propagate(self):
+        class DownAlgod:
+            def application_info(self, app_id):
+                raise AlgodHTTPError("unavailable", 503)
+
+        with pytest.raises(AlgodHTTPError):
+            plan_deployment(DownAlgod(), make_spec(), 7, SENDER)
+
+
+class TestManifest:
+
+    def test_latest_per_network(self, tmp_path):
+        manifest = DeploymentManifest(tmp_path / "deployments.json")
+        assert manifest.latest("testnet") is None
+        manifest.record("testnet", {"appId": 1, "action": CREATE})
+        manifest.record("localnet", {"appId": 5, "action": CREATE})
+        manifest.record("testnet", {"appId": 2, "action": CREATE})
+        assert manifest.latest("testnet")["appId"] == 2
+        assert [entry["appId"] for entry in manifest.load()["testnet"]] == [1, 2]
+        assert list(tmp_path.iterdir()) == [tmp_path / "deployments.json"]
+
+    def test_concurrent_records_all_kept(self, tmp_path):
+        manifest = DeploymentManifest(tmp_path / "deployments.json")
+        threads = [
+            threading.Thread(target=manifest.record, args=(f"net{i % 3}", {"appId": i})) for i in range(30)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sum(len(entries) for entries in manifest.load().values()) == 30
+
+    def test_manifest_before_env(self, tmp_path):
+        manifest = DeploymentManifest(tmp_path / "deployments.json")
+        assert known_app_id(manifest, "testnet", "42") == 42
+        assert known_app_id(manifest, "testnet", "0") is None
+        assert known_app_id(manifest, "testnet") is None
+        manifest.record("testnet", {"appId": 9})
+        assert known_app_id(manifest, "testnet", "42") == 9
+
+
+def test_networks_deployed_concurrently(monkeypatch):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_deploy(network, app_id=None, **kwargs):
+        barrier.wait()  # only passes if all three run at once
+        if network == "mainnet":
+            raise RuntimeError("insufficient balance")
+        return app_id or 100
+
+    monkeypatch.setattr(deploy, "deploy", fake_deploy)
+    results = deploy.deploy_networks(["localnet", "testnet", "mainnet"], {"testnet": 7})
+    assert results["localnet"] == 100
+    assert results["testnet"] == 7
+    assert isinstance(results["mainnet"], RuntimeError)
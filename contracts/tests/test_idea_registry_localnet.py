@@ -0,0 +1,604 @@
+"""
+IdeaVault — IdeaRegistry LocalNet Tests
+End-to-end checks against a real node: box references, fees, logs and the
+off-chain tooling. Opt-in, since every call waits for a block; run with
+`pytest --localnet` after `algokit localnet start`.
+"""
+
+import pytest
+import base64
+import hashlib
+import time
+
+pytest.importorskip("algokit_utils", reason="LocalNet tests need algokit-utils")
+
+from algokit_utils import (  # noqa: E402
+    AlgoAmount,
+    AlgorandClient,
+    AppClient,
+    AppClientMethodCallParams,
+    AppFactoryCreateMethodCallParams,
+    BoxReference,
+    PaymentParams,
+    SigningAccount,
+)
+from algosdk import encoding  # noqa: E402
+from idea_codec import (  # noqa: E402
+    HASHES_PER_PAGE,
+    ORDINALS_PER_PAGE,
+    cid_to_digest,
+    decode_record,
+    digest_to_cid,
+    founder_page_box_name,
+    founder_stats_box_name,
+    page_box_name,
+    register_founder_names,
+    register_page_names,
+)
+from registry_client import (  # noqa: E402
+    MAX_GROUP_SIZE,
+    MAX_HASHES_PER_CALL,
+    deletion_box_names,
+    get_ideas as client_get_ideas,
+    read_founder_stats,
+    read_global_state,
+    registration_box_names,
+    verify_ideas as client_verify_ideas,
+)
+from registry_spec import ARC56_PATH  # noqa: E402
+
+pytestmark = pytest.mark.localnet
+
+
+class RegistryAppClient:
+    """IdeaRegistry ABI calls by method name on an algokit-utils 4.x AppClient."""
+
+    def __init__(self, client: AppClient):
+        self.client = client
+        self.app_id = client.app_id
+        self.app_address = client.app_address
+
+    def send(self, method: str, args: tuple = (), boxes: list = ()):
+        """Send (or simulate, for readonly methods) one call; `boxes` are (app_id, name) pairs."""
+        return self.client.send.call(AppClientMethodCallParams(
+            method=method,
+            args=list(args),
+            box_references=[BoxReference(app_id=app_id, name=name) for app_id, name in boxes],
+        ))
+
+
+def fund(algorand: AlgorandClient, receiver: str, algo: int = 10) -> None:
+    algorand.send.payment(PaymentParams(
+        sender=algorand.account.localnet_dispenser().address,
+        receiver=receiver,
+        amount=AlgoAmount.from_algo(algo),
+    ))
+
+
+@pytest.fixture(scope="session")
+def algorand() -> AlgorandClient:
+    """Connect to AlgoKit LocalNet."""
+    return AlgorandClient.default_localnet()
+
+
+@pytest.fixture(scope="session")
+def founder(algorand: AlgorandClient) -> SigningAccount:
+    """Create and fund test founder account."""
+    account = algorand.account.random()
+    fund(algorand, account.address)
+    return account
+
+
+@pytest.fixture(scope="session")
+def other_user(algorand: AlgorandClient) -> SigningAccount:
+    """Create a second test account."""
+    account = algorand.account.random()
+    fund(algorand, account.address)
+    return account
+
+
+@pytest.fixture(scope="session")
+def idea_hash() -> bytes:
+    """Generate a deterministic test idea hash."""
+    content = "My Amazing AI Startup Idea 2026-02-19T18:00:00"
+    return hashlib.sha256(content.encode()).digest()  # 32 bytes
+
+
+@pytest.fixture(scope="session")
+def ipfs_cid() -> str:
+    """CIDv0 of the test idea's pitch document."""
+    return make_cid("My Amazing AI Startup Idea pitch deck")
+
+
+@pytest.fixture(scope="session")
+def app_client(algorand: AlgorandClient, founder: SigningAccount) -> RegistryAppClient:
+    """Deploy IdeaRegistry contract to LocalNet and return client."""
+    factory = algorand.client.get_app_factory(
+        app_spec=ARC56_PATH.read_text(encoding="utf-8"),
+        default_sender=founder.address,
+        default_signer=founder.signer,
+    )
+    client, _ = factory.send.create(AppFactoryCreateMethodCallParams(method="create_application"))
+    # Fund the app account so it can cover box minimum-balance requirements
+    fund(algorand, client.app_address)
+    return RegistryAppClient(client)
+
+
+@pytest.fixture
+def register_boxes(algorand: AlgorandClient, app_client, founder: SigningAccount):
+    """Box references for a registration by `founder`: the idea boxes plus the index boxes."""
+    def boxes(*idea_hashes: bytes) -> list:
+        names = list(idea_hashes) + registration_box_names(
+            algorand.client.algod, app_client.app_id, founder.address
+        )
+        return [(app_client.app_id, name) for name in names]
+    return boxes
+
+
+def make_cid(label: str) -> str:
+    """Build a valid CIDv0 string for a synthetic document."""
+    return digest_to_cid(hashlib.sha256(label.encode()).digest())
+
+
+def cid_arg(cid: str) -> list[int]:
+    """Encode a CIDv0 as the byte[32] digest argument the contract expects."""
+    return list(cid_to_digest(cid))
+
+
+def make_hashes(label: str, count: int) -> list[bytes]:
+    """Build `count` distinct deterministic 32-byte idea hashes."""
+    return [hashlib.sha256(f"{label}-{i}".encode()).digest() for i in range(count)]
+
+
+def txn_fee(result) -> int:
+    """Extract the fee paid by a confirmed app call."""
+    return result.confirmation["txn"]["txn"].get("fee", 0)
+
+
+class TestIdeaRegistry:
+
+    def test_initial_total_is_zero(self, app_client):
+        """Contract should start with total_ideas = 0."""
+        result = app_client.send("get_total_ideas")
+        assert result.abi_return == 0, "Initial total_ideas should be 0"
+
+    def test_register_idea_success(self, register_boxes, app_client, founder, idea_hash, ipfs_cid):
+        """
+        Registering a new idea should:
+        - Return a non-zero timestamp
+        - Increment total_ideas to 1
+        """
+        result = app_client.send(
+            "register_idea",
+            args=(
+                list(idea_hash),  # 32-byte array
+                cid_arg(ipfs_cid),                    # cid_digest
+                "My Amazing AI Startup Idea",         # title preview
+            ),
+            # Box reference needed for Box storage writes
+            boxes=register_boxes(idea_hash),
+        )
+        timestamp = result.abi_return
+        assert timestamp > 0, "Timestamp should be > 0"
+
+        # Verify counter incremented
+        total = app_client.send("get_total_ideas")
+        assert total.abi_return == 1
+
+    def test_duplicate_hash_rejected(self, register_boxes, app_client, idea_hash):
+        """
+        Submitting the same hash twice should fail with ERR:DUPLICATE_HASH.
+        This is the core anti-theft protection.
+        """
+        with pytest.raises(Exception, match="Idea hash already registered"):
+            app_client.send(
+                "register_idea",
+                args=(
+                    list(idea_hash),
+                    cid_arg(make_cid("different document")),
+                    "Same idea title",
+                ),
+                boxes=register_boxes(idea_hash),
+            )
+
+    def test_verify_registered_idea_returns_true(self, app_client, idea_hash):
+        """verify_idea should return True for a registered hash."""
+        result = app_client.send(
+            "verify_idea",
+            args=(list(idea_hash),),
+            boxes=[(app_client.app_id, idea_hash)],
+        )
+        assert result.abi_return is True
+
+    def test_verify_unknown_hash_returns_false(self, app_client):
+        """verify_idea should return False for an unregistered hash."""
+        unknown_hash = hashlib.sha256(b"some unknown idea").digest()
+        result = app_client.send(
+            "verify_idea",
+            args=(list(unknown_hash),),
+            boxes=[(app_client.app_id, unknown_hash)],
+        )
+        assert result.abi_return is False
+
+    def test_get_idea_returns_correct_data(self, app_client, founder, idea_hash, ipfs_cid):
+        """get_idea should return (founder_address, timestamp, cid_digest)."""
+        result = app_client.send(
+            "get_idea",
+            args=(list(idea_hash),),
+            boxes=[(app_client.app_id, idea_hash)],
+        )
+        addr, timestamp, cid_digest = result.abi_return
+        assert addr == founder.address
+        assert timestamp > 0
+        assert digest_to_cid(bytes(cid_digest)) == ipfs_cid
+
+    def test_get_nonexistent_idea_fails(self, app_client):
+        """get_idea on unknown hash should fail with ERR:IDEA_NOT_FOUND."""
+        missing_hash = hashlib.sha256(b"not registered").digest()
+        with pytest.raises(Exception, match="ERR:IDEA_NOT_FOUND"):
+            app_client.send(
+                "get_idea",
+                args=(list(missing_hash),),
+                boxes=[(app_client.app_id, missing_hash)],
+            )
+
+    def test_second_idea_increments_counter(self, register_boxes, app_client):
+        """Registering a second idea should increment counter to 2."""
+        new_hash = hashlib.sha256(b"Second Unique Idea 2026").digest()
+        app_client.send(
+            "register_idea",
+            args=(
+                list(new_hash),
+                cid_arg(make_cid("second document")),
+                "Second Startup Idea",
+            ),
+            boxes=register_boxes(new_hash),
+        )
+        total = app_client.send("get_total_ideas")
+        assert total.abi_return == 2
+
+
+class TestBatchRegistration:
+
+    BATCH_SIZE = 3  # one box reference per entry plus five index boxes; 8 references per transaction
+
+    def test_batch_registers_every_entry(self, register_boxes, app_client):
+        """A batch of new hashes should register all of them in one call."""
+        hashes = make_hashes("batch-new", self.BATCH_SIZE)
+        before = app_client.send("get_total_ideas").abi_return
+
+        result = app_client.send(
+            "register_ideas_batch",
+            args=([(list(h), cid_arg(make_cid(f"batch document {i}")), f"Batch idea {i}") for i, h in enumerate(hashes)],),
+            boxes=register_boxes(*hashes),
+        )
+        timestamps, duplicates = result.abi_return
+        assert len(timestamps) == self.BATCH_SIZE
+        assert all(ts > 0 for ts in timestamps)
+        assert not any(duplicates)
+
+        after = app_client.send("get_total_ideas").abi_return
+        assert after == before + self.BATCH_SIZE
+
+        for h in hashes:
+            verified = app_client.send(
+                "verify_idea",
+                args=(list(h),),
+                boxes=[(app_client.app_id, h)],
+            )
+            assert verified.abi_return is True
+
+    def test_batch_flags_duplicates_without_aborting(self, register_boxes, app_client, idea_hash):
+        """Already-registered hashes are reported in the bitmap, not rejected."""
+        fresh = make_hashes("batch-mixed", 2)
+        entries = [fresh[0], idea_hash, fresh[1]]
+        before = app_client.send("get_total_ideas").abi_return
+
+        result = app_client.send(
+            "register_ideas_batch",
+            args=([(list(h), cid_arg(make_cid("mixed document")), "Mixed batch") for h in entries],),
+            boxes=register_boxes(*entries),
+        )
+        timestamps, duplicates = result.abi_return
+        assert list(duplicates) == [False, True, False]
+        assert timestamps[1] == 0
+        assert timestamps[0] > 0 and timestamps[2] > 0
+
+        after = app_client.send("get_total_ideas").abi_return
+        assert after == before + 2
+
+    def test_batch_throughput_and_fees_beat_single_calls(self, algorand, register_boxes, app_client, founder):
+        """
+        Registering N ideas in one batch call should cost less per idea and
+        achieve higher ideas/second than N individual register_idea calls.
+        """
+        n = self.BATCH_SIZE
+
+        single_hashes = make_hashes("throughput-single", n)
+        # Resolve box references up front so state reads don't count against single calls
+        algod = algorand.client.algod
+        next_ordinal = read_global_state(algod, app_client.app_id)["next_ordinal"]
+        founder_total, _ = read_founder_stats(algod, app_client.app_id, founder.address)
+        founder_key = encoding.decode_address(founder.address)
+        single_boxes = [
+            [
+                (app_client.app_id, name)
+                for name in [
+                    h,
+                    *register_page_names(next_ordinal + i),
+                    *register_founder_names(founder_key, founder_total + i),
+                ]
+            ]
+            for i, h in enumerate(single_hashes)
+        ]
+        single_fees = 0
+        start = time.perf_counter()
+        for i, h in enumerate(single_hashes):
+            result = app_client.send(
+                "register_idea",
+                args=(list(h), cid_arg(make_cid(f"single document {i}")), f"Single idea {i}"),
+                boxes=single_boxes[i],
+            )
+            single_fees += txn_fee(result)
+        single_elapsed = time.perf_counter() - start
+
+        batch_hashes = make_hashes("throughput-batch", n)
+        batch_boxes = register_boxes(*batch_hashes)
+        start = time.perf_counter()
+        result = app_client.send(
+            "register_ideas_batch",
+            args=([(list(h), cid_arg(make_cid(f"batch document {i}")), f"Batch idea {i}") for i, h in enumerate(batch_hashes)],),
+            boxes=batch_boxes,
+        )
+        batch_elapsed = time.perf_counter() - start
+        batch_fees = txn_fee(result)
+
+        single_rate = n / single_elapsed
+        batch_rate = n / batch_elapsed
+        single_fee_per_idea = single_fees / n
+        batch_fee_per_idea = batch_fees / n
+        print(
+            f"\nsingle: {single_rate:.1f} ideas/s, {single_fee_per_idea:.0f} µALGO/idea"
+            f"\nbatch:  {batch_rate:.1f} ideas/s, {batch_fee_per_idea:.0f} µALGO/idea"
+        )
+
+        assert batch_fee_per_idea < single_fee_per_idea
+        assert batch_rate > single_rate
+
+
+class TestBulkReads:
+
+    def test_verify_ideas_mixed(self, app_client, idea_hash):
+        """verify_ideas returns one flag per hash, in order."""
+        unknown = hashlib.sha256(b"bulk unknown idea").digest()
+        hashes = [idea_hash, unknown]
+        result = app_client.send(
+            "verify_ideas",
+            args=([list(h) for h in hashes],),
+            boxes=[(app_client.app_id, h) for h in hashes],
+        )
+        assert list(result.abi_return) == [True, False]
+
+    def test_get_ideas_does_not_abort_on_missing(self, app_client, founder, idea_hash, ipfs_cid):
+        """get_ideas returns found=False rows for unknown hashes instead of failing."""
+        unknown = hashlib.sha256(b"bulk missing idea").digest()
+        hashes = [idea_hash, unknown]
+        result = app_client.send(
+            "get_ideas",
+            args=([list(h) for h in hashes],),
+            boxes=[(app_client.app_id, h) for h in hashes],
+        )
+        (found, addr, timestamp, cid_digest), (missing_found, *_rest) = result.abi_return
+        assert found is True
+        assert addr == founder.address
+        assert timestamp > 0
+        assert digest_to_cid(bytes(cid_digest)) == ipfs_cid
+        assert missing_found is False
+
+    def test_client_reads_span_groups_in_one_simulate(self, algorand, app_client, idea_hash):
+        """registry_client sends every 16-call group in a single simulate request."""
+        hashes = [idea_hash] + make_hashes("bulk-groups", 2 * MAX_GROUP_SIZE * MAX_HASHES_PER_CALL)
+        flags = client_verify_ideas(algorand.client.algod, app_client.app_id, hashes)
+        assert flags == {h: h == idea_hash for h in hashes}
+        records = client_get_ideas(algorand.client.algod, app_client.app_id, hashes[:2])
+        assert records[idea_hash] is not None and records[hashes[1]] is None
+
+    def test_verify_ideas_rejects_oversized_call(self, app_client):
+        """A single call is capped at 8 hashes (one box reference each)."""
+        hashes = make_hashes("bulk-oversized", 9)
+        with pytest.raises(Exception, match="Too many hashes for one call"):
+            app_client.send(
+                "verify_ideas",
+                args=([list(h) for h in hashes],),
+                boxes=[(app_client.app_id, h) for h in hashes[:8]],
+            )
+
+
+class TestRecordLayout:
+
+    def test_box_uses_v1_fixed_layout(self, algorand, app_client, founder, idea_hash, ipfs_cid):
+        """The stored box value decodes with idea_codec at fixed offsets."""
+        value = algorand.client.algod.application_box_by_name(app_client.app_id, idea_hash)["value"]
+        record = decode_record(base64.b64decode(value))
+        assert record.founder_address == founder.address
+        assert record.ipfs_cid == ipfs_cid
+        assert record.title == "My Amazing AI Startup Idea"
+
+    def test_title_over_64_bytes_rejected(self, register_boxes, app_client):
+        """Titles longer than the fixed 64-byte limit are rejected."""
+        new_hash = hashlib.sha256(b"Long title idea").digest()
+        with pytest.raises(Exception, match="Title preview must be at most 64 bytes"):
+            app_client.send(
+                "register_idea",
+                args=(list(new_hash), cid_arg(make_cid("long title")), "x" * 65),
+                boxes=register_boxes(new_hash),
+            )
+
+    def test_import_keeps_legacy_founder_and_timestamp(self, algorand, app_client, other_user):
+        """import_idea (creator only) stores and indexes an idea under its original founder and time."""
+        algod = algorand.client.algod
+        new_hash = hashlib.sha256(b"Imported legacy idea").digest()
+        cid = make_cid("imported document")
+        names = [new_hash] + registration_box_names(algod, app_client.app_id, other_user.address)
+        app_client.send(
+            "import_idea",
+            args=(list(new_hash), other_user.address, 1_700_000_000, cid_arg(cid), "Legacy idea"),
+            boxes=[(app_client.app_id, name) for name in names],
+        )
+        result = app_client.send("get_idea", args=(list(new_hash),), boxes=[(app_client.app_id, new_hash)])
+        founder, timestamp, cid_digest = result.abi_return
+        assert (founder, timestamp, bytes(cid_digest)) == (other_user.address, 1_700_000_000, cid_to_digest(cid))
+        assert read_founder_stats(algod, app_client.app_id, other_user.address)[1] >= 1
+
+        with pytest.raises(Exception, match="already registered"):
+            app_client.send(
+                "import_idea",
+                args=(list(new_hash), other_user.address, 1_700_000_000, cid_arg(cid), "Legacy idea"),
+                boxes=[(app_client.app_id, name) for name in names],
+            )
+
+
+class TestEvents:
+
+    def test_register_and_delete_emit_arc28_events(self, algorand, register_boxes, app_client, founder):
+        """register_idea emits IdeaRegistered and delete_idea emits IdeaDeleted."""
+        from idea_events import IdeaDeletedEvent, IdeaRegisteredEvent, decode_logs
+
+        algod = algorand.client.algod
+        new_hash = hashlib.sha256(b"Evented idea").digest()
+        cid = make_cid("evented document")
+        result = app_client.send(
+            "register_idea",
+            args=(list(new_hash), cid_arg(cid), "Evented idea"),
+            boxes=register_boxes(new_hash),
+        )
+        logs = [base64.b64decode(entry) for entry in result.confirmation["logs"]]
+        (event,) = decode_logs(logs)
+        assert isinstance(event, IdeaRegisteredEvent)
+        assert event.idea_hash == new_hash
+        assert event.founder == encoding.decode_address(founder.address)
+        assert event.timestamp == result.abi_return
+        assert event.ipfs_cid == cid
+
+        result = app_client.send(
+            "delete_idea",
+            args=(list(new_hash),),
+            boxes=[(app_client.app_id, name) for name in deletion_box_names(algod, app_client.app_id, new_hash)],
+        )
+        logs = [base64.b64decode(entry) for entry in result.confirmation["logs"]]
+        assert decode_logs(logs) == [IdeaDeletedEvent(new_hash, encoding.decode_address(founder.address))]
+
+
+class TestOrdinalIndex:
+
+    def test_list_ideas_pages_through_registrations(self, algorand, register_boxes, app_client):
+        """list_ideas returns hashes in registration order and never crosses a page."""
+        new_hash = hashlib.sha256(b"Listed idea").digest()
+        app_client.send(
+            "register_idea",
+            args=(list(new_hash), cid_arg(make_cid("listed document")), "Listed idea"),
+            boxes=register_boxes(new_hash),
+        )
+        next_ordinal = read_global_state(algorand.client.algod, app_client.app_id)["next_ordinal"]
+        last_page = (next_ordinal - 1) // HASHES_PER_PAGE
+        page_start = last_page * HASHES_PER_PAGE
+
+        result = app_client.send(
+            "list_ideas",
+            args=(page_start, HASHES_PER_PAGE * 2),
+            boxes=[(app_client.app_id, page_box_name(last_page))],
+        )
+        hashes, end = result.abi_return
+        assert end == next_ordinal
+        assert bytes(hashes[-1]) == new_hash
+        assert len(hashes) == next_ordinal - page_start
+
+    def test_enumerator_yields_registered_ideas(self, algorand, app_client):
+        """box_enumerator walks the page index and skips deleted ideas."""
+        from box_enumerator import enumerate_ideas
+
+        ideas = dict(enumerate_ideas(algorand.client.algod, app_client.app_id))
+        assert len(ideas) == app_client.send("get_total_ideas").abi_return
+        assert hashlib.sha256(b"Listed idea").digest() in ideas
+
+
+class TestFounderIndex:
+
+    def test_founder_ideas_listed_oldest_first(self, algorand, register_boxes, app_client, founder):
+        """get_founder_ideas pages through the ordinals of the founder's ideas in one box read."""
+        algod = algorand.client.algod
+        founder_key = encoding.decode_address(founder.address)
+        before, live_before = read_founder_stats(algod, app_client.app_id, founder.address)
+
+        new_hash = hashlib.sha256(b"Founder indexed idea").digest()
+        app_client.send(
+            "register_idea",
+            args=(list(new_hash), cid_arg(make_cid("founder document")), "Founder idea"),
+            boxes=register_boxes(new_hash),
+        )
+
+        next_ordinal = read_global_state(algod, app_client.app_id)["next_ordinal"]
+
+        page = before // ORDINALS_PER_PAGE
+        result = app_client.send(
+            "get_founder_ideas",
+            args=(founder.address, page * ORDINALS_PER_PAGE, ORDINALS_PER_PAGE),
+            boxes=[
+                (app_client.app_id, founder_stats_box_name(founder_key)),
+                (app_client.app_id, founder_page_box_name(founder_key, page)),
+            ],
+        )
+        ordinals, next_offset, live = result.abi_return
+        assert next_offset == before + 1
+        assert live == live_before + 1
+        assert ordinals[-1] == next_ordinal - 1
+
+    def test_founder_enumerator_resolves_ordinals(self, algorand, app_client, founder):
+        """box_enumerator maps the founder's ordinals back to their hashes."""
+        from box_enumerator import iter_founder_hashes
+
+        hashes = list(iter_founder_hashes(algorand.client.algod, app_client.app_id, founder.address))
+        assert hashlib.sha256(b"Founder indexed idea").digest() in hashes
+
+    def test_unknown_founder_has_no_ideas(self, app_client, other_user):
+        """A founder without registrations yields an empty list, not an error."""
+        other_key = encoding.decode_address(other_user.address)
+        result = app_client.send(
+            "get_founder_ideas",
+            args=(other_user.address, 0, ORDINALS_PER_PAGE),
+            boxes=[(app_client.app_id, founder_stats_box_name(other_key))],
+        )
+        assert result.abi_return == ([], 0, 0)
+
+    def test_delete_drops_idea_from_founder_list(self, algorand, register_boxes, app_client, founder):
+        """Deleting tombstones the founder slot, so get_founder_ideas no longer returns it."""
+        algod = algorand.client.algod
+        founder_key = encoding.decode_address(founder.address)
+        new_hash = hashlib.sha256(b"Founder deleted idea").digest()
+        app_client.send(
+            "register_idea",
+            args=(list(new_hash), cid_arg(make_cid("deleted document")), "Deleted idea"),
+            boxes=register_boxes(new_hash),
+        )
+        ordinal = read_global_state(algod, app_client.app_id)["next_ordinal"] - 1
+        total, live = read_founder_stats(algod, app_client.app_id, founder.address)
+
+        app_client.send(
+            "delete_idea",
+            args=(list(new_hash),),
+            boxes=[(app_client.app_id, name) for name in deletion_box_names(algod, app_client.app_id, new_hash)],
+        )
+        assert read_founder_stats(algod, app_client.app_id, founder.address) == (total, live - 1)
+
+        page = (total - 1) // ORDINALS_PER_PAGE
+        result = app_client.send(
+            "get_founder_ideas",
+            args=(founder.address, page * ORDINALS_PER_PAGE, ORDINALS_PER_PAGE),
+            boxes=[
+                (app_client.app_id, founder_stats_box_name(founder_key)),
+                (app_client.app_id, founder_page_box_name(founder_key, page)),
+            ],
+        )
+        ordinals, next_offset, _ = result.abi_return
+        assert next_offset == total
+        assert ordinal not in ordinals
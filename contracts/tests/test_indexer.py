@@ -0,0 +1,230 @@
+"""
+IdeaVault — Indexer tests
+Replays synthetic blocks shaped like algod's JSON block response through the
+indexer. No LocalNet required.
+"""
+
+import base64
+import hashlib
+import json
+
+import pytest
+
+from idea_codec import digest_to_cid
+from idea_events import (
+    IDEA_DELETED,
+    IDEA_REGISTERED,
+    IdeaDeletedEvent,
+    IdeaRegisteredEvent,
+    decode_block,
+    decode_registered_payload,
+)
+from indexer import (
+    ABI_RETURN_PREFIX,
+    DELETE_IDEA,
+    LOG_PREFIX,
+    REGISTER_IDEA,
+    REGISTER_IDEA_STRING_CID,
+    REGISTER_IDEAS_BATCH,
+    IdeaIndex,
+    iter_block_fixture,
+)
+
+APP_ID = 1234
+FOUNDER = bytes(range(32))
+TIMESTAMP = 1_771_000_000
+
+
+def b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def abi_string(text: str) -> bytes:
+    encoded = text.encode()
+    return len(encoded).to_bytes(2, "big") + encoded
+
+
+def registered_log(timestamp: int = TIMESTAMP) -> bytes:
+    return LOG_PREFIX + FOUNDER + b":" + timestamp.to_bytes(8, "big")
+
+
+def digest(label: str) -> bytes:
+    return hashlib.sha256(label.encode()).digest()
+
+
+def app_call(args: list[bytes], logs: list[bytes], app_id: int = APP_ID) -> dict:
+    return {
+        "txn": {"type": "appl", "apid": app_id, "apaa": [b64(a) for a in args]},
+        "dt": {"lg": [b64(entry) for entry in logs]},
+    }
+
+
+def registered_event(idea_hash: bytes, title: str) -> bytes:
+    return IDEA_REGISTERED + idea_hash + FOUNDER + TIMESTAMP.to_bytes(8, "big") + digest(f"cid-{title}")
+
+
+def register_call(idea_hash: bytes, title: str) -> dict:
+    """register_idea call as emitted by the current contract (ARC-28 event)."""
+    return app_call(
+        [REGISTER_IDEA, idea_hash, digest(f"cid-{title}"), abi_string(title)],
+        [registered_event(idea_hash, title), ABI_RETURN_PREFIX + TIMESTAMP.to_bytes(8, "big")],
+    )
+
+
+def delete_call(idea_hash: bytes) -> dict:
+    return app_call([DELETE_IDEA, idea_hash], [IDEA_DELETED + idea_hash + FOUNDER])
+
+
+def legacy_register_call(idea_hash: bytes, title: str) -> dict:
+    """register_idea call from before events: only the IDEA_REGISTERED log line."""
+    return app_call(
+        [REGISTER_IDEA, idea_hash, digest(f"cid-{title}"), abi_string(title)],
+        [registered_log(), ABI_RETURN_PREFIX + TIMESTAMP.to_bytes(8, "big")],
+    )
+
+
+def legacy_batch_call(entries: list[tuple[bytes, str]], duplicates: list[bool]) -> dict:
+    # (byte[32],byte[32],string)[] — uint16 count, uint16 head offsets, tuples
+    elements = [
+        idea_hash + digest(f"cid-{title}") + (66).to_bytes(2, "big") + abi_string(title)
+        for idea_hash, title in entries
+    ]
+    heads, offset = b"", 2 * len(elements)
+    for element in elements:
+        heads += offset.to_bytes(2, "big")
+        offset += len(element)
+    entries_arg = len(elements).to_bytes(2, "big") + heads + b"".join(elements)
+
+    # (uint64[],bool[]) return value
+    timestamps = len(entries).to_bytes(2, "big") + b"".join(
+        (0 if dup else TIMESTAMP).to_bytes(8, "big") for dup in duplicates
+    )
+    bits = 0
+    for i, dup in enumerate(duplicates):
+        if dup:
+            bits |= 0x80 >> i
+    flags = len(duplicates).to_bytes(2, "big") + bytes([bits])
+    returned = (4).to_bytes(2, "big") + (4 + len(timestamps)).to_bytes(2, "big") + timestamps + flags
+
+    logs = [registered_log() for dup in duplicates if not dup]
+    return app_call([REGISTER_IDEAS_BATCH, entries_arg], logs + [ABI_RETURN_PREFIX + returned])
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = IdeaIndex(tmp_path / "index.sqlite3", APP_ID)
+    yield idx
+    idx.close()
+
+
+class TestEvents:
+
+    def test_block_events_decoded_in_order(self):
+        a, b = digest("ev-a"), digest("ev-b")
+        block = {"txns": [register_call(a, "A"), delete_call(a), register_call(b, "B")]}
+        events = decode_block(block, APP_ID, round_number=5)
+        assert [type(e) for e in events] == [IdeaRegisteredEvent, IdeaDeletedEvent, IdeaRegisteredEvent]
+        assert events[0].idea_hash == a
+        assert events[0].founder == FOUNDER
+        assert events[0].timestamp == TIMESTAMP
+        assert events[0].ipfs_cid == digest_to_cid(digest("cid-A"))
+        assert events[2].round == 5
+
+    def test_return_and_foreign_logs_ignored(self):
+        block = {"txns": [app_call([REGISTER_IDEA], [b"hello", ABI_RETURN_PREFIX + bytes(8)])]}
+        assert decode_block(block, APP_ID) == []
+
+    def test_concatenated_payload_decoded_in_one_pass(self):
+        hashes = [digest(f"bulk-{i}") for i in range(100)]
+        payload = b"".join(registered_event(h, "Bulk") for h in hashes)
+        events = decode_registered_payload(payload)
+        assert [e.idea_hash for e in events] == hashes
+
+
+class TestIndexer:
+
+    def test_single_registration_indexed(self, index):
+        idea_hash = digest("idea-1")
+        index.apply_block(10, {"txns": [register_call(idea_hash, "First idea")]})
+
+        idea = index.get(idea_hash)
+        assert idea.founder == FOUNDER
+        assert idea.timestamp == TIMESTAMP
+        assert idea.cid_digest == digest("cid-First idea")
+        assert idea.round == 10
+        assert index.checkpoint == 10
+
+    def test_legacy_log_registration_indexed(self, index):
+        idea_hash = digest("legacy-1")
+        index.apply_block(10, {"txns": [legacy_register_call(idea_hash, "Legacy idea")]})
+        idea = index.get(idea_hash)
+        assert idea.founder == FOUNDER
+        assert idea.cid_digest == digest("cid-Legacy idea")
+
+    def test_legacy_string_cid_registration_indexed(self, index):
+        idea_hash = digest("legacy-string")
+        cid = digest_to_cid(digest("legacy document"))
+        call = app_call(
+            [REGISTER_IDEA_STRING_CID, idea_hash, abi_string(cid), abi_string("Old ABI")],
+            [registered_log()],
+        )
+        index.apply_block(10, {"txns": [call]})
+        assert index.get(idea_hash).ipfs_cid == cid
+
+    def test_legacy_batch_skips_duplicates(self, index):
+        a, dup, b = digest("a"), digest("dup"), digest("b")
+        block = {"txns": [legacy_batch_call([(a, "A"), (dup, "Dup"), (b, "B")], [False, True, False])]}
+        assert index.apply_block(11, block) == 2
+        assert index.is_registered(a) and index.is_registered(b)
+        assert not index.is_registered(dup)
+        assert index.get(b).cid_digest == digest("cid-B")
+
+    def test_delete_removes_entry(self, index):
+        idea_hash = digest("to-delete")
+        index.apply_block(12, {"txns": [register_call(idea_hash, "Doomed")]})
+        index.apply_block(13, {"txns": [delete_call(idea_hash)]})
+        assert index.get(idea_hash) is None
+        assert index.count() == 0
+
+    def test_delete_then_reregister_in_one_block(self, index):
+        idea_hash = digest("phoenix")
+        index.apply_block(14, {"txns": [register_call(idea_hash, "Old")]})
+        index.apply_block(15, {"txns": [delete_call(idea_hash), register_call(idea_hash, "New")]})
+        assert index.get(idea_hash).cid_digest == digest("cid-New")
+
+    def test_other_apps_ignored(self, index):
+        call = register_call(digest("elsewhere"), "Other app")
+        call["txn"]["apid"] = APP_ID + 1
+        assert index.apply_block(14, {"txns": [call]}) == 0
+
+    def test_resume_skips_checkpointed_rounds(self, tmp_path):
+        path = tmp_path / "index.sqlite3"
+        first = IdeaIndex(path, APP_ID)
+        first.apply_block(20, {"txns": [register_call(digest("x"), "X")]})
+        first.close()
+
+        resumed = IdeaIndex(path, APP_ID)
+        blocks = [
+            (20, {"txns": [delete_call(digest("x"))]}),  # already applied
+            (21, {"txns": [register_call(digest("y"), "Y")]}),
+        ]
+        assert resumed.consume(blocks) == 1
+        assert resumed.is_registered(digest("x"))
+        assert resumed.checkpoint == 21
+        resumed.close()
+
+    def test_lookup_falls_back_for_fresh_hashes(self, index):
+        calls = []
+        index.lookup(digest("unknown"), fallback=lambda h: calls.append(h))
+        assert calls == [digest("unknown")]
+
+    def test_block_fixture_replay(self, index, tmp_path):
+        fixture = tmp_path / "blocks.jsonl"
+        with open(fixture, "w", encoding="utf-8") as f:
+            for round_number in range(30, 33):
+                block = {"txns": [register_call(digest(f"fx-{round_number}"), f"Fixture {round_number}")]}
+                f.write(json.dumps({"round": round_number, "block": block}) + "\n")
+
+        assert index.consume(iter_block_fixture(fixture)) == 3
+        assert index.count() == 3
+        assert index.checkpoint == 32
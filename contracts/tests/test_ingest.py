@@ -0,0 +1,97 @@
+"""
+IdeaVault — streaming ingest tests
+Hashes documents in chunks and streams them to a local PinningServer.
+"""
+
+import hashlib
+import io
+import random
+import threading
+
+import pytest
+
+from ingest import (
+    CidMismatch,
+    DocumentHasher,
+    hash_file,
+    hash_stream,
+    multipart_upload,
+    pin_file,
+    register_while_pinning,
+)
+from pinning_server import PinningServer, parse_multipart
+from unixfs import CHUNK_SIZE, cidv0, file_root
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = PinningServer(tmp_path / "pins").start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def deck(tmp_path):
+    path = tmp_path / "deck.pdf"
+    path.write_bytes(random.Random(7).randbytes(CHUNK_SIZE * 2 + 12_345))
+    return path
+
+
+class TestHashing:
+
+    @pytest.mark.parametrize("read_size", [1_000, CHUNK_SIZE, CHUNK_SIZE + 1, 1 << 20])
+    def test_stream_matches_whole_buffer(self, read_size):
+        data = random.Random(read_size).randbytes(CHUNK_SIZE * 3 + 17)
+        digest = hash_stream(io.BytesIO(data), read_size)
+        assert digest.sha256 == hashlib.sha256(data).digest()
+        assert digest.cid == cidv0(data)
+        assert digest.size == len(data)
+        assert digest.dag_size == file_root(data).cumulative_size
+
+    def test_empty_document(self):
+        digest = DocumentHasher().digest()
+        assert digest.cid == "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"
+        assert digest.sha256 == hashlib.sha256(b"").digest()
+
+    def test_cid_digest_is_register_argument(self, deck):
+        digest = hash_file(deck)
+        assert len(digest.cid_digest) == 32
+
+
+class TestUpload:
+
+    def test_multipart_body_is_well_formed(self, deck):
+        content_type, length, body = multipart_upload(deck)
+        payload = b"".join(body)
+        assert len(payload) == length
+        assert parse_multipart(content_type, payload)["file"] == ("deck.pdf", deck.read_bytes())
+
+    def test_streamed_pin_matches_local_cid(self, server, deck):
+        response = pin_file(server.url, deck)
+        assert response["IpfsHash"] == hash_file(deck).cid
+        assert response["PinSize"] == hash_file(deck).dag_size
+
+    def test_register_runs_during_upload(self, server, deck):
+        server.service.latency = 0.2
+        uploading = threading.Event()
+        original = server.service.pin
+
+        def pin(data, name=None):
+            uploading.set()
+            return original(data, name)
+
+        server.service.pin = pin
+
+        def register(digest):
+            # The upload is still sleeping in the server when the commitment is made
+            assert uploading.wait(5)
+            return digest.cid_digest
+
+        digest, registered = register_while_pinning(deck, server.url, register)
+        assert registered == digest.cid_digest
+
+    def test_mismatch_detected(self, server, deck):
+        original = server.service.pin
+        server.service.pin = lambda data, name=None: original(data + b"tampered", name)
+        with pytest.raises(CidMismatch):
+            register_while_pinning(deck, server.url, lambda digest: None)
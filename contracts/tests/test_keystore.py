@@ -0,0 +1,132 @@
+"""
+IdeaVault — Keystore and bulk wallet tests
+Fixed-width encrypted keystore records, parallel generation into a keystore
+and grouping of funding payments. No LocalNet required.
+"""
+
+import nacl.pwhash
+import pytest
+from algosdk import account, mnemonic, transaction
+
+from generate_wallet import generate_keystore, payment_groups
+from keystore import (
+    HEADER_SIZE,
+    PUBLIC_KEY_SIZE,
+    RECORD_SIZE,
+    Keystore,
+    KeystoreError,
+    KeystoreHeader,
+    KeystoreWriter,
+    seal,
+)
+
+PASSWORD = b"correct horse battery staple"
+# Cheapest Argon2id parameters, so tests don't pay the interactive cost
+FAST = KeystoreHeader.new(nacl.pwhash.argon2id.OPSLIMIT_MIN, nacl.pwhash.argon2id.MEMLIMIT_MIN)
+
+
+def write_keystore(path, seeds):
+    with KeystoreWriter(path, PASSWORD, FAST) as writer:
+        writer.append(b"".join(seal(writer.key, seed) for seed in seeds))
+
+
+class TestKeystore:
+
+    def test_round_trip_matches_algosdk(self, tmp_path):
+        seeds = [bytes([i]) * 32 for i in range(5)]
+        path = tmp_path / "w.keystore"
+        write_keystore(path, seeds)
+        assert path.stat().st_size == HEADER_SIZE + 5 * RECORD_SIZE
+
+        with Keystore(path, PASSWORD) as keystore:
+            assert len(keystore) == 5
+            for index, (address, private_key) in enumerate(keystore.accounts()):
+                assert keystore.seed(index) == seeds[index]
+                assert account.address_from_private_key(private_key) == address
+                assert len(mnemonic.from_private_key(private_key).split()) == 25
+
+    def test_addresses_readable_without_password(self, tmp_path):
+        path = tmp_path / "w.keystore"
+        write_keystore(path, [bytes([7]) * 32])
+        with Keystore(path) as keystore:
+            (address,) = keystore.addresses()
+            with pytest.raises(KeystoreError, match="without a password"):
+                keystore.seed(0)
+        with Keystore(path, PASSWORD) as keystore:
+            assert keystore.address(0) == address
+
+    def test_wrong_password_rejected(self, tmp_path):
+        path = tmp_path / "w.keystore"
+        write_keystore(path, [bytes(32)])
+        with pytest.raises(KeystoreError, match="Wrong password"):
+            Keystore(path, b"guess")
+
+    def test_tampered_records_rejected(self, tmp_path):
+        path = tmp_path / "w.keystore"
+        write_keystore(path, [bytes([1]) * 32, bytes([2]) * 32])
+        data = bytearray(path.read_bytes())
+        first, second = HEADER_SIZE, HEADER_SIZE + RECORD_SIZE
+        # Swap the public keys: each ciphertext still decrypts, but to the other account
+        data[first:first + PUBLIC_KEY_SIZE], data[second:second + PUBLIC_KEY_SIZE] = (
+            data[second:second + PUBLIC_KEY_SIZE], data[first:first + PUBLIC_KEY_SIZE],
+        )
+        path.write_bytes(bytes(data))
+        with pytest.raises(KeystoreError, match="does not match"):
+            Keystore(path, PASSWORD)
+
+        data[second + RECORD_SIZE - 1] ^= 1
+        path.write_bytes(bytes(data))
+        with Keystore(path) as keystore:
+            keystore.key = FAST.derive_key(PASSWORD)
+            with pytest.raises(KeystoreError, match="corrupted"):
+                keystore.seed(1)
+
+    def test_partial_files_rejected(self, tmp_path):
+        path = tmp_path / "w.keystore"
+        write_keystore(path, [bytes(32)])
+        path.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(KeystoreError, match="not a whole keystore"):
+            Keystore(path)
+        path.write_bytes(b"x" * HEADER_SIZE)
+        with pytest.raises(KeystoreError, match="Not a keystore"):
+            Keystore(path)
+
+    def test_failed_write_leaves_nothing(self, tmp_path):
+        path = tmp_path / "w.keystore"
+        with pytest.raises(RuntimeError):
+            with KeystoreWriter(path, PASSWORD, FAST) as writer:
+                writer.append(seal(writer.key, bytes(32)))
+                raise RuntimeError("generator crashed")
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestBulkGeneration:
+
+    def test_parallel_blocks_fill_the_keystore(self, tmp_path):
+        path = tmp_path / "bulk.keystore"
+        generate_keystore(path, PASSWORD, 250, workers=2, block_size=64)
+        with Keystore(path, PASSWORD) as keystore:
+            addresses = list(keystore.addresses())
+            assert len(addresses) == len(set(addresses)) == 250
+            assert account.address_from_private_key(keystore.private_key(249)) == addresses[249]
+
+    def test_vanity_prefix(self, tmp_path):
+        path = tmp_path / "vanity.keystore"
+        generate_keystore(path, PASSWORD, 8, workers=2, prefix="A", block_size=3)
+        with Keystore(path) as keystore:
+            assert all(address.startswith("A") for address in keystore.addresses())
+
+    def test_rejects_impossible_prefix(self, tmp_path):
+        with pytest.raises(ValueError, match="alphabet"):
+            generate_keystore(tmp_path / "x.keystore", PASSWORD, 1, prefix="A0")
+
+
+def test_payments_grouped_by_sixteen():
+    _, sender = account.generate_account()
+    receivers = [account.generate_account()[1] for _ in range(40)]
+    params = transaction.SuggestedParams(fee=1_000, first=1, last=1_000, gh="A" * 44, flat_fee=True)
+    groups = list(payment_groups(sender, params, receivers, 100_000))
+    assert [len(group) for group in groups] == [16, 16, 8]
+    assert [txn.receiver for group in groups for txn in group] == receivers
+    assert all(len({txn.group for txn in group}) == 1 for group in groups)
+    assert len({group[0].group for group in groups}) == 3
@@ -0,0 +1,152 @@
+"""
+IdeaVault — load generator tests
+Runs the pipeline against its stand-ins (local pinning server, simulated
+chain, SQLite) with tiny latencies. No LocalNet required.
+"""
+
+import hashlib
+import time
+
+import pytest
+
+from loadgen import (
+    STAGES,
+    DuplicateIdea,
+    IdeaStore,
+    LatencyRecorder,
+    PinningClient,
+    Pipeline,
+    SimulatedChain,
+    generate_idea_hash,
+    percentile,
+    run_level,
+    synthetic_payloads,
+)
+from pinning_server import PinningServer
+from unixfs import cidv0
+
+
+@pytest.fixture
+def pinning(tmp_path):
+    server = PinningServer(tmp_path / "pins", latency=0.001).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def pipeline(pinning, tmp_path):
+    return Pipeline(PinningClient(pinning.url), SimulatedChain(block_time=0.02), IdeaStore(tmp_path / "ideas.db"))
+
+
+class TestStats:
+
+    def test_percentile_nearest_rank(self):
+        samples = [float(i) for i in range(1, 101)]
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile([7.0], 95) == 7.0
+        assert percentile([], 50) == 0.0
+
+    def test_recorder_summary(self):
+        recorder = LatencyRecorder()
+        for ms in (1, 2, 3, 4):
+            recorder.record("hash", ms / 1000)
+        recorder.fail("register")
+        summary = recorder.summary()
+        assert set(summary) == set(STAGES)
+        assert summary["hash"]["p50Ms"] == 2.0
+        assert summary["hash"]["maxMs"] == 4.0
+        assert summary["register"]["failures"] == 1
+        assert recorder.failed == 1
+
+    def test_idea_hash_matches_backend(self):
+        expected = hashlib.sha256(b"t|d|2026-01-01T00:00:00.000Z").hexdigest()
+        assert generate_idea_hash("t", "d", "2026-01-01T00:00:00.000Z") == expected
+
+
+class TestStandIns:
+
+    def test_pinning_returns_unixfs_cid(self, pinning):
+        client = PinningClient(pinning.url)
+        assert client.pin_file(b"deck") == cidv0(b"deck")
+        assert client.pin_json({"title": "t"}) == cidv0(b'{"title":"t"}')
+        assert pinning.service.pins == 2
+
+    def test_chain_confirms_at_next_block(self):
+        chain = SimulatedChain(block_time=0.05)
+        round_before = chain.current_round()
+        chain.register(b"\x01" * 32, b"\x02" * 32, b"title")
+        assert chain.current_round() > round_before
+
+    def test_chain_rejects_duplicates(self):
+        chain = SimulatedChain(block_time=0.01)
+        chain.register(b"\x01" * 32, b"\x02" * 32, b"title")
+        with pytest.raises(DuplicateIdea):
+            chain.register(b"\x01" * 32, b"\x03" * 32, b"again")
+
+    def test_chain_spills_full_blocks(self):
+        chain = SimulatedChain(block_time=0.05, txns_per_block=1)
+        started = time.monotonic()
+        chain.register(b"\x01" * 32, b"\x00" * 32, b"")
+        chain.register(b"\x02" * 32, b"\x00" * 32, b"")
+        # The second transaction cannot share the first one's block
+        assert time.monotonic() - started >= 0.05
+
+
+class TestRunLevel:
+
+    def test_closed_loop_level(self, pipeline):
+        payloads = synthetic_payloads(seed=1, doc_size=1024)
+        result = run_level(pipeline, payloads, concurrency=4, count=20)
+        assert result.completed == 20 and result.failed == 0
+        assert result.throughput > 0
+        assert all(result.stages[stage]["count"] == 20 for stage in STAGES if stage != "cid")
+        assert pipeline.store.count() == 20
+
+    def test_closed_loop_excludes_slot_wait(self):
+        class SlowPipeline:
+            def run_one(self, payload, recorder, arrival):
+                time.sleep(0.05)
+                recorder.record("total", time.perf_counter() - arrival)
+                return True
+
+        result = run_level(SlowPipeline(), iter(range(5)), concurrency=1, count=5)
+        # Back-to-back ideas on one slot: nothing queued behind the previous one
+        assert result.stages["total"]["maxMs"] < 80
+
+    def test_open_loop_rate(self, pipeline):
+        payloads = synthetic_payloads(seed=2, doc_size=256)
+        result = run_level(pipeline, payloads, concurrency=8, count=10, rate=200.0)
+        assert result.completed == 10
+        # Ten arrivals at 200/s span at least 45 ms
+        assert result.elapsed >= 0.045
+
+    def test_failures_are_counted_per_stage(self, pinning, tmp_path):
+        class BrokenChain:
+            def register(self, *args):
+                raise RuntimeError("node down")
+
+        pipeline = Pipeline(PinningClient(pinning.url), BrokenChain(), IdeaStore(tmp_path / "ideas.db"))
+        result = run_level(pipeline, synthetic_payloads(seed=3, doc_size=64), concurrency=2, count=4)
+        assert result.completed == 0
+        assert result.stages["register"]["failures"] == 4
+        assert result.stages["pin_json"]["count"] == 4
+
+    def test_requires_a_stop_condition(self, pipeline):
+        with pytest.raises(ValueError):
+            run_level(pipeline, synthetic_payloads(seed=4, doc_size=64), concurrency=1)
+
+
+class TestPrecompute:
+
+    def test_precomputed_cids_match_uploads(self, pinning, tmp_path):
+        pipeline = Pipeline(
+            PinningClient(pinning.url), SimulatedChain(block_time=0.02), IdeaStore(tmp_path / "ideas.db"),
+            precompute=True,
+        )
+        try:
+            result = run_level(pipeline, synthetic_payloads(seed=5, doc_size=4096), concurrency=4, count=12)
+        finally:
+            pipeline.close()
+        assert result.completed == 12 and result.failed == 0
+        assert result.stages["cid"]["count"] == 12
@@ -0,0 +1,154 @@
+"""
+IdeaVault — Merkle anchoring tests
+Tree shape, inclusion proofs and manifests of merkle.py, plus the anchor box
+and BatchAnchored event encodings. No LocalNet required.
+"""
+
+import hashlib
+import json
+
+import pytest
+
+from idea_codec import ANCHOR_PREFIX, anchor_box_name, decode_anchor, digest_to_cid
+from idea_events import BATCH_ANCHORED, BatchAnchoredEvent, decode_log
+from merkle import (
+    InclusionProof,
+    MerkleTree,
+    build_manifest,
+    compute_root,
+    leaf_hash,
+    load_manifest,
+    manifest_bytes,
+    manifest_cid,
+    node_hash,
+    tree_depth,
+    verify_inclusion,
+)
+from unixfs import cidv0
+
+
+def hashes(count: int, label: str = "idea") -> list[bytes]:
+    return [hashlib.sha256(f"{label}-{i}".encode()).digest() for i in range(count)]
+
+
+class TestTree:
+
+    def test_single_leaf_is_the_root(self):
+        (idea,) = hashes(1)
+        tree = MerkleTree([idea])
+        assert tree.root == leaf_hash(idea)
+        assert tree.proof(0).siblings == ()
+
+    def test_odd_node_is_promoted_not_duplicated(self):
+        a, b, c = hashes(3)
+        tree = MerkleTree([a, b, c])
+        assert tree.root == node_hash(node_hash(leaf_hash(a), leaf_hash(b)), leaf_hash(c))
+        assert MerkleTree([a, b, c, c]).root != tree.root
+
+    def test_leaf_and_node_domains_differ(self):
+        a, b = hashes(2)
+        inner = node_hash(leaf_hash(a), leaf_hash(b))
+        # The concatenated children as a "leaf" must not reproduce the inner node
+        assert leaf_hash(leaf_hash(a) + leaf_hash(b)) != inner
+
+    def test_rejects_empty_and_malformed(self):
+        with pytest.raises(ValueError, match="at least one"):
+            MerkleTree([])
+        with pytest.raises(ValueError, match="32 bytes"):
+            MerkleTree([b"short"])
+
+    def test_index_of_first_occurrence(self):
+        a, b = hashes(2)
+        tree = MerkleTree([a, b, a])
+        assert tree.index_of(a) == 0 and tree.index_of(b) == 1
+        with pytest.raises(KeyError):
+            tree.index_of(hashes(1, "absent")[0])
+
+
+class TestProofs:
+
+    @pytest.mark.parametrize("count", list(range(1, 70)) + [255, 256, 257, 1000])
+    def test_every_leaf_verifies(self, count):
+        ideas = hashes(count)
+        tree = MerkleTree(ideas)
+        for index, idea in enumerate(ideas):
+            proof = tree.proof(index)
+            assert len(proof.siblings) <= tree_depth(count)
+            assert verify_inclusion(idea, proof, tree.root)
+
+    def test_wrong_hash_or_root_fails(self):
+        ideas = hashes(10)
+        tree = MerkleTree(ideas)
+        proof = tree.proof(4)
+        assert not verify_inclusion(ideas[5], proof, tree.root)
+        assert not verify_inclusion(ideas[4], proof, MerkleTree(hashes(10, "other")).root)
+
+    def test_tampered_sibling_fails(self):
+        ideas = hashes(17)
+        tree = MerkleTree(ideas)
+        proof = tree.proof(6)
+        for position in range(len(proof.siblings)):
+            siblings = list(proof.siblings)
+            siblings[position] = bytes(32)
+            assert not verify_inclusion(ideas[6], InclusionProof(6, 17, tuple(siblings)), tree.root)
+
+    def test_wrong_shape_fails(self):
+        ideas = hashes(9)
+        tree = MerkleTree(ideas)
+        proof = tree.proof(8)
+        assert compute_root(ideas[8], InclusionProof(8, 9, proof.siblings + (bytes(32),))) is None
+        assert compute_root(ideas[8], InclusionProof(8, 9, proof.siblings[:-1])) is None
+        assert compute_root(ideas[8], InclusionProof(9, 9, proof.siblings)) is None
+        assert not verify_inclusion(ideas[8], InclusionProof(8, 10, proof.siblings), tree.root)
+        assert not verify_inclusion(ideas[7], InclusionProof(7, 9, proof.siblings), tree.root)
+
+    def test_encode_round_trip(self):
+        tree = MerkleTree(hashes(33))
+        proof = tree.proof(32)
+        encoded = proof.encode()
+        assert len(encoded) == 16 + 32 * len(proof.siblings)
+        assert InclusionProof.decode(encoded) == proof
+        assert InclusionProof.from_dict(json.loads(json.dumps(proof.as_dict()))) == proof
+        with pytest.raises(ValueError, match="Invalid proof size"):
+            InclusionProof.decode(encoded[:-1])
+
+
+class TestManifest:
+
+    def test_cid_matches_pinned_bytes(self, tmp_path):
+        tree = MerkleTree(hashes(5))
+        manifest = build_manifest(tree)
+        assert manifest_cid(manifest) == cidv0(manifest_bytes(manifest))
+
+        path = tmp_path / "batch.json"
+        path.write_bytes(manifest_bytes(manifest))
+        loaded, loaded_manifest = load_manifest(path)
+        assert loaded.root == tree.root and loaded_manifest == manifest
+
+    def test_tampered_manifest_rejected(self, tmp_path):
+        manifest = build_manifest(MerkleTree(hashes(5)))
+        manifest["leaves"][2] = bytes(32).hex()
+        path = tmp_path / "batch.json"
+        path.write_bytes(manifest_bytes(manifest))
+        with pytest.raises(ValueError, match="manifest says"):
+            load_manifest(path)
+
+
+class TestEncodings:
+
+    def test_anchor_box(self):
+        root, cid_digest = hashes(2, "anchor")
+        anchorer = bytes(range(32))
+        value = anchorer + (1_771_000_000).to_bytes(8, "big") + (500).to_bytes(8, "big") + cid_digest
+        record = decode_anchor(value)
+        assert (record.anchorer, record.timestamp, record.count) == (anchorer, 1_771_000_000, 500)
+        assert record.manifest_cid == digest_to_cid(cid_digest)
+        assert anchor_box_name(root) == ANCHOR_PREFIX + root
+        with pytest.raises(ValueError):
+            anchor_box_name(root[:31])
+
+    def test_batch_anchored_event(self):
+        root, cid_digest = hashes(2, "event")
+        anchorer = bytes(range(32))
+        log = BATCH_ANCHORED + root + anchorer + (7).to_bytes(8, "big") + (1000).to_bytes(8, "big") + cid_digest
+        assert decode_log(log, round_number=3) == BatchAnchoredEvent(root, anchorer, 7, 1000, cid_digest, 3)
@@ -0,0 +1,356 @@
+"""
+IdeaVault — Registration outbox tests
+Drives outbox.py's queue and dispatcher with in-memory stage handlers and a
+manual clock, and its pin stage against the local pinning server. No
+LocalNet, Pinata or Postgres required.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+from algosdk import account
+from algosdk.error import AlgodHTTPError
+
+import outbox as outbox_module
+from outbox import (
+    CHAIN,
+    DONE,
+    FAILED,
+    PIN,
+    RECORD,
+    Backoff,
+    ChainStage,
+    Dispatcher,
+    Outbox,
+    PermanentError,
+    PinStage,
+    make_handler,
+)
+from pinning_server import PinningServer
+from unixfs import cidv0
+
+PAYLOAD = {"title": "Idea", "description": "d", "category": "c", "stage": "IDEA", "founderId": "user-1"}
+
+
+def idea_hash(i: int) -> bytes:
+    return hashlib.sha256(f"outbox-{i}".encode()).digest()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Stages:
+    """Stage handlers recording their calls; `failures[stage]` raises that many times."""
+
+    def __init__(self):
+        self.calls = {PIN: [], CHAIN: [], RECORD: []}
+        self.failures = {PIN: 0, CHAIN: 0, RECORD: 0}
+        self.permanent: set[str] = set()
+        self._lock = threading.Lock()
+
+    def handler(self, stage):
+        def run(registration):
+            with self._lock:
+                self.calls[stage].append(registration.pending_id)
+                if stage in self.permanent:
+                    raise PermanentError(f"{stage} rejected")
+                if self.failures[stage]:
+                    self.failures[stage] -= 1
+                    raise ConnectionError(f"{stage} unavailable")
+            return {
+                PIN: {"ipfs_cid": "Qm" + "p" * 44},
+                CHAIN: {"txn_id": "TX" + registration.pending_id[:8], "block_timestamp": 1_771_000_000},
+                RECORD: {"idea_id": registration.pending_id},
+            }[stage]
+
+        return run
+
+    def handlers(self):
+        return {stage: self.handler(stage) for stage in (PIN, CHAIN, RECORD)}
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def outbox(tmp_path, clock):
+    box = Outbox(tmp_path / "outbox.sqlite", clock=clock)
+    yield box
+    box.close()
+
+
+def drain(dispatcher: Dispatcher, timeout: float = 5.0) -> None:
+    """Poll until nothing is due and nothing is running."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        started = dispatcher.poll()
+        if not started and not dispatcher.in_flight:
+            return
+        time.sleep(0.001)
+    raise AssertionError("Dispatcher did not go idle")
+
+
+@pytest.fixture
+def stages():
+    return Stages()
+
+
+@pytest.fixture
+def dispatcher(outbox, stages):
+    d = Dispatcher(outbox, stages.handlers(), backoff=Backoff(base=1.0, cap=10.0, max_attempts=3))
+    yield d
+    d.close()
+
+
+class TestQueue:
+
+    def test_enqueue_is_idempotent_on_hash(self, outbox):
+        first, created = outbox.enqueue(idea_hash(0), PAYLOAD)
+        again, created_again = outbox.enqueue(idea_hash(0), {**PAYLOAD, "title": "Other"})
+        assert created and not created_again
+        assert again.pending_id == first.pending_id
+        assert again.payload == PAYLOAD
+        assert outbox.counts()[PIN] == 1
+
+    def test_document_spooled_until_pinned(self, outbox):
+        registration, _ = outbox.enqueue(idea_hash(0), PAYLOAD, b"deck", "deck.pdf")
+        path = outbox.document_path(registration.pending_id)
+        assert path.read_bytes() == b"deck"
+        assert outbox.advance(registration.pending_id, PIN, {"ipfs_cid": "QmX"})
+        assert not path.exists()
+        assert outbox.get(registration.pending_id).stage == CHAIN
+
+    def test_survives_reopen(self, tmp_path, clock):
+        box = Outbox(tmp_path / "outbox.sqlite", clock=clock)
+        registration, _ = box.enqueue(idea_hash(0), PAYLOAD)
+        box.close()
+        reopened = Outbox(tmp_path / "outbox.sqlite", clock=clock)
+        assert reopened.get(registration.pending_id) == registration
+        reopened.close()
+
+    def test_lease_hides_claimed_rows_until_expiry(self, outbox, clock):
+        outbox.enqueue(idea_hash(0), PAYLOAD)
+        (claimed,) = outbox.claim(PIN, 10, lease=30.0)
+        assert outbox.claim(PIN, 10) == []
+        clock.now += 31
+        assert [r.pending_id for r in outbox.claim(PIN, 10)] == [claimed.pending_id]
+
+    def test_late_worker_cannot_advance_twice(self, outbox):
+        registration, _ = outbox.enqueue(idea_hash(0), PAYLOAD)
+        assert outbox.advance(registration.pending_id, PIN, {"ipfs_cid": "QmX"})
+        assert not outbox.advance(registration.pending_id, PIN, {"ipfs_cid": "QmX"})
+        assert outbox.get(registration.pending_id).stage == CHAIN
+
+    def test_rejects_incomplete_payloads(self, outbox):
+        with pytest.raises(ValueError, match="founderId required"):
+            outbox.enqueue(idea_hash(0), {**PAYLOAD, "founderId": ""})
+        with pytest.raises(ValueError, match="title, description required"):
+            outbox.enqueue(idea_hash(0), {k: v for k, v in PAYLOAD.items() if k not in ("title", "description")})
+        assert outbox.counts()[PIN] == 0
+
+    def test_rejects_unknown_fields(self, outbox):
+        registration, _ = outbox.enqueue(idea_hash(0), PAYLOAD)
+        with pytest.raises(ValueError, match="Unknown fields"):
+            outbox.note(registration.pending_id, stage=DONE)
+
+
+class TestDispatcher:
+
+    def test_registrations_reach_done(self, outbox, dispatcher, stages):
+        ids = [outbox.enqueue(idea_hash(i), PAYLOAD)[0].pending_id for i in range(20)]
+        drain(dispatcher)
+        assert outbox.counts()[DONE] == 20
+        done = outbox.get(ids[0])
+        assert (done.ipfs_cid, done.block_timestamp, done.idea_id) == ("Qm" + "p" * 44, 1_771_000_000, ids[0])
+        assert all(sorted(calls) == sorted(ids) for calls in stages.calls.values())
+
+    def test_failed_stage_retried_alone_after_backoff(self, outbox, dispatcher, stages, clock):
+        registration, _ = outbox.enqueue(idea_hash(0), PAYLOAD)
+        stages.failures[RECORD] = 1
+        drain(dispatcher)
+        waiting = outbox.get(registration.pending_id)
+        assert (waiting.stage, waiting.attempts) == (RECORD, 1)
+        assert waiting.last_error == "ConnectionError: record unavailable"
+
+        clock.now += 10
+        drain(dispatcher)
+        assert outbox.get(registration.pending_id).stage == DONE
+        # Pin and chain ran once: only the failing stage was repeated
+        assert (len(stages.calls[PIN]), len(stages.calls[CHAIN]), len(stages.calls[RECORD])) == (1, 1, 2)
+
+    def test_gives_up_after_max_attempts(self, outbox, dispatcher, stages, clock):
+        registration, _ = outbox.enqueue(idea_hash(0), PAYLOAD)
+        stages.failures[CHAIN] = 99
+        for _ in range(3):
+            drain(dispatcher)
+            clock.now += 10
+        assert outbox.get(registration.pending_id).stage == FAILED
+        assert len(stages.calls[CHAIN]) == 3
+        assert stages.calls[RECORD] == []
+
+    def test_permanent_error_fails_then_requeue_resumes(self, outbox, dispatcher, stages):
+        registration, _ = outbox.enqueue(idea_hash(0), PAYLOAD)
+        stages.permanent.add(CHAIN)
+        drain(dispatcher)
+        failed = outbox.get(registration.pending_id)
+        assert (failed.stage, failed.last_error) == (FAILED, "chain rejected")
+
+        stages.permanent.clear()
+        assert outbox.requeue(registration.pending_id) == CHAIN
+        drain(dispatcher)
+        assert outbox.get(registration.pending_id).stage == DONE
+        assert len(stages.calls[PIN]) == 1
+        assert outbox.requeue(registration.pending_id) is None
+
+    def test_concurrency_bounded_per_stage(self, outbox, stages):
+        running, peak = [0], [0]
+        lock = threading.Lock()
+        release = threading.Event()
+
+        def slow_pin(registration):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            release.wait(5)
+            with lock:
+                running[0] -= 1
+            return {"ipfs_cid": "QmX"}
+
+        dispatcher = Dispatcher(outbox, {**stages.handlers(), PIN: slow_pin}, concurrency={PIN: 3})
+        for i in range(10):
+            outbox.enqueue(idea_hash(i), PAYLOAD)
+        assert dispatcher.poll() == 3
+        assert dispatcher.poll() == 0
+        release.set()
+        drain(dispatcher)
+        dispatcher.close()
+        assert peak[0] <= 3
+        assert outbox.counts()[DONE] == 10
+
+
+class TestPinStage:
+
+    def test_pins_deck_then_metadata(self, tmp_path, outbox):
+        server = PinningServer(tmp_path / "pins").start()
+        try:
+            deck = b"pitch deck " * 50_000
+            payload = {**PAYLOAD, "metadata": {"title": "Idea", "founder": "user-1"}}
+            registration, _ = outbox.enqueue(idea_hash(0), payload, deck, "deck.pdf")
+            fields = PinStage(outbox, server.url)(registration)
+
+            assert fields["pitch_deck_cid"] == cidv0(deck)
+            metadata = json.loads(server.service.store.open(fields["ipfs_cid"])[:])
+            assert metadata == {
+                "title": "Idea", "founder": "user-1",
+                "ideaHash": idea_hash(0).hex(), "pitchDeckCid": cidv0(deck),
+            }
+            # A retry pins the same content to the same CIDs
+            assert PinStage(outbox, server.url)(outbox.get(registration.pending_id)) == fields
+        finally:
+            server.stop()
+
+    def test_missing_document_is_permanent(self, outbox):
+        registration, _ = outbox.enqueue(idea_hash(0), PAYLOAD, b"deck", "deck.pdf")
+        outbox.document_path(registration.pending_id).unlink()
+        with pytest.raises(PermanentError):
+            PinStage(outbox, "http://127.0.0.1:9")(registration)
+
+
+class TxnAlgod:
+    """pending_transaction_info for a few known txids; anything else is unknown."""
+
+    def __init__(self, txns: dict[str, dict]):
+        self.txns = txns
+
+    def pending_transaction_info(self, txid):
+        if txid not in self.txns:
+            raise AlgodHTTPError("txn does not exist", 404)
+        return self.txns[txid]
+
+
+class TestChainStage:
+
+    @pytest.fixture
+    def registered(self, monkeypatch):
+        """The box already exists: an earlier attempt confirmed."""
+        private_key, sender = account.generate_account()
+        record = type("OnChainIdea", (), {"founder": sender, "ipfs_cid": "Qm" + "p" * 44, "timestamp": 1_771_000_000})
+        monkeypatch.setattr(outbox_module, "get_ideas", lambda algod, app_id, hashes, sender: {h: record for h in hashes})
+        monkeypatch.setattr(outbox_module, "registry_method", lambda name: None)
+        return private_key
+
+    def at_chain(self, outbox, txn_id):
+        registration, _ = outbox.enqueue(idea_hash(0), PAYLOAD)
+        outbox.note(registration.pending_id, ipfs_cid="Qm" + "p" * 44, txn_id=txn_id)
+        return outbox.get(registration.pending_id)
+
+    def test_keeps_the_noted_txid_that_confirmed(self, outbox, registered):
+        stage = ChainStage(outbox, TxnAlgod({"TX1": {"confirmed-round": 50}}), 1, registered)
+        assert stage(self.at_chain(outbox, "TX1")) == {"txn_id": "TX1", "block_timestamp": 1_771_000_000}
+
+    def test_drops_a_noted_txid_that_never_confirmed(self, outbox, registered):
+        # TX2 was noted, then rejected because TX1 (no longer noted) had confirmed
+        stage = ChainStage(outbox, TxnAlgod({"TX2": {"pool-error": "transaction already in ledger"}}), 1, registered)
+        assert stage(self.at_chain(outbox, "TX2"))["txn_id"] is None
+
+
+class TestHttp:
+
+    @pytest.fixture
+    def url(self, outbox):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(outbox))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+    def post(self, url, body):
+        request = urllib.request.Request(
+            url + "/registrations", data=json.dumps(body).encode(), method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+
+    def test_enqueue_acknowledged_with_pending_id(self, url, outbox):
+        body = {**PAYLOAD, "ideaHash": idea_hash(0).hex(), "document": base64.b64encode(b"deck").decode(), "documentName": "d.pdf"}
+        started = time.perf_counter()
+        status, created = self.post(url, body)
+        assert time.perf_counter() - started < 0.1
+        assert (status, created["stage"]) == (202, PIN)
+        assert outbox.get(created["pendingId"]).payload == PAYLOAD
+
+        status, again = self.post(url, body)
+        assert (status, again["pendingId"]) == (200, created["pendingId"])
+
+        with urllib.request.urlopen(f"{url}/registrations/{created['pendingId']}") as response:
+            assert json.load(response)["ideaHash"] == idea_hash(0).hex()
+        with urllib.request.urlopen(f"{url}/stats") as response:
+            assert json.load(response)[PIN] == 1
+
+    def test_bad_requests(self, url):
+        with pytest.raises(urllib.error.HTTPError) as e:
+            self.post(url, {"ideaHash": "zz"})
+        assert e.value.code == 400
+        with pytest.raises(urllib.error.HTTPError) as e:
+            self.post(url, {**PAYLOAD, "ideaHash": idea_hash(1).hex(), "founderId": None})
+        assert e.value.code == 400
+        assert json.load(e.value) == {"error": "founderId required"}
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(f"{url}/registrations/unknown")
+        assert e.value.code == 404
@@ -0,0 +1,106 @@
+"""
+IdeaVault — local pinning server tests
+Talks HTTP to a PinningServer on an ephemeral port. No network required.
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from loadgen import PinningClient
+from pinning_server import ContentStore, PinningServer, parse_multipart, pinata_json
+from unixfs import cidv0
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = PinningServer(tmp_path).start()
+    yield server
+    server.stop()
+
+
+def get(url: str) -> tuple[int, bytes]:
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+class TestEncoding:
+
+    def test_pinata_json_matches_json_stringify(self):
+        assert pinata_json({"title": "Idée", "n": 3, "tags": ["a"]}) == '{"title":"Idée","n":3,"tags":["a"]}'.encode()
+
+    def test_parse_multipart(self):
+        body = (
+            b'--b\r\nContent-Disposition: form-data; name="file"; filename="deck.pdf"\r\n\r\n'
+            b"\x00\x01\r\n--b\r\nContent-Disposition: form-data; name=\"pinataMetadata\"\r\n\r\n"
+            b'{"name":"deck.pdf"}\r\n--b--\r\n'
+        )
+        fields = parse_multipart("multipart/form-data; boundary=b", body)
+        assert fields["file"] == ("deck.pdf", b"\x00\x01")
+        assert json.loads(fields["pinataMetadata"][1]) == {"name": "deck.pdf"}
+
+
+class TestStore:
+
+    def test_sharded_and_deduplicated(self, tmp_path):
+        store = ContentStore(tmp_path)
+        cid = cidv0(b"blob")
+        assert store.put(cid, b"blob") is True
+        assert store.put(cid, b"blob") is False
+        assert store.path(cid).parent.name == cid[-3:-1]
+        assert bytes(store.open(cid)) == b"blob"
+        assert store.open(cidv0(b"other")) is None
+
+    def test_empty_blob(self, tmp_path):
+        store = ContentStore(tmp_path)
+        store.put(cidv0(b""), b"")
+        assert store.open(cidv0(b"")) == b""
+
+
+class TestServer:
+
+    def test_pin_file_and_gateway(self, server):
+        client = PinningClient(server.url)
+        data = bytes(range(256)) * 2_000
+        cid = client.pin_file(data)
+        assert cid == cidv0(data)
+        assert get(f"{server.url}/ipfs/{cid}") == (200, data)
+
+    def test_pin_json(self, server):
+        client = PinningClient(server.url)
+        cid = client.pin_json({"ideaHash": "ab", "title": "Idea"})
+        assert cid == cidv0(b'{"ideaHash":"ab","title":"Idea"}')
+        assert json.loads(get(f"{server.url}/ipfs/{cid}")[1]) == {"ideaHash": "ab", "title": "Idea"}
+
+    def test_duplicate_pin_reported(self, server):
+        def pin() -> dict:
+            body = json.dumps({"pinataContent": {"a": 1}}).encode()
+            request = urllib.request.Request(
+                f"{server.url}/pinning/pinJSONToIPFS", data=body, headers={"Content-Type": "application/json"}
+            )
+            with urllib.request.urlopen(request) as response:
+                return json.load(response)
+
+        first, second = pin(), pin()
+        assert first["IpfsHash"] == second["IpfsHash"]
+        assert (first["isDuplicate"], second["isDuplicate"]) == (False, True)
+        assert first["PinSize"] > len(b'{"a":1}')
+
+    def test_errors(self, server):
+        assert get(f"{server.url}/ipfs/{cidv0(b'never pinned')}")[0] == 404
+        assert get(f"{server.url}/nope")[0] == 404
+        request = urllib.request.Request(
+            f"{server.url}/pinning/pinJSONToIPFS", data=b"{}", headers={"Content-Type": "application/json"}
+        )
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(request)
+        assert e.value.code == 400
+
+    def test_authentication_probe(self, server):
+        status, body = get(f"{server.url}/data/testAuthentication")
+        assert status == 200 and "Congratulations" in json.loads(body)["message"]
@@ -0,0 +1,144 @@
+"""
+IdeaVault — Fee-pooled registration tests
+Group packing, reference layout and fee accounting for pooled_register. No
+LocalNet required.
+"""
+
+import hashlib
+import random
+
+import pytest
+
+from box_planner import (
+    APP_CALL_BUDGET,
+    ASSUMED_BUDGET,
+    CALL_ARGS_OVERHEAD,
+    DEFAULT_BUDGET,
+    MAX_APP_ARGS_BYTES,
+    MAX_GROUP_SIZE,
+    MAX_TXN_REFERENCES,
+    BudgetModel,
+    entry_arg_size,
+    index_reference_bound,
+    register_group_size as group_size,
+)
+from bulk_register import BulkEntry, IndexCursor
+from idea_codec import HASHES_PER_PAGE, ORDINALS_PER_PAGE, founder_page_box_name
+from pooled_register import (
+    MIN_FEE,
+    PLAN_CHUNK,
+    fee_report,
+    index_box_names,
+    layout_group,
+    plan_pooled,
+)
+
+FOUNDER = bytes(range(32))
+
+
+def entries(count: int, title: str = "t" * 32, label: str = "pooled") -> list[BulkEntry]:
+    return [
+        BulkEntry(hashlib.sha256(f"{label}-{i}".encode()).digest(), hashlib.sha256(str(i).encode()).digest(), title)
+        for i in range(count)
+    ]
+
+
+def check_layout(group: list[BulkEntry], cursor: IndexCursor, budget: BudgetModel, separate_payer: bool):
+    index_names = index_box_names(cursor, group)
+    assert len(index_names) <= index_reference_bound(len(group))
+    calls = layout_group(group, index_names, budget, separate_payer)
+
+    assert len(calls) == group_size(group, budget, separate_payer) <= MAX_GROUP_SIZE
+    assert [e for call in calls for e in call.entries] == group
+    assert all(len(call.boxes) <= MAX_TXN_REFERENCES for call in calls)
+    assert all(
+        CALL_ARGS_OVERHEAD + sum(entry_arg_size(e) for e in call.entries) <= MAX_APP_ARGS_BYTES for call in calls
+    )
+    assert len(group) * budget.per_idea + len(calls) * budget.per_call <= len(calls) * APP_CALL_BUDGET
+    referenced = [name for call in calls for name in call.boxes]
+    assert set(referenced) == {e.idea_hash for e in group} | set(index_names)
+    if separate_payer:
+        assert calls[0].entries == ()
+    return calls
+
+
+class TestPacking:
+
+    def test_default_budget_fills_a_group_of_16(self):
+        group = next(plan_pooled(entries(200)))
+        # As many ideas as 16 calls' pooled budget covers: 23 at the recorded 89 + 413 per idea
+        spare = MAX_GROUP_SIZE * (APP_CALL_BUDGET - DEFAULT_BUDGET.per_call)
+        assert len(group) == spare // DEFAULT_BUDGET.per_idea
+        assert group_size(group) == MAX_GROUP_SIZE
+
+    def test_cheaper_ideas_pack_beyond_three_per_call(self):
+        budget = BudgetModel(per_call=100, per_idea=120)
+        groups = list(plan_pooled(entries(500), budget))
+        assert len(groups[0]) > 3 * MAX_GROUP_SIZE
+        assert [e for group in groups for e in group] == entries(500)
+
+    def test_remainder_group_uses_fewest_transactions(self):
+        assert group_size(entries(1)) == 1
+        assert group_size(entries(1), separate_payer=True) == 2
+        # 4 ideas + 7 index boxes need a second transaction either way
+        assert group_size(entries(4), ASSUMED_BUDGET) == group_size(entries(4), ASSUMED_BUDGET, True) == 2
+
+    def test_long_titles_split_by_argument_bytes(self):
+        budget = BudgetModel(per_call=0, per_idea=10)
+        group = entries(40, title="x" * 64)
+        calls = layout_group(group, index_box_names(IndexCursor(0, FOUNDER, 0), group), budget)
+        assert len(calls) >= -(-40 * entry_arg_size(group[0]) // (MAX_APP_ARGS_BYTES - CALL_ARGS_OVERHEAD))
+
+    def test_budget_only_padding_calls_register_nothing(self):
+        budget = BudgetModel(per_call=200, per_idea=600)
+        group = entries(2)
+        calls = layout_group(group, index_box_names(IndexCursor(0, FOUNDER, 0), group), budget)
+        assert len(calls) == 3
+        assert sum(1 for call in calls if not call.entries) == 1
+
+    def test_index_names_cover_every_page_touched(self):
+        cursor = IndexCursor(HASHES_PER_PAGE - 1, FOUNDER, ORDINALS_PER_PAGE - 1)
+        names = index_box_names(cursor, entries(HASHES_PER_PAGE + 2))
+        # Ordinal pages 0..2 plus slack 3, stats, founder pages 0..1 plus slack 2
+        assert len(names) == 4 + 1 + 3
+        assert names[-1] == founder_page_box_name(FOUNDER, 2)
+        assert (cursor.next_ordinal, cursor.founder_total) == (2 * HASHES_PER_PAGE + 1, ORDINALS_PER_PAGE + HASHES_PER_PAGE + 1)
+
+
+class TestRandomWorkloads:
+
+    @pytest.mark.parametrize("seed", range(8))
+    def test_layouts_respect_every_limit(self, seed):
+        rng = random.Random(seed)
+        budget = BudgetModel(per_call=rng.randint(0, 300), per_idea=rng.randint(40, 233))
+        separate_payer = rng.random() < 0.5
+        workload = [
+            BulkEntry(rng.randbytes(32), rng.randbytes(32), "é" * rng.randint(0, 32))
+            for _ in range(rng.randint(1, 600))
+        ]
+        cursor = IndexCursor(rng.randint(0, 10_000), FOUNDER, rng.randint(0, 500))
+        groups = list(plan_pooled(workload, budget, separate_payer))
+        assert [e for group in groups for e in group] == workload
+        for group in groups:
+            check_layout(group, cursor, budget, separate_payer)
+
+    def test_stream_planned_in_chunks(self):
+        groups = list(plan_pooled(iter(entries(PLAN_CHUNK + 10))))
+        assert sum(len(group) for group in groups) == PLAN_CHUNK + 10
+
+
+class TestFeeReport:
+
+    def test_savings_against_unpooled(self):
+        report = fee_report(entries(480), ASSUMED_BUDGET)
+        assert (report.ideas, report.groups, report.transactions) == (480, 10, 160)
+        assert report.pooled_fee == 160 * MIN_FEE
+        assert report.single_fee == 480 * MIN_FEE
+        assert report.batched_fee == 160 * MIN_FEE
+        assert report.savings(report.single_fee) == pytest.approx(2 / 3)
+        assert report.as_dict()["savingsVsBatched"] == 0.0
+
+    def test_cheaper_budget_beats_batched(self):
+        report = fee_report(entries(480), BudgetModel(per_call=100, per_idea=120))
+        assert report.pooled_fee < report.batched_fee
+        assert "saved" in report.format()
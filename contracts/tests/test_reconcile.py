@@ -0,0 +1,215 @@
+"""
+IdeaVault — Database reconciliation tests
+Runs reconcile.py against a SQLite copy of the Prisma Idea / User tables and
+an in-memory chain. No LocalNet or Postgres required.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from box_enumerator import HASHES_PER_SIMULATE
+from reconcile import (
+    CID,
+    FOUNDER,
+    INVALID_HASH,
+    MISSING,
+    TIMESTAMP,
+    VERIFIED_FLAG,
+    IdeaTable,
+    libpq_url,
+    reconcile,
+)
+from registry_client import OnChainIdea
+
+SERVICE = "SERVICE" + "A" * 51
+WALLET = "WALLET" + "B" * 52
+
+SCHEMA = """
+CREATE TABLE "User" ("id" TEXT PRIMARY KEY, "walletAddress" TEXT UNIQUE);
+CREATE TABLE "Idea" (
+    "id" TEXT PRIMARY KEY,
+    "ideaHash" TEXT UNIQUE NOT NULL,
+    "blockTimestamp" INTEGER,
+    "ipfsCid" TEXT,
+    "isVerified" BOOLEAN NOT NULL DEFAULT 0,
+    "founderId" TEXT NOT NULL REFERENCES "User" ("id"),
+    "updatedAt" TEXT
+);
+"""
+
+
+def idea_hash(i: int) -> str:
+    return hashlib.sha256(f"idea-{i}".encode()).hexdigest()
+
+
+class Chain:
+    """In-memory registry: records every fetched chunk and peak concurrency."""
+
+    def __init__(self):
+        self.ideas: dict[bytes, OnChainIdea] = {}
+        self.calls: list[list[bytes]] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, hashes: list[bytes]) -> dict:
+        with self._lock:
+            self.calls.append(hashes)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return {h: self.ideas.get(h) for h in hashes}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def db():
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.executescript(SCHEMA)
+    connection.execute('INSERT INTO "User" VALUES (?, ?)', ("user-1", WALLET))
+    connection.execute('INSERT INTO "User" VALUES (?, ?)', ("user-2", None))
+    yield connection
+    connection.close()
+
+
+def add_row(db, chain, i, *, on_chain=True, founder=SERVICE, verified=True, timestamp=1_771_000_000, cid="Qm" + "c" * 44, user="user-1", stored_hash=None):
+    h = stored_hash or idea_hash(i)
+    db.execute(
+        'INSERT INTO "Idea" ("id", "ideaHash", "blockTimestamp", "ipfsCid", "isVerified", "founderId") VALUES (?, ?, ?, ?, ?, ?)',
+        (f"id-{i}", h, timestamp, cid, verified, user),
+    )
+    if on_chain:
+        chain.ideas[bytes.fromhex(h)] = OnChainIdea(founder, 1_771_000_000, "Qm" + "c" * 44)
+
+
+def run(db, chain, **kwargs):
+    mismatches = []
+    with ThreadPoolExecutor(4) as executor:
+        report = reconcile(
+            IdeaTable(db, placeholder="?"),
+            chain,
+            executor,
+            window=kwargs.pop("window", 8),
+            founders=frozenset({SERVICE}),
+            on_mismatch=mismatches.append,
+            **kwargs,
+        )
+    return report, mismatches
+
+
+def verified_flags(db) -> dict[str, bool]:
+    return {id: bool(v) for id, v in db.execute('SELECT "id", "isVerified" FROM "Idea"')}
+
+
+class TestDiff:
+
+    def test_consistent_rows_match(self, db):
+        chain = Chain()
+        for i in range(10):
+            add_row(db, chain, i)
+        add_row(db, chain, 10, founder=WALLET)
+        report, mismatches = run(db, chain)
+        assert (report.rows, report.matched) == (11, 11)
+        assert mismatches == []
+
+    def test_every_kind_detected(self, db):
+        chain = Chain()
+        add_row(db, chain, 0, on_chain=False)
+        add_row(db, chain, 1, founder="OTHER")
+        add_row(db, chain, 2, timestamp=5)
+        add_row(db, chain, 3, cid="QmWrong")
+        add_row(db, chain, 4, verified=False)
+        add_row(db, chain, 5, on_chain=False, stored_hash="not-hex")
+        add_row(db, chain, 6, timestamp=None, user="user-2")
+        report, mismatches = run(db, chain)
+
+        kinds = {(m.idea_id, m.kind) for m in mismatches}
+        assert kinds == {
+            ("id-0", MISSING), ("id-0", VERIFIED_FLAG),
+            ("id-1", FOUNDER), ("id-1", VERIFIED_FLAG),
+            ("id-2", TIMESTAMP), ("id-2", VERIFIED_FLAG),
+            ("id-3", CID), ("id-3", VERIFIED_FLAG),
+            ("id-4", VERIFIED_FLAG),
+            ("id-5", INVALID_HASH), ("id-5", VERIFIED_FLAG),
+            ("id-6", TIMESTAMP), ("id-6", VERIFIED_FLAG),
+        }
+        assert report.matched == 0
+        assert report.mismatches[VERIFIED_FLAG] == 7
+        # Reported in ideaHash order
+        assert [m.idea_hash for m in mismatches] == sorted(m.idea_hash for m in mismatches)
+
+    def test_founder_report_lists_accepted_addresses(self, db):
+        chain = Chain()
+        add_row(db, chain, 0, founder="OTHER")
+        _, mismatches = run(db, chain)
+        (founder,) = [m for m in mismatches if m.kind == FOUNDER]
+        assert founder.as_dict()["database"] == sorted({SERVICE, WALLET})
+        assert founder.as_dict()["chain"] == "OTHER"
+
+
+class TestRepair:
+
+    def test_flags_set_to_chain_state(self, db):
+        chain = Chain()
+        add_row(db, chain, 0, on_chain=False, verified=True)
+        add_row(db, chain, 1, verified=False)
+        add_row(db, chain, 2, cid="QmWrong", verified=True)
+        add_row(db, chain, 3)
+        report, _ = run(db, chain, repair=True)
+        assert report.repaired == 3
+        assert verified_flags(db) == {"id-0": False, "id-1": True, "id-2": False, "id-3": True}
+        touched = {id for id, at in db.execute('SELECT "id", "updatedAt" FROM "Idea"') if at}
+        assert touched == {"id-0", "id-1", "id-2"}
+
+        report, mismatches = run(db, chain, repair=True)
+        assert report.repaired == 0
+        assert VERIFIED_FLAG not in report.mismatches
+
+    def test_report_only_leaves_rows_alone(self, db):
+        chain = Chain()
+        add_row(db, chain, 0, on_chain=False)
+        report, _ = run(db, chain)
+        assert report.repaired == 0
+        assert verified_flags(db) == {"id-0": True}
+
+
+class TestStreaming:
+
+    def test_every_row_checked_once_in_simulate_chunks(self, db):
+        chain = Chain()
+        for i in range(1_000):
+            add_row(db, chain, i, on_chain=i % 3 != 0)
+        report, mismatches = run(db, chain, page_size=300, window=3)
+
+        assert report.rows == 1_000
+        fetched = [h for call in chain.calls for h in call]
+        assert sorted(fetched) == sorted(bytes.fromhex(idea_hash(i)) for i in range(1_000))
+        assert all(len(call) <= HASHES_PER_SIMULATE for call in chain.calls)
+        assert chain.peak <= 3
+        assert report.mismatches[MISSING] == 334
+        assert report.last_hash == max(idea_hash(i) for i in range(1_000))
+
+    def test_resume_after_hash(self, db):
+        chain = Chain()
+        for i in range(50):
+            add_row(db, chain, i)
+        hashes = sorted(idea_hash(i) for i in range(50))
+        report, _ = run(db, chain, page_size=7, after=hashes[19])
+        assert report.rows == 30
+        assert min(h for call in chain.calls for h in call).hex() == hashes[20]
+
+    def test_empty_table(self, db):
+        report, _ = run(db, Chain())
+        assert (report.rows, report.last_hash) == (0, "")
+        assert "Checked 0 rows" in report.format()
+
+
+def test_prisma_options_stripped():
+    url = "postgresql://u:p@host:5432/db?schema=public&sslmode=require&pgbouncer=true"
+    assert libpq_url(url) == "postgresql://u:p@host:5432/db?sslmode=require"
@@ -0,0 +1,73 @@
+"""
+IdeaVault — ABI spec and params cache tests
+Checks the ARC-56 parse against hand-computed selectors and the suggested
+params cache against a counting algod double. No LocalNet required.
+"""
+
+import hashlib
+import time
+
+from conftest import contract_abimethods
+from registry_spec import SuggestedParamsCache, load_spec
+
+
+class CountingAlgod:
+    """Minimal algod double: counts suggested_params calls."""
+
+    algod_address = "http://localhost:4001"
+
+    def __init__(self):
+        self.calls = 0
+
+    def suggested_params(self):
+        from algosdk.transaction import SuggestedParams
+
+        self.calls += 1
+        return SuggestedParams(fee=0, first=self.calls, last=self.calls + 1000, gh="", flat_fee=False)
+
+
+class TestSpec:
+
+    def test_spec_parsed_once(self):
+        assert load_spec() is load_spec()
+
+    def test_selectors_match_signatures(self):
+        spec = load_spec()
+        for name, method in spec.methods.items():
+            expected = hashlib.new("sha512_256", method.get_signature().encode()).digest()[:4]
+            assert method.get_selector() == expected
+            assert spec.selectors[expected] is method
+
+    def test_bytecode_loaded(self):
+        spec = load_spec()
+        assert spec.approval_program and spec.clear_program
+
+    def test_artifact_lists_every_abimethod(self):
+        assert set(load_spec().methods) == contract_abimethods()
+
+
+class TestParamsCache:
+
+    def test_params_reused_within_ttl(self):
+        algod = CountingAlgod()
+        cache = SuggestedParamsCache(ttl=60, background=False)
+        first = cache.get(algod)
+        first.fee = 12345  # callers get a copy
+        second = cache.get(algod)
+        assert algod.calls == 1
+        assert second.fee == 0
+
+    def test_params_refetched_after_ttl(self):
+        algod = CountingAlgod()
+        cache = SuggestedParamsCache(ttl=0.01, background=False)
+        cache.get(algod)
+        time.sleep(0.02)
+        assert cache.get(algod).first == 2
+
+    def test_invalidate_forces_refetch(self):
+        algod = CountingAlgod()
+        cache = SuggestedParamsCache(ttl=60, background=False)
+        cache.get(algod)
+        cache.invalidate(algod)
+        cache.get(algod)
+        assert algod.calls == 2
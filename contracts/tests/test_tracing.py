@@ -0,0 +1,151 @@
+"""
+IdeaVault — Tracing tests
+Span nesting and error status, the three exporters' output formats and the
+sign / submit / confirm split of an atomic group. No LocalNet required.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from tracing import (
+    NOOP_SPAN,
+    JsonLinesExporter,
+    OtlpExporter,
+    PrometheusExporter,
+    Tracer,
+    traced_execute,
+)
+
+
+class ListExporter:
+    """Collects finished spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestTracer:
+
+    def test_disabled_tracer_hands_out_the_noop_span(self):
+        tracer = Tracer()
+        assert not tracer.enabled
+        with tracer.span("submit", operation="register_idea") as span:
+            span.set(txid="X")
+        assert span is NOOP_SPAN
+
+    def test_nested_spans_share_a_trace(self):
+        exporter = ListExporter()
+        tracer = Tracer([exporter])
+        with tracer.span("register") as outer:
+            with tracer.span("sign") as inner:
+                pass
+        with tracer.span("register") as other:
+            pass
+        assert [span.name for span in exporter.spans] == ["sign", "register", "register"]
+        assert inner.trace_id == outer.trace_id and inner.parent_id == outer.span_id
+        assert outer.parent_id is None and other.trace_id != outer.trace_id
+        assert outer.duration >= inner.duration >= 0
+
+    def test_errors_recorded_and_reraised(self):
+        exporter = ListExporter()
+        tracer = Tracer([exporter])
+        with pytest.raises(TimeoutError):
+            with tracer.span("confirm"):
+                raise TimeoutError
+        assert exporter.spans[0].error == "TimeoutError"
+
+    def test_configure_from_spec(self, tmp_path):
+        tracer = Tracer()
+        tracer.configure(f"jsonl:{tmp_path / 't.jsonl'}, prometheus:{tmp_path / 'm.prom'},otlp:{tmp_path / 'o.json'}")
+        assert [type(e) for e in tracer.exporters] == [JsonLinesExporter, PrometheusExporter, OtlpExporter]
+        tracer.close()
+        with pytest.raises(ValueError, match="IDEAVAULT_TRACE"):
+            Tracer().configure("statsd:localhost:8125")
+
+
+class TestExporters:
+
+    def test_json_lines(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tracer = Tracer([JsonLinesExporter(path)])
+        with tracer.span("simulate", method="get_ideas", hashes=128):
+            pass
+        tracer.close()
+        (record,) = [json.loads(line) for line in path.read_text().splitlines()]
+        assert record["name"] == "simulate"
+        assert record["attributes"] == {"method": "get_ideas", "hashes": 128}
+        assert record["error"] is None and record["duration"] >= 0
+
+    def test_prometheus_histogram(self, tmp_path):
+        path = tmp_path / "ideavault.prom"
+        exporter = PrometheusExporter(path, buckets=(0.1, 1.0))
+        for duration, error in [(0.05, None), (0.5, None), (5.0, "TimeoutError")]:
+            exporter.export(SimpleNamespace(name="confirm", duration=duration, error=error))
+        exporter.close()
+
+        text = path.read_text()
+        assert 'ideavault_span_duration_seconds_bucket{span="confirm",le="0.1"} 1' in text
+        assert 'ideavault_span_duration_seconds_bucket{span="confirm",le="1.0"} 2' in text
+        assert 'ideavault_span_duration_seconds_bucket{span="confirm",le="+Inf"} 3' in text
+        assert 'ideavault_span_duration_seconds_count{span="confirm"} 3' in text
+        assert 'ideavault_span_errors_total{span="confirm"} 1' in text
+        assert not list(tmp_path.glob("*.part"))
+
+    def test_otlp_json(self, tmp_path):
+        path = tmp_path / "otlp.json"
+        tracer = Tracer([OtlpExporter(str(path), batch_size=2)])
+        with tracer.span("register"):
+            with tracer.span("submit", txns=16, retry=False):
+                pass
+        # A full batch is written without waiting for close
+        (request,) = [json.loads(line) for line in path.read_text().splitlines()]
+        submit, register = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert submit["parentSpanId"] == register["spanId"] and "parentSpanId" not in register
+        assert len(submit["traceId"]) == 32 and len(submit["spanId"]) == 16
+        assert int(submit["endTimeUnixNano"]) >= int(submit["startTimeUnixNano"])
+        assert submit["attributes"] == [
+            {"key": "txns", "value": {"intValue": "16"}},
+            {"key": "retry", "value": {"boolValue": False}},
+        ]
+        assert submit["status"] == {"code": 1}
+        tracer.close()
+
+
+def test_execute_split_into_sign_submit_confirm(monkeypatch):
+    import tracing
+
+    calls = []
+
+    class FakeComposer:
+        def get_tx_count(self):
+            return 2
+
+        def gather_signatures(self):
+            calls.append("sign")
+
+        def submit(self, client):
+            calls.append("submit")
+            return ["TX1", "TX2"]
+
+        def execute(self, client, wait_rounds):
+            calls.append(f"execute:{wait_rounds}")
+            return "result"
+
+    exporter = ListExporter()
+    monkeypatch.setattr(tracing, "tracer", Tracer([exporter]))
+    assert traced_execute(FakeComposer(), object(), 4, "register_idea") == "result"
+    assert calls == ["sign", "submit", "execute:4"]
+    assert [(s.name, s.attributes["operation"]) for s in exporter.spans] == [
+        ("sign", "register_idea"), ("submit", "register_idea"), ("confirm", "register_idea"),
+    ]
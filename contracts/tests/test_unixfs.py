@@ -0,0 +1,71 @@
+"""
+IdeaVault — UnixFS CIDv0 tests
+Known `ipfs add` vectors plus the structure of multi-chunk DAGs.
+"""
+
+import hashlib
+
+from unixfs import CHUNK_SIZE, MAX_LINKS, DagBuilder, cidv0, file_root, leaf_node, parent_node
+
+
+class TestVectors:
+
+    def test_empty_file(self):
+        assert cidv0(b"") == "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"
+
+    def test_hello_world(self):
+        assert cidv0(b"hello world\n") == "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+
+    def test_single_chunk_is_its_own_root(self):
+        data = b"x" * CHUNK_SIZE
+        assert file_root(data) == leaf_node(data)
+
+
+class TestLayout:
+
+    def test_two_chunks_link_under_one_root(self):
+        data = bytes(range(256)) * (CHUNK_SIZE // 256) + b"tail"
+        root = file_root(data)
+        leaves = [leaf_node(data[:CHUNK_SIZE]), leaf_node(data[CHUNK_SIZE:])]
+        assert root == parent_node(leaves)
+        assert root.file_size == len(data)
+        assert root.cumulative_size == root.block_size + sum(leaf.block_size for leaf in leaves)
+
+    def test_tree_deepens_past_max_links(self):
+        chunk = 16
+        data = b"".join(hashlib.sha256(str(i).encode()).digest()[:chunk] for i in range(MAX_LINKS + 1))
+        leaves = [leaf_node(data[i:i + chunk]) for i in range(0, len(data), chunk)]
+        expected = parent_node([parent_node(leaves[:MAX_LINKS]), parent_node(leaves[MAX_LINKS:])])
+        assert file_root(data, chunk_size=chunk) == expected
+
+    def test_exactly_max_links_is_one_level(self):
+        data = b"ab" * MAX_LINKS
+        leaves = [leaf_node(b"ab") for _ in range(MAX_LINKS)]
+        assert file_root(data, chunk_size=2) == parent_node(leaves)
+
+
+def reference_root(leaves):
+    """Batch fold of leaves, MAX_LINKS per parent, to check DagBuilder against."""
+    layer = leaves
+    while len(layer) > 1:
+        layer = [parent_node(layer[i:i + MAX_LINKS]) for i in range(0, len(layer), MAX_LINKS)]
+    return layer[0]
+
+
+class TestDagBuilder:
+
+    def test_matches_batch_fold_at_tree_boundaries(self):
+        for count in (2, MAX_LINKS - 1, MAX_LINKS, MAX_LINKS + 1, MAX_LINKS * MAX_LINKS + 1):
+            data = bytes(i % 251 for i in range(count))
+            leaves = [leaf_node(data[i:i + 1]) for i in range(count)]
+            assert file_root(data, chunk_size=1) == reference_root(leaves), count
+
+    def test_update_boundaries_do_not_matter(self):
+        data = bytes(range(256)) * 40
+        expected = file_root(data, chunk_size=1000)
+        for step in (1, 7, 999, 1000, 1001, 4096):
+            builder = DagBuilder(chunk_size=1000)
+            for i in range(0, len(data), step):
+                builder.update(data[i:i + step])
+            assert builder.finish() == expected, step
+            assert builder.size == len(data)
@@ -0,0 +1,195 @@
+"""
+IdeaVault — Verification cache tests
+Drives VerificationService with an in-memory fetch function and a manual
+clock. No LocalNet required.
+"""
+
+import hashlib
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import verification_service
+from idea_events import IdeaDeletedEvent
+from verification_service import VerificationService, make_handler
+
+REGISTERED = hashlib.sha256(b"registered").digest()
+UNKNOWN = hashlib.sha256(b"unknown").digest()
+RECORD = object()  # stands in for an OnChainIdea
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Chain:
+    """In-memory registry: counts fetches like simulate round-trips."""
+
+    def __init__(self, ideas: dict):
+        self.ideas = ideas
+        self.calls: list[list[bytes]] = []
+
+    def __call__(self, hashes: list[bytes]) -> dict:
+        self.calls.append(hashes)
+        return {h: self.ideas.get(h) for h in hashes}
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def chain():
+    return Chain({REGISTERED: RECORD})
+
+
+@pytest.fixture
+def service(chain, clock):
+    return VerificationService(chain, capacity=4, positive_ttl=3600, negative_ttl=5, clock=clock)
+
+
+class TestReadThrough:
+
+    def test_positive_result_cached(self, service, chain):
+        assert service.verify_idea(REGISTERED)
+        assert service.verify_idea(REGISTERED)
+        assert len(chain.calls) == 1
+        assert service.stats.hits == 1 and service.stats.misses == 1
+
+    def test_misses_share_one_fetch(self, service, chain):
+        assert service.verify_ideas([REGISTERED, UNKNOWN]) == {REGISTERED: True, UNKNOWN: False}
+        assert chain.calls == [[REGISTERED, UNKNOWN]]
+
+    def test_negative_result_expires_quickly(self, service, chain, clock):
+        assert not service.verify_idea(UNKNOWN)
+        clock.now = 4
+        assert not service.verify_idea(UNKNOWN)
+        assert service.stats.negative_hits == 1
+
+        chain.ideas[UNKNOWN] = RECORD
+        clock.now = 6
+        assert service.verify_idea(UNKNOWN)
+        assert len(chain.calls) == 2
+
+    def test_lru_evicts_least_recently_used(self, service, chain):
+        hashes = [hashlib.sha256(bytes([i])).digest() for i in range(5)]
+        chain.ideas.update({h: RECORD for h in hashes})
+        service.get_ideas(hashes[:4])
+        service.get_idea(hashes[0])  # refresh the oldest entry
+        service.get_idea(hashes[4])
+        assert service.stats.evictions == 1
+        calls = len(chain.calls)
+        service.get_idea(hashes[0])
+        assert len(chain.calls) == calls
+        service.get_idea(hashes[1])
+        assert len(chain.calls) == calls + 1
+
+
+class TestInvalidation:
+
+    def test_deleted_event_evicts(self, service, chain):
+        service.verify_idea(REGISTERED)
+        del chain.ideas[REGISTERED]
+        service.observe([IdeaDeletedEvent(REGISTERED, bytes(32))])
+        assert not service.verify_idea(REGISTERED)
+        assert service.stats.invalidations == 1
+
+    def test_fetch_racing_delete_is_not_cached(self, clock):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_fetch(hashes):
+            started.set()
+            release.wait(5)
+            return {h: RECORD for h in hashes}
+
+        service = VerificationService(slow_fetch, clock=clock)
+        reader = threading.Thread(target=service.verify_idea, args=(REGISTERED,))
+        reader.start()
+        started.wait(5)
+        service.invalidate(REGISTERED)  # delete lands while the read is in flight
+        release.set()
+        reader.join(5)
+
+        assert REGISTERED not in service._entries
+
+    def test_fetch_racing_registration_keeps_the_event(self, clock):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_fetch(hashes):
+            started.set()
+            release.wait(5)
+            return {h: None for h in hashes}  # read before the registration landed
+
+        service = VerificationService(slow_fetch, clock=clock)
+        reader = threading.Thread(target=service.verify_idea, args=(UNKNOWN,))
+        reader.start()
+        started.wait(5)
+        service.record(UNKNOWN, RECORD)  # IdeaRegistered observed meanwhile
+        release.set()
+        reader.join(5)
+
+        assert service._entries[UNKNOWN][0] is RECORD
+
+    def test_stats_report_latency(self, service):
+        service.verify_ideas([REGISTERED, UNKNOWN])
+        stats = service.stats.as_dict()
+        assert stats["fetches"] == 1
+        assert stats["fetchMaxMs"] >= stats["fetchMeanMs"] >= 0
+
+
+class TestWatcher:
+
+    def test_restarts_from_the_failed_round(self, service, monkeypatch):
+        monkeypatch.setattr(verification_service, "WATCH_RETRY_DELAY", 0.01)
+        fetched, done = [], threading.Event()
+
+        class FlakyAlgod:
+            failed = False
+
+            def status(self):
+                return {"last-round": 1_000}
+
+            def block_info(self, round_number):
+                if round_number == 12 and not self.failed:
+                    self.failed = True
+                    raise ConnectionError("algod restarted")
+                if round_number > 14:
+                    threading.Event().wait()  # park the watcher once the test has its rounds
+                fetched.append(round_number)
+                if round_number == 14:
+                    done.set()
+                return {"block": {}}
+
+        service.watch(FlakyAlgod(), app_id=1, start_round=10)
+        assert done.wait(5)
+        assert fetched == [10, 11, 12, 13, 14]
+        assert service.stats.watcher_restarts == 1
+
+
+def test_chain_errors_are_server_errors():
+    def failing_fetch(hashes):
+        raise ConnectionError("algod unreachable")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(VerificationService(failing_fetch)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/verify/{REGISTERED.hex()}", timeout=5)
+        assert error.value.code == 502
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/verify/abcd", timeout=5)
+        assert error.value.code == 400
+        assert json.loads(error.value.read())["error"] == "Idea hash must be 32 bytes"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,331 @@
+"""
+Timing spans for the IdeaRegistry chain client.
+Param fetches, signing, submission, confirmation waits and simulate calls
+are wrapped in spans and handed to pluggable exporters: JSON lines, a
+Prometheus textfile (for node_exporter's textfile collector) and OTLP/JSON
+(POSTed to an OpenTelemetry collector or appended to a file).
+
+Tracing is off unless IDEAVAULT_TRACE names exporters, e.g.
+
+    IDEAVAULT_TRACE=jsonl:trace.jsonl,prometheus:ideavault.prom,otlp:http://127.0.0.1:4318/v1/traces
+
+While it is off, span() returns one shared no-op object, so instrumented
+code pays a single attribute check per span.
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Protocol
+
+TRACE_ENV = "IDEAVAULT_TRACE"
+SERVICE_NAME = "ideavault-contracts"
+
+# Seconds; algod calls are milliseconds, confirmation waits a few rounds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROMETHEUS_INTERVAL = 10.0
+OTLP_BATCH_SIZE = 512
+
+_current: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("ideavault_span", default=None)
+
+
+class Span:
+    """One timed operation; use as a context manager."""
+
+    __slots__ = (
+        "tracer", "name", "attributes", "trace_id", "span_id", "parent_id",
+        "start_ns", "duration", "error", "_started", "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.error: str | None = None
+        self.duration = 0.0
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes once they are known (txid, rounds waited, ...)."""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.span_id = os.urandom(8).hex()
+        self._token = _current.set(self)
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration = time.perf_counter() - self._started
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self.tracer.finish(self)
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentId": self.parent_id,
+            "start": self.start_ns / 1e9,
+            "duration": self.duration,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stands in for every span while tracing is off."""
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Exporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonLinesExporter:
+    """One JSON object per finished span, appended to a file."""
+
+    def __init__(self, path: str | Path):
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.as_dict(), default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class PrometheusExporter:
+    """
+    Duration histograms and error counts per span name, rewritten to a
+    Prometheus textfile at most every `interval` seconds and on close.
+    """
+
+    def __init__(self, path: str | Path, buckets: tuple[float, ...] = DEFAULT_BUCKETS, interval: float = PROMETHEUS_INTERVAL):
+        self.path = Path(path)
+        self.buckets = buckets
+        self.interval = interval
+        self._counts: dict[str, list[int]] = defaultdict(lambda: [0] * (len(buckets) + 1))
+        self._sums: dict[str, float] = defaultdict(float)
+        self._errors: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._written = time.monotonic()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._counts[span.name][bisect_left(self.buckets, span.duration)] += 1
+            self._sums[span.name] += span.duration
+            if span.error:
+                self._errors[span.name] += 1
+            due = time.monotonic() - self._written >= self.interval
+        if due:
+            self.flush()
+
+    def render(self) -> str:
+        lines = [
+            "# HELP ideavault_span_duration_seconds Duration of IdeaRegistry client operations.",
+            "# TYPE ideavault_span_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name in sorted(self._counts):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), self._counts[name]):
+                    cumulative += count
+                    lines.append(f'ideavault_span_duration_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'ideavault_span_duration_seconds_sum{{span="{name}"}} {self._sums[name]}')
+                lines.append(f'ideavault_span_duration_seconds_count{{span="{name}"}} {cumulative}')
+            lines.append("# HELP ideavault_span_errors_total Client operations that raised.")
+            lines.append("# TYPE ideavault_span_errors_total counter")
+            for name in sorted(self._counts):
+                lines.append(f'ideavault_span_errors_total{{span="{name}"}} {self._errors[name]}')
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        # Write-then-rename, so the collector never scrapes a half-written file
+        partial_path = self.path.with_name(self.path.name + ".part")
+        partial_path.write_text(self.render(), encoding="utf-8")
+        os.replace(partial_path, self.path)
+        self._written = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpExporter:
+    """
+    Spans in the OTLP/JSON trace format, batched. A http(s) target is POSTed
+    to (an OpenTelemetry collector's /v1/traces); anything else is a file
+    that gets one export request per line.
+    """
+
+    def __init__(self, target: str, service_name: str = SERVICE_NAME, batch_size: int = OTLP_BATCH_SIZE):
+        self.target = target
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self._batch: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._batch.append(span)
+            full = len(self._batch) >= self.batch_size
+        if full:
+            self.flush()
+
+    def encode(self, spans: list[Span]) -> dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                    "name": span.name,
+                    "kind": 3,  # SPAN_KIND_CLIENT
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.start_ns + int(span.duration * 1e9)),
+                    "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                    "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                } for span in spans],
+            }],
+        }]}
+
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._batch = self._batch, []
+        if not spans:
+            return
+        body = json.dumps(self.encode(spans)).encode()
+        try:
+            if self.target.startswith(("http://", "https://")):
+                request = urllib.request.Request(self.target, body, {"Content-Type": "application/json"})
+                urllib.request.urlopen(request, timeout=5).close()
+            else:
+                with open(self.target, "ab") as f:
+                    f.write(body + b"\n")
+        except OSError as e:
+            # Losing a batch of spans must never fail the operation being traced
+            print(f"tracing: dropped {len(spans)} spans: {e}", file=sys.stderr)
+
+    def close(self) -> None:
+        self.flush()
+
+
+EXPORTERS = {"jsonl": JsonLinesExporter, "prometheus": PrometheusExporter, "otlp": OtlpExporter}
+
+
+class Tracer:
+    """Creates spans and fans finished ones out to the exporters."""
+
+    def __init__(self, exporters: list[Exporter] | None = None):
+        self.exporters: list[Exporter] = list(exporters or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def span(self, name: str, **attributes: Any) -> Span | _NoopSpan:
+        if not self.exporters:
+            return NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def finish(self, span: Span) -> None:
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    def configure(self, spec: str) -> None:
+        """Add exporters from a spec like "jsonl:trace.jsonl,prometheus:ideavault.prom"."""
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            kind, _, target = item.partition(":")
+            if kind not in EXPORTERS or not target:
+                raise ValueError(f"Bad {TRACE_ENV} entry {item!r}: expected one of {sorted(EXPORTERS)} followed by :target")
+            self.exporters.append(EXPORTERS[kind](target))
+
+    def flush(self) -> None:
+        for exporter in self.exporters:
+            exporter.flush()
+
+    def close(self) -> None:
+        exporters, self.exporters = self.exporters, []
+        for exporter in exporters:
+            exporter.close()
+
+
+# Process-wide tracer used by the tooling
+tracer = Tracer()
+if os.environ.get(TRACE_ENV):
+    tracer.configure(os.environ[TRACE_ENV])
+    atexit.register(tracer.close)
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """A span on the process-wide tracer (a no-op while tracing is off)."""
+    return tracer.span(name, **attributes)
+
+
+def traced_submit(atc, algod_client, operation: str) -> list[str]:
+    """
+    Sign and submit an AtomicTransactionComposer as separate spans. The
+    composer keeps its signatures, so submit() does not sign again.
+    """
+    with span("sign", operation=operation, txns=atc.get_tx_count()):
+        atc.gather_signatures()
+    with span("submit", operation=operation):
+        return atc.submit(algod_client)
+
+
+def traced_execute(atc, algod_client, wait_rounds: int, operation: str):
+    """atc.execute() split into sign, submit and confirm spans."""
+    traced_submit(atc, algod_client, operation)
+    with span("confirm", operation=operation):
+        # Already submitted: execute() only waits and decodes the results
+        return atc.execute(algod_client, wait_rounds)
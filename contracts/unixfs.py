@@ -0,0 +1,154 @@
+"""
+UnixFS CIDv0 computation.
+Builds the same dag-pb file DAG `ipfs add` / Pinata produce with their
+defaults (CIDv0, 256 KiB fixed-size chunks, balanced layout with at most 174
+links per node, UnixFS File leaves) and returns its root CID, so a local pin
+yields the identical "Qm..." string the real service would.
+
+Only the hashes are computed and blocks are not kept; DagBuilder consumes a
+file incrementally, so CIDs of large documents need O(depth) memory. A single-chunk file is its
+own root. Larger files get intermediate nodes whose links carry each child's
+cumulative size and whose UnixFS data lists each child's file size.
+"""
+
+import hashlib
+from dataclasses import dataclass
+
+from idea_codec import digest_to_cid
+
+CHUNK_SIZE = 262_144
+MAX_LINKS = 174
+
+_UNIXFS_FILE = 2
+_MULTIHASH_SHA256_PREFIX = b"\x12\x20"
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _field_varint(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _field_bytes(number: int, value: bytes) -> bytes:
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+@dataclass(frozen=True)
+class DagNode:
+    """A hashed dag-pb block: its digest, encoded size, and what it spans."""
+
+    digest: bytes
+    block_size: int
+    cumulative_size: int  # block_size plus every descendant's block size
+    file_size: int  # bytes of file content under this node
+
+    @property
+    def cid(self) -> str:
+        return digest_to_cid(self.digest)
+
+
+def _hash_block(block: bytes, children_size: int, file_size: int) -> DagNode:
+    return DagNode(hashlib.sha256(block).digest(), len(block), len(block) + children_size, file_size)
+
+
+def leaf_node(chunk: bytes) -> DagNode:
+    """UnixFS File leaf holding one chunk (an empty chunk omits the Data field)."""
+    unixfs = _field_varint(1, _UNIXFS_FILE)
+    if chunk:
+        unixfs += _field_bytes(2, chunk)
+    unixfs += _field_varint(3, len(chunk))
+    return _hash_block(_field_bytes(1, unixfs), 0, len(chunk))
+
+
+def parent_node(children: list[DagNode]) -> DagNode:
+    """Intermediate File node linking `children` in order."""
+    file_size = sum(child.file_size for child in children)
+    links = b"".join(
+        _field_bytes(2, _field_bytes(1, _MULTIHASH_SHA256_PREFIX + child.digest)
+                     + _field_bytes(2, b"")
+                     + _field_varint(3, child.cumulative_size))
+        for child in children
+    )
+    unixfs = _field_varint(1, _UNIXFS_FILE) + _field_varint(3, file_size)
+    unixfs += b"".join(_field_varint(4, child.file_size) for child in children)
+    # dag-pb canonical order: Links (field 2) before Data (field 1)
+    block = links + _field_bytes(1, unixfs)
+    return _hash_block(block, sum(child.cumulative_size for child in children), file_size)
+
+
+class DagBuilder:
+    """
+    Incremental UnixFS file importer: feed bytes with update(), then finish().
+
+    Keeps at most one partial chunk plus up to MAX_LINKS pending digests per
+    tree level, so memory stays flat however large the file is. Produces the
+    same root as folding all leaves bottom-up MAX_LINKS at a time.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._buffer = bytearray()
+        self._levels: list[list[DagNode]] = [[]]
+
+    def update(self, data: bytes | memoryview) -> None:
+        view = memoryview(data)
+        self.size += len(view)
+        if self._buffer:
+            take = min(len(view), self.chunk_size - len(self._buffer))
+            self._buffer += view[:take]
+            view = view[take:]
+            if len(self._buffer) < self.chunk_size:
+                return
+            self._add_leaf(bytes(self._buffer))
+            self._buffer.clear()
+        while len(view) >= self.chunk_size:
+            self._add_leaf(bytes(view[:self.chunk_size]))
+            view = view[self.chunk_size:]
+        self._buffer += view
+
+    def finish(self) -> DagNode:
+        """Root of everything fed so far; the builder must not be reused."""
+        if self._buffer or self.size == 0:
+            self._add_leaf(bytes(self._buffer))
+            self._buffer.clear()
+        levels = self._levels
+        for depth, nodes in enumerate(levels):
+            higher = any(levels[depth + 1:])
+            if len(nodes) == 1 and not higher:
+                return nodes[0]
+            if nodes:
+                self._push(depth + 1, parent_node(nodes))
+        raise AssertionError("unreachable: the top level always holds the root")
+
+    def _add_leaf(self, chunk: bytes) -> None:
+        self._push(0, leaf_node(chunk))
+
+    def _push(self, depth: int, node: DagNode) -> None:
+        if depth == len(self._levels):
+            self._levels.append([])
+        level = self._levels[depth]
+        level.append(node)
+        if len(level) == MAX_LINKS:
+            # A full node never gains more links, so it can be hashed right away
+            self._levels[depth] = []
+            self._push(depth + 1, parent_node(level))
+
+
+def file_root(data: bytes | memoryview, chunk_size: int = CHUNK_SIZE) -> DagNode:
+    """Root node of `data` imported as a UnixFS file."""
+    builder = DagBuilder(chunk_size)
+    builder.update(data)
+    return builder.finish()
+
+
+def cidv0(data: bytes | memoryview) -> str:
+    """CIDv0 of `data` as `ipfs add --cid-version=0` would report it."""
+    return file_root(data).cid
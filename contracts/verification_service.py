@@ -0,0 +1,317 @@
+"""
+IdeaRegistry verification service.
+Read-through cache in front of registry_client.get_ideas. A registered idea
+only changes when the creator calls delete_idea, so positive results are
+kept in a bounded LRU (with a long TTL as a safety net) while negative
+results expire quickly, since an unknown hash may be registered any moment.
+
+A block watcher decodes IdeaRegistered / IdeaDeleted events as rounds are
+produced: deletes evict the hash and registrations populate it. Algorand
+blocks are final once produced, so an observed event never has to be rolled
+back. Lookups racing an event cannot overwrite what the event cached. If the
+watcher fails it is restarted with backoff from the first unprocessed round.
+
+Run as a sidecar to serve GET /verify/<hash>, /ideas/<hash> and /stats.
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from idea_events import IdeaDeletedEvent, IdeaEvent, IdeaRegisteredEvent, decode_block
+
+if TYPE_CHECKING:
+    from registry_client import OnChainIdea
+
+DEFAULT_CAPACITY = 100_000
+DEFAULT_POSITIVE_TTL = 3_600.0
+DEFAULT_NEGATIVE_TTL = 5.0
+# Block watcher restart backoff (seconds), doubled after each failure
+WATCH_RETRY_DELAY = 1.0
+WATCH_MAX_RETRY_DELAY = 60.0
+
+logger = logging.getLogger(__name__)
+
+Fetch = Callable[[list[bytes]], dict[bytes, Optional["OnChainIdea"]]]
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters and chain fetch latency."""
+
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    fetches: int = 0
+    fetch_seconds: float = 0.0
+    fetch_max_seconds: float = 0.0
+    watcher_restarts: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+    @property
+    def fetch_mean_seconds(self) -> float:
+        return self.fetch_seconds / self.fetches if self.fetches else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "negativeHits": self.negative_hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hit_ratio, 4),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "fetches": self.fetches,
+            "fetchMeanMs": round(self.fetch_mean_seconds * 1000, 3),
+            "fetchMaxMs": round(self.fetch_max_seconds * 1000, 3),
+            "watcherRestarts": self.watcher_restarts,
+        }
+
+
+class VerificationService:
+    """Thread-safe read-through LRU/TTL cache of idea lookups."""
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        capacity: int = DEFAULT_CAPACITY,
+        positive_ttl: float = DEFAULT_POSITIVE_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._fetch = fetch
+        self.capacity = capacity
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries: OrderedDict[bytes, tuple[Optional["OnChainIdea"], float]] = OrderedDict()
+        # Event generation per hash, so fetches that raced an observed event are not cached
+        self._generation = 0
+        self._invalidated: OrderedDict[bytes, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    @classmethod
+    def for_app(cls, algod_client, app_id: int, **kwargs) -> "VerificationService":
+        """Service backed by get_ideas simulate calls against `app_id`."""
+        from registry_client import get_ideas
+
+        return cls(lambda hashes: get_ideas(algod_client, app_id, hashes), **kwargs)
+
+    def get_ideas(self, idea_hashes: Iterable[bytes]) -> dict[bytes, Optional["OnChainIdea"]]:
+        """Records for many hashes (None if not registered); misses share one fetch."""
+        hashes = list(dict.fromkeys(idea_hashes))
+        results: dict[bytes, Optional["OnChainIdea"]] = {}
+        missing: list[bytes] = []
+        now = self._clock()
+
+        with self._lock:
+            for idea_hash in hashes:
+                entry = self._entries.get(idea_hash)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(idea_hash)
+                    results[idea_hash] = entry[0]
+                    if entry[0] is None:
+                        self.stats.negative_hits += 1
+                    else:
+                        self.stats.hits += 1
+                else:
+                    missing.append(idea_hash)
+                    self.stats.misses += 1
+            generation = self._generation
+
+        if missing:
+            started = time.perf_counter()
+            fetched = self._fetch(missing)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.stats.fetches += 1
+                self.stats.fetch_seconds += elapsed
+                self.stats.fetch_max_seconds = max(self.stats.fetch_max_seconds, elapsed)
+                for idea_hash in missing:
+                    idea = fetched.get(idea_hash)
+                    results[idea_hash] = idea
+                    if self._invalidated.get(idea_hash, -1) < generation:
+                        self._store(idea_hash, idea)
+
+        return {idea_hash: results[idea_hash] for idea_hash in hashes}
+
+    def get_idea(self, idea_hash: bytes) -> Optional["OnChainIdea"]:
+        return self.get_ideas([idea_hash])[idea_hash]
+
+    def verify_ideas(self, idea_hashes: Iterable[bytes]) -> dict[bytes, bool]:
+        return {h: idea is not None for h, idea in self.get_ideas(idea_hashes).items()}
+
+    def verify_idea(self, idea_hash: bytes) -> bool:
+        return self.get_idea(idea_hash) is not None
+
+    def invalidate(self, idea_hash: bytes) -> None:
+        """Forget a hash, e.g. after its delete_idea call was observed."""
+        with self._lock:
+            self._bump(idea_hash)
+            if self._entries.pop(idea_hash, None) is not None:
+                self.stats.invalidations += 1
+
+    def record(self, idea_hash: bytes, idea: "OnChainIdea") -> None:
+        """Cache a registration seen on-chain, superseding lookups still in flight."""
+        with self._lock:
+            self._bump(idea_hash)
+            self._store(idea_hash, idea)
+
+    def observe(self, events: Iterable[IdeaEvent]) -> None:
+        """Apply on-chain events in order: deletes evict, registrations populate."""
+        for event in events:
+            if isinstance(event, IdeaDeletedEvent):
+                self.invalidate(event.idea_hash)
+            elif isinstance(event, IdeaRegisteredEvent):
+                from algosdk import encoding
+                from registry_client import OnChainIdea
+
+                idea = OnChainIdea(
+                    founder=encoding.encode_address(event.founder),
+                    timestamp=event.timestamp,
+                    ipfs_cid=event.ipfs_cid,
+                )
+                self.record(event.idea_hash, idea)
+
+    def observe_block(self, block: dict, app_id: int, round_number: int = 0) -> None:
+        self.observe(decode_block(block, app_id, round_number))
+
+    def watch(self, algod_client, app_id: int, start_round: int | None = None) -> threading.Thread:
+        """Follow new blocks on a daemon thread, applying their events."""
+        from indexer import follow_blocks
+
+        if start_round is None:
+            start_round = algod_client.status()["last-round"] + 1
+
+        def run() -> None:
+            next_round, delay = start_round, WATCH_RETRY_DELAY
+            while True:
+                try:
+                    for round_number, block in follow_blocks(algod_client, next_round):
+                        self.observe_block(block, app_id, round_number)
+                        next_round, delay = round_number + 1, WATCH_RETRY_DELAY
+                except Exception:
+                    # Resuming at next_round means no event is skipped, so
+                    # cached entries stay valid across the restart
+                    logger.exception("Block watcher failed at round %d; restarting in %.0fs", next_round, delay)
+                    with self._lock:
+                        self.stats.watcher_restarts += 1
+                    time.sleep(delay)
+                    delay = min(delay * 2, WATCH_MAX_RETRY_DELAY)
+
+        thread = threading.Thread(target=run, name="verification-watcher", daemon=True)
+        thread.start()
+        return thread
+
+    def _bump(self, idea_hash: bytes) -> None:
+        # Caller holds the lock
+        self._generation += 1
+        self._invalidated[idea_hash] = self._generation
+        self._invalidated.move_to_end(idea_hash)
+        while len(self._invalidated) > self.capacity:
+            self._invalidated.popitem(last=False)
+
+    def _store(self, idea_hash: bytes, idea: Optional["OnChainIdea"]) -> None:
+        # Caller holds the lock
+        ttl = self.negative_ttl if idea is None else self.positive_ttl
+        self._entries[idea_hash] = (idea, self._clock() + ttl)
+        self._entries.move_to_end(idea_hash)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+
+def make_handler(service: VerificationService) -> type[BaseHTTPRequestHandler]:
+    """HTTP handler serving /verify/<hex>, /ideas/<hex> and /stats."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            parts = self.path.strip("/").split("/")
+            try:
+                if parts == ["stats"]:
+                    self._send(200, service.stats.as_dict())
+                elif len(parts) == 2 and parts[0] in ("verify", "ideas"):
+                    idea_hash = bytes.fromhex(parts[1])
+                    if len(idea_hash) != 32:
+                        raise ValueError("Idea hash must be 32 bytes")
+                    if parts[0] == "verify":
+                        self._send(200, {"ideaHash": parts[1], "verified": service.verify_idea(idea_hash)})
+                    else:
+                        idea = service.get_idea(idea_hash)
+                        if idea is None:
+                            self._send(404, {"error": "Idea not found on-chain"})
+                        else:
+                            self._send(200, {
+                                "ideaHash": parts[1],
+                                "founder": idea.founder,
+                                "timestamp": idea.timestamp,
+                                "ipfsCid": idea.ipfs_cid,
+                            })
+                else:
+                    self._send(404, {"error": "Not found"})
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+            except Exception:
+                logger.exception("Lookup for %s failed", self.path)
+                self._send(502, {"error": "On-chain lookup failed"})
+
+        def _send(self, status: int, body: dict) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve cached IdeaRegistry verification over HTTP")
+    parser.add_argument("--network", default="localnet", choices=["localnet", "testnet", "mainnet"], help="Target network")
+    parser.add_argument("--app-id", type=int, default=int(os.environ.get("ALGORAND_APP_ID", "0")), help="IdeaRegistry app ID")
+    parser.add_argument("--port", type=int, default=8081, help="HTTP port")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="Maximum cached hashes")
+    parser.add_argument("--negative-ttl", type=float, default=DEFAULT_NEGATIVE_TTL, help="Seconds to cache 'not registered'")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if not args.app_id:
+        raise SystemExit("App ID required: pass --app-id or set ALGORAND_APP_ID")
+
+    from algokit_utils import AlgorandClient
+    if args.network == "localnet":
+        algorand = AlgorandClient.default_localnet()
+    elif args.network == "testnet":
+        algorand = AlgorandClient.testnet()
+    else:
+        algorand = AlgorandClient.mainnet()
+    algod_client = algorand.client.algod
+
+    service = VerificationService.for_app(
+        algod_client, args.app_id, capacity=args.capacity, negative_ttl=args.negative_ttl
+    )
+    service.watch(algod_client, args.app_id)
+
+    server = ThreadingHTTPServer(("", args.port), make_handler(service))
+    print(f"Serving verification for app {args.app_id} on :{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{service.stats.as_dict()}")
@@ -2,7 +2,7 @@
 
 import { useState } from 'react';
 import { useRouter } from 'next/navigation';
-import { registerIdea } from '@/services/api';
+import { registerIdea, waitForRegistration, PendingRegistration } from '@/services/api';
 
 const CATEGORIES = ['FINTECH', 'HEALTHTECH', 'EDTECH', 'AGRITECH', 'ECOMMERCE', 'SAAS', 'AI_ML', 'BLOCKCHAIN', 'SUSTAINABILITY', 'GAMING', 'SOCIAL', 'OTHER'];
 const STAGES = ['IDEA', 'MVP', 'EARLY_TRACTION', 'GROWTH', 'SCALING'];
@@ -11,6 +11,12 @@ const VISIBILITY = [
     { value: 'PRIVATE', label: '🔒 Private — only you can see it' },
     { value: 'NDA_REQUIRED', label: '📑 NDA Required — investors request access' },
 ];
+// Outbox stages of a queued registration, as shown while polling
+const PENDING_LABELS: Record<string, string> = {
+    pin: 'Uploading documents to IPFS...',
+    chain: 'Registering on Blockchain...',
+    record: 'Saving your idea...',
+};
 
 export default function RegisterIdeaPage() {
     const router = useRouter();
@@ -23,6 +29,7 @@ export default function RegisterIdeaPage() {
     const [submitting, setSubmitting] = useState(false);
     const [error, setError] = useState('');
     const [result, setResult] = useState<any>(null);
+    const [pending, setPending] = useState<PendingRegistration | null>(null);
 
     const set = (k: string, v: string) => setForm(f => ({ ...f, [k]: v }));
 
@@ -33,12 +40,20 @@ export default function RegisterIdeaPage() {
             Object.entries(form).forEach(([k, v]) => { if (v) fd.append(k, v); });
             if (file) fd.append('pitchDeck', file);
             const res = await registerIdea(fd);
-            setResult(res);
+            if ('pending' in res) {
+                // Queued on the registration outbox (202): poll until it is on-chain
+                setPending(res.pending);
+                const done = await waitForRegistration(res.pending, setPending);
+                setResult({ blockchainProof: done.blockchainProof });
+            } else {
+                setResult(res);
+            }
             setStep(4); // success step
         } catch (err: any) {
             setError(err.message);
         } finally {
             setSubmitting(false);
+            setPending(null);
         }
     }
 
@@ -58,10 +73,14 @@ export default function RegisterIdeaPage() {
                         </div>
                         <div className="flex flex-col gap-1">
                             <p className="text-slate-400 text-xs">Transaction ID</p>
-                            <a href={blockchainProof.explorerLink} target="_blank" rel="noopener noreferrer"
-                                className="font-mono text-blue-400 text-xs hover:text-blue-300 break-all">
-                                {blockchainProof.txnId} ↗
-                            </a>
+                            {blockchainProof.explorerLink ? (
+                                <a href={blockchainProof.explorerLink} target="_blank" rel="noopener noreferrer"
+                                    className="font-mono text-blue-400 text-xs hover:text-blue-300 break-all">
+                                    {blockchainProof.txnId} ↗
+                                </a>
+                            ) : (
+                                <p className="font-mono text-slate-500 text-xs">Confirmed on-chain (see the app's boxes)</p>
+                            )}
                         </div>
                         <div className="flex flex-col gap-1">
                             <p className="text-slate-400 text-xs">App ID (Smart Contract)</p>
@@ -76,7 +95,7 @@ export default function RegisterIdeaPage() {
                         </div>
                     </div>
                     <div className="flex flex-col sm:flex-row gap-3">
-                        <a href={blockchainProof.explorerLink} target="_blank" rel="noopener noreferrer"
+                        <a href={blockchainProof.explorerLink ?? blockchainProof.appLink} target="_blank" rel="noopener noreferrer"
                             className="flex-1 border border-blue-500/40 text-blue-400 hover:bg-blue-500/10 px-6 py-3 rounded-xl font-semibold text-sm transition-colors text-center">
                             View on Testnet Explorer ↗
                         </a>
@@ -236,7 +255,9 @@ export default function RegisterIdeaPage() {
                             <button onClick={() => setStep(2)} disabled={submitting} className="flex-1 border border-slate-700 text-slate-300 py-3 rounded-xl font-bold transition-colors hover:border-slate-500 disabled:opacity-40">← Back</button>
                             <button onClick={handleSubmit} disabled={submitting}
                                 className="flex-1 bg-green-600 hover:bg-green-700 disabled:opacity-50 text-white py-3 rounded-xl font-bold transition-colors">
-                                {submitting ? 'Registering on Blockchain...' : '🛡️ Register on Blockchain'}
+                                {submitting
+                                    ? (pending && PENDING_LABELS[pending.stage]) || 'Registering on Blockchain...'
+                                    : '🛡️ Register on Blockchain'}
                             </button>
                         </div>
                     </div>
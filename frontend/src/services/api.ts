@@ -55,7 +55,30 @@ export async function registerIdea(formData: FormData) {
             : 'Failed to register idea');
         throw new Error(message);
     }
-    return data as { success: boolean; idea: Idea; blockchainProof: BlockchainProof };
+    return data as RegisterIdeaResponse;
+}
+export async function getPendingRegistration(pendingId: string) {
+    return request<PendingRegistration>(`/api/ideas/pending/${encodeURIComponent(pendingId)}`);
+}
+/**
+ * Poll a queued registration (202 from POST /api/ideas) until it is on-chain and recorded.
+ * Rejects with the outbox's last error if the registration fails.
+ */
+export async function waitForRegistration(
+    pending: PendingRegistration,
+    onProgress?: (pending: PendingRegistration) => void,
+    intervalMs = 2000,
+) {
+    let current = pending;
+    while (current.stage !== 'done') {
+        if (current.stage === 'failed') {
+            throw new Error(current.lastError || 'Registration failed');
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+        current = await getPendingRegistration(current.pendingId);
+        onProgress?.(current);
+    }
+    return current as PendingRegistration & { blockchainProof: BlockchainProof };
 }
 export async function getIdeas(params?: Record<string, string>) {
     const qs = params ? '?' + new URLSearchParams(params).toString() : '';
@@ -105,10 +128,22 @@ export interface Idea {
 }
 
 export interface BlockchainProof {
-    ideaHash: string; txnId: string; appId: string; blockTimestamp: number;
-    ipfsCid: string; explorerLink: string; appLink: string; ipfsLink: string;
+    ideaHash: string; txnId: string | null; appId: string; blockTimestamp: number;
+    ipfsCid: string; explorerLink: string | null; appLink: string; ipfsLink: string;
+}
+
+export interface PendingRegistration {
+    pendingId: string; ideaHash: string; stage: 'pin' | 'chain' | 'record' | 'done' | 'failed';
+    ipfsCid?: string | null; pitchDeckCid?: string | null; txnId?: string | null;
+    blockTimestamp?: number | null; ideaId?: string | null; attempts: number; lastError?: string | null;
+    blockchainProof?: BlockchainProof;
 }
 
+// 201 when registered inline; 202 when queued on the registration outbox
+export type RegisterIdeaResponse =
+    | { success: boolean; idea: Idea; blockchainProof: BlockchainProof }
+    | { success: boolean; pending: PendingRegistration };
+
 export interface VerificationResult {
     verified: boolean; ideaHash: string; txnId?: string; appId?: string;
     explorerLink?: string; appLink?: string; verifiedAt: string;